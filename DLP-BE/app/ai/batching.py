@@ -0,0 +1,235 @@
+"""
+비동기 마이크로 배칭 스케줄러
+동시에 들어온 추론 요청을 길이 버킷별로 모아 한 번의 forward pass로 처리
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchScheduler:
+    """
+    길이 버킷 기반 동적 마이크로 배칭 스케줄러
+
+    - submit()으로 들어온 요청을 길이 버킷별 대기열에 적재
+    - 버킷이 max_batch_size에 도달하거나 가장 오래된 요청이 max_wait_ms를 넘기면 배치 실행
+    - 배치는 한 번에 하나씩 별도 스레드에서 실행 (코어 경쟁 방지)
+    - 배치 결과를 요청별 Future로 다시 분배
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[Any]], list[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        bucket_width: int = 128,
+        length_fn: Callable[[Any], int] = len,
+        name: str = "batch"
+    ):
+        """
+        Args:
+            batch_fn: 입력 리스트를 받아 같은 순서의 결과 리스트를 반환하는 동기 함수
+            max_batch_size: 배치당 최대 요청 수
+            max_wait_ms: 첫 요청이 배치를 기다리는 최대 시간 (밀리초)
+            bucket_width: 길이 버킷 폭 (같은 버킷끼리만 배치 → 패딩 낭비 감소)
+            length_fn: 요청 길이 계산 함수 (기본: 문자 수)
+            name: 로그/통계용 이름
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.bucket_width = max(1, bucket_width)
+        self.length_fn = length_fn
+        self.name = name
+
+        # 버킷 키 → deque[(item, future, enqueued_at)]
+        self._buckets: dict[int, deque] = {}
+        self._pending_count = 0
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+        # 튜닝용 통계
+        self._batch_size_histogram: dict[int, int] = {}
+        self._queue_depth_histogram: dict[int, int] = {}
+        self._max_queue_depth = 0
+        self._total_batches = 0
+        self._total_items = 0
+        self._total_wait_ms = 0.0
+        self._total_batch_ms = 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """
+        요청을 대기열에 넣고 배치 처리 결과를 기다림
+
+        Args:
+            item: batch_fn에 전달될 단일 입력
+
+        Returns:
+            해당 입력에 대한 batch_fn 결과
+        """
+        self._ensure_dispatcher()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = self.length_fn(item) // self.bucket_width
+
+        self._buckets.setdefault(key, deque()).append((item, future, loop.time()))
+        self._pending_count += 1
+        self._record_queue_depth(self._pending_count)
+        self._wakeup.set()
+
+        return await future
+
+    def _ensure_dispatcher(self) -> None:
+        """디스패처 태스크가 현재 이벤트 루프에서 실행 중인지 확인"""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            return
+
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    async def _dispatch_loop(self) -> None:
+        """배치 선택 및 실행 루프"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            if self._pending_count == 0:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            key, deadline = self._select_bucket()
+            delay = deadline - loop.time()
+
+            if delay > 0:
+                # 더 모일 때까지 대기 (새 요청이 오면 다시 평가)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            items = self._pop_batch(key)
+            if items:
+                await self._run_batch(items)
+
+    def _select_bucket(self) -> tuple[int, float]:
+        """
+        다음에 실행할 버킷 선택
+
+        Returns:
+            (버킷 키, 실행 시각) - 가득 찬 버킷은 즉시, 그 외에는 가장 오래된 요청 기준
+        """
+        selected_key = None
+        oldest = None
+
+        for key, bucket in self._buckets.items():
+            if not bucket:
+                continue
+            if len(bucket) >= self.max_batch_size:
+                return key, 0.0
+            enqueued_at = bucket[0][2]
+            if oldest is None or enqueued_at < oldest:
+                selected_key = key
+                oldest = enqueued_at
+
+        return selected_key, oldest + self.max_wait
+
+    def _pop_batch(self, key: int) -> list[tuple]:
+        """버킷에서 최대 max_batch_size개 요청을 꺼냄 (취소된 요청 제외)"""
+        bucket = self._buckets[key]
+        items = []
+
+        while bucket and len(items) < self.max_batch_size:
+            item = bucket.popleft()
+            self._pending_count -= 1
+            if not item[1].cancelled():
+                items.append(item)
+
+        if not bucket:
+            del self._buckets[key]
+
+        return items
+
+    async def _run_batch(self, items: list[tuple]) -> None:
+        """배치 실행 후 결과를 각 Future에 분배"""
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        inputs = [item for item, _, _ in items]
+
+        try:
+            results = await asyncio.to_thread(self.batch_fn, inputs)
+        except Exception as e:
+            logger.error(f"[{self.name}] Batch of {len(items)} failed: {str(e)}")
+            for _, future, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        finished_at = loop.time()
+        for (_, future, _), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+        # 통계 갱신
+        size = len(items)
+        self._total_batches += 1
+        self._total_items += size
+        self._batch_size_histogram[size] = self._batch_size_histogram.get(size, 0) + 1
+        self._total_wait_ms += sum((started_at - enqueued_at) * 1000 for _, _, enqueued_at in items)
+        self._total_batch_ms += (finished_at - started_at) * 1000
+
+        logger.debug(
+            f"[{self.name}] Ran batch of {size} in {(finished_at - started_at) * 1000:.1f}ms "
+            f"(pending: {self._pending_count})"
+        )
+
+    def _record_queue_depth(self, depth: int) -> None:
+        """enqueue 시점의 대기열 깊이를 2의 거듭제곱 구간으로 기록"""
+        self._max_queue_depth = max(self._max_queue_depth, depth)
+        bucket = 1
+        while bucket < depth:
+            bucket *= 2
+        self._queue_depth_histogram[bucket] = self._queue_depth_histogram.get(bucket, 0) + 1
+
+    def get_stats(self) -> dict:
+        """
+        튜닝용 통계 반환
+
+        Returns:
+            dict: 대기열 깊이, 배치 크기/대기열 깊이 히스토그램, 평균 대기/실행 시간
+        """
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._pending_count,
+            "max_queue_depth": self._max_queue_depth,
+            "total_batches": self._total_batches,
+            "total_items": self._total_items,
+            "avg_batch_size": round(self._total_items / self._total_batches, 2) if self._total_batches else 0.0,
+            "avg_wait_ms": round(self._total_wait_ms / self._total_items, 2) if self._total_items else 0.0,
+            "avg_batch_ms": round(self._total_batch_ms / self._total_batches, 2) if self._total_batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_size_histogram.items())),
+            "queue_depth_histogram": {
+                f"<={depth}": count for depth, count in sorted(self._queue_depth_histogram.items())
+            },
+        }
+
+    def shutdown(self) -> None:
+        """디스패처 중지 및 대기 중인 요청 취소"""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            self._dispatcher.cancel()
+        self._dispatcher = None
+
+        for bucket in self._buckets.values():
+            for _, future, _ in bucket:
+                if not future.done():
+                    future.cancel()
+        self._buckets.clear()
+        self._pending_count = 0
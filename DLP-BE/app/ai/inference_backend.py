@@ -0,0 +1,175 @@
+"""
+PII 토큰 분류 추론 백엔드
+settings.MODEL_MODE에 따라 PyTorch eager 또는 ONNX Runtime(FP32/INT8)으로 추론
+"""
+from pathlib import Path
+import logging
+import os
+import torch
+
+from app.core.config import settings
+
+# onnxruntime은 선택 의존성 (pip install -e ".[onnx]")
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# MODEL_MODE 값
+MODE_TORCH = "LOCAL"
+MODE_ONNX = "ONNX"
+MODE_ONNX_INT8 = "ONNX_INT8"
+
+
+class TorchTokenClassifierBackend:
+    """PyTorch eager 추론 백엔드 (기본값)"""
+
+    name = "torch"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict_proba(self, inputs: dict[str, torch.Tensor]) -> torch.Tensor:
+        """
+        토큰별 라벨 확률 계산
+
+        Args:
+            inputs: 토크나이저 출력 (input_ids, attention_mask 등)
+
+        Returns:
+            torch.Tensor: [batch, seq_len, num_labels] softmax 확률
+        """
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            return torch.nn.functional.softmax(outputs.logits, dim=-1)
+
+
+class OnnxTokenClassifierBackend:
+    """ONNX Runtime CPU 추론 백엔드 (FP32 또는 동적 INT8 양자화)"""
+
+    def __init__(self, model, model_name: str, quantized: bool = False):
+        """
+        Args:
+            model: ONNX 내보내기에 사용할 PyTorch 모델
+            model_name: 캐시 경로 구분용 모델 이름
+            quantized: True면 동적 INT8 양자화 모델 사용
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed (pip install -e \".[onnx]\")")
+
+        self.name = "onnx-int8" if quantized else "onnx"
+        self.model_path = ensure_onnx_model(model, model_name, quantized=quantized)
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.ONNX_INTRA_OP_THREADS > 0:
+            session_options.intra_op_num_threads = settings.ONNX_INTRA_OP_THREADS
+
+        self.session = ort.InferenceSession(
+            str(self.model_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [node.name for node in self.session.get_inputs()]
+        logger.info(f"Loaded ONNX PII model: {self.model_path}")
+
+    def predict_proba(self, inputs: dict[str, torch.Tensor]) -> torch.Tensor:
+        """
+        토큰별 라벨 확률 계산
+
+        Args:
+            inputs: 토크나이저 출력 (그래프에 정의된 입력만 사용)
+
+        Returns:
+            torch.Tensor: [batch, seq_len, num_labels] softmax 확률
+        """
+        feeds = {name: inputs[name].numpy() for name in self.input_names}
+        logits = self.session.run(["logits"], feeds)[0]
+        return torch.nn.functional.softmax(torch.from_numpy(logits), dim=-1)
+
+
+def ensure_onnx_model(model, model_name: str, quantized: bool = False) -> Path:
+    """
+    ONNX 모델을 디스크에 한 번만 내보내고 캐시된 경로 반환
+
+    Args:
+        model: PyTorch 토큰 분류 모델
+        model_name: 모델 이름 (예: psh3333/roberta-large-korean-pii5)
+        quantized: 동적 INT8 양자화 모델 생성 여부
+
+    Returns:
+        Path: ONNX 모델 파일 경로
+    """
+    cache_dir = Path(settings.ONNX_CACHE_DIR) / model_name.replace("/", "--")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    fp32_path = cache_dir / "model.onnx"
+    if not fp32_path.exists():
+        _export_onnx(model, fp32_path)
+
+    if not quantized:
+        return fp32_path
+
+    int8_path = cache_dir / "model.int8.onnx"
+    if not int8_path.exists():
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        logger.info(f"Quantizing ONNX model to INT8: {int8_path}")
+        tmp_path = int8_path.with_suffix(".tmp.onnx")
+        quantize_dynamic(str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8)
+        os.replace(tmp_path, int8_path)
+
+    return int8_path
+
+
+def _export_onnx(model, path: Path) -> None:
+    """PyTorch 모델을 동적 batch/sequence 축을 갖는 ONNX 그래프로 내보내기"""
+    logger.info(f"Exporting PII model to ONNX: {path}")
+
+    dummy_input_ids = torch.ones((1, 8), dtype=torch.long)
+    dummy_attention_mask = torch.ones((1, 8), dtype=torch.long)
+    tmp_path = path.with_suffix(".tmp.onnx")
+
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy_input_ids, dummy_attention_mask),
+            str(tmp_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch", 1: "sequence"},
+            },
+            opset_version=17,
+            dynamo=False
+        )
+
+    # 내보내기 도중 중단돼도 불완전한 파일이 캐시로 쓰이지 않도록 마지막에 이동
+    os.replace(tmp_path, path)
+
+
+def create_inference_backend(model, model_name: str, mode: str | None = None):
+    """
+    MODEL_MODE에 맞는 추론 백엔드 생성
+
+    Args:
+        model: 로드된 PyTorch 모델
+        model_name: 모델 이름
+        mode: "LOCAL"(PyTorch) | "ONNX" | "ONNX_INT8" (기본: settings.MODEL_MODE)
+    """
+    mode = (mode or settings.MODEL_MODE).upper()
+
+    if mode == MODE_ONNX:
+        return OnnxTokenClassifierBackend(model, model_name, quantized=False)
+    if mode == MODE_ONNX_INT8:
+        return OnnxTokenClassifierBackend(model, model_name, quantized=True)
+    if mode != MODE_TORCH:
+        logger.warning(f"Unknown MODEL_MODE '{mode}', falling back to PyTorch")
+
+    return TorchTokenClassifierBackend(model)
@@ -98,6 +98,8 @@ def cleanup_models():
 
     # PII 모델 정리
     if _pii_detector_instance is not None:
+        if getattr(_pii_detector_instance, 'batch_scheduler', None) is not None:
+            _pii_detector_instance.batch_scheduler.shutdown()
         if hasattr(_pii_detector_instance, 'model') and hasattr(_pii_detector_instance.model, 'cpu'):
             _pii_detector_instance.model.cpu()
         _pii_detector_instance = None
@@ -106,6 +108,8 @@ def cleanup_models():
 
     # 정책 위반 모델 정리
     if _policy_detector_instance is not None:
+        if getattr(_policy_detector_instance, 'batch_scheduler', None) is not None:
+            _policy_detector_instance.batch_scheduler.shutdown()
         if hasattr(_policy_detector_instance, 'model') and hasattr(_policy_detector_instance.model, 'cpu'):
             _policy_detector_instance.model.cpu()
         _policy_detector_instance = None
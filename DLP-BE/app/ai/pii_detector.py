@@ -1,6 +1,9 @@
 # app/ai/pii_detector.py
 from transformers import AutoTokenizer, AutoModelForTokenClassification
 import torch
+from app.ai.batching import MicroBatchScheduler
+from app.ai.inference_backend import create_inference_backend
+from app.core.config import settings
 from app.utils.entity_extractor import extract_bio_entities, has_pii_entities
 
 class RobertaKoreanPIIDetector:
@@ -14,6 +17,17 @@ class RobertaKoreanPIIDetector:
         self.tokenizer: AutoTokenizer | None = None
         self.model: AutoModelForTokenClassification | None = None
         self._load_model()
+
+        # 동시 요청을 하나의 forward pass로 묶는 배칭 스케줄러
+        self.batch_scheduler: MicroBatchScheduler | None = None
+        if settings.PII_BATCH_ENABLED:
+            self.batch_scheduler = MicroBatchScheduler(
+                batch_fn=self._predict_batch_sync,
+                max_batch_size=settings.PII_BATCH_MAX_SIZE,
+                max_wait_ms=settings.PII_BATCH_MAX_WAIT_MS,
+                bucket_width=settings.PII_BATCH_BUCKET_WIDTH,
+                name="pii"
+            )
     
     def _load_model(self):
         """모델과 토크나이저 로드"""
@@ -21,6 +35,8 @@ class RobertaKoreanPIIDetector:
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
             self.model = AutoModelForTokenClassification.from_pretrained(self.model_name)
             self.model.eval()
+            # MODEL_MODE에 따른 추론 백엔드 (PyTorch / ONNX / ONNX INT8)
+            self.backend = create_inference_backend(self.model, self.model_name)
         except Exception as e:
             raise RuntimeError(f"Failed to load PII detection model: {str(e)}")
     
@@ -37,12 +53,16 @@ class RobertaKoreanPIIDetector:
         if not self.model or not self.tokenizer:
             raise RuntimeError("PII detection model not loaded")
 
-        # CPU intensive한 모델 추론을 별도 스레드에서 실행
-        import asyncio
-        predictions = await asyncio.to_thread(self._predict_tokens_sync, text)
+        if self.batch_scheduler is not None:
+            # 동시 요청과 함께 배치로 묶어 추론
+            predictions = await self.batch_scheduler.submit(text)
+        else:
+            # CPU intensive한 모델 추론을 별도 스레드에서 실행
+            import asyncio
+            predictions = await asyncio.to_thread(self._predict_tokens_sync, text)
 
         # 새로운 엔티티 추출 함수 사용
-        entities = extract_bio_entities(predictions, self.tokenizer, text)
+        entities = extract_bio_entities(predictions, self.model.config.id2label, text)
 
         # PII 존재 여부 확인
         has_pii = has_pii_entities(entities)
@@ -53,31 +73,112 @@ class RobertaKoreanPIIDetector:
             "raw_predictions": predictions
         }
 
-    def _predict_tokens_sync(self, text: str) -> list[dict[str, any]]:
+    def _predict_tokens_sync(self, text: str) -> dict[str, list]:
         """토큰별 PII 라벨 예측 (동기 함수)"""
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
+        return self._predict_batch_sync([text])[0]
+
+    def encode_pooled(self, texts: list[str]):
+        """
+        RoBERTa 인코더 마지막 hidden state의 mean pooling 임베딩 (정책 게이트 선형 모델 입력)
 
+        Returns:
+            torch.Tensor: [batch, hidden_size]
+        """
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=settings.PII_MAX_LENGTH,
+            padding=True
+        )
         with torch.no_grad():
-            outputs = self.model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            predicted_classes = predictions.argmax(-1)
+            hidden = self.model.base_model(**inputs).last_hidden_state
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        return (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
 
-        tokens = self.tokenizer.convert_ids_to_tokens(inputs["input_ids"][0])
-        predictions_list = predicted_classes[0].tolist()
+    def _predict_batch_sync(self, texts: list[str]) -> list[dict[str, list]]:
+        """
+        여러 텍스트의 토큰별 PII 라벨을 한 번의 forward pass로 예측 (동기 함수)
+
+        max_length를 넘는 텍스트는 stride만큼 겹치는 윈도우로 나누고,
+        모든 텍스트의 모든 윈도우를 하나의 배치로 추론한 뒤
+        겹치는 토큰은 신뢰도가 가장 높은 예측으로 병합합니다.
+        후처리는 텐서 연산으로 수행하고, O 토큰을 제거한 뒤에만 리스트로 변환합니다.
+
+        Args:
+            texts: 분석할 텍스트 리스트 (패딩하여 하나의 배치로 처리)
 
-        results = []
-        for i, (token, prediction) in enumerate(zip(tokens, predictions_list)):
-            if token in ["[CLS]", "[SEP]", "[PAD]"]:
-                continue
+        Returns:
+            텍스트별 O가 아닌 토큰의 병렬 배열 (입력 순서 유지, 원문 순서 정렬):
+            {"label_ids", "confidences", "positions", "starts", "ends"}
+            positions는 O 토큰을 포함한 전체 토큰 기준 위치
+        """
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=settings.PII_MAX_LENGTH,
+            padding=True,
+            return_overflowing_tokens=settings.PII_SLIDING_WINDOW,
+            stride=settings.PII_WINDOW_STRIDE if settings.PII_SLIDING_WINDOW else 0,
+            return_offsets_mapping=True
+        )
 
-            label = self.model.config.id2label[prediction]
-            confidence = float(predictions[0][i][prediction])
+        # 모델 입력이 아닌 항목 분리
+        offset_mapping = inputs.pop("offset_mapping")
+        sample_mapping = inputs.pop("overflow_to_sample_mapping", None)
+
+        predictions = self.backend.predict_proba(inputs)
+        confidences, label_ids = predictions.max(-1)
+
+        num_windows, seq_len = label_ids.shape
+        if sample_mapping is None:
+            sample_mapping = torch.arange(num_windows)
+
+        # 패딩 및 특수 토큰([CLS], [SEP] 등)은 원문 위치가 없음
+        starts = offset_mapping[..., 0]
+        ends = offset_mapping[..., 1]
+        valid = inputs["attention_mask"].bool() & (starts != ends)
+
+        samples = sample_mapping.view(-1, 1).expand(num_windows, seq_len)[valid]
+        starts = starts[valid]
+        ends = ends[valid]
+        confidences = confidences[valid]
+        label_ids = label_ids[valid]
+
+        # (텍스트, start, end) 키로 윈도우 간 중복 토큰 병합: 신뢰도 내림차순 → 키 오름차순 안정 정렬
+        span = int(ends.max()) + 1 if ends.numel() else 1
+        keys = (samples * span + starts) * span + ends
+        order = torch.sort(confidences, descending=True, stable=True).indices
+        order = order[torch.sort(keys[order], stable=True).indices]
+        keys = keys[order]
+        first = torch.ones_like(keys, dtype=torch.bool)
+        first[1:] = keys[1:] != keys[:-1]
+        order = order[first]
+
+        samples = samples[order]
+        # 텍스트별 전체 토큰 기준 위치 (정렬된 텍스트 구간 시작점 기준)
+        positions = torch.arange(len(order)) - torch.searchsorted(samples, samples)
+
+        # O 토큰 제거 후에만 Python 리스트 생성
+        o_label_id = self.model.config.label2id.get("O", -1)
+        entity_mask = label_ids[order] != o_label_id
+        order = order[entity_mask]
+        samples = samples[entity_mask]
+        positions = positions[entity_mask]
+
+        columns = {
+            "label_ids": label_ids[order].tolist(),
+            "confidences": confidences[order].tolist(),
+            "positions": positions.tolist(),
+            "starts": starts[order].tolist(),
+            "ends": ends[order].tolist(),
+        }
 
-            results.append({
-                "token": token,
-                "label": label,
-                "confidence": confidence,
-                "position": i
-            })
+        batch_results = []
+        offset = 0
+        for count in torch.bincount(samples, minlength=len(texts)).tolist():
+            batch_results.append({name: values[offset:offset + count] for name, values in columns.items()})
+            offset += count
 
-        return results
\ No newline at end of file
+        return batch_results
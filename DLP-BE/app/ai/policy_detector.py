@@ -4,10 +4,14 @@ EXAONE 기반 맥락 분석으로 정부 정책 위반 여부 판단
 """
 from transformers import AutoModelForCausalLM, AutoTokenizer
 from peft import PeftModel
+from app.ai.batching import MicroBatchScheduler
 import torch
+import copy
 import re
 import logging
 
+from app.core.config import settings
+
 # bitsandbytes는 CUDA에서만 사용 (macOS 미지원)
 try:
     from transformers import BitsAndBytesConfig
@@ -21,10 +25,31 @@ logger = logging.getLogger(__name__)
 class PolicyViolationDetector:
     """EXAONE 기반 정책 위반 탐지 모델 (QLoRA with PEFT)"""
 
+    # 분류 카테고리 (텍스트 매칭 시 VIOLATION_*을 먼저 검사)
+    CATEGORIES = [
+        "VIOLATION_PRIVACY_CITIZEN",
+        "VIOLATION_CLASSIFIED",
+        "VIOLATION_HR",
+        "VIOLATION_SALARY",
+        "VIOLATION_DELIBERATION",
+        "SAFE"
+    ]
+
+    # prefix KV cache 사용 전 prefix/suffix 분리 토크나이징이 전체 토크나이징과 같은지 확인할 샘플
+    # (사용자 텍스트 시작/끝 문자가 chat template 경계 토큰과 합쳐지는 경우를 포함)
+    PREFIX_CHECK_SAMPLES = (
+        "홍길동 과장의 연봉은 얼마인가요?",
+        " 앞에 공백이 있는 질문",
+        "\n줄바꿈으로 시작하는 질문",
+        "What is the salary of employee 1024?",
+        "2024년 인사 평가 결과\n",
+        "!?",
+    )
+
     def __init__(
         self,
-        adapter_name: str = "psh3333/EXAONE-Policy-Violation-Detector-v1",
-        base_model_name: str = "LGAI-EXAONE/EXAONE-3.5-7.8B-Instruct"
+        adapter_name: str = settings.POLICY_ADAPTER_NAME,
+        base_model_name: str = settings.POLICY_BASE_MODEL_NAME
     ):
         """
         정책 위반 탐지 모델 초기화
@@ -100,6 +125,30 @@ SAFE | VIOLATION_PRIVACY_CITIZEN | VIOLATION_CLASSIFIED | VIOLATION_HR | VIOLATI
 
 카테고리만 출력."""
 
+        # 스코어링 모드용 카테고리별 라벨 토큰 시퀀스
+        self.label_token_ids = [
+            self.tokenizer.encode(category, add_special_tokens=False)
+            for category in self.CATEGORIES
+        ]
+
+        # 고정 프롬프트 prefix(시스템 프롬프트 + chat template 헤더) KV cache
+        self.prefix_ids = None
+        self.prefix_past = None
+        self.suffix_template = None
+        if settings.POLICY_PREFIX_CACHE_ENABLED:
+            self._init_prefix_cache()
+
+        # 동시 요청을 left-padding 배치로 묶는 스케줄러
+        self.batch_scheduler: MicroBatchScheduler | None = None
+        if settings.POLICY_BATCH_ENABLED:
+            self.batch_scheduler = MicroBatchScheduler(
+                batch_fn=self._detect_violation_batch_sync,
+                max_batch_size=settings.POLICY_BATCH_MAX_SIZE,
+                max_wait_ms=settings.POLICY_BATCH_MAX_WAIT_MS,
+                bucket_width=settings.POLICY_BATCH_BUCKET_WIDTH,
+                name="policy"
+            )
+
     async def detect_violation(self, text: str) -> dict[str, str | float]:
         """
         텍스트의 정책 위반 여부 판단
@@ -114,6 +163,10 @@ SAFE | VIOLATION_PRIVACY_CITIZEN | VIOLATION_CLASSIFIED | VIOLATION_HR | VIOLATI
             }
         """
         try:
+            if self.batch_scheduler is not None:
+                # 동시 요청과 함께 배치로 묶어 추론
+                return await self.batch_scheduler.submit(text)
+
             # CPU intensive한 모델 추론을 별도 스레드에서 실행
             import asyncio
             result = await asyncio.to_thread(self._detect_violation_sync, text)
@@ -128,21 +181,253 @@ SAFE | VIOLATION_PRIVACY_CITIZEN | VIOLATION_CLASSIFIED | VIOLATION_HR | VIOLATI
             }
 
     def _detect_violation_sync(self, text: str) -> dict[str, str | float]:
-        """동기 방식으로 정책 위반 판단"""
-        # Chat template 구성
+        """동기 방식으로 정책 위반 판단 (POLICY_DETECTION_MODE에 따라 스코어링/생성)"""
+        return self._detect_violation_batch_sync([text])[0]
+
+    def _detect_violation_batch_sync(self, texts: list[str]) -> list[dict[str, str | float]]:
+        """
+        여러 텍스트의 정책 위반 판단 (배칭 스케줄러의 batch_fn)
+
+        SCORING 모드는 한 번의 배치 forward로 처리하고,
+        GENERATE 모드는 요청별로 generate()를 실행합니다.
+        """
+        if settings.POLICY_DETECTION_MODE.upper() == "GENERATE":
+            return [self._generate_violation_sync(text) for text in texts]
+        return self._score_violation_batch_sync(texts)
+
+    def _build_input_ids(self, text: str) -> torch.Tensor:
+        """Chat template을 적용한 프롬프트 토큰 ID"""
         messages = [
             {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": f"다음 질문을 분류하세요:\n\n{text}"}
         ]
 
-        # 토크나이징 (chat template 적용)
-        input_ids = self.tokenizer.apply_chat_template(
+        return self.tokenizer.apply_chat_template(
             messages,
             tokenize=True,
             add_generation_prompt=True,
-            return_tensors="pt"
+            return_tensors="pt",
+            return_dict=False
+        )
+
+    def _init_prefix_cache(self) -> None:
+        """
+        사용자 텍스트 앞의 고정 prefix를 한 번만 prefill하여 KV cache 저장
+
+        chat template을 sentinel로 렌더링해 prefix/suffix 문자열로 나누고,
+        prefix 토큰 + (사용자 텍스트 + suffix) 토큰이 전체 토크나이징 결과와
+        일치하는 경우에만 사용합니다 (불일치 시 전체 prefill로 동작).
+        """
+        sentinel = "<<USER_TEXT>>"
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": f"다음 질문을 분류하세요:\n\n{sentinel}"}
+        ]
+        rendered = self.tokenizer.apply_chat_template(
+            messages,
+            tokenize=False,
+            add_generation_prompt=True
+        )
+        prefix_text, suffix_template = rendered.split(sentinel)
+
+        prefix_ids = self.tokenizer.encode(prefix_text, add_special_tokens=False)
+        self.suffix_template = suffix_template
+
+        # prefix/suffix 경계에서 토큰이 달라지지 않는지 확인 (경계에 오는 문자 종류별 샘플)
+        for sample in self.PREFIX_CHECK_SAMPLES:
+            expected = self._build_input_ids(sample)[0].tolist()
+            if prefix_ids + self._encode_suffix(sample) != expected:
+                logger.warning(f"Prompt prefix tokenization is not stable for {sample!r}, prefix KV cache disabled")
+                self.suffix_template = None
+                return
+
+        self.prefix_ids = torch.tensor([prefix_ids], device=self.device)
+        with torch.no_grad():
+            outputs = self.model(
+                input_ids=self.prefix_ids,
+                attention_mask=torch.ones_like(self.prefix_ids),
+                use_cache=True
+            )
+        self.prefix_past = outputs.past_key_values
+        logger.info(f"Policy prompt prefix cached ({len(prefix_ids)} tokens)")
+
+    def _encode_suffix(self, text: str) -> list[int]:
+        """prefix 이후의 사용자 텍스트 + chat template 꼬리 토큰 ID"""
+        return self.tokenizer.encode(text + self.suffix_template, add_special_tokens=False)
+
+    def _prefill_batch(self, texts: list[str]):
+        """
+        프롬프트 배치 prefill (prefix KV cache가 있으면 사용자 suffix만 계산)
+
+        사용자 부분은 왼쪽 패딩하여 마지막 위치를 맞추고,
+        prefix cache를 사용할 때는 패딩이 prefix와 suffix 사이에 위치합니다.
+        position_ids는 attention_mask 누적합으로 계산하여 패딩 영향을 제거합니다.
+
+        Returns:
+            tuple: (모델 출력, prefix를 포함한 전체 attention_mask [batch, seq_len])
+        """
+        if self.prefix_past is None:
+            sequences = [self._build_input_ids(text)[0].tolist() for text in texts]
+        else:
+            sequences = [self._encode_suffix(text) for text in texts]
+
+        max_length = max(len(ids) for ids in sequences)
+        pad_id = self.tokenizer.pad_token_id
+        input_ids = torch.tensor(
+            [[pad_id] * (max_length - len(ids)) + ids for ids in sequences],
+            device=self.device
+        )
+        attention_mask = torch.tensor(
+            [[0] * (max_length - len(ids)) + [1] * len(ids) for ids in sequences],
+            dtype=torch.long,
+            device=self.device
         )
 
+        past_key_values = None
+        if self.prefix_past is not None:
+            # 공유 prefix cache는 그대로 두고 배치 크기만큼 복제한 새 cache 사용
+            past_key_values = self._expand_past(self.prefix_past, len(texts))
+            prefix_mask = torch.ones(
+                (len(texts), self.prefix_ids.shape[1]),
+                dtype=torch.long,
+                device=self.device
+            )
+            attention_mask = torch.cat([prefix_mask, attention_mask], dim=1)
+
+        outputs = self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            position_ids=self._position_ids(attention_mask)[:, -max_length:],
+            past_key_values=past_key_values,
+            use_cache=True
+        )
+        return outputs, attention_mask
+
+    @staticmethod
+    def _position_ids(attention_mask: torch.Tensor) -> torch.Tensor:
+        """패딩을 건너뛴 위치 ID (패딩 위치는 0)"""
+        return (attention_mask.cumsum(dim=-1) - 1).clamp(min=0)
+
+    def _score_violation_sync(self, text: str) -> dict[str, str | float]:
+        """단일 텍스트 라벨 스코어링"""
+        return self._score_violation_batch_sync([text])[0]
+
+    def _score_violation_batch_sync(self, texts: list[str]) -> list[dict[str, str | float]]:
+        """
+        생성 없이 카테고리 라벨의 로그 확률을 비교하여 판단
+
+        프롬프트를 한 번 prefill한 뒤, 6개 라벨 토큰 시퀀스를 KV cache 위에서
+        하나의 배치로 평가하여 시퀀스 로그 확률을 계산합니다.
+        confidence는 6개 라벨에 대한 softmax 확률입니다.
+        """
+        with torch.no_grad():
+            outputs, attention_mask = self._prefill_batch(texts)
+            next_token_logprobs = torch.log_softmax(outputs.logits[:, -1, :].float(), dim=-1)
+            label_scores = self._score_labels(
+                next_token_logprobs,
+                outputs.past_key_values,
+                attention_mask
+            )
+
+        probabilities = torch.softmax(label_scores, dim=-1)
+        results = []
+        for row in probabilities:
+            best = int(row.argmax())
+            logger.debug(
+                "Policy label probabilities: "
+                + ", ".join(f"{c}={p:.3f}" for c, p in zip(self.CATEGORIES, row.tolist()))
+            )
+            results.append({
+                "judgment": self.CATEGORIES[best],
+                "confidence": float(row[best])
+            })
+
+        return results
+
+    def _score_labels(
+        self,
+        next_token_logprobs: torch.Tensor,
+        past_key_values,
+        attention_mask: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        프롬프트 KV cache 위에서 카테고리 라벨 시퀀스 로그 확률 계산
+
+        Args:
+            next_token_logprobs: 프롬프트 마지막 위치의 다음 토큰 로그 확률 [batch, vocab]
+            past_key_values: 프롬프트 prefill KV cache
+            attention_mask: 프롬프트 attention_mask [batch, prompt_len]
+
+        Returns:
+            torch.Tensor: 카테고리별 시퀀스 로그 확률 [batch, num_categories]
+        """
+        batch_size = attention_mask.shape[0]
+        num_labels = len(self.label_token_ids)
+        max_label_length = max(len(ids) for ids in self.label_token_ids)
+        pad_id = self.tokenizer.pad_token_id
+
+        # 라벨을 오른쪽 패딩 (causal attention이므로 뒤쪽 패딩은 앞 토큰 점수에 영향 없음)
+        label_ids = torch.tensor(
+            [ids + [pad_id] * (max_label_length - len(ids)) for ids in self.label_token_ids],
+            device=self.device
+        )
+        label_mask = torch.tensor(
+            [[1.0] * len(ids) + [0.0] * (max_label_length - len(ids)) for ids in self.label_token_ids],
+            device=self.device
+        )
+
+        # 첫 라벨 토큰은 prefill 출력에서 바로 계산
+        scores = next_token_logprobs[:, label_ids[:, 0]]
+
+        if max_label_length > 1:
+            # 나머지 라벨 토큰은 KV cache를 (요청 × 라벨) 수만큼 복제하여 한 번에 평가
+            # 복제 순서: 요청0-라벨0..5, 요청1-라벨0..5, ...
+            label_attention_mask = torch.cat([
+                attention_mask.repeat_interleave(num_labels, dim=0),
+                torch.ones(
+                    (batch_size * num_labels, max_label_length - 1),
+                    dtype=torch.long,
+                    device=self.device
+                )
+            ], dim=1)
+            outputs = self.model(
+                input_ids=label_ids[:, :-1].repeat(batch_size, 1),
+                attention_mask=label_attention_mask,
+                position_ids=self._position_ids(label_attention_mask)[:, -(max_label_length - 1):],
+                past_key_values=self._expand_past(past_key_values, num_labels),
+                use_cache=True
+            )
+            logprobs = torch.log_softmax(outputs.logits.float(), dim=-1)
+            token_logprobs = logprobs.gather(
+                -1, label_ids[:, 1:].repeat(batch_size, 1).unsqueeze(-1)
+            ).squeeze(-1)
+            token_scores = (token_logprobs * label_mask[:, 1:].repeat(batch_size, 1)).sum(dim=-1)
+            scores = scores + token_scores.view(batch_size, num_labels)
+
+        return scores
+
+    @staticmethod
+    def _expand_past(past_key_values, batch_size: int):
+        """
+        KV cache의 각 요청을 batch_size번 복제한 새 cache (Cache 객체/legacy tuple 모두 지원)
+
+        forward가 반환 cache를 확장하므로 입력 cache(공유 prefix cache 등)는 변경하지 않습니다.
+        """
+        if hasattr(past_key_values, "batch_repeat_interleave"):
+            expanded = copy.deepcopy(past_key_values)
+            expanded.batch_repeat_interleave(batch_size)
+            return expanded
+
+        return tuple(
+            tuple(tensor.repeat_interleave(batch_size, dim=0) for tensor in layer)
+            for layer in past_key_values
+        )
+
+    def _generate_violation_sync(self, text: str) -> dict[str, str | float]:
+        """generate()로 카테고리 텍스트를 생성하여 판단 (레거시 모드)"""
+        # 토크나이징 (chat template 적용)
+        input_ids = self._build_input_ids(text)
+
         # attention_mask 생성 (모든 토큰을 attend하도록 설정)
         attention_mask = torch.ones_like(input_ids)
 
@@ -150,11 +435,17 @@ SAFE | VIOLATION_PRIVACY_CITIZEN | VIOLATION_CLASSIFIED | VIOLATION_HR | VIOLATI
         input_ids = input_ids.to(self.device)
         attention_mask = attention_mask.to(self.device)
 
+        # prefix KV cache가 있으면 generate()가 캐시된 길이 이후만 prefill
+        generate_kwargs = {}
+        if self.prefix_past is not None:
+            generate_kwargs["past_key_values"] = copy.deepcopy(self.prefix_past)
+
         # 생성 (카테고리만 출력하므로 토큰 수 최소화)
         with torch.no_grad():
             outputs = self.model.generate(
                 input_ids,
                 attention_mask=attention_mask,
+                **generate_kwargs,
                 max_new_tokens=15,  # 50 → 15로 감소 (카테고리 이름만 필요)
                 do_sample=False,
                 pad_token_id=self.tokenizer.pad_token_id,
@@ -189,19 +480,9 @@ SAFE | VIOLATION_PRIVACY_CITIZEN | VIOLATION_CLASSIFIED | VIOLATION_HR | VIOLATI
         Returns:
             str: 추출된 카테고리 (SAFE, VIOLATION_*)
         """
-        # 가능한 카테고리 패턴
-        categories = [
-            "VIOLATION_PRIVACY_CITIZEN",
-            "VIOLATION_CLASSIFIED",
-            "VIOLATION_HR",
-            "VIOLATION_SALARY",
-            "VIOLATION_DELIBERATION",
-            "SAFE"
-        ]
-
         # 텍스트에서 카테고리 검색 (순서대로, 먼저 매칭되는 것 반환)
         text_upper = text.upper()
-        for category in categories:
+        for category in self.CATEGORIES:
             if category in text_upper:
                 return category
 
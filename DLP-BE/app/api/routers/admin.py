@@ -3,9 +3,12 @@
 """
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.models.user import User
 from app.core.dependencies import get_current_user
-from app.services.log_service import PIILogService
+from app.core.config import settings
+from app.services.log_service import PIILogService, InvalidCursorError, CursorExpiredError
+from app.services.log_export_service import LogExportJob, ExportFormatError, EXPORT_FORMATS, get_export_progress
 from app.schemas.log import (
     LogListResponse,
     StatisticsOverview,
@@ -24,7 +27,7 @@ log_service = PIILogService()
 @router.get("/logs",
             response_model=LogListResponse,
             summary="PII 검사 로그 조회",
-            description="관리자 전용: PII 검사 로그를 조회합니다. 필터링 및 페이징 지원. 기본 조회 기간: 최근 24시간")
+            description="관리자 전용: PII 검사 로그를 조회합니다. 필터링 및 페이징(offset/커서) 지원. 기본 조회 기간: 최근 24시간")
 async def get_logs(
     start_date: datetime | None = Query(None, description="시작 날짜 (ISO 8601, 기본: 24시간 전)"),
     end_date: datetime | None = Query(None, description="종료 날짜 (ISO 8601, 기본: 현재)"),
@@ -34,6 +37,8 @@ async def get_logs(
     page: int = Query(1, ge=1, description="페이지 번호"),
     page_size: int = Query(20, ge=1, le=100, description="페이지 크기 (1-100)"),
     sort: str = Query("timestamp:desc", description="정렬 (field:asc 또는 field:desc)"),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="페이징 방식 (offset 또는 cursor)"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor (지정 시 필터/정렬/페이지 크기는 커서 값 사용)"),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -41,9 +46,17 @@ async def get_logs(
 
     - 날짜 범위 기본값: 최근 24시간
     - IP, PII 여부, 엔티티 타입으로 필터링 가능
-    - 페이징 지원
+    - offset 페이징: page * page_size가 LOGS_MAX_OFFSET_WINDOW(기본 10,000) 이내만 허용
+    - 커서 페이징: pagination=cursor로 첫 페이지를 받고, 응답의 next_cursor를 cursor로 넘겨 다음 페이지 조회
+      (point-in-time + search_after, 깊이와 무관하게 일정한 지연시간, 만료 시 410)
     """
     try:
+        if cursor is None and pagination == "offset" and page * page_size > settings.LOGS_MAX_OFFSET_WINDOW:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"offset 페이징은 {settings.LOGS_MAX_OFFSET_WINDOW}건까지만 조회할 수 있습니다. pagination=cursor를 사용하세요."
+            )
+
         # 기본값 설정: 24시간 전부터 현재까지
         if start_date is None:
             start_date = datetime.utcnow() - timedelta(hours=24)
@@ -63,11 +76,25 @@ async def get_logs(
             entity_type=entity_type,
             page=page,
             page_size=page_size,
-            sort=sort
+            sort=sort,
+            cursor_mode=pagination == "cursor",
+            cursor=cursor
         )
 
         return result
 
+    except HTTPException:
+        raise
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다."
+        )
+    except CursorExpiredError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="커서가 만료되었습니다. 첫 페이지부터 다시 조회하세요."
+        )
     except Exception as e:
         logger.error(f"Failed to get logs: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -76,6 +103,76 @@ async def get_logs(
         )
 
 
+@router.get("/logs/export",
+            summary="PII 검사 로그 내보내기",
+            description="관리자 전용: /logs와 같은 필터의 로그 전체를 NDJSON/CSV/Parquet으로 스트리밍합니다. 기본 조회 기간: 최근 24시간")
+async def export_logs(
+    start_date: datetime | None = Query(None, description="시작 날짜 (ISO 8601, 기본: 24시간 전)"),
+    end_date: datetime | None = Query(None, description="종료 날짜 (ISO 8601, 기본: 현재)"),
+    client_ip: str | None = Query(None, description="클라이언트 IP 주소 필터"),
+    has_pii: bool | None = Query(None, description="PII 탐지 여부 필터 (true/false)"),
+    entity_type: str | None = Query(None, description="PII 타입 필터 (PERSON, PHONE_NUM 등)"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|parquet)$", description="형식 (ndjson, csv, parquet)"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    PII 검사 로그 내보내기 (관리자 전용)
+
+    - 결과 전체를 메모리에 올리지 않고 배치 단위로 스트리밍 (point-in-time slice 병렬 읽기)
+    - 응답 헤더 X-Export-Id로 /logs/export/{export_id}에서 진행 상황 조회
+    - 순서: slice 안에서만 시간순 (전체 정렬 필요 시 받은 뒤 timestamp로 정렬)
+    - parquet은 pyarrow 필요 ('export' extra, 없으면 400)
+    """
+    if start_date is None:
+        start_date = datetime.utcnow() - timedelta(hours=24)
+    if end_date is None:
+        end_date = datetime.utcnow()
+
+    try:
+        job = LogExportJob(
+            export_format=export_format,
+            start_date=start_date,
+            end_date=end_date,
+            client_ip=client_ip,
+            has_pii=has_pii,
+            entity_type=entity_type
+        )
+    except ExportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    logger.info(
+        f"Admin {current_user.username} started log export {job.export_id}: "
+        f"format={export_format}, start={start_date}, end={end_date}, ip={client_ip}, has_pii={has_pii}"
+    )
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = f"pii-logs-{start_date:%Y%m%d%H%M}-{end_date:%Y%m%d%H%M}.{extension}"
+    return StreamingResponse(
+        job.stream(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-Id": job.export_id
+        }
+    )
+
+
+@router.get("/logs/export/{export_id}",
+            summary="로그 내보내기 진행 상황",
+            description="관리자 전용: 내보낸 건수, 전체 건수, 진행률, 처리 속도를 조회합니다.")
+async def get_export_status(
+    export_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    progress = get_export_progress(export_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="내보내기 작업을 찾을 수 없습니다."
+        )
+    return progress
+
+
 @router.get("/statistics/overview",
             response_model=StatisticsOverview,
             summary="전체 통계 개요",
@@ -0,0 +1,105 @@
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, status
+from app.core.config import settings
+from app.schemas.file import FileProcessResponse
+from app.services.file_extraction_service import get_file_extraction_service
+from app.services.log_service import PIILogService
+from app.utils.ip_utils import get_client_ip
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+log_service = PIILogService()
+
+# 업로드를 임시 파일로 옮길 때 한 번에 읽는 크기
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _save_upload(file: UploadFile) -> tuple[str, int]:
+    """
+    업로드를 청크 단위로 임시 파일에 저장 (FILE_MAX_BYTES 초과 시 413)
+
+    Returns:
+        (임시 파일 경로, 크기)
+    """
+    suffix = os.path.splitext(file.filename or "")[1][:16]
+    size = 0
+    with tempfile.NamedTemporaryFile(prefix="dlp-upload-", suffix=suffix, delete=False) as tmp:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.FILE_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"파일 크기가 제한({settings.FILE_MAX_BYTES // (1024 * 1024)}MB)을 초과했습니다."
+                    )
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return tmp.name, size
+
+
+@router.post("/process",
+             response_model=FileProcessResponse,
+             summary="파일 텍스트 추출 및 PII 탐지 (프록시용, 인증 불필요)",
+             description="업로드 파일(PDF, DOCX, 이미지, 텍스트)에서 페이지 단위로 텍스트를 추출하고 개인정보를 탐지합니다. 프록시 서버에서 호출합니다.",
+             status_code=status.HTTP_200_OK)
+async def process_file(
+    request: Request,
+    file: UploadFile = File(..., description="검사할 파일"),
+    process_options: str = Form("", description="프록시 처리 옵션 (예약)")
+) -> FileProcessResponse:
+    """
+    파일 텍스트 추출 + PII 탐지 API (프록시용, 인증 불필요)
+
+    - **file**: 검사할 파일 (FILE_MAX_BYTES 이하)
+
+    반환값:
+    - **text**: 추출 텍스트 앞부분
+    - **has_pii** / **entities**: 페이지별 탐지 결과 (page는 1부터 시작)
+    - **pages_total** / **pages_processed** / **truncated**: 페이지·시간 예산 적용 결과
+    """
+    client_ip = get_client_ip(request)
+    filename = file.filename or "unknown"
+
+    path, size = await _save_upload(file)
+    try:
+        logger.info(f"File processing started from IP: {client_ip}, file: {filename}, size: {size}")
+        service = get_file_extraction_service()
+        result = await service.process(path, filename, file.content_type, size)
+    except Exception as e:
+        logger.error(f"File processing failed from IP {client_ip}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="파일 처리 중 오류가 발생했습니다."
+        )
+    finally:
+        os.unlink(path)
+
+    logger.info(
+        f"File processing completed. IP: {client_ip}, file: {filename}, kind: {result.kind}, "
+        f"pages: {result.pages_processed}/{result.pages_total}, has_pii: {result.has_pii}, "
+        f"entities: {len(result.entities)}, response_time: {result.processing_time_ms:.2f}ms"
+    )
+
+    detection = service.build_detection_result(result)
+    result.reason = detection.reason
+
+    # 텍스트를 추출한 경우에만 탐지 로그 저장 (원문 대신 파일명 + 추출 텍스트 앞부분)
+    if result.pages_processed:
+        try:
+            await log_service.log_detection(
+                client_ip=client_ip,
+                original_text=f"[file] {filename}\n{result.text}",
+                result=detection,
+                response_time_ms=result.processing_time_ms
+            )
+        except Exception as log_error:
+            logger.warning(f"Failed to log file detection result: {str(log_error)}")
+
+    return result
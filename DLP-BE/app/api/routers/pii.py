@@ -1,9 +1,14 @@
 from fastapi import APIRouter, HTTPException, status, Request
 from fastapi.responses import JSONResponse
-from app.schemas.pii import PIIDetectionRequest, PIIDetectionResponse
+from app.schemas.pii import PIIDetectionRequest, PIIDetectionResponse, PIIAuditRequest, PIIEnabledTypesResponse
 from app.services.pii_service import PIIDetectionService
 from app.services.log_service import PIILogService
+from app.services.policy_gate import get_policy_gate
+from app.services.log_shipper import get_log_shipper
+from app.services.log_rollup import get_log_rollup
+from app.core.config import settings
 from app.ai.model_manager import get_pii_detector
+from app.core.detection_cache import get_detection_cache
 from app.utils.ip_utils import get_client_ip
 import logging
 import time
@@ -84,6 +89,47 @@ async def detect_pii(
             detail="PII 탐지 중 오류가 발생했습니다."
         )
 
+@router.post("/audit",
+             summary="프록시 자체 차단 감사 로그 (프록시용, 인증 불필요)",
+             description="프록시가 정규식 빠른 경로로 차단한 요청을 탐지 로그에 기록합니다. 모델 추론은 수행하지 않습니다.",
+             status_code=status.HTTP_202_ACCEPTED)
+async def audit_pii(
+    audit_request: PIIAuditRequest,
+    request: Request
+):
+    """
+    프록시 자체 판정 감사 로그 API (프록시용, 인증 불필요)
+
+    - **text**: 차단된 원문 텍스트
+    - **entities**: 프록시에서 탐지한 엔티티 (type, value, start, end 등)
+    - **reason**: 프록시 차단 사유
+    - **source**: 판정 출처
+    """
+    client_ip = get_client_ip(request)
+    result = pii_service.build_audit_response(audit_request.entities)
+
+    await log_service.log_detection(
+        client_ip=client_ip,
+        original_text=audit_request.text,
+        result=result,
+        response_time_ms=0.0,
+        model_version=audit_request.source
+    )
+
+    logger.info(
+        f"Proxy audit logged. IP: {client_ip}, source: {audit_request.source}, "
+        f"entities: {len(audit_request.entities)}, reason: {audit_request.reason}"
+    )
+    return {"logged": True}
+
+@router.get("/settings",
+            response_model=PIIEnabledTypesResponse,
+            summary="활성화된 PII 타입 조회 (프록시용, 인증 불필요)",
+            description="관리자 PII 설정에서 탐지가 켜진 타입 목록을 반환합니다. 프록시는 정규식 빠른 경로를 이 타입으로 제한합니다.")
+async def get_enabled_pii_types() -> PIIEnabledTypesResponse:
+    """활성화된 PII 타입 조회 API (프록시용, 인증 불필요, 설정 캐시 사용)"""
+    return PIIEnabledTypesResponse(enabled_types=await pii_service.get_enabled_types())
+
 @router.get("/health",
             summary="PII 탐지 서비스 상태 확인",
             description="PII 탐지 모델이 정상적으로 로드되었는지 확인합니다. 인증 불필요.")
@@ -94,13 +140,35 @@ async def health_check():
         detector = get_pii_detector()
         model_loaded = detector.model is not None and detector.tokenizer is not None
 
+        # 배칭 스케줄러 통계 (대기열 깊이, 배치 크기 히스토그램)
+        batching = detector.batch_scheduler.get_stats() if detector.batch_scheduler else None
+
+        # 탐지 결과 캐시 통계 (hit/miss/eviction)
+        cache = get_detection_cache()
+        detection_cache = cache.get_stats() if cache else None
+
+        # 정책 게이트 통계 (섀도 모드 누락 위반 수 포함)
+        policy_gate = get_policy_gate().get_stats()
+
+        # 로그 적재기 통계 (큐 깊이, 유실/spill 수, 플러시 지연 시간)
+        log_shipper = get_log_shipper().get_stats() if settings.LOG_SHIPPER_ENABLED else None
+
+        # 통계 롤업 범위와 늦은 로그 재집계 대기 수
+        log_rollup = get_log_rollup().get_stats() if settings.ROLLUP_ENABLED else None
+
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "status": "healthy",
                 "message": "PII detection service is running",
                 "model_loaded": model_loaded,
-                "model_name": detector.model_name
+                "model_name": detector.model_name,
+                "inference_backend": detector.backend.name,
+                "batching": batching,
+                "detection_cache": detection_cache,
+                "policy_gate": policy_gate,
+                "log_shipper": log_shipper,
+                "log_rollup": log_rollup
             }
         )
     except Exception as e:
@@ -23,13 +23,93 @@ class Settings(BaseSettings):
     # AI Model
     PII_MODEL_NAME: str = "psh3333/roberta-large-korean-pii5"
     DEFAULT_PII_THRESHOLD: float = 0.59
-    MODEL_MODE: str = "LOCAL"
+    MODEL_MODE: str = "LOCAL"  # LOCAL(PyTorch) | ONNX | ONNX_INT8
+    ONNX_CACHE_DIR: str = ".cache/onnx"
+    ONNX_INTRA_OP_THREADS: int = 0  # 0이면 onnxruntime 기본값
+
+    POLICY_ADAPTER_NAME: str = "psh3333/EXAONE-Policy-Violation-Detector-v1"
+    POLICY_BASE_MODEL_NAME: str = "LGAI-EXAONE/EXAONE-3.5-7.8B-Instruct"
+    POLICY_DETECTION_MODE: str = "SCORING"  # SCORING(라벨 로그 확률 1회 prefill) | GENERATE(generate())
+    POLICY_PREFIX_CACHE_ENABLED: bool = True  # 고정 시스템 프롬프트 prefix KV cache 재사용
+
+    # 정책 탐지 마이크로 배칭 (left-padding 배치 스코어링)
+    POLICY_BATCH_ENABLED: bool = True
+    POLICY_BATCH_MAX_SIZE: int = 8
+    POLICY_BATCH_MAX_WAIT_MS: float = 10.0
+    POLICY_BATCH_BUCKET_WIDTH: int = 256  # 길이 버킷 폭 (문자 수)
+
+    # 정책 탐지 1차 게이트 (OFF | SHADOW: LLM 판단과 비교 기록 | ENFORCE: 무해 판정 시 LLM 생략, POLICY_GATE_WEIGHTS_PATH 필수)
+    POLICY_GATE_MODE: str = "SHADOW"
+    POLICY_GATE_WEIGHTS_PATH: str = ""  # 선형 모델 가중치 JSON (train_policy_gate.py), 비우면 키워드 사전만 사용
+    POLICY_GATE_RECALL_TARGET: float = 0.99
+
+    # PII 추론 윈도우 (max_length 초과 텍스트는 stride만큼 겹치는 윈도우로 분할)
+    PII_MAX_LENGTH: int = 512
+    PII_SLIDING_WINDOW: bool = True
+    PII_WINDOW_STRIDE: int = 128
+
+    # PII 추론 마이크로 배칭
+    PII_BATCH_ENABLED: bool = True
+    PII_BATCH_MAX_SIZE: int = 16
+    PII_BATCH_MAX_WAIT_MS: float = 5.0
+    PII_BATCH_BUCKET_WIDTH: int = 128  # 길이 버킷 폭 (문자 수)
+
+    # NER/정책 단계 동시 실행 (PII 탐지 시 진행 중인 정책 검사 취소)
+    PII_CONCURRENT_STAGES: bool = False
+
+    # 탐지 결과 캐시 (memory: 프로세스 로컬 LRU, redis: 멀티 워커 공유)
+    DETECTION_CACHE_ENABLED: bool = True
+    DETECTION_CACHE_BACKEND: str = "memory"
+    DETECTION_CACHE_MAX_ENTRIES: int = 10000
+    DETECTION_CACHE_TTL_SECONDS: float = 600.0
+    DETECTION_CACHE_KEY_PREFIX: str = "dlp:detect"
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # 파일 텍스트 추출 (/api/v1/file/process)
+    FILE_EXTRACTION_WORKERS: int = 2  # 페이지 추출 프로세스 풀 크기
+    FILE_MAX_BYTES: int = 50 * 1024 * 1024
+    FILE_MAX_PAGES: int = 50  # 파일당 처리할 최대 페이지 수 (초과분은 truncated)
+    FILE_TIME_BUDGET_SECONDS: float = 30.0  # 파일당 추출+탐지 시간 예산
+    FILE_PAGE_TIMEOUT_SECONDS: float = 10.0  # 페이지 하나의 추출 제한 시간
+    FILE_OCR_ENABLED: bool = True
+    FILE_OCR_LANG: str = "kor+eng"
+    FILE_TEXT_EXCERPT_CHARS: int = 2000  # 응답에 포함할 추출 텍스트 앞부분 길이
 
     # Elasticsearch
     ELASTICSEARCH_HOST: str = "localhost"
     ELASTICSEARCH_PORT: int = 9200
     ELASTICSEARCH_INDEX_PREFIX: str = "pii-detection"
-    ELASTICSEARCH_LOG_RETENTION_DAYS: int = 30
+    ELASTICSEARCH_LOG_RETENTION_DAYS: int = 30  # rollover 후 이 기간이 지나면 backing 인덱스 삭제
+    ELASTICSEARCH_LOG_ROLLOVER_MAX_AGE: str = "1d"  # 쓰기 인덱스 rollover 주기
+    ELASTICSEARCH_LOG_ROLLOVER_MAX_SHARD_SIZE: str = "50gb"  # 하루가 지나기 전이라도 primary shard가 이 크기를 넘으면 rollover
+    ELASTICSEARCH_LOG_SHARDS: int = 1  # backing 인덱스당 primary shard 수
+
+    # 로그 적재 (요청 경로에서는 큐에 넣기만 하고, 백그라운드에서 _bulk로 묶어 전송)
+    LOG_SHIPPER_ENABLED: bool = True
+    LOG_SHIPPER_QUEUE_SIZE: int = 10000
+    LOG_SHIPPER_BATCH_SIZE: int = 500
+    LOG_SHIPPER_FLUSH_INTERVAL_SECONDS: float = 1.0
+    LOG_SHIPPER_MAX_RETRIES: int = 3  # 배치 전송 재시도 후 실패하면 overflow 정책 적용
+    LOG_SHIPPER_OVERFLOW_POLICY: str = "spill"  # drop | spill (큐 초과/전송 실패 문서를 JSONL로 저장 후 복구 시 재전송)
+    LOG_SHIPPER_SPILL_PATH: str = ".cache/log_spill.jsonl"
+    LOG_SHIPPER_SPILL_MAX_BYTES: int = 512 * 1024 * 1024  # 초과 시 drop
+
+    # 관리자 통계 롤업 (분/시간 요약 문서, 닫힌 버킷은 롤업으로 조회하고 열린 버킷만 원본 로그 집계)
+    ROLLUP_ENABLED: bool = True
+    ROLLUP_INTERVAL_SECONDS: float = 30.0
+    ROLLUP_SETTLE_SECONDS: float = 10.0  # 버킷이 닫힌 뒤 로그 전송/refresh를 기다리는 시간
+    ROLLUP_BACKFILL_HOURS: int = 24  # 처음 실행 시 롤업할 과거 구간 (그 이전은 원본 로그로 조회)
+    ROLLUP_MAX_IPS_PER_BUCKET: int = 10000
+
+    # 관리자 로그 조회 페이징 (깊은 페이지는 point-in-time + search_after 커서 사용)
+    LOGS_MAX_OFFSET_WINDOW: int = 10000  # page * page_size 한도 (ES index.max_result_window)
+    LOGS_CURSOR_KEEP_ALIVE: str = "2m"  # 다음 페이지 요청까지 point-in-time 유지 시간
+
+    # 관리자 로그 내보내기 (point-in-time slice 병렬 읽기 + 스트리밍 응답)
+    EXPORT_SLICES: int = 4  # 병렬로 읽을 slice 수
+    EXPORT_BATCH_SIZE: int = 2000  # slice별 search_after 페이지 크기
+    EXPORT_KEEP_ALIVE: str = "5m"  # 다음 페이지 요청까지 point-in-time 유지 시간 (느린 클라이언트 고려)
+    EXPORT_PROGRESS_LOG_ROWS: int = 100000  # 진행 상황 로그 간격
 
     @property
     def elasticsearch_url(self) -> str:
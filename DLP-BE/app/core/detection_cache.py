@@ -0,0 +1,162 @@
+"""
+탐지 결과 캐시 (텍스트 해시 + 모델 버전 기반)
+설정 필터링 이전의 모델 원본 출력만 저장하여, 임계값 변경 시에도 캐시 무효화가 필요 없음
+"""
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_cache_key(text: str, model_version: str) -> str:
+    """
+    원문 텍스트와 모델 버전의 SHA-256 해시로 캐시 키 생성
+
+    캐시된 엔티티의 start/end/value는 원문 기준 위치이므로 정규화(NFC, 앞뒤 공백 제거 등) 없이
+    정확히 같은 텍스트만 같은 키를 갖도록 합니다 (다른 표기에 히트하면 마스킹 위치가 어긋남).
+    """
+    digest = hashlib.sha256()
+    digest.update(model_version.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(text.encode("utf-8"))
+    return f"{settings.DETECTION_CACHE_KEY_PREFIX}:{digest.hexdigest()}"
+
+
+class InMemoryDetectionCache:
+    """프로세스 로컬 LRU + TTL 캐시"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        # key → (expires_at, value)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> dict | None:
+        """캐시 조회 (만료 항목은 제거 후 미스 처리)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: dict) -> None:
+        """캐시 저장 (용량 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class RedisDetectionCache:
+    """멀티 워커 배포용 Redis 공유 캐시 (TTL/LRU는 Redis가 관리)"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("redis is not installed (pip install -e \".[cache]\")")
+
+        self.client = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> dict | None:
+        """캐시 조회 (Redis 장애 시 미스 처리)"""
+        try:
+            raw = await self.client.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Detection cache get failed: {str(e)}")
+            return None
+
+        if raw is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: dict) -> None:
+        """캐시 저장 (Redis 장애 시 무시)"""
+        try:
+            await self.client.set(key, json.dumps(value, ensure_ascii=False), ex=int(self.ttl_seconds))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Detection cache set failed: {str(e)}")
+
+    def get_stats(self) -> dict:
+        """캐시 통계 (워커 로컬 카운터)"""
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": None,  # Redis maxmemory-policy가 관리
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_detection_cache() -> InMemoryDetectionCache | RedisDetectionCache | None:
+    """
+    설정에 맞는 탐지 결과 캐시를 싱글톤으로 반환
+
+    Returns:
+        캐시 인스턴스 (DETECTION_CACHE_ENABLED=False면 None)
+    """
+    if not settings.DETECTION_CACHE_ENABLED:
+        return None
+
+    if settings.DETECTION_CACHE_BACKEND.lower() == "redis":
+        logger.info(f"Using Redis detection cache: {settings.REDIS_URL}")
+        return RedisDetectionCache(settings.REDIS_URL, settings.DETECTION_CACHE_TTL_SECONDS)
+
+    return InMemoryDetectionCache(
+        max_entries=settings.DETECTION_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.DETECTION_CACHE_TTL_SECONDS
+    )
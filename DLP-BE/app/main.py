@@ -5,10 +5,15 @@ from app.api.routers.pii import router as pii_router
 from app.api.routers.auth import router as auth_router
 from app.api.routers.admin import router as admin_router
 from app.api.routers.pii_settings import router as pii_settings_router
+from app.api.routers.file import router as file_router
 from app.ai.model_manager import preload_models, cleanup_models
 from app.core.elasticsearch import ElasticsearchClient
 from app.repository.elasticsearch_repo import ElasticsearchRepository
 from app.services.pii_settings_service import PIISettingsService
+from app.services.file_extraction_service import get_file_extraction_service
+from app.services.log_shipper import get_log_shipper
+from app.services.log_rollup import get_log_rollup
+from app.core.config import settings
 from app.db.session import get_db  # get_session -> get_db로 변경
 import logging
 
@@ -37,6 +42,7 @@ app.add_middleware(
 # 라우터 추가
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])  # 인증 API (인증 불필요)
 app.include_router(pii_router, prefix="/api/v1/pii", tags=["PII Detection"])  # PII API (인증 불필요, 프록시용)
+app.include_router(file_router, prefix="/api/v1/file", tags=["File Processing"])  # 파일 검사 API (인증 불필요, 프록시용)
 app.include_router(admin_router, prefix="/api/v1/admin", tags=["Admin Dashboard"])  # 관리자 API (인증 필수)
 app.include_router(pii_settings_router, prefix="/api/v1/admin/pii-settings", tags=["PII Settings"])  # PII 설정 API (인증 필수)
 
@@ -64,6 +70,17 @@ async def startup_event():
         logger.warning(f"Elasticsearch initialization failed: {str(e)}")
         logger.warning("Application will continue without logging functionality")
 
+    # 로그 배치 적재기 시작 (ES 장애 중에도 큐/spill로 로그 보존)
+    if settings.LOG_SHIPPER_ENABLED:
+        await get_log_shipper().start()
+
+    # 관리자 통계 롤업 작업 시작 (늦게 전송된 로그는 적재기가 알려 줘서 해당 버킷 재집계)
+    if settings.ROLLUP_ENABLED:
+        rollup = get_log_rollup()
+        if settings.LOG_SHIPPER_ENABLED:
+            get_log_shipper().on_shipped = rollup.mark_late
+        await rollup.start()
+
     # PII 설정 캐시 초기화 (get_session -> get_db로 변경)
     try:
         async for session in get_db():
@@ -85,6 +102,16 @@ async def shutdown_event():
     cleanup_models()
     logger.info("AI models cleaned up")
 
+    # 파일 추출 프로세스 풀 종료
+    get_file_extraction_service().shutdown()
+
+    if settings.ROLLUP_ENABLED:
+        await get_log_rollup().stop()
+
+    # 남은 로그 전송 후 적재기 종료 (ES 클라이언트보다 먼저)
+    if settings.LOG_SHIPPER_ENABLED:
+        await get_log_shipper().stop()
+
     # Elasticsearch 클라이언트 종료
     try:
         await ElasticsearchClient.close_client()
@@ -107,7 +134,8 @@ async def root():
             "IP-based Request Logging (Elasticsearch)",
             "Admin Dashboard & Statistics",
             "JWT Authentication (Admin only)",
-            "PII Detection Settings (Enable/Disable & Threshold)"
+            "PII Detection Settings (Enable/Disable & Threshold)",
+            "File Text Extraction (PDF, DOCX, Image OCR)"
         ],
         "endpoints": {
             "docs": "/docs",
@@ -118,8 +146,12 @@ async def root():
             },
             "pii_detection": {
                 "detect": "/api/v1/pii/detect (프록시용, 인증 불필요)",
+                "enabled_types": "/api/v1/pii/settings (프록시용, 인증 불필요)",
                 "health": "/api/v1/pii/health"
             },
+            "file_processing": {
+                "process": "/api/v1/file/process (multipart 업로드, 프록시용, 인증 불필요)"
+            },
             "admin_dashboard": {
                 "logs": "/api/v1/admin/logs (인증 필수)",
                 "statistics_overview": "/api/v1/admin/statistics/overview",
@@ -2,120 +2,166 @@
 Elasticsearch 저장소 레이어
 """
 from datetime import datetime, timedelta
-from elasticsearch import AsyncElasticsearch, NotFoundError
+from elasticsearch import AsyncElasticsearch, BadRequestError, NotFoundError
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class WriteAliasMissingError(Exception):
+    """쓰기 alias가 없음 (기동 시 ES 장애로 create_index_if_not_exists가 alias를 만들지 못한 경우 등)"""
+
+
 class ElasticsearchRepository:
     """Elasticsearch 데이터 접근 레이어"""
 
     def __init__(self, es_client: AsyncElasticsearch):
         self.client = es_client
-        self.index_name = f"{settings.ELASTICSEARCH_INDEX_PREFIX}-logs"
+        base_name = f"{settings.ELASTICSEARCH_INDEX_PREFIX}-logs"
+        # 쓰기 alias: 현재 backing 인덱스(is_write_index)를 가리키며 ILM rollover 시 새 인덱스로 넘어감
+        self.index_name = f"{base_name}-write"
+        # 읽기 대상: 날짜별 backing 인덱스 전체 + 이전 버전의 단일 인덱스 (롤업 인덱스는 포함하지 않음)
+        self.read_index = f"{base_name}*"
+        self.template_name = base_name
+        self.policy_name = f"{base_name}-policy"
+        # 날짜 포함 backing 인덱스 이름 (예: pii-detection-logs-2026.03.02-000001, rollover마다 번호 증가)
+        self.bootstrap_index = f"<{base_name}-{{now/d}}-000001>"
+        self.backing_pattern = f"{base_name}-*"
+
+    @property
+    def read_target(self) -> dict:
+        """
+        읽기 검색 공통 인자
+
+        pre_filter_shard_size=1이면 ES가 먼저 각 backing 인덱스의 timestamp 최소/최대값으로
+        조회 기간과 겹치지 않는 인덱스를 건너뛰므로, 기간을 지정한 검색/집계는 해당 날짜 인덱스만 읽습니다.
+        일치하는 인덱스가 하나도 없으면 기존과 같이 NotFoundError가 발생합니다.
+        """
+        return {"index": self.read_index, "allow_no_indices": False, "pre_filter_shard_size": 1}
 
     async def create_index_if_not_exists(self) -> None:
         """
-        인덱스가 없으면 생성 (ILM 정책 포함)
+        ILM 정책, 인덱스 템플릿, 첫 backing 인덱스 + 쓰기 alias 생성
+
+        매핑/설정은 템플릿에 있어 rollover로 만들어지는 인덱스에도 그대로 적용되고,
+        보관 기간이 지난 인덱스는 ILM이 인덱스 단위로 삭제합니다.
         """
         try:
-            exists = await self.client.indices.exists(index=self.index_name)
+            await self._create_ilm_policy()
+            await self._put_index_template()
+
+            exists = await self.client.indices.exists_alias(name=self.index_name)
             if not exists:
-                # 인덱스 매핑 정의
-                mappings = {
+                try:
+                    await self.client.indices.create(
+                        index=self.bootstrap_index,
+                        aliases={self.index_name: {"is_write_index": True}}
+                    )
+                    logger.info(f"Created Elasticsearch index with write alias: {self.index_name}")
+                except BadRequestError as e:
+                    # 다른 워커가 먼저 만든 경우
+                    if e.error != "resource_already_exists_exception":
+                        raise
+
+        except Exception as e:
+            logger.error(f"Failed to create index: {str(e)}")
+            # 인덱스 생성 실패해도 계속 진행 (이미 존재할 수 있음)
+
+    async def _put_index_template(self) -> None:
+        """backing 인덱스용 인덱스 템플릿 (매핑 + ILM 설정, 설정 변경이 다음 rollover부터 반영되도록 매번 갱신)"""
+        # 인덱스 매핑 정의
+        mappings = {
+            "properties": {
+                "timestamp": {
+                    "type": "date",
+                    "format": "strict_date_optional_time||epoch_millis"
+                },
+                "client_ip": {"type": "ip"},
+                "original_text": {
+                    "type": "text",
+                    "fields": {
+                        "keyword": {
+                            "type": "keyword",
+                            "ignore_above": 256
+                        }
+                    }
+                },
+                "text_length": {"type": "integer"},
+                "has_pii": {"type": "boolean"},
+                "detected_entities": {
+                    "type": "nested",
                     "properties": {
-                        "timestamp": {
-                            "type": "date",
-                            "format": "strict_date_optional_time||epoch_millis"
-                        },
-                        "client_ip": {"type": "ip"},
-                        "original_text": {
+                        "type": {"type": "keyword"},
+                        "value": {
                             "type": "text",
                             "fields": {
-                                "keyword": {
-                                    "type": "keyword",
-                                    "ignore_above": 256
-                                }
+                                "keyword": {"type": "keyword"}
                             }
                         },
-                        "text_length": {"type": "integer"},
-                        "has_pii": {"type": "boolean"},
-                        "detected_entities": {
-                            "type": "nested",
-                            "properties": {
-                                "type": {"type": "keyword"},
-                                "value": {
-                                    "type": "text",
-                                    "fields": {
-                                        "keyword": {"type": "keyword"}
-                                    }
-                                },
-                                "confidence": {"type": "float"},
-                                "token_count": {"type": "integer"}
-                            }
-                        },
-                        "entity_types": {"type": "keyword"},
-                        "entity_count": {"type": "integer"},
-                        "blocked": {"type": "boolean"},
-                        "reason": {"type": "text"},
-                        "response_time_ms": {"type": "float"},
-                        "model_version": {"type": "keyword"},
-                        "api_version": {"type": "keyword"}
+                        "confidence": {"type": "float"},
+                        "token_count": {"type": "integer"},
+                        "start": {"type": "integer"},
+                        "end": {"type": "integer"}
                     }
-                }
-
-                # ILM 정책 설정 (30일 후 삭제)
-                settings_config = {
-                    "index": {
-                        "lifecycle": {
-                            "name": "pii-detection-ilm-policy",
-                            "rollover_alias": self.index_name
-                        },
-                        "number_of_shards": 1,
-                        "number_of_replicas": 0
+                },
+                "entity_types": {"type": "keyword"},
+                "entity_count": {"type": "integer"},
+                "blocked": {"type": "boolean"},
+                "reason": {"type": "text"},
+                "response_time_ms": {"type": "float"},
+                "stage_timings_ms": {
+                    "properties": {
+                        "ner": {"type": "float"},
+                        "gate": {"type": "float"},
+                        "policy": {"type": "float"}
                     }
-                }
-
-                await self.client.indices.create(
-                    index=self.index_name,
-                    mappings=mappings,
-                    settings=settings_config
-                )
-                logger.info(f"Created Elasticsearch index: {self.index_name}")
+                },
+                "model_version": {"type": "keyword"},
+                "api_version": {"type": "keyword"}
+            }
+        }
 
-                # ILM 정책 생성 (아직 없으면)
-                await self._create_ilm_policy()
+        settings_config = {
+            "index": {
+                "lifecycle": {
+                    "name": self.policy_name,
+                    "rollover_alias": self.index_name
+                },
+                "number_of_shards": settings.ELASTICSEARCH_LOG_SHARDS,
+                "number_of_replicas": 0
+            }
+        }
 
-        except Exception as e:
-            logger.error(f"Failed to create index: {str(e)}")
-            # 인덱스 생성 실패해도 계속 진행 (이미 존재할 수 있음)
+        await self.client.indices.put_index_template(
+            name=self.template_name,
+            index_patterns=[self.backing_pattern],
+            template={"settings": settings_config, "mappings": mappings},
+            priority=200
+        )
 
     async def _create_ilm_policy(self) -> None:
-        """ILM 정책 생성 (30일 후 삭제)"""
+        """ILM 정책 생성/갱신 (하루 또는 크기 기준 rollover, rollover 후 보관 기간이 지나면 인덱스 삭제)"""
         try:
-            policy_name = "pii-detection-ilm-policy"
-            policy_exists = await self.client.ilm.get_lifecycle(name=policy_name, ignore_unavailable=True)
-
-            if not policy_exists:
-                policy = {
-                    "policy": {
-                        "phases": {
-                            "hot": {
-                                "actions": {}
-                            },
-                            "delete": {
-                                "min_age": f"{settings.ELASTICSEARCH_LOG_RETENTION_DAYS}d",
-                                "actions": {
-                                    "delete": {}
-                                }
+            policy = {
+                "phases": {
+                    "hot": {
+                        "actions": {
+                            "rollover": {
+                                "max_age": settings.ELASTICSEARCH_LOG_ROLLOVER_MAX_AGE,
+                                "max_primary_shard_size": settings.ELASTICSEARCH_LOG_ROLLOVER_MAX_SHARD_SIZE
                             }
                         }
+                    },
+                    "delete": {
+                        "min_age": f"{settings.ELASTICSEARCH_LOG_RETENTION_DAYS}d",
+                        "actions": {
+                            "delete": {}
+                        }
                     }
                 }
-                await self.client.ilm.put_lifecycle(name=policy_name, policy=policy)
-                logger.info(f"Created ILM policy: {policy_name}")
+            }
+            await self.client.ilm.put_lifecycle(name=self.policy_name, policy=policy)
         except Exception as e:
             logger.warning(f"Failed to create ILM policy: {str(e)}")
 
@@ -136,13 +182,87 @@ class ElasticsearchRepository:
             result = await self.client.index(
                 index=self.index_name,
                 document=log_data,
-                refresh="false"  # 비동기 처리 (성능 향상)
+                refresh="false",  # 비동기 처리 (성능 향상)
+                require_alias=True  # alias가 없을 때 같은 이름의 일반 인덱스가 자동 생성되지 않도록
             )
             return result["_id"]
+        except NotFoundError as e:
+            if e.error == "index_not_found_exception":
+                raise WriteAliasMissingError(self.index_name) from e
+            logger.error(f"Failed to index log: {str(e)}")
+            raise
         except Exception as e:
             logger.error(f"Failed to index log: {str(e)}")
             raise
 
+    async def bulk_index(self, documents: list[dict]) -> list[tuple[int, dict]]:
+        """
+        _bulk API로 여러 로그를 한 번에 인덱싱 (timestamp는 호출자가 채움)
+
+        Args:
+            documents: 로그 데이터 dict 목록
+
+        Returns:
+            list[tuple[int, dict]]: 실패한 문서의 (HTTP 상태, 원본 문서) 목록
+
+        Raises:
+            WriteAliasMissingError: 쓰기 alias가 없음 (create_index_if_not_exists 후 다시 전송)
+        """
+        operations = []
+        for document in documents:
+            # alias가 없을 때 alias 이름으로 일반 인덱스가 자동 생성되면 템플릿의 rollover 설정이
+            # 자기 자신을 가리켜 ILM이 멈추므로, alias로만 쓰도록 요구
+            operations.append({"index": {"_index": self.index_name, "require_alias": True}})
+            operations.append(document)
+
+        result = await self.client.bulk(operations=operations, refresh="false")
+        if not result.get("errors"):
+            return []
+
+        failed = []
+        for document, item in zip(documents, result["items"]):
+            outcome = item.get("index", {})
+            if outcome.get("error"):
+                if outcome["error"].get("type") == "index_not_found_exception":
+                    raise WriteAliasMissingError(self.index_name)
+                failed.append((outcome.get("status", 500), document))
+        return failed
+
+    @staticmethod
+    def build_log_query(
+        start_date: datetime,
+        end_date: datetime,
+        client_ip: str | None = None,
+        has_pii: bool | None = None,
+        entity_type: str | None = None
+    ) -> dict:
+        """로그 조회 필터 쿼리 (목록 조회, 커서 조회 공통)"""
+        must_conditions = [
+            {
+                "range": {
+                    "timestamp": {
+                        "gte": start_date.isoformat(),
+                        "lte": end_date.isoformat()
+                    }
+                }
+            }
+        ]
+
+        if client_ip:
+            must_conditions.append({"term": {"client_ip": client_ip}})
+
+        if has_pii is not None:
+            must_conditions.append({"term": {"has_pii": has_pii}})
+
+        if entity_type:
+            must_conditions.append({"term": {"entity_types": entity_type}})
+
+        return {
+            "bool": {
+                "must": must_conditions
+            }
+        }
+
     async def search_logs(
         self,
         start_date: datetime,
@@ -165,31 +285,7 @@ class ElasticsearchRepository:
         """
         try:
             # 쿼리 구성
-            must_conditions = [
-                {
-                    "range": {
-                        "timestamp": {
-                            "gte": start_date.isoformat(),
-                            "lte": end_date.isoformat()
-                        }
-                    }
-                }
-            ]
-
-            if client_ip:
-                must_conditions.append({"term": {"client_ip": client_ip}})
-
-            if has_pii is not None:
-                must_conditions.append({"term": {"has_pii": has_pii}})
-
-            if entity_type:
-                must_conditions.append({"term": {"entity_types": entity_type}})
-
-            query = {
-                "bool": {
-                    "must": must_conditions
-                }
-            }
+            query = self.build_log_query(start_date, end_date, client_ip, has_pii, entity_type)
 
             # 정렬 파싱
             sort_field, sort_order = sort.split(":")
@@ -199,7 +295,7 @@ class ElasticsearchRepository:
             from_value = (page - 1) * page_size
 
             result = await self.client.search(
-                index=self.index_name,
+                **self.read_target,
                 query=query,
                 sort=sort_config,
                 from_=from_value,
@@ -218,6 +314,84 @@ class ElasticsearchRepository:
             logger.error(f"Failed to search logs: {str(e)}")
             raise
 
+    async def count_logs(self, query: dict) -> int:
+        """필터에 맞는 로그 수 (인덱스가 없으면 0)"""
+        try:
+            result = await self.client.count(index=self.read_index, allow_no_indices=False, query=query)
+            return result["count"]
+        except NotFoundError:
+            return 0
+
+    async def open_point_in_time(self, keep_alive: str, index_filter: dict | None = None) -> str:
+        """
+        로그 인덱스의 point-in-time 열기 (커서 조회 동안 같은 스냅샷을 보도록)
+
+        Args:
+            index_filter: 지정하면 이 쿼리와 겹치지 않는 backing 인덱스(조회 기간 밖)는 point-in-time에서 제외
+
+        Raises:
+            NotFoundError: 인덱스가 없음
+        """
+        kwargs = {"index_filter": index_filter} if index_filter is not None else {}
+        result = await self.client.open_point_in_time(index=self.read_index, keep_alive=keep_alive, **kwargs)
+        return result["id"]
+
+    async def close_point_in_time(self, pit_id: str) -> None:
+        """point-in-time 닫기 (이미 만료되었으면 무시)"""
+        try:
+            await self.client.close_point_in_time(id=pit_id)
+        except Exception as e:
+            logger.debug(f"Failed to close point-in-time: {str(e)}")
+
+    async def search_logs_after(
+        self,
+        pit_id: str,
+        keep_alive: str,
+        query: dict,
+        sort: str,
+        size: int,
+        search_after: list | None = None,
+        track_total_hits: bool = False,
+        slice_id: int | None = None,
+        max_slices: int = 1
+    ) -> dict:
+        """
+        point-in-time + search_after 로그 검색 (깊이와 무관하게 일정한 지연시간)
+
+        정렬은 (sort 필드, _shard_doc) 순서이며, _shard_doc이 같은 시각의 문서 간 순서를 고정합니다.
+        slice_id/max_slices를 지정하면 결과를 max_slices개로 나눈 조각 중 하나만 조회합니다 (병렬 내보내기용).
+
+        Returns:
+            dict: {
+                "total": int | None (track_total_hits일 때만),
+                "hits": list[dict],
+                "pit_id": str (ES가 갱신한 point-in-time ID),
+                "search_after": list | None (마지막 문서의 정렬 값)
+            }
+
+        Raises:
+            NotFoundError: point-in-time 만료
+        """
+        sort_field, sort_order = sort.split(":")
+        kwargs = {"search_after": search_after} if search_after is not None else {}
+        if slice_id is not None and max_slices > 1:
+            kwargs["slice"] = {"id": slice_id, "max": max_slices}
+        result = await self.client.search(
+            pit={"id": pit_id, "keep_alive": keep_alive},
+            query=query,
+            sort=[{sort_field: {"order": sort_order}}, {"_shard_doc": {"order": sort_order}}],
+            size=size,
+            track_total_hits=track_total_hits,
+            **kwargs
+        )
+        hits = result["hits"]["hits"]
+        return {
+            "total": result["hits"]["total"]["value"] if track_total_hits else None,
+            "hits": [hit["_source"] | {"id": hit["_id"]} for hit in hits],
+            "pit_id": result.get("pit_id", pit_id),
+            "search_after": hits[-1]["sort"] if hits else None
+        }
+
     async def aggregate_statistics(
         self,
         start_date: datetime,
@@ -254,23 +428,20 @@ class ElasticsearchRepository:
                     "terms": {
                         "field": "entity_types",
                         "size": 10
-                    },
+                    }
+                },
+                # 타입별 평균 신뢰도: nested 엔티티의 doc values로 집계 (_source를 읽지 않음)
+                "pii_type_confidence": {
+                    "nested": {"path": "detected_entities"},
                     "aggs": {
-                        "avg_confidence": {
-                            "avg": {
-                                "script": {
-                                    "source": """
-                                        double sum = 0;
-                                        int count = 0;
-                                        for (entity in params._source.detected_entities) {
-                                            if (entity.type == params.pii_type) {
-                                                sum += entity.confidence;
-                                                count++;
-                                            }
-                                        }
-                                        return count > 0 ? sum / count : 0;
-                                    """,
-                                    "params": {"pii_type": "dummy"}
+                        "by_type": {
+                            "terms": {
+                                "field": "detected_entities.type",
+                                "size": 50  # top_pii_types의 모든 타입을 덮도록 PII 타입 수보다 크게
+                            },
+                            "aggs": {
+                                "avg_confidence": {
+                                    "avg": {"field": "detected_entities.confidence"}
                                 }
                             }
                         }
@@ -290,7 +461,7 @@ class ElasticsearchRepository:
             }
 
             result = await self.client.search(
-                index=self.index_name,
+                **self.read_target,
                 query=query,
                 aggs=aggs,
                 size=0  # 문서 결과는 필요 없음
@@ -343,7 +514,7 @@ class ElasticsearchRepository:
             }
 
             result = await self.client.search(
-                index=self.index_name,
+                **self.read_target,
                 query=query,
                 aggs=aggs,
                 size=0
@@ -397,7 +568,7 @@ class ElasticsearchRepository:
             }
 
             result = await self.client.search(
-                index=self.index_name,
+                **self.read_target,
                 query=query,
                 aggs=aggs,
                 size=0
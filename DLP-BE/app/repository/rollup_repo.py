@@ -0,0 +1,505 @@
+"""
+통계 롤업 저장소 레이어
+원본 탐지 로그를 분/시간 단위로 미리 집계한 요약 문서를 관리합니다.
+
+롤업 인덱스 문서 종류 (kind):
+- summary: 버킷별 요청/탐지/차단 수, 응답 시간 합계/개수/최대
+- type: 버킷별 PII 타입 문서 수, 엔티티 수, 신뢰도 합계
+- ip: 버킷별 IP 요청/탐지 수, IP의 PII 타입별 문서 수 (nested)
+- watermark: 단위별로 롤업이 끝난 연속 구간 [coverage_start, bucket_start)
+"""
+from datetime import datetime
+from elasticsearch import AsyncElasticsearch, NotFoundError
+from app.core.config import settings
+from app.repository.elasticsearch_repo import ElasticsearchRepository
+import heapq
+import logging
+
+logger = logging.getLogger(__name__)
+
+# PII 타입 수보다 크게 (타입별 terms 집계 크기)
+PII_TYPE_TERMS_SIZE = 50
+
+# 롤업 IP 집계 페이지 크기 (IP당 하위 버킷이 최대 PII_TYPE_TERMS_SIZE + 1개라 search.max_buckets 65,536 이내로 유지)
+IP_ROLLUP_PAGE_SIZE = 500
+
+TIMELINE_FORMAT = "yyyy-MM-dd'T'HH:mm:ss'Z'"
+
+
+def empty_summary() -> dict:
+    """집계 결과 공통 형식 (원본/롤업 구간 결과를 합칠 때 사용)"""
+    return {
+        "total": 0,
+        "detected": 0,
+        "blocked": 0,
+        "response_time_sum": 0.0,
+        "response_time_count": 0,
+        "types": {},  # {pii_type: {"count", "entity_count", "confidence_sum"}}
+        "ips": {},  # {client_ip: {"total", "detected", "types": {pii_type: count}}}
+        "timeline": {},  # {key_as_string: {"total", "detected"}}
+    }
+
+
+def merge_summaries(summaries: list[dict]) -> dict:
+    """구간별 집계 결과 합산"""
+    merged = empty_summary()
+    for summary in summaries:
+        for field in ("total", "detected", "blocked", "response_time_sum", "response_time_count"):
+            merged[field] += summary[field]
+        for pii_type, values in summary["types"].items():
+            target = merged["types"].setdefault(pii_type, {"count": 0, "entity_count": 0, "confidence_sum": 0.0})
+            for field, value in values.items():
+                target[field] += value
+        for client_ip, values in summary["ips"].items():
+            target = merged["ips"].setdefault(client_ip, {"total": 0, "detected": 0, "types": {}})
+            target["total"] += values["total"]
+            target["detected"] += values["detected"]
+            for pii_type, count in values["types"].items():
+                target["types"][pii_type] = target["types"].get(pii_type, 0) + count
+        for key, values in summary["timeline"].items():
+            target = merged["timeline"].setdefault(key, {"total": 0, "detected": 0})
+            target["total"] += values["total"]
+            target["detected"] += values["detected"]
+    return merged
+
+
+def _range(field: str, start: datetime, end: datetime, include_end: bool) -> dict:
+    return {"range": {field: {"gte": start.isoformat(), ("lte" if include_end else "lt"): end.isoformat()}}}
+
+
+class RollupRepository:
+    """통계 롤업 인덱스 데이터 접근 레이어"""
+
+    def __init__(self, es_client: AsyncElasticsearch):
+        self.client = es_client
+        self.index_name = f"{settings.ELASTICSEARCH_INDEX_PREFIX}-rollups"
+        # 원본 로그 읽기 (날짜별 backing 인덱스 패턴, 조회 기간 밖의 인덱스는 pre-filter로 건너뜀)
+        self.raw_target = ElasticsearchRepository(es_client).read_target
+
+    async def create_index_if_not_exists(self) -> None:
+        """롤업 인덱스가 없으면 생성"""
+        try:
+            exists = await self.client.indices.exists(index=self.index_name)
+            if not exists:
+                mappings = {
+                    "properties": {
+                        "kind": {"type": "keyword"},
+                        "granularity": {"type": "keyword"},
+                        "bucket_start": {
+                            "type": "date",
+                            "format": "strict_date_optional_time||epoch_millis"
+                        },
+                        "total": {"type": "long"},
+                        "detected": {"type": "long"},
+                        "blocked": {"type": "long"},
+                        "response_time_sum": {"type": "double"},
+                        "response_time_count": {"type": "long"},
+                        "response_time_max": {"type": "float"},
+                        "pii_type": {"type": "keyword"},
+                        "entity_count": {"type": "long"},
+                        "confidence_sum": {"type": "double"},
+                        "client_ip": {"type": "ip"},
+                        "coverage_start": {"type": "date", "index": False},
+                        "pii_types": {
+                            "type": "nested",
+                            "properties": {
+                                "type": {"type": "keyword"},
+                                "count": {"type": "long"}
+                            }
+                        }
+                    }
+                }
+                await self.client.indices.create(
+                    index=self.index_name,
+                    mappings=mappings,
+                    settings={"index": {"number_of_shards": 1, "number_of_replicas": 0}}
+                )
+                logger.info(f"Created Elasticsearch index: {self.index_name}")
+        except Exception as e:
+            logger.error(f"Failed to create rollup index: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # 롤업 생성
+    # ------------------------------------------------------------------
+
+    async def compute_rollups(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        ip_size: int
+    ) -> list[dict]:
+        """
+        원본 로그 [start_date, end_date)를 granularity("1m", "1h") 버킷으로 집계해 롤업 문서 생성
+
+        Returns:
+            list[dict]: "_id"가 포함된 롤업 문서 목록 (문서가 없는 버킷은 생략)
+
+        IP별 집계는 버킷 수가 (버킷 수 x IP 수 x PII 타입 수)로 커지므로
+        composite 집계로 따로 나눠 조회한 뒤 버킷마다 요청 수 상위 ip_size개만 저장합니다.
+        """
+        aggs = {
+            "buckets": {
+                "date_histogram": {
+                    "field": "timestamp",
+                    "fixed_interval": granularity,
+                    "min_doc_count": 1,
+                    "format": "strict_date_optional_time"
+                },
+                "aggs": self._raw_summary_aggs(ip_size, include_ips=False)
+            }
+        }
+        query = _range("timestamp", start_date, end_date, include_end=False)
+        try:
+            result = await self.client.search(**self.raw_target, query=query, aggs=aggs, size=0)
+            ips_by_bucket = await self._compute_ip_rollups(granularity, query, ip_size)
+        except NotFoundError:
+            return []
+
+        documents = []
+        for bucket in result["aggregations"]["buckets"]["buckets"]:
+            summary = self._parse_raw_summary(bucket, bucket["doc_count"])
+            summary["ips"] = ips_by_bucket.get(bucket["key_as_string"], {})
+            bucket_start = bucket["key_as_string"].replace("Z", "")
+            key = f"{granularity}:{bucket_start}"
+            base = {"granularity": granularity, "bucket_start": bucket_start}
+
+            documents.append(base | {
+                "_id": f"{key}:summary",
+                "kind": "summary",
+                "total": summary["total"],
+                "detected": summary["detected"],
+                "blocked": summary["blocked"],
+                "response_time_sum": summary["response_time_sum"],
+                "response_time_count": summary["response_time_count"],
+                "response_time_max": bucket["response_time"]["max"]
+            })
+            for pii_type, values in summary["types"].items():
+                documents.append(base | {
+                    "_id": f"{key}:type:{pii_type}",
+                    "kind": "type",
+                    "pii_type": pii_type,
+                    "total": values["count"],
+                    "entity_count": values["entity_count"],
+                    "confidence_sum": values["confidence_sum"]
+                })
+            for client_ip, values in summary["ips"].items():
+                documents.append(base | {
+                    "_id": f"{key}:ip:{client_ip}",
+                    "kind": "ip",
+                    "client_ip": client_ip,
+                    "total": values["total"],
+                    "detected": values["detected"],
+                    "pii_types": [{"type": t, "count": c} for t, c in values["types"].items()]
+                })
+        return documents
+
+    async def _compute_ip_rollups(self, granularity: str, query: dict, ip_size: int) -> dict[str, dict]:
+        """
+        버킷별 IP 요청/탐지 수와 PII 타입별 문서 수 (composite 집계를 after_key로 페이지 조회)
+
+        Returns:
+            dict: {버킷 key_as_string: {client_ip: {"total", "detected", "types"}}} (버킷마다 상위 ip_size개)
+        """
+        composite = {
+            "size": IP_ROLLUP_PAGE_SIZE,
+            "sources": [
+                {"bucket": {"date_histogram": {
+                    "field": "timestamp",
+                    "fixed_interval": granularity,
+                    "format": "strict_date_optional_time"
+                }}},
+                {"client_ip": {"terms": {"field": "client_ip"}}}
+            ]
+        }
+        sub_aggs = self._raw_summary_aggs(ip_size)["ips"]["aggs"]
+
+        ips_by_bucket: dict[str, dict] = {}
+        while True:
+            result = await self.client.search(
+                **self.raw_target,
+                query=query,
+                aggs={"ips": {"composite": composite, "aggs": sub_aggs}},
+                size=0
+            )
+            page = result["aggregations"]["ips"]
+            for bucket in page["buckets"]:
+                ips_by_bucket.setdefault(bucket["key"]["bucket"], {})[bucket["key"]["client_ip"]] = {
+                    "total": bucket["doc_count"],
+                    "detected": bucket["detected"]["doc_count"],
+                    "types": {sub["key"]: sub["doc_count"] for sub in bucket["pii_types"]["buckets"]}
+                }
+            after_key = page.get("after_key")
+            if after_key is None or len(page["buckets"]) < IP_ROLLUP_PAGE_SIZE:
+                break
+            composite = composite | {"after": after_key}
+
+        for key, ips in ips_by_bucket.items():
+            if len(ips) > ip_size:
+                top = heapq.nlargest(ip_size, ips.items(), key=lambda item: item[1]["total"])
+                ips_by_bucket[key] = dict(top)
+        return ips_by_bucket
+
+    async def put_rollups(self, documents: list[dict], coverage: tuple[str, datetime, datetime] | None = None) -> None:
+        """
+        롤업 문서 저장 (같은 버킷은 _id로 덮어씀, 재계산해도 결과가 같음)
+
+        Args:
+            documents: compute_rollups 결과
+            coverage: 함께 기록할 워터마크 (granularity, 롤업 시작, 다음에 집계할 버킷 시작)
+        """
+        operations = []
+        for document in documents:
+            document = dict(document)
+            operations.append({"index": {"_index": self.index_name, "_id": document.pop("_id")}})
+            operations.append(document)
+        if coverage is not None:
+            granularity, coverage_start, coverage_end = coverage
+            operations.append({"index": {"_index": self.index_name, "_id": f"watermark:{granularity}"}})
+            operations.append({
+                "kind": "watermark",
+                "granularity": granularity,
+                "coverage_start": coverage_start.isoformat(),
+                "bucket_start": coverage_end.isoformat()
+            })
+        if not operations:
+            return
+
+        # 읽기 경로가 워터마크를 믿고 롤업을 조회하므로 검색 가능해진 뒤 반환
+        result = await self.client.bulk(operations=operations, refresh="wait_for")
+        if result.get("errors"):
+            failed = sum(1 for item in result["items"] if item.get("index", {}).get("error"))
+            raise RuntimeError(f"{failed} rollup documents failed to index")
+
+    async def get_coverage(self, granularity: str) -> tuple[datetime, datetime] | None:
+        """롤업이 끝난 연속 구간 (coverage_start, 다음에 집계할 버킷 시작), 없으면 None"""
+        try:
+            document = await self.client.get(index=self.index_name, id=f"watermark:{granularity}")
+        except NotFoundError:
+            return None
+        source = document["_source"]
+        return datetime.fromisoformat(source["coverage_start"]), datetime.fromisoformat(source["bucket_start"])
+
+    # ------------------------------------------------------------------
+    # 통계 조회
+    # ------------------------------------------------------------------
+
+    async def summarize_rollups(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        ip_size: int,
+        interval: str | None = None
+    ) -> dict:
+        """롤업 문서 [start_date, end_date) 합산 (interval이 있으면 시간대별 추세 포함)"""
+        sums = {field: {"sum": {"field": field}} for field in ("total", "detected")}
+        summary_aggs = sums | {
+            "blocked": {"sum": {"field": "blocked"}},
+            "response_time_sum": {"sum": {"field": "response_time_sum"}},
+            "response_time_count": {"sum": {"field": "response_time_count"}}
+        }
+        if interval:
+            summary_aggs["timeline"] = {
+                "date_histogram": {"field": "bucket_start", "calendar_interval": interval, "format": TIMELINE_FORMAT},
+                "aggs": sums
+            }
+
+        aggs = {
+            "summary": {"filter": {"term": {"kind": "summary"}}, "aggs": summary_aggs},
+            "types": {
+                "filter": {"term": {"kind": "type"}},
+                "aggs": {
+                    "by_type": {
+                        "terms": {"field": "pii_type", "size": PII_TYPE_TERMS_SIZE},
+                        "aggs": {
+                            "total": {"sum": {"field": "total"}},
+                            "entity_count": {"sum": {"field": "entity_count"}},
+                            "confidence_sum": {"sum": {"field": "confidence_sum"}}
+                        }
+                    }
+                }
+            },
+            "ips": {
+                "filter": {"term": {"kind": "ip"}},
+                "aggs": {
+                    "by_ip": {
+                        "terms": {"field": "client_ip", "size": ip_size, "order": {"total": "desc"}},
+                        "aggs": sums | {
+                            "pii_types": {
+                                "nested": {"path": "pii_types"},
+                                "aggs": {
+                                    "by_type": {
+                                        "terms": {"field": "pii_types.type", "size": PII_TYPE_TERMS_SIZE},
+                                        "aggs": {"count": {"sum": {"field": "pii_types.count"}}}
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        query = {
+            "bool": {
+                "filter": [
+                    {"term": {"granularity": granularity}},
+                    _range("bucket_start", start_date, end_date, include_end=False)
+                ]
+            }
+        }
+        result = await self.client.search(index=self.index_name, query=query, aggs=aggs, size=0)
+        aggregations = result["aggregations"]
+
+        summary = empty_summary()
+        totals = aggregations["summary"]
+        for field in ("total", "detected", "blocked", "response_time_count"):
+            summary[field] = int(totals[field]["value"])
+        summary["response_time_sum"] = totals["response_time_sum"]["value"]
+        for bucket in totals.get("timeline", {}).get("buckets", []):
+            summary["timeline"][bucket["key_as_string"]] = {
+                "total": int(bucket["total"]["value"]),
+                "detected": int(bucket["detected"]["value"])
+            }
+        for bucket in aggregations["types"]["by_type"]["buckets"]:
+            summary["types"][bucket["key"]] = {
+                "count": int(bucket["total"]["value"]),
+                "entity_count": int(bucket["entity_count"]["value"]),
+                "confidence_sum": bucket["confidence_sum"]["value"]
+            }
+        for bucket in aggregations["ips"]["by_ip"]["buckets"]:
+            summary["ips"][bucket["key"]] = {
+                "total": int(bucket["total"]["value"]),
+                "detected": int(bucket["detected"]["value"]),
+                "types": {
+                    sub["key"]: int(sub["count"]["value"])
+                    for sub in bucket["pii_types"]["by_type"]["buckets"]
+                }
+            }
+        return summary
+
+    async def summarize_raw(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        include_end: bool,
+        ip_size: int,
+        interval: str | None = None
+    ) -> dict:
+        """원본 로그 구간 집계 (롤업이 아직 없는 가장자리/현재 버킷용)"""
+        aggs = self._raw_summary_aggs(ip_size)
+        if interval:
+            aggs["timeline"] = {
+                "date_histogram": {"field": "timestamp", "calendar_interval": interval, "format": TIMELINE_FORMAT},
+                "aggs": {"detected": {"filter": {"term": {"has_pii": True}}}}
+            }
+        try:
+            result = await self.client.search(
+                **self.raw_target,
+                query=_range("timestamp", start_date, end_date, include_end),
+                aggs=aggs,
+                size=0,
+                track_total_hits=True
+            )
+        except NotFoundError:
+            return empty_summary()
+
+        aggregations = result["aggregations"]
+        summary = self._parse_raw_summary(aggregations, result["hits"]["total"]["value"])
+        for bucket in aggregations.get("timeline", {}).get("buckets", []):
+            summary["timeline"][bucket["key_as_string"]] = {
+                "total": bucket["doc_count"],
+                "detected": bucket["detected"]["doc_count"]
+            }
+        return summary
+
+    async def count_unique_ips(self, rollup_ranges: list[tuple], raw_ranges: list[tuple]) -> int:
+        """
+        롤업 IP 문서와 원본 로그를 한 번에 조회해 고유 IP 수 계산 (구간별 cardinality는 합산할 수 없음)
+
+        Args:
+            rollup_ranges: (granularity, start, end) 목록
+            raw_ranges: (start, end, include_end) 목록
+        """
+        should = [
+            {"bool": {"filter": [
+                {"term": {"kind": "ip"}},
+                {"term": {"granularity": granularity}},
+                _range("bucket_start", start, end, include_end=False)
+            ]}}
+            for granularity, start, end in rollup_ranges
+        ]
+        should += [_range("timestamp", start, end, include_end) for start, end, include_end in raw_ranges]
+        if not should:
+            return 0
+
+        result = await self.client.search(
+            index=f"{self.index_name},{self.raw_target['index']}",
+            query={"bool": {"should": should, "minimum_should_match": 1}},
+            aggs={"unique_ips": {"cardinality": {"field": "client_ip"}}},
+            size=0,
+            ignore_unavailable=True,
+            pre_filter_shard_size=1
+        )
+        return result["aggregations"]["unique_ips"]["value"]
+
+    # ------------------------------------------------------------------
+    # 원본 로그 집계 공통
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _raw_summary_aggs(ip_size: int, include_ips: bool = True) -> dict:
+        detected = {"filter": {"term": {"has_pii": True}}}
+        aggs = {
+            "detected": detected,
+            "blocked": {"filter": {"term": {"blocked": True}}},
+            "response_time": {"stats": {"field": "response_time_ms"}},
+            "pii_types": {"terms": {"field": "entity_types", "size": PII_TYPE_TERMS_SIZE}},
+            "confidence": {
+                "nested": {"path": "detected_entities"},
+                "aggs": {
+                    "by_type": {
+                        "terms": {"field": "detected_entities.type", "size": PII_TYPE_TERMS_SIZE},
+                        "aggs": {"confidence_sum": {"sum": {"field": "detected_entities.confidence"}}}
+                    }
+                }
+            },
+            "ips": {
+                "terms": {"field": "client_ip", "size": ip_size},
+                "aggs": {
+                    "detected": detected,
+                    "pii_types": {"terms": {"field": "entity_types", "size": PII_TYPE_TERMS_SIZE}}
+                }
+            }
+        }
+        if not include_ips:
+            del aggs["ips"]
+        return aggs
+
+    @staticmethod
+    def _parse_raw_summary(aggregations: dict, doc_count: int) -> dict:
+        summary = empty_summary()
+        summary["total"] = doc_count
+        summary["detected"] = aggregations["detected"]["doc_count"]
+        summary["blocked"] = aggregations["blocked"]["doc_count"]
+        summary["response_time_sum"] = aggregations["response_time"]["sum"] or 0.0
+        summary["response_time_count"] = aggregations["response_time"]["count"]
+
+        entities = {
+            bucket["key"]: (bucket["doc_count"], bucket["confidence_sum"]["value"])
+            for bucket in aggregations["confidence"]["by_type"]["buckets"]
+        }
+        for bucket in aggregations["pii_types"]["buckets"]:
+            entity_count, confidence_sum = entities.get(bucket["key"], (0, 0.0))
+            summary["types"][bucket["key"]] = {
+                "count": bucket["doc_count"],
+                "entity_count": entity_count,
+                "confidence_sum": confidence_sum
+            }
+        for bucket in aggregations.get("ips", {}).get("buckets", []):
+            summary["ips"][bucket["key"]] = {
+                "total": bucket["doc_count"],
+                "detected": bucket["detected"]["doc_count"],
+                "types": {sub["key"]: sub["doc_count"] for sub in bucket["pii_types"]["buckets"]}
+            }
+        return summary
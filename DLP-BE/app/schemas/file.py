@@ -0,0 +1,57 @@
+from pydantic import BaseModel, Field
+
+from app.schemas.pii import DetectedEntity
+
+
+class FileDetectedEntity(DetectedEntity):
+    page: int = Field(..., description="엔티티가 탐지된 페이지 (1부터 시작, start/end는 해당 페이지 텍스트 기준)", ge=1)
+
+
+class FileProcessResponse(BaseModel):
+    filename: str = Field(..., description="업로드 파일명")
+    content_type: str | None = Field(None, description="업로드 Content-Type")
+    kind: str | None = Field(None, description="판별된 파일 종류 (pdf, image, docx, text)")
+    size: int = Field(..., description="파일 크기 (바이트)", ge=0)
+    text: str = Field("", description="추출 텍스트 앞부분 (FILE_TEXT_EXCERPT_CHARS 이내)")
+    has_pii: bool = Field(False, description="개인정보 탐지 여부")
+    reason: str = Field("", description="탐지 결과에 대한 이유")
+    entities: list[FileDetectedEntity] = Field(default_factory=list, description="페이지별 탐지 엔티티 목록")
+    pages_total: int = Field(0, description="파일 전체 페이지 수", ge=0)
+    pages_processed: int = Field(0, description="추출/탐지를 마친 페이지 수", ge=0)
+    truncated: bool = Field(False, description="예산 초과로 일부 페이지를 검사하지 않았는지 여부")
+    budget_exceeded: str | None = Field(None, description="초과한 예산 (pages, time)")
+    processing_time_ms: float = Field(0.0, description="처리 시간 (밀리초)")
+    error: str | None = Field(None, description="추출 실패 사유 (미지원 형식, 의존성 미설치 등)")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "filename": "report.pdf",
+                    "content_type": "application/pdf",
+                    "kind": "pdf",
+                    "size": 183422,
+                    "text": "2024년 상반기 보고서 담당자 홍길동 010-1234-5678 ...",
+                    "has_pii": True,
+                    "reason": "개인정보 2개 탐지됨 (PERSON, PHONE_NUM)",
+                    "entities": [
+                        {
+                            "type": "PERSON",
+                            "value": "홍길동",
+                            "confidence": 0.95,
+                            "token_count": 2,
+                            "start": 19,
+                            "end": 22,
+                            "page": 1
+                        }
+                    ],
+                    "pages_total": 300,
+                    "pages_processed": 50,
+                    "truncated": True,
+                    "budget_exceeded": "pages",
+                    "processing_time_ms": 8421.5,
+                    "error": None
+                }
+            ]
+        }
+    }
@@ -21,6 +21,7 @@ class PIILogCreate(BaseModel):
     policy_violation: bool
     policy_judgment: str | None = None
     policy_confidence: float | None = None
+    stage_timings_ms: dict[str, float] | None = None
     model_version: str = "psh3333/roberta-large-korean-pii5"
     api_version: str = "1.0.0"
 
@@ -43,6 +44,7 @@ class PIILogResponse(BaseModel):
     policy_violation: bool = False
     policy_judgment: str | None = None
     policy_confidence: float | None = None
+    stage_timings_ms: dict[str, float] | None = None
     model_version: str
     api_version: str
 
@@ -65,6 +67,7 @@ class LogListResponse(BaseModel):
     page: int
     page_size: int
     logs: list[PIILogResponse]
+    next_cursor: str | None = None  # 커서 페이징: 다음 페이지 토큰 (마지막 페이지면 None)
 
 
 class StatisticsOverview(BaseModel):
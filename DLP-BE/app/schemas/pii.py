@@ -8,6 +8,19 @@ class DetectedEntity(BaseModel):
     value: str = Field(..., description="탐지된 개인정보 값")
     confidence: float = Field(..., description="탐지 신뢰도 (0.0 ~ 1.0)", ge=0.0, le=1.0)
     token_count: int = Field(..., description="해당 엔티티의 토큰 개수", gt=0)
+    start: int | None = Field(None, description="원문 내 시작 위치 (문자 단위, 포함)", ge=0)
+    end: int | None = Field(None, description="원문 내 끝 위치 (문자 단위, 미포함)", ge=0)
+
+class PIIAuditRequest(BaseModel):
+    """프록시가 자체 판정으로 차단한 요청의 감사 로그"""
+    text: str = Field(..., description="차단된 원문 텍스트", min_length=1, max_length=10000)
+    entities: list[DetectedEntity] = Field(..., description="프록시에서 탐지한 개인정보 엔티티 목록", min_length=1)
+    reason: str = Field(..., description="프록시 차단 사유")
+    source: str = Field("proxy_regex", description="판정 출처 (예: proxy_regex)")
+
+class PIIEnabledTypesResponse(BaseModel):
+    """관리자 PII 설정에서 활성화된 타입 (프록시 정규식 빠른 경로 필터용)"""
+    enabled_types: list[str] = Field(..., description="탐지가 활성화된 PII 타입 목록 (DB 라벨)")
 
 class PIIDetectionResponse(BaseModel):
     has_pii: bool = Field(..., description="개인정보 탐지 여부")
@@ -17,6 +30,7 @@ class PIIDetectionResponse(BaseModel):
     policy_violation: bool = Field(..., description="정책 위반 탐지 여부")
     policy_judgment: str | None = Field(None, description="정책 판단 결과 (SAFE, VIOLATION_PRIVACY_CITIZEN, VIOLATION_CLASSIFIED, VIOLATION_HR)")
     policy_confidence: float | None = Field(None, description="정책 판단 신뢰도 (0.0 ~ 1.0)", ge=0.0, le=1.0)
+    stage_timings_ms: dict[str, float] | None = Field(None, description="단계별 소요 시간 (ner, gate, policy, 밀리초)")
     
     model_config = {
         "json_schema_extra": {
@@ -30,13 +44,17 @@ class PIIDetectionResponse(BaseModel):
                             "type": "PERSON",
                             "value": "홍길동",
                             "confidence": 0.95,
-                            "token_count": 2
+                            "token_count": 2,
+                            "start": 0,
+                            "end": 3
                         },
                         {
                             "type": "PHONE",
                             "value": "010-1234-5678",
                             "confidence": 0.89,
-                            "token_count": 3
+                            "token_count": 3,
+                            "start": 11,
+                            "end": 24
                         }
                     ],
                     "policy_violation": False,
@@ -0,0 +1,192 @@
+"""
+파일 텍스트 추출 + PII 탐지 서비스
+
+페이지 추출은 프로세스 풀(spawn)에서, PII 탐지는 이벤트 루프의 배칭 추론기에서 수행합니다.
+추출(생산자)과 탐지(소비자)를 작은 큐로 연결해 다음 페이지 추출과 현재 페이지 탐지가 겹치도록 하고,
+풀 작업을 파일 단위가 아닌 페이지 단위로 제출하므로 동시에 들어온 파일들의 페이지가 번갈아 처리됩니다.
+파일마다 페이지 수/시간 예산을 두어 수백 페이지짜리 문서가 워커를 독점하지 못하게 합니다.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import asyncio
+import logging
+import multiprocessing
+import time
+
+from app.core.config import settings
+from app.schemas.file import FileDetectedEntity, FileProcessResponse
+from app.schemas.pii import PIIDetectionResponse
+from app.services.pii_service import PIIDetectionService
+from app.utils import file_text_extractor
+from app.utils.file_text_extractor import FileExtractionError
+
+logger = logging.getLogger(__name__)
+
+# 추출이 탐지보다 앞서 나갈 수 있는 페이지 수 (메모리에 들고 있는 추출 텍스트 상한)
+PIPELINE_QUEUE_SIZE = 2
+
+# 워커 하나가 처리할 최대 작업 수 (파서 메모리 누수/손상 파일 영향을 제한하기 위해 주기적으로 교체)
+WORKER_MAX_TASKS = 200
+
+BUDGET_PAGES = "pages"
+BUDGET_TIME = "time"
+
+_END = object()
+
+
+class FileExtractionService:
+    """파일 페이지 추출 프로세스 풀 + 추출/탐지 스트리밍 파이프라인"""
+
+    def __init__(self, pii_service: PIIDetectionService | None = None):
+        self.pii_service = pii_service or PIIDetectionService()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """프로세스 풀 (첫 요청 시 생성, 모델을 물려받지 않도록 spawn 사용)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.FILE_EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=WORKER_MAX_TASKS
+            )
+            logger.info(f"File extraction pool started ({settings.FILE_EXTRACTION_WORKERS} workers)")
+        return self._executor
+
+    async def _run(self, fn, *args, timeout: float):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), fn, *args)
+        return await asyncio.wait_for(future, timeout)
+
+    async def process(self, path: str, filename: str, content_type: str | None, size: int) -> FileProcessResponse:
+        """
+        임시 파일로 저장된 업로드를 페이지 단위로 추출하면서 PII 탐지
+
+        Args:
+            path: 업로드를 저장한 임시 파일 경로 (호출자가 삭제)
+            filename: 원본 파일명
+            content_type: 업로드 Content-Type
+            size: 파일 크기 (바이트)
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + settings.FILE_TIME_BUDGET_SECONDS
+        response = FileProcessResponse(filename=filename, content_type=content_type, size=size)
+
+        kind = file_text_extractor.detect_kind(filename, content_type)
+        response.kind = kind
+        if kind is None:
+            response.error = "unsupported_file_type"
+            return self._finish(response, start_time)
+
+        try:
+            response.pages_total = await self._run(
+                file_text_extractor.count_pages, path, kind,
+                timeout=min(settings.FILE_PAGE_TIMEOUT_SECONDS, settings.FILE_TIME_BUDGET_SECONDS)
+            )
+        except FileExtractionError as e:
+            logger.warning(f"File extraction unavailable for {filename}: {e}")
+            response.error = str(e)
+            return self._finish(response, start_time)
+        except TimeoutError:
+            response.error = "extraction_timeout"
+            return self._finish(response, start_time)
+        except Exception as e:
+            logger.warning(f"Failed to open {filename} ({kind}): {e}")
+            response.error = "extraction_failed"
+            return self._finish(response, start_time)
+
+        pages_to_process = min(response.pages_total, settings.FILE_MAX_PAGES)
+        if pages_to_process < response.pages_total:
+            response.budget_exceeded = BUDGET_PAGES
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        producer = asyncio.create_task(self._produce_pages(path, kind, pages_to_process, deadline, queue, response))
+
+        excerpt_parts: list[str] = []
+        excerpt_length = 0
+        try:
+            while (item := await queue.get()) is not _END:
+                index, text, page_length = item
+                if excerpt_length < settings.FILE_TEXT_EXCERPT_CHARS:
+                    excerpt_parts.append(text[:min(page_length, settings.FILE_TEXT_EXCERPT_CHARS - excerpt_length)])
+                    excerpt_length += len(excerpt_parts[-1])
+
+                if text.strip():
+                    entities = await self.pii_service.detect_entities(text)
+                    # 뒤에 붙은 다음 페이지 앞부분에서 시작하는 엔티티는 다음 페이지에서 보고
+                    response.entities.extend(
+                        FileDetectedEntity(**entity.model_dump(), page=index + 1)
+                        for entity in entities if entity.start is None or entity.start < page_length
+                    )
+                response.pages_processed += 1
+
+                if time.perf_counter() > deadline and response.pages_processed < pages_to_process:
+                    response.budget_exceeded = BUDGET_TIME
+                    break
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+        response.text = "".join(excerpt_parts)
+        response.has_pii = len(response.entities) > 0
+        response.truncated = response.pages_processed < response.pages_total
+        return self._finish(response, start_time)
+
+    async def _produce_pages(
+        self,
+        path: str,
+        kind: str,
+        page_count: int,
+        deadline: float,
+        queue: asyncio.Queue,
+        response: FileProcessResponse
+    ) -> None:
+        """
+        페이지를 하나씩 풀에 제출하고 추출 결과를 큐에 넣음 (예산 초과/실패 시 중단)
+
+        소비자가 먼저 중단하면 취소되므로, 정상 종료 시에만 종료 표시를 넣습니다.
+        """
+        for index in range(page_count):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                response.budget_exceeded = BUDGET_TIME
+                break
+            try:
+                text, page_length = await self._run(
+                    file_text_extractor.extract_page, path, kind, index,
+                    settings.FILE_OCR_ENABLED, settings.FILE_OCR_LANG,
+                    timeout=min(remaining, settings.FILE_PAGE_TIMEOUT_SECONDS)
+                )
+            except TimeoutError:
+                # 진행 중인 워커 작업은 끝날 때까지 슬롯을 쓰지만, 이 파일의 다음 페이지는 제출하지 않음
+                logger.warning(f"Page {index + 1} extraction timed out ({kind})")
+                response.budget_exceeded = BUDGET_TIME
+                break
+            except Exception as e:
+                logger.warning(f"Page {index + 1} extraction failed ({kind}): {e}")
+                response.error = str(e) if isinstance(e, FileExtractionError) else "extraction_failed"
+                break
+            await queue.put((index, text, page_length))
+
+        await queue.put(_END)
+
+    def build_detection_result(self, response: FileProcessResponse) -> PIIDetectionResponse:
+        """탐지 로그 저장용 응답 형태 변환"""
+        return self.pii_service.build_file_response(response.entities)
+
+    @staticmethod
+    def _finish(response: FileProcessResponse, start_time: float) -> FileProcessResponse:
+        response.processing_time_ms = (time.perf_counter() - start_time) * 1000
+        return response
+
+    def shutdown(self) -> None:
+        """프로세스 풀 종료 (애플리케이션 종료 시)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("File extraction pool stopped")
+
+
+@lru_cache(maxsize=1)
+def get_file_extraction_service() -> FileExtractionService:
+    """파일 추출 서비스 싱글톤"""
+    return FileExtractionService()
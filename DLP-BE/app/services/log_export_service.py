@@ -0,0 +1,332 @@
+"""
+탐지 로그 내보내기 서비스 (NDJSON / CSV / Parquet 스트리밍)
+
+point-in-time를 열고 slice별로 search_after 페이지를 병렬로 읽어 제한된 큐에 넣으면,
+응답 스트림이 배치 단위로 꺼내 형식에 맞게 인코딩해 보냅니다.
+큐가 차면 읽기가 멈추므로 결과 전체를 메모리에 들고 있지 않으며, 메모리 사용량은
+(slice 수 x 2 + 1) 배치 정도로 제한됩니다. slice 간 순서는 보장하지 않습니다 (slice 안에서는 시간순).
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+import uuid
+
+from elasticsearch import NotFoundError
+
+from app.core.config import settings
+from app.core.elasticsearch import get_elasticsearch_client
+from app.repository.elasticsearch_repo import ElasticsearchRepository
+
+logger = logging.getLogger(__name__)
+
+# 형식 -> (media type, 확장자)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# CSV/Parquet 컬럼 순서 (목록/사전 값은 JSON 문자열로 저장)
+EXPORT_COLUMNS = [
+    "id", "timestamp", "client_ip", "has_pii", "blocked", "entity_count", "entity_types",
+    "detected_entities", "reason", "response_time_ms", "policy_violation", "policy_judgment",
+    "policy_confidence", "stage_timings_ms", "model_version", "api_version", "text_length", "original_text",
+]
+JSON_COLUMNS = {"entity_types", "detected_entities", "stage_timings_ms"}
+
+# 최근 내보내기 진행 상황 보관 수
+PROGRESS_HISTORY = 100
+
+_progress: OrderedDict[str, dict] = OrderedDict()
+
+
+class ExportFormatError(ValueError):
+    """지원하지 않거나 의존성이 없는 내보내기 형식"""
+
+
+def get_export_progress(export_id: str) -> dict | None:
+    """내보내기 진행 상황 (이 프로세스에서 시작한 최근 PROGRESS_HISTORY건)"""
+    progress = _progress.get(export_id)
+    if progress is None:
+        return None
+    elapsed = (progress["finished_at"] or time.time()) - progress["started_at"]
+    total = progress["total"]
+    return progress | {
+        "percent": round(progress["exported"] / total * 100, 2) if total else None,
+        "rows_per_second": round(progress["exported"] / elapsed, 1) if elapsed > 0 else None,
+        "started_at": datetime.utcfromtimestamp(progress["started_at"]).isoformat(),
+        "finished_at": datetime.utcfromtimestamp(progress["finished_at"]).isoformat() if progress["finished_at"] else None,
+    }
+
+
+# ----------------------------------------------------------------------
+# 형식별 인코더
+# ----------------------------------------------------------------------
+
+class NdjsonEncoder:
+    """한 줄에 로그 하나 (원본 문서 + id)"""
+
+    def start(self) -> bytes:
+        return b""
+
+    def encode(self, rows: list[dict]) -> bytes:
+        return "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows).encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CsvEncoder:
+    """EXPORT_COLUMNS 순서의 CSV (Excel에서 한글이 깨지지 않도록 UTF-8 BOM 포함)"""
+
+    def start(self) -> bytes:
+        return ("﻿" + self._write([EXPORT_COLUMNS])).encode("utf-8")
+
+    def encode(self, rows: list[dict]) -> bytes:
+        return self._write(
+            [_json_cell(column, row.get(column)) for column in EXPORT_COLUMNS] for row in rows
+        ).encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b""
+
+    @staticmethod
+    def _write(rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter 출력을 모았다가 배치마다 꺼내 가는 쓰기 전용 파일 객체"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ParquetEncoder:
+    """배치마다 row group 하나를 쓰는 Parquet 스트림 (pyarrow 필요, 'export' extra)"""
+
+    def __init__(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ExportFormatError("parquet export requires pyarrow (install the 'export' extra)") from e
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("id", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("client_ip", pa.string()),
+            ("has_pii", pa.bool_()),
+            ("blocked", pa.bool_()),
+            ("entity_count", pa.int32()),
+            ("entity_types", pa.list_(pa.string())),
+            ("detected_entities", pa.string()),
+            ("reason", pa.string()),
+            ("response_time_ms", pa.float64()),
+            ("policy_violation", pa.bool_()),
+            ("policy_judgment", pa.string()),
+            ("policy_confidence", pa.float64()),
+            ("stage_timings_ms", pa.string()),
+            ("model_version", pa.string()),
+            ("api_version", pa.string()),
+            ("text_length", pa.int32()),
+            ("original_text", pa.string()),
+        ])
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def start(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, rows: list[dict]) -> bytes:
+        columns = {name: [] for name in self._schema.names}
+        for row in rows:
+            for name in self._schema.names:
+                value = row.get(name)
+                if name == "timestamp" and isinstance(value, str):
+                    value = datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+                elif name in JSON_COLUMNS and name != "entity_types":
+                    value = _json_cell(name, value)
+                columns[name].append(value)
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def _json_cell(column: str, value):
+    if column in JSON_COLUMNS and value is not None:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def make_encoder(export_format: str):
+    """형식 이름으로 인코더 생성"""
+    if export_format == "ndjson":
+        return NdjsonEncoder()
+    if export_format == "csv":
+        return CsvEncoder()
+    if export_format == "parquet":
+        return ParquetEncoder()
+    raise ExportFormatError(f"unsupported export format: {export_format}")
+
+
+# ----------------------------------------------------------------------
+# 내보내기 작업
+# ----------------------------------------------------------------------
+
+class LogExportJob:
+    """내보내기 1건 (stream()을 StreamingResponse 본문으로 사용)"""
+
+    def __init__(
+        self,
+        export_format: str,
+        start_date: datetime,
+        end_date: datetime,
+        client_ip: str | None = None,
+        has_pii: bool | None = None,
+        entity_type: str | None = None
+    ):
+        """
+        Raises:
+            ExportFormatError: 지원하지 않는 형식 또는 pyarrow 미설치 (스트림 시작 전에 확인)
+        """
+        self.encoder = make_encoder(export_format)
+        self.export_id = uuid.uuid4().hex
+        self.query = ElasticsearchRepository.build_log_query(start_date, end_date, client_ip, has_pii, entity_type)
+        self.slices = max(1, settings.EXPORT_SLICES)
+        self.batch_size = settings.EXPORT_BATCH_SIZE
+        self.keep_alive = settings.EXPORT_KEEP_ALIVE
+        self._pit_id: str | None = None
+
+        self.progress = {
+            "export_id": self.export_id,
+            "format": export_format,
+            "status": "pending",
+            "exported": 0,
+            "total": None,
+            "started_at": time.time(),
+            "finished_at": None,
+            "error": None,
+        }
+        _progress[self.export_id] = self.progress
+        while len(_progress) > PROGRESS_HISTORY:
+            _progress.popitem(last=False)
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """인코딩된 바이트 청크 생성 (클라이언트가 끊으면 읽기 작업과 point-in-time 정리)"""
+        repo = ElasticsearchRepository(await get_elasticsearch_client())
+        workers: list[asyncio.Task] = []
+        self.progress["status"] = "running"
+        try:
+            self.progress["total"] = await repo.count_logs(self.query)
+            yield self.encoder.start()
+
+            try:
+                self._pit_id = await repo.open_point_in_time(self.keep_alive, index_filter=self.query)
+            except NotFoundError:
+                self._pit_id = None  # 인덱스가 없으면 빈 결과
+
+            if self._pit_id is not None:
+                queue: asyncio.Queue = asyncio.Queue(maxsize=self.slices * 2)
+                workers = [
+                    asyncio.create_task(self._read_slice(repo, slice_id, queue))
+                    for slice_id in range(self.slices)
+                ]
+                finished = 0
+                next_log = settings.EXPORT_PROGRESS_LOG_ROWS
+                while finished < len(workers):
+                    batch = await queue.get()
+                    if batch is None:
+                        finished += 1
+                        continue
+                    if isinstance(batch, Exception):
+                        raise batch
+
+                    chunk = self.encoder.encode(batch)
+                    self.progress["exported"] += len(batch)
+                    if self.progress["exported"] >= next_log:
+                        next_log += settings.EXPORT_PROGRESS_LOG_ROWS
+                        logger.info(f"Log export {self.export_id}: {self.progress['exported']}/{self.progress['total']} rows")
+                    if chunk:
+                        yield chunk
+
+            tail = self.encoder.finish()
+            self.progress["status"] = "completed"
+            if tail:
+                yield tail
+            logger.info(f"Log export {self.export_id} completed: {self.progress['exported']} rows")
+
+        except (asyncio.CancelledError, GeneratorExit):
+            self.progress["status"] = "cancelled"
+            logger.info(f"Log export {self.export_id} cancelled after {self.progress['exported']} rows")
+            raise
+        except Exception as e:
+            # 응답 헤더는 이미 나갔으므로 스트림을 중단하고 진행 상황에 오류 기록
+            self.progress["status"] = "failed"
+            self.progress["error"] = str(e)
+            logger.error(f"Log export {self.export_id} failed: {str(e)}", exc_info=True)
+            raise
+        finally:
+            self.progress["finished_at"] = time.time()
+            for worker in workers:
+                worker.cancel()
+            if workers:
+                await asyncio.gather(*workers, return_exceptions=True)
+            if self._pit_id is not None:
+                await repo.close_point_in_time(self._pit_id)
+
+    async def _read_slice(self, repo: ElasticsearchRepository, slice_id: int, queue: asyncio.Queue) -> None:
+        """slice 하나를 search_after로 끝까지 읽어 배치 단위로 큐에 넣음 (끝나면 None, 실패하면 예외 객체)"""
+        search_after = None
+        try:
+            while True:
+                result = await repo.search_logs_after(
+                    pit_id=self._pit_id,
+                    keep_alive=self.keep_alive,
+                    query=self.query,
+                    sort="timestamp:asc",
+                    size=self.batch_size,
+                    search_after=search_after,
+                    slice_id=slice_id,
+                    max_slices=self.slices
+                )
+                self._pit_id = result["pit_id"]
+                if result["hits"]:
+                    await queue.put(result["hits"])
+                if len(result["hits"]) < self.batch_size:
+                    break
+                search_after = result["search_after"]
+            await queue.put(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
@@ -0,0 +1,265 @@
+"""
+관리자 통계 롤업 작업
+닫힌 분/시간 버킷을 주기적으로 원본 로그에서 집계해 롤업 인덱스에 저장하고,
+통계 조회 시 롤업이 있는 구간은 롤업으로, 나머지(가장자리와 아직 열린 현재 버킷)만 원본 로그로 집계합니다.
+
+늦게 도착한 로그(spill 재전송, 재시도 후 전송)는 LogShipper가 전송 후 알려 주며,
+해당 분/시간 버킷을 원본에서 다시 집계해 덮어씁니다.
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.elasticsearch import get_elasticsearch_client
+from app.repository.rollup_repo import RollupRepository, merge_summaries
+
+logger = logging.getLogger(__name__)
+
+MINUTE = "1m"
+HOUR = "1h"
+
+# (단위, 버킷 크기, 한 번에 집계할 구간 길이)
+LEVELS = [
+    (MINUTE, timedelta(minutes=1), timedelta(hours=1)),
+    (HOUR, timedelta(hours=1), timedelta(hours=24)),
+]
+
+# 분 단위보다 잘게 나누는 추세 간격은 시간 롤업을 사용할 수 없음
+MINUTE_INTERVALS = {"1m", "minute"}
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """로그 timestamp와 같은 UTC naive 시각으로 변환"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def floor_time(value: datetime, step: timedelta) -> datetime:
+    return datetime.min + (value - datetime.min) // step * step
+
+
+def ceil_time(value: datetime, step: timedelta) -> datetime:
+    floored = floor_time(value, step)
+    return floored if floored == value else floored + step
+
+
+def plan_ranges(
+    start_date: datetime,
+    end_date: datetime,
+    coverage: dict[str, tuple[datetime, datetime] | None],
+    interval: str | None = None
+) -> tuple[list[tuple], list[tuple]]:
+    """
+    조회 구간을 롤업 구간과 원본 구간으로 분할
+
+    시간 롤업으로 덮을 수 있는 가운데 구간을 먼저 잡고, 남은 양쪽을 분 롤업으로,
+    분 경계에 못 미치는 가장자리와 롤업 범위 밖(워터마크 이후의 열린 버킷 등)은 원본 로그로 집계합니다.
+
+    Returns:
+        (롤업 구간 [(granularity, start, end)], 원본 구간 [(start, end, include_end)])
+    """
+    rollup_ranges = []
+    remainders = [(start_date, end_date, True)]
+
+    levels = [level for level in reversed(LEVELS) if not (level[0] == HOUR and interval in MINUTE_INTERVALS)]
+    for granularity, step, _ in levels:
+        if coverage.get(granularity) is None:
+            continue
+        coverage_start, coverage_end = coverage[granularity]
+        next_remainders = []
+        for start, end, include_end in remainders:
+            rollup_start = max(ceil_time(start, step), coverage_start)
+            rollup_end = min(floor_time(end, step), coverage_end)
+            if rollup_start >= rollup_end:
+                next_remainders.append((start, end, include_end))
+                continue
+            rollup_ranges.append((granularity, rollup_start, rollup_end))
+            if start < rollup_start:
+                next_remainders.append((start, rollup_start, False))
+            next_remainders.append((rollup_end, end, include_end))
+        remainders = next_remainders
+
+    raw_ranges = [(start, end, include_end) for start, end, include_end in remainders if start < end or include_end]
+    return rollup_ranges, raw_ranges
+
+
+class LogRollup:
+    """분/시간 롤업 주기 작업 + 롤업/원본 혼합 통계 조회"""
+
+    def __init__(self, interval_seconds: float, settle_seconds: float, backfill_hours: int, max_ips_per_bucket: int):
+        """
+        Args:
+            interval_seconds: 롤업 작업 주기
+            settle_seconds: 버킷이 닫힌 뒤 로그가 검색 가능해질 때까지 기다리는 시간
+            backfill_hours: 워터마크가 없을 때 처음 롤업할 과거 구간
+            max_ips_per_bucket: 버킷당 저장할 최대 IP 수
+        """
+        self.interval_seconds = interval_seconds
+        self.settle = timedelta(seconds=settle_seconds)
+        self.backfill = timedelta(hours=backfill_hours)
+        self.max_ips_per_bucket = max_ips_per_bucket
+
+        # 단위별 롤업이 끝난 연속 구간 [시작, 워터마크)
+        self.coverage: dict[str, tuple[datetime, datetime] | None] = {granularity: None for granularity, _, _ in LEVELS}
+        self._initialized = False
+        self._dirty: dict[datetime, float] = {}  # 늦게 도착한 로그가 있는 분 버킷 -> 표시 시각
+        self._task: asyncio.Task | None = None
+        self.last_error: str | None = None
+        self.counters = {"runs": 0, "buckets_rolled": 0, "late_buckets_rolled": 0, "last_run_ms": 0.0}
+
+    async def start(self) -> None:
+        """주기 작업 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="log-rollup")
+            logger.info(f"Log rollup started (every {self.interval_seconds}s, settle {self.settle.total_seconds()}s)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def ready(self) -> bool:
+        """롤업 조회를 사용할 수 있는지 (작업이 초기화되어 롤업 범위를 알고 있음)"""
+        return self._initialized and any(self.coverage.values())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"Log rollup run failed: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self, now: datetime | None = None) -> None:
+        """닫힌 버킷 롤업 + 늦게 도착한 로그가 있는 버킷 재집계"""
+        start_time = time.perf_counter()
+        repo = RollupRepository(await get_elasticsearch_client())
+        if not self._initialized:
+            await repo.create_index_if_not_exists()
+            for granularity, _, _ in LEVELS:
+                self.coverage[granularity] = await repo.get_coverage(granularity)
+            self._initialized = True
+
+        closed = (now or datetime.utcnow()) - self.settle
+        for granularity, step, chunk in LEVELS:
+            target = floor_time(closed, step)
+            if self.coverage[granularity] is None:
+                # 처음 실행: backfill_hours만큼만 과거를 롤업하고, 그 이전 구간 조회는 원본 로그 사용
+                start = floor_time(target - self.backfill, step)
+                self.coverage[granularity] = (start, start)
+            # 중단 기간이 길었어도 구멍이 생기지 않도록 워터마크부터 이어서 롤업
+            coverage_start, watermark = self.coverage[granularity]
+            while watermark < target:
+                chunk_end = min(target, watermark + chunk)
+                documents = await repo.compute_rollups(granularity, watermark, chunk_end, self.max_ips_per_bucket)
+                await repo.put_rollups(documents, coverage=(granularity, coverage_start, chunk_end))
+                self.counters["buckets_rolled"] += sum(1 for document in documents if document["kind"] == "summary")
+                watermark = chunk_end
+                self.coverage[granularity] = (coverage_start, watermark)
+
+        await self._roll_late_buckets(repo)
+        self.counters["runs"] += 1
+        self.counters["last_run_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+
+    def mark_late(self, documents: list[dict]) -> None:
+        """전송된 로그 중 이미 롤업된 버킷에 속하는 것을 재집계 대상으로 표시 (LogShipper 전송 후 호출)"""
+        if self.coverage[MINUTE] is None:
+            return
+        coverage_start, watermark = self.coverage[MINUTE]
+        now = time.monotonic()
+        for document in documents:
+            try:
+                timestamp = to_utc_naive(datetime.fromisoformat(document["timestamp"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if coverage_start <= timestamp < watermark:
+                self._dirty[floor_time(timestamp, timedelta(minutes=1))] = now
+
+    async def _roll_late_buckets(self, repo: RollupRepository) -> None:
+        settle = self.settle.total_seconds()
+        now = time.monotonic()
+        ready = sorted(bucket for bucket, marked_at in self._dirty.items() if now - marked_at >= settle)
+        rolled = set()
+        for bucket in ready:
+            del self._dirty[bucket]
+            for granularity, step, _ in LEVELS:
+                bucket_start = floor_time(bucket, step)
+                coverage = self.coverage[granularity]
+                if coverage is None or not coverage[0] <= bucket_start < coverage[1]:
+                    continue
+                if (granularity, bucket_start) in rolled:
+                    continue
+                rolled.add((granularity, bucket_start))
+                documents = await repo.compute_rollups(
+                    granularity, bucket_start, bucket_start + step, self.max_ips_per_bucket
+                )
+                await repo.put_rollups(documents)
+                self.counters["late_buckets_rolled"] += 1
+
+    async def summarize(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        ip_size: int,
+        interval: str | None = None,
+        unique_ips: bool = False
+    ) -> dict:
+        """
+        롤업/원본 혼합 집계
+
+        Returns:
+            dict: rollup_repo.empty_summary() 형식 (unique_ips=True면 "unique_ips" 포함)
+        """
+        start_date, end_date = to_utc_naive(start_date), to_utc_naive(end_date)
+        rollup_ranges, raw_ranges = plan_ranges(start_date, end_date, self.coverage, interval)
+        repo = RollupRepository(await get_elasticsearch_client())
+
+        tasks = [
+            repo.summarize_rollups(granularity, start, end, ip_size, interval)
+            for granularity, start, end in rollup_ranges
+        ]
+        tasks += [
+            repo.summarize_raw(start, end, include_end, ip_size, interval)
+            for start, end, include_end in raw_ranges
+        ]
+        if unique_ips:
+            tasks.append(repo.count_unique_ips(rollup_ranges, raw_ranges))
+
+        results = await asyncio.gather(*tasks)
+        if unique_ips:
+            summary = merge_summaries(results[:-1])
+            summary["unique_ips"] = results[-1]
+        else:
+            summary = merge_summaries(results)
+        return summary
+
+    def get_stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "coverage": {
+                granularity: [coverage[0].isoformat(), coverage[1].isoformat()] if coverage else None
+                for granularity, coverage in self.coverage.items()
+            },
+            "pending_late_buckets": len(self._dirty),
+            "last_error": self.last_error,
+            **self.counters,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_log_rollup() -> LogRollup:
+    """설정 기반 롤업 작업 싱글톤"""
+    return LogRollup(
+        interval_seconds=settings.ROLLUP_INTERVAL_SECONDS,
+        settle_seconds=settings.ROLLUP_SETTLE_SECONDS,
+        backfill_hours=settings.ROLLUP_BACKFILL_HOURS,
+        max_ips_per_bucket=settings.ROLLUP_MAX_IPS_PER_BUCKET
+    )
@@ -2,8 +2,12 @@
 PII 검사 로그 서비스
 """
 from datetime import datetime
+import base64
+import json
 import logging
 
+from elasticsearch import NotFoundError
+
 from app.schemas.pii import PIIDetectionResponse
 from app.schemas.log import (
     PIILogCreate,
@@ -17,11 +21,43 @@ from app.schemas.log import (
     IPStatistics,
     IPStatisticsResponse
 )
-from app.repository.elasticsearch_repo import ElasticsearchRepository
+from app.repository.elasticsearch_repo import ElasticsearchRepository, WriteAliasMissingError
 from app.core.elasticsearch import get_elasticsearch_client
+from app.core.config import settings
+from app.services.log_shipper import get_log_shipper
+from app.services.log_rollup import LogRollup, get_log_rollup
 
 logger = logging.getLogger(__name__)
 
+# 롤업/원본 구간 결과를 합칠 때 구간별로 가져올 IP 수 (상위 IP 정확도)
+STATISTICS_IP_TERMS = 1000
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없는 로그 조회 커서"""
+
+
+class CursorExpiredError(Exception):
+    """커서의 point-in-time이 만료됨 (처음부터 다시 조회해야 함)"""
+
+
+def encode_cursor(state: dict) -> str:
+    """커서 상태를 불투명 토큰으로 인코딩 (base64url JSON)"""
+    raw = json.dumps(state, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    """encode_cursor 역변환 (형식이 맞지 않으면 InvalidCursorError)"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        state = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("invalid cursor") from e
+    if not isinstance(state, dict) or not {"pit", "after", "filters", "sort", "size", "page", "total"} <= state.keys():
+        raise InvalidCursorError("invalid cursor")
+    return state
+
 
 class PIILogService:
     """PII 검사 로그 서비스"""
@@ -31,21 +67,21 @@ class PIILogService:
         client_ip: str,
         original_text: str,
         result: PIIDetectionResponse,
-        response_time_ms: float
+        response_time_ms: float,
+        model_version: str | None = None
     ) -> None:
         """
         PII 검사 결과를 Elasticsearch에 저장
+        (LOG_SHIPPER_ENABLED면 큐에 넣고 바로 반환, 실제 저장은 LogShipper가 _bulk로 묶어서 처리)
 
         Args:
             client_ip: 클라이언트 IP 주소
             original_text: 원문 텍스트
             result: PII 탐지 결과
             response_time_ms: 응답 시간 (밀리초)
+            model_version: 판정 주체 (기본: NER 모델, 프록시 자체 판정은 "proxy_regex" 등)
         """
         try:
-            es_client = await get_elasticsearch_client()
-            repo = ElasticsearchRepository(es_client)
-
             # 엔티티 타입 추출
             entity_types = list(set(entity.type for entity in result.entities))
 
@@ -64,11 +100,27 @@ class PIILogService:
                 # 정책 위반 정보
                 policy_violation=result.policy_violation,
                 policy_judgment=result.policy_judgment,
-                policy_confidence=result.policy_confidence
+                policy_confidence=result.policy_confidence,
+                stage_timings_ms=result.stage_timings_ms,
+                **({"model_version": model_version} if model_version else {})
             )
 
+            if settings.LOG_SHIPPER_ENABLED:
+                # 배치 전송 시점이 아니라 요청 시점의 시각을 기록
+                document = log_data.model_dump()
+                document["timestamp"] = datetime.utcnow().isoformat()
+                get_log_shipper().enqueue(document)
+                return
+
             # Elasticsearch에 저장
-            doc_id = await repo.index_log(log_data.model_dump())
+            es_client = await get_elasticsearch_client()
+            repo = ElasticsearchRepository(es_client)
+            try:
+                doc_id = await repo.index_log(log_data.model_dump())
+            except WriteAliasMissingError:
+                # 기동 시 ES 장애로 alias가 없으면 지금 만들고 다시 저장
+                await repo.create_index_if_not_exists()
+                doc_id = await repo.index_log(log_data.model_dump())
             logger.info(f"Logged PII detection result: {doc_id} (IP: {client_ip}, has_pii: {result.has_pii})")
 
         except Exception as e:
@@ -84,18 +136,49 @@ class PIILogService:
         entity_type: str | None = None,
         page: int = 1,
         page_size: int = 20,
-        sort: str = "timestamp:desc"
+        sort: str = "timestamp:desc",
+        cursor_mode: bool = False,
+        cursor: str | None = None
     ) -> LogListResponse:
         """
         로그 조회 (페이징, 필터링)
 
+        Args:
+            cursor_mode: True면 point-in-time + search_after 커서 페이징으로 첫 페이지 조회
+            cursor: 이전 응답의 next_cursor (지정하면 필터/정렬/페이지 크기는 커서에 담긴 값 사용)
+
         Returns:
             LogListResponse: 로그 목록 및 페이징 정보
+
+        Raises:
+            InvalidCursorError: 커서 형식 오류
+            CursorExpiredError: 커서의 point-in-time 만료
         """
         try:
             es_client = await get_elasticsearch_client()
             repo = ElasticsearchRepository(es_client)
 
+            if cursor is not None or cursor_mode:
+                if cursor is not None:
+                    state = decode_cursor(cursor)
+                else:
+                    state = {
+                        "pit": None,
+                        "after": None,
+                        "filters": {
+                            "start_date": start_date.isoformat(),
+                            "end_date": end_date.isoformat(),
+                            "client_ip": client_ip,
+                            "has_pii": has_pii,
+                            "entity_type": entity_type
+                        },
+                        "sort": sort,
+                        "size": page_size,
+                        "page": 1,
+                        "total": None
+                    }
+                return await self._get_logs_after(repo, state)
+
             result = await repo.search_logs(
                 start_date=start_date,
                 end_date=end_date,
@@ -123,10 +206,78 @@ class PIILogService:
                 logs=logs
             )
 
+        except (InvalidCursorError, CursorExpiredError):
+            raise
         except Exception as e:
             logger.error(f"Failed to get logs: {str(e)}", exc_info=True)
             raise
 
+    async def _get_logs_after(self, repo: ElasticsearchRepository, state: dict) -> LogListResponse:
+        """커서 상태로 다음 페이지 조회 (전체 건수는 첫 페이지에서만 계산해 커서로 전달)"""
+        filters = state["filters"]
+        try:
+            query = repo.build_log_query(
+                start_date=datetime.fromisoformat(filters["start_date"]),
+                end_date=datetime.fromisoformat(filters["end_date"]),
+                client_ip=filters.get("client_ip"),
+                has_pii=filters.get("has_pii"),
+                entity_type=filters.get("entity_type")
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursorError("invalid cursor") from e
+
+        keep_alive = settings.LOGS_CURSOR_KEEP_ALIVE
+        pit_id = state["pit"]
+        if pit_id is None:
+            try:
+                pit_id = await repo.open_point_in_time(keep_alive, index_filter=query)
+            except NotFoundError:
+                # 인덱스가 아직 없으면 빈 결과
+                return LogListResponse(total=0, page=1, page_size=state["size"], logs=[])
+
+        try:
+            result = await repo.search_logs_after(
+                pit_id=pit_id,
+                keep_alive=keep_alive,
+                query=query,
+                sort=state["sort"],
+                size=state["size"],
+                search_after=state["after"],
+                track_total_hits=state["total"] is None
+            )
+        except NotFoundError as e:
+            raise CursorExpiredError("cursor expired") from e
+
+        total = result["total"] if state["total"] is None else state["total"]
+        logs = [
+            PIILogResponse(
+                id=hit["id"],
+                timestamp=datetime.fromisoformat(hit["timestamp"].replace("Z", "+00:00")),
+                **{k: v for k, v in hit.items() if k != "id" and k != "timestamp"}
+            )
+            for hit in result["hits"]
+        ]
+
+        next_cursor = None
+        if len(logs) == state["size"] and state["page"] * state["size"] < total:
+            next_cursor = encode_cursor(state | {
+                "pit": result["pit_id"],
+                "after": result["search_after"],
+                "page": state["page"] + 1,
+                "total": total
+            })
+        else:
+            # 마지막 페이지: point-in-time을 만료까지 기다리지 않고 바로 닫음
+            await repo.close_point_in_time(result["pit_id"])
+
+        return LogListResponse(
+            total=total,
+            page=state["page"],
+            page_size=state["size"],
+            logs=logs,
+            next_cursor=next_cursor
+        )
+
     async def get_statistics_overview(
         self,
         start_date: datetime,
@@ -139,6 +290,11 @@ class PIILogService:
             StatisticsOverview: 전체 통계 데이터
         """
         try:
+            rollup = self._get_rollup()
+            if rollup is not None:
+                summary = await rollup.summarize(start_date, end_date, STATISTICS_IP_TERMS, unique_ips=True)
+                return self._overview_from_summary(start_date, end_date, summary)
+
             es_client = await get_elasticsearch_client()
             repo = ElasticsearchRepository(es_client)
 
@@ -213,6 +369,22 @@ class PIILogService:
             interval: "1h", "1d", "1w" 등
         """
         try:
+            rollup = self._get_rollup()
+            if rollup is not None:
+                summary = await rollup.summarize(start_date, end_date, ip_size=1, interval=interval)
+                timeline = [
+                    TimelineDataPoint(
+                        timestamp=datetime.fromisoformat(key.replace("Z", "+00:00")),
+                        total_requests=values["total"],
+                        detected_requests=values["detected"],
+                        detection_rate=round(
+                            values["detected"] / values["total"] * 100, 2
+                        ) if values["total"] > 0 else 0.0
+                    )
+                    for key, values in sorted(summary["timeline"].items())
+                ]
+                return TimelineResponse(timeline=timeline)
+
             es_client = await get_elasticsearch_client()
             repo = ElasticsearchRepository(es_client)
 
@@ -245,6 +417,24 @@ class PIILogService:
         PII 타입별 통계
         """
         try:
+            rollup = self._get_rollup()
+            if rollup is not None:
+                summary = await rollup.summarize(start_date, end_date, ip_size=1)
+                top_types = sorted(summary["types"].items(), key=lambda item: item[1]["count"], reverse=True)[:10]
+                total_detected = sum(values["count"] for _, values in top_types)
+                statistics = [
+                    PIITypeStatistics(
+                        pii_type=pii_type,
+                        count=values["count"],
+                        percentage=round(values["count"] / total_detected * 100, 2) if total_detected > 0 else 0.0,
+                        avg_confidence=round(
+                            values["confidence_sum"] / values["entity_count"], 4
+                        ) if values["entity_count"] > 0 else 0.0
+                    )
+                    for pii_type, values in top_types
+                ]
+                return PIITypeStatisticsResponse(statistics=statistics)
+
             es_client = await get_elasticsearch_client()
             repo = ElasticsearchRepository(es_client)
 
@@ -255,12 +445,18 @@ class PIILogService:
 
             total_detected = sum(bucket["doc_count"] for bucket in aggs["top_pii_types"]["buckets"])
 
+            # 엔티티 단위 평균 신뢰도 (nested 집계)
+            avg_confidence = {
+                bucket["key"]: bucket["avg_confidence"]["value"] or 0.0
+                for bucket in aggs["pii_type_confidence"]["by_type"]["buckets"]
+            }
+
             statistics = [
                 PIITypeStatistics(
                     pii_type=bucket["key"],
                     count=bucket["doc_count"],
                     percentage=round(bucket["doc_count"] / total_detected * 100, 2) if total_detected > 0 else 0.0,
-                    avg_confidence=0.0  # 추후 구현
+                    avg_confidence=round(avg_confidence.get(bucket["key"], 0.0), 4)
                 )
                 for bucket in aggs["top_pii_types"]["buckets"]
             ]
@@ -281,6 +477,26 @@ class PIILogService:
         IP별 통계
         """
         try:
+            rollup = self._get_rollup()
+            if rollup is not None:
+                summary = await rollup.summarize(start_date, end_date, max(size, STATISTICS_IP_TERMS))
+                top_ips = sorted(summary["ips"].items(), key=lambda item: item[1]["total"], reverse=True)[:size]
+                statistics = [
+                    IPStatistics(
+                        client_ip=client_ip,
+                        total_requests=values["total"],
+                        detected_requests=values["detected"],
+                        detection_rate=round(
+                            values["detected"] / values["total"] * 100, 2
+                        ) if values["total"] > 0 else 0.0,
+                        most_detected_type=(
+                            max(values["types"], key=values["types"].get) if values["types"] else None
+                        )
+                    )
+                    for client_ip, values in top_ips
+                ]
+                return IPStatisticsResponse(statistics=statistics)
+
             es_client = await get_elasticsearch_client()
             repo = ElasticsearchRepository(es_client)
 
@@ -307,3 +523,51 @@ class PIILogService:
         except Exception as e:
             logger.error(f"Failed to get statistics by IP: {str(e)}", exc_info=True)
             raise
+
+    @staticmethod
+    def _get_rollup() -> LogRollup | None:
+        """롤업 조회가 가능하면 롤업 작업 반환 (아직 롤업이 없으면 원본 로그 집계)"""
+        if not settings.ROLLUP_ENABLED:
+            return None
+        rollup = get_log_rollup()
+        return rollup if rollup.ready else None
+
+    @staticmethod
+    def _overview_from_summary(start_date: datetime, end_date: datetime, summary: dict) -> StatisticsOverview:
+        """롤업/원본 혼합 집계 결과로 통계 개요 생성 (원본 집계 경로와 같은 기준)"""
+        total_requests = summary["total"]
+        detected_requests = summary["detected"]
+        detection_rate = (detected_requests / total_requests * 100) if total_requests > 0 else 0.0
+
+        top_types = sorted(summary["types"].items(), key=lambda item: item[1]["count"], reverse=True)[:10]
+        top_ips = sorted(summary["ips"].items(), key=lambda item: item[1]["total"], reverse=True)[:10]
+        response_time_count = summary["response_time_count"]
+
+        return StatisticsOverview(
+            period={"start": start_date.isoformat(), "end": end_date.isoformat()},
+            total_requests=total_requests,
+            detected_requests=detected_requests,
+            detection_rate=round(detection_rate, 2),
+            blocked_requests=detected_requests,  # PII 탐지 = 차단
+            blocked_rate=round(detection_rate, 2),
+            avg_response_time_ms=round(
+                summary["response_time_sum"] / response_time_count, 2
+            ) if response_time_count > 0 else 0.0,
+            unique_ips=summary["unique_ips"],
+            top_detected_types=[
+                {
+                    "type": pii_type,
+                    "count": values["count"],
+                    "percentage": round(values["count"] / detected_requests * 100, 2) if detected_requests > 0 else 0.0
+                }
+                for pii_type, values in top_types
+            ],
+            top_ips=[
+                {
+                    "client_ip": client_ip,
+                    "request_count": values["total"],
+                    "detection_count": values["detected"]
+                }
+                for client_ip, values in top_ips
+            ]
+        )
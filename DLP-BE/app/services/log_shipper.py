@@ -0,0 +1,382 @@
+"""
+탐지 로그 백그라운드 적재기
+요청 경로에서는 제한된 크기의 메모리 큐에 넣기만 하고, 백그라운드 작업이 크기/시간 기준으로 묶어
+_bulk API로 전송합니다. Elasticsearch 장애 시에는 재시도 후 overflow 정책(drop | spill)을 적용하며,
+spill된 문서(JSONL)는 전송이 다시 성공하면 재전송합니다.
+"""
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+
+from app.core.config import settings
+from app.core.elasticsearch import get_elasticsearch_client
+from app.repository.elasticsearch_repo import ElasticsearchRepository, WriteAliasMissingError
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_SPILL = "spill"
+
+# 재시도 대기 (1, 2, 4, ... 초, 최대 30초)
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+# 플러시 지연 시간 통계에 사용할 최근 배치 수
+LATENCY_WINDOW = 256
+
+# 종료 시 대기 중인 전송 루프를 깨우는 표식 (문서로 전송하지 않음)
+_WAKE: dict = {}
+
+
+class LogShipper:
+    """제한 큐 + _bulk 배치 전송 로그 적재기"""
+
+    def __init__(
+        self,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        max_retries: int,
+        overflow_policy: str,
+        spill_path: str,
+        spill_max_bytes: int
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.overflow_policy = overflow_policy.lower()
+        self.spill_path = Path(spill_path)
+        self.spill_max_bytes = spill_max_bytes
+
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max(1, queue_size))
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._inflight: list[dict] = []
+        # 전송에 성공한 문서 목록을 받는 콜백 (통계 롤업의 늦은 로그 재집계 등)
+        self.on_shipped: Callable[[list[dict]], None] | None = None
+
+        self._latencies_ms: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.es_available = True
+        self.last_error: str | None = None
+        self.counters = {
+            "enqueued": 0,
+            "shipped": 0,
+            "rejected": 0,  # 매핑 오류 등 재시도해도 실패하는 문서
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "quarantined": 0,  # 파싱할 수 없어 재전송하지 않고 격리한 spill 줄
+            "batches": 0,
+            "failed_batches": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 생명주기
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """백그라운드 전송 작업 시작"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run(), name="log-shipper")
+            logger.info(
+                f"Log shipper started (batch {self.batch_size}, interval {self.flush_interval}s, "
+                f"queue {self._queue.maxsize}, overflow {self.overflow_policy})"
+            )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """남은 로그를 전송하고 종료 (시간 안에 못 보낸 문서는 overflow 정책 적용)"""
+        self._closing = True
+        if self._task is None:
+            return
+
+        try:
+            self._queue.put_nowait(_WAKE)
+        except asyncio.QueueFull:
+            pass  # 큐가 차 있으면 루프가 기다리지 않고 바로 꺼내 감
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except TimeoutError:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+        remaining = self._drain_nowait(self._queue.qsize())
+        if remaining:
+            self._overflow(remaining, "shutdown")
+        logger.info(f"Log shipper stopped: {self.get_stats()}")
+
+    def enqueue(self, document: dict) -> bool:
+        """
+        로그 문서를 큐에 넣음 (대기하지 않음)
+
+        Returns:
+            bool: 큐에 들어갔으면 True, 가득 차서 overflow 정책을 적용했으면 False
+        """
+        try:
+            self._queue.put_nowait(document)
+        except asyncio.QueueFull:
+            self._overflow([document], "queue_full")
+            return False
+        self.counters["enqueued"] += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # 전송 루프
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        # 예기치 못한 오류로 작업이 끝나면 큐만 계속 차므로, 배치 단위로 기록하고 계속 진행
+        try:
+            await self._replay_spill()
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Log shipper spill replay failed: {str(e)}", exc_info=True)
+
+        while not (self._closing and self._queue.empty()):
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                await self._ship(batch)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Log shipper flush error: {str(e)}", exc_info=True)
+
+    async def _next_batch(self) -> list[dict]:
+        """첫 문서를 기다린 뒤 batch_size개 또는 flush_interval이 지날 때까지 모음"""
+        try:
+            first = await asyncio.wait_for(self._queue.get(), self.flush_interval)
+        except TimeoutError:
+            return []
+
+        batch = [] if first is _WAKE else [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            batch.extend(self._drain_nowait(self.batch_size - len(batch)))
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.batch_size or remaining <= 0 or self._closing:
+                break
+            try:
+                document = await asyncio.wait_for(self._queue.get(), remaining)
+            except TimeoutError:
+                break
+            if document is not _WAKE:
+                batch.append(document)
+        return batch
+
+    def _drain_nowait(self, limit: int) -> list[dict]:
+        documents = []
+        while len(documents) < limit:
+            try:
+                document = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if document is not _WAKE:
+                documents.append(document)
+        return documents
+
+    async def _ship(self, batch: list[dict]) -> None:
+        """배치 전송 (일시적 실패는 지수 백오프로 재시도, 끝내 실패하면 overflow 정책)"""
+        self._inflight = batch
+        try:
+            pending = batch
+            for attempt in range(self.max_retries + 1):
+                pending = await self._send(pending)
+                if not pending:
+                    break
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt))
+
+            if pending:
+                self.counters["failed_batches"] += 1
+                self._overflow(pending, "flush_failed")
+            elif self.spill_path.exists():
+                # 전송이 다시 성공하면 spill된 문서 재전송
+                await self._replay_spill()
+        except asyncio.CancelledError:
+            # 종료 시간 초과로 취소되면 전송 중이던 문서도 보존
+            self._overflow(self._inflight, "shutdown")
+            raise
+        finally:
+            self._inflight = []
+
+    async def _send(self, batch: list[dict]) -> list[dict]:
+        """
+        _bulk 1회 전송
+
+        Returns:
+            list[dict]: 재시도해야 하는 문서 (전송 자체가 실패하면 배치 전체)
+        """
+        start_time = time.perf_counter()
+        try:
+            repo = ElasticsearchRepository(await get_elasticsearch_client())
+            try:
+                failed = await repo.bulk_index(batch)
+            except WriteAliasMissingError:
+                # 기동 시 ES가 내려가 있어 alias를 만들지 못한 경우: 지금 만들고 다시 전송
+                logger.warning(f"Write alias {repo.index_name} missing, bootstrapping it before retrying")
+                await repo.create_index_if_not_exists()
+                failed = await repo.bulk_index(batch)
+        except Exception as e:
+            if self.es_available:
+                logger.warning(f"Log shipper flush failed, will retry: {str(e)}")
+            self.es_available = False
+            self.last_error = str(e)
+            return batch
+
+        self._latencies_ms.append((time.perf_counter() - start_time) * 1000)
+        self.counters["batches"] += 1
+        if not self.es_available:
+            logger.info("Log shipper flush recovered")
+        self.es_available = True
+
+        # 429/5xx는 재시도, 그 외(매핑 오류 등)는 버림
+        retry = [document for status, document in failed if status == 429 or status >= 500]
+        rejected = len(failed) - len(retry)
+        if rejected:
+            self.counters["rejected"] += rejected
+            logger.warning(f"Log shipper: {rejected} documents rejected by Elasticsearch")
+        self.counters["shipped"] += len(batch) - len(failed)
+        if self.on_shipped is not None:
+            failed_ids = {id(document) for _, document in failed}
+            self.on_shipped([document for document in batch if id(document) not in failed_ids])
+        return retry
+
+    # ------------------------------------------------------------------
+    # overflow (drop / spill)
+    # ------------------------------------------------------------------
+
+    def _overflow(self, documents: list[dict], reason: str) -> None:
+        if not documents:
+            return
+        if self.overflow_policy == OVERFLOW_SPILL and self._spill(documents):
+            self.counters["spilled"] += len(documents)
+            return
+
+        if self.counters["dropped"] == 0 or reason != "queue_full":
+            logger.warning(f"Log shipper dropped {len(documents)} documents ({reason})")
+        self.counters["dropped"] += len(documents)
+
+    def _spill(self, documents: list[dict]) -> bool:
+        """JSONL 파일에 추가 (용량 한도 초과 시 False)"""
+        lines = "".join(json.dumps(document, ensure_ascii=False, default=str) + "\n" for document in documents)
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            size = self.spill_path.stat().st_size if self.spill_path.exists() else 0
+            if size + len(lines) > self.spill_max_bytes:
+                return False
+            if size and not self._ends_with_newline(self.spill_path):
+                # 이전에 쓰다 만 줄(프로세스 중단 등)에 이어 붙여 새 문서까지 깨지지 않도록 줄을 끊음
+                lines = "\n" + lines
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            return True
+        except OSError as e:
+            logger.error(f"Log shipper spill failed: {str(e)}")
+            return False
+
+    @staticmethod
+    def _ends_with_newline(path: Path) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _parse_spilled(self, lines: list[str]) -> list[dict]:
+        """spill 줄 파싱 (잘린 마지막 줄 등 파싱할 수 없는 줄은 .corrupt 파일로 격리)"""
+        documents = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                documents.append(json.loads(line))
+                continue
+            except json.JSONDecodeError:
+                pass
+
+            self.counters["quarantined"] += 1
+            corrupt_path = self.spill_path.with_name(self.spill_path.name + ".corrupt")
+            logger.warning(f"Log shipper: unparseable spilled line moved to {corrupt_path}")
+            try:
+                with open(corrupt_path, "a", encoding="utf-8") as f:
+                    f.write(line if line.endswith("\n") else line + "\n")
+            except OSError as e:
+                logger.error(f"Log shipper quarantine failed: {str(e)}")
+        return documents
+
+    async def _replay_spill(self) -> None:
+        """spill 파일을 배치 단위로 재전송 (실패하면 남은 문서를 다시 spill 파일로 돌려놓음)"""
+        replay_path = self.spill_path.with_name(self.spill_path.name + ".replay")
+        if not replay_path.exists():
+            if not self.spill_path.exists():
+                return
+            os.replace(self.spill_path, replay_path)
+
+        replayed = 0
+        with open(replay_path, encoding="utf-8") as f:
+            while lines := list(itertools.islice(f, self.batch_size)):
+                documents = self._parse_spilled(lines)
+                if not documents:
+                    continue
+                retry = await self._send(documents)
+                if retry:
+                    # 재전송 실패: 실패분 + 읽지 않은 나머지를 spill 파일로 되돌리고 다음 성공 때 다시 시도
+                    if not self._spill(retry):
+                        logger.warning(f"Log shipper dropped {len(retry)} documents (spill_full)")
+                        self.counters["dropped"] += len(retry)
+                    with open(self.spill_path, "a", encoding="utf-8") as out:
+                        for line in f:
+                            out.write(line)
+                    break
+                replayed += len(documents)
+
+        os.unlink(replay_path)
+        if replayed:
+            self.counters["replayed"] += replayed
+            logger.info(f"Log shipper replayed {replayed} spilled documents")
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> dict:
+        """큐 깊이, 전송/유실 카운터, 플러시 지연 시간 (최근 배치 기준)"""
+        latencies = sorted(self._latencies_ms)
+
+        def percentile(p: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2)
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "es_available": self.es_available,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "inflight": len(self._inflight),
+            "spill_bytes": self.spill_path.stat().st_size if self.spill_path.exists() else 0,
+            "flush_latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)},
+            "last_error": self.last_error,
+            **self.counters,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_log_shipper() -> LogShipper:
+    """설정 기반 로그 적재기 싱글톤"""
+    return LogShipper(
+        queue_size=settings.LOG_SHIPPER_QUEUE_SIZE,
+        batch_size=settings.LOG_SHIPPER_BATCH_SIZE,
+        flush_interval=settings.LOG_SHIPPER_FLUSH_INTERVAL_SECONDS,
+        max_retries=settings.LOG_SHIPPER_MAX_RETRIES,
+        overflow_policy=settings.LOG_SHIPPER_OVERFLOW_POLICY,
+        spill_path=settings.LOG_SHIPPER_SPILL_PATH,
+        spill_max_bytes=settings.LOG_SHIPPER_SPILL_MAX_BYTES
+    )
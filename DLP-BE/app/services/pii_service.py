@@ -1,8 +1,13 @@
 from app.ai.model_manager import get_pii_detector, get_policy_detector
+from app.core.config import settings
+from app.core.detection_cache import get_detection_cache, build_cache_key
 from app.schemas.pii import PIIDetectionResponse, DetectedEntity
 from app.services.pii_settings_service import PIISettingsService
+from app.services.policy_gate import get_policy_gate
 from app.db.session import get_db  # get_session -> get_db로 변경
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -40,69 +45,62 @@ class PIIDetectionService:
 
         1단계: NER 기반 PII 탐지 (설정 기반 필터링 포함)
         2단계: 정책 위반 맥락 탐지 (PII 없을 때만)
-        """
 
-        # ==================== 1단계: NER 기반 PII 탐지 ====================
-        logger.info("Stage 1: NER-based PII detection")
+        PII_CONCURRENT_STAGES=True면 두 단계를 동시에 시작하고,
+        필터링 후 PII가 남으면 진행 중인 2단계를 취소합니다 (응답 의미는 동일).
+        """
+        stage_timings: dict[str, float] = {}
 
         # 싱글톤 모델 인스턴스 가져오기
         pii_detector = get_pii_detector()
 
-        # AI 모델로 PII 탐지
-        detection_result = await pii_detector.detect_pii(text)
-
-        # PII 설정 조회 (캐시 사용)
-        settings_dict = await self._get_pii_settings()
-
-        # 설정 기반 필터링
-        filtered_entities = []
-        for entity in detection_result["entities"]:
-            model_type = entity["type"]
-
-            # 모델 라벨 → DB 라벨 변환
-            db_type = self.LABEL_MAPPING.get(model_type, model_type)
-
-            logger.debug(f"Model type: {model_type} → DB type: {db_type}")
-
-            # 해당 타입의 설정 확인 (DB 타입으로 조회)
-            setting = settings_dict.get(db_type)
-
-            # 설정이 없거나 비활성화된 경우 제외
-            if not setting or not setting.get("enabled", True):
-                logger.debug(f"Filtered out {model_type} (disabled)")
-                continue
+        # 탐지 결과 캐시 조회 (설정 필터링 이전의 모델 원본 출력)
+        cache = get_detection_cache()
+        cache_key = build_cache_key(text, self._model_version(pii_detector)) if cache else None
+        cached = await cache.get(cache_key) if cache else None
 
-            # confidence를 퍼센트로 변환 (0.0~1.0 → 0~100)
-            confidence_percent = entity["confidence"] * 100
-            threshold = setting.get("threshold", 0)
+        # 동시 실행 모드: 캐시된 정책 결과가 없으면 1단계와 함께 2단계 시작
+        policy_task = None
+        if settings.PII_CONCURRENT_STAGES and (cached is None or cached["policy"] is None):
+            policy_task = asyncio.create_task(self._run_policy_stage(text, pii_detector, stage_timings))
 
-            # threshold 미만인 경우 제외
-            if confidence_percent < threshold:
-                logger.debug(
-                    f"Filtered out {model_type} '{entity['value']}' "
-                    f"(confidence {confidence_percent:.1f}% < threshold {threshold}%)"
-                )
-                continue
-
-            # 필터 통과 (원래 모델 타입 유지)
-            filtered_entities.append(entity)
+        try:
+            # ==================== 1단계: NER 기반 PII 탐지 ====================
+            logger.info("Stage 1: NER-based PII detection")
+
+            if cached is not None:
+                logger.info("Detection cache hit")
+                raw_entities = cached["entities"]
+            else:
+                # AI 모델로 PII 탐지
+                stage_start = time.perf_counter()
+                detection_result = await pii_detector.detect_pii(text)
+                stage_timings["ner"] = (time.perf_counter() - stage_start) * 1000
+                raw_entities = detection_result["entities"]
+                cached = {"entities": raw_entities, "policy": None}
+                if cache:
+                    await cache.set(cache_key, cached)
+
+            # PII 설정 조회 (캐시 사용)
+            settings_dict = await self._get_pii_settings()
+        except BaseException:
+            if policy_task is not None:
+                policy_task.cancel()
+            raise
+
+        # 설정 기반 필터링 (캐시 히트 시에도 항상 현재 설정으로 재적용)
+        filtered_entities = self._filter_entities(raw_entities, settings_dict)
 
         # 필터링된 엔티티로 응답 구성
-        entities = [
-            DetectedEntity(
-                type=entity["type"],
-                value=entity["value"],
-                confidence=entity["confidence"],
-                token_count=entity["token_count"]
-            )
-            for entity in filtered_entities
-        ]
+        entities = self._to_detected_entities(filtered_entities)
 
         # has_pii는 필터링 후 결과 기준
         has_pii = len(entities) > 0
 
-        # PII가 탐지된 경우 → 정책 검사 스킵하고 즉시 반환
+        # PII가 탐지된 경우 → 정책 검사 스킵(또는 진행 중인 검사 취소)하고 즉시 반환
         if has_pii:
+            if policy_task is not None:
+                policy_task.cancel()
             logger.info(f"PII detected: {len(entities)} entities. Skipping policy check.")
             reason = self._generate_reason(has_pii, entities, None, None)
             details = self._generate_details(has_pii, entities, None, None)
@@ -114,20 +112,30 @@ class PIIDetectionService:
                 entities=entities,
                 policy_violation=False,
                 policy_judgment=None,
-                policy_confidence=None
+                policy_confidence=None,
+                stage_timings_ms=stage_timings
             )
 
         # ==================== 2단계: 정책 위반 탐지 ====================
         logger.info("Stage 2: Policy violation detection (no PII found)")
 
-        policy_detector = get_policy_detector()
-        policy_result = await policy_detector.detect_violation(text)
+        policy_result = cached["policy"]
+
+        if policy_result is None:
+            if policy_task is not None:
+                policy_result = await policy_task
+            else:
+                policy_result = await self._run_policy_stage(text, pii_detector, stage_timings)
+
+            # 게이트 판단과 추론 실패 시의 기본값(SAFE, 0.0)은 캐시하지 않음
+            if cache and not policy_result.get("gated") and policy_result["confidence"] > 0.0:
+                await cache.set(cache_key, {"entities": raw_entities, "policy": policy_result})
 
         policy_judgment = policy_result["judgment"]
         policy_confidence = policy_result["confidence"]
-        policy_violation = not policy_detector.is_safe(policy_judgment)
+        policy_violation = policy_judgment != "SAFE"
 
-        logger.info(f"Policy judgment: {policy_judgment} (confidence: {policy_confidence:.2%})")
+        logger.info(f"Policy judgment: {policy_judgment} (confidence: {policy_confidence})")
 
         # reason과 details 생성
         reason = self._generate_reason(has_pii, entities, policy_violation, policy_judgment)
@@ -140,9 +148,144 @@ class PIIDetectionService:
             entities=entities,
             policy_violation=policy_violation,
             policy_judgment=policy_judgment,
-            policy_confidence=policy_confidence
+            policy_confidence=policy_confidence,
+            stage_timings_ms=stage_timings
+        )
+
+    async def detect_entities(self, text: str) -> list[DetectedEntity]:
+        """
+        1단계(NER) 탐지 + 설정 기반 필터링만 수행 (정책 검사 없음)
+
+        파일 추출 텍스트처럼 페이지 단위로 나눠 검사하는 경우에 사용합니다.
+        """
+        pii_detector = get_pii_detector()
+
+        cache = get_detection_cache()
+        cache_key = build_cache_key(text, self._model_version(pii_detector)) if cache else None
+        cached = await cache.get(cache_key) if cache else None
+
+        if cached is not None:
+            raw_entities = cached["entities"]
+        else:
+            detection_result = await pii_detector.detect_pii(text)
+            raw_entities = detection_result["entities"]
+            if cache:
+                await cache.set(cache_key, {"entities": raw_entities, "policy": None})
+
+        settings_dict = await self._get_pii_settings()
+        return self._to_detected_entities(self._filter_entities(raw_entities, settings_dict))
+
+    @staticmethod
+    def _to_detected_entities(entities: list[dict]) -> list[DetectedEntity]:
+        """모델 출력 엔티티(dict) → 응답 스키마 변환"""
+        return [
+            DetectedEntity(
+                type=entity["type"],
+                value=entity["value"],
+                confidence=entity["confidence"],
+                token_count=entity["token_count"],
+                start=entity.get("start"),
+                end=entity.get("end")
+            )
+            for entity in entities
+        ]
+
+    async def _run_policy_stage(self, text: str, pii_detector, stage_timings: dict[str, float]) -> dict:
+        """
+        2단계 정책 위반 탐지 (1차 게이트 포함)
+
+        Returns:
+            dict: {"judgment", "confidence"} (게이트가 LLM을 생략한 경우 "gated": True)
+        """
+        # 1차 게이트: 명백히 무해한 텍스트는 LLM 검사 생략 (ENFORCE) 또는 비교 기록 (SHADOW)
+        gate = get_policy_gate()
+        gate_decision = None
+        if gate.enabled:
+            stage_start = time.perf_counter()
+            gate_decision = await gate.evaluate(text, pii_detector)
+            stage_timings["gate"] = (time.perf_counter() - stage_start) * 1000
+
+        if gate_decision is not None and gate.enforcing and not gate_decision["run_policy"]:
+            logger.info("Policy gate: benign text, skipping policy check")
+            gate.record(gate_decision, None)
+            score = gate_decision["score"]
+            return {
+                "judgment": "SAFE",
+                "confidence": 1.0 - score if score is not None else None,
+                "gated": True
+            }
+
+        stage_start = time.perf_counter()
+        policy_result = await get_policy_detector().detect_violation(text)
+        stage_timings["policy"] = (time.perf_counter() - stage_start) * 1000
+
+        if gate_decision is not None:
+            gate.record(gate_decision, policy_result["judgment"])
+
+        return policy_result
+
+    def _filter_entities(self, raw_entities: list[dict], settings_dict: dict[str, dict]) -> list[dict]:
+        """PII 설정(활성화 여부, 임계값) 기반 엔티티 필터링"""
+        filtered_entities = []
+        for entity in raw_entities:
+            model_type = entity["type"]
+
+            # 모델 라벨 → DB 라벨 변환
+            db_type = self.LABEL_MAPPING.get(model_type, model_type)
+
+            logger.debug(f"Model type: {model_type} → DB type: {db_type}")
+
+            # 해당 타입의 설정 확인 (DB 타입으로 조회)
+            setting = settings_dict.get(db_type)
+
+            # 설정이 없거나 비활성화된 경우 제외
+            if not setting or not setting.get("enabled", True):
+                logger.debug(f"Filtered out {model_type} (disabled)")
+                continue
+
+            # confidence를 퍼센트로 변환 (0.0~1.0 → 0~100)
+            confidence_percent = entity["confidence"] * 100
+            threshold = setting.get("threshold", 0)
+
+            # threshold 미만인 경우 제외
+            if confidence_percent < threshold:
+                logger.debug(
+                    f"Filtered out {model_type} '{entity['value']}' "
+                    f"(confidence {confidence_percent:.1f}% < threshold {threshold}%)"
+                )
+                continue
+
+            # 필터 통과 (원래 모델 타입 유지)
+            filtered_entities.append(entity)
+
+        return filtered_entities
+
+    def build_audit_response(self, entities: list[DetectedEntity]) -> PIIDetectionResponse:
+        """프록시 자체 판정(정형 PII) 결과를 탐지 응답 형태로 변환 (감사 로그 저장용)"""
+        return PIIDetectionResponse(
+            has_pii=True,
+            reason=self._generate_reason(True, entities, None, None),
+            details=self._generate_details(True, entities, None, None),
+            entities=entities,
+            policy_violation=False
+        )
+
+    def build_file_response(self, entities: list[DetectedEntity]) -> PIIDetectionResponse:
+        """파일 추출 텍스트 탐지 결과를 탐지 응답 형태로 변환 (정책 검사 없음, 로그 저장용)"""
+        has_pii = len(entities) > 0
+        return PIIDetectionResponse(
+            has_pii=has_pii,
+            reason=self._generate_reason(has_pii, entities, False, None),
+            details=self._generate_details(has_pii, entities, False, None),
+            entities=entities,
+            policy_violation=False
         )
 
+    @staticmethod
+    def _model_version(pii_detector) -> str:
+        """캐시 키에 포함할 모델 버전 (모델 변경 시 자동으로 다른 키 사용)"""
+        return f"{pii_detector.model_name}|{settings.MODEL_MODE}|{settings.POLICY_ADAPTER_NAME}"
+
     def _generate_reason(
         self,
         has_pii: bool,
@@ -196,6 +339,16 @@ class PIIDetectionService:
         # 모두 통과
         return "개인정보 및 정책 위반이 탐지되지 않았습니다"
 
+    async def get_enabled_types(self) -> list[str]:
+        """
+        활성화된 PII 타입 목록 (프록시 정규식 빠른 경로 필터용)
+
+        정규식 확정 탐지는 confidence 1.0(100%)이라 임계값과 무관하게 통과하므로 활성화 여부만 봅니다.
+        설정이 없는 타입은 _filter_entities와 같이 비활성으로 취급합니다.
+        """
+        settings_dict = await self._get_pii_settings()
+        return sorted(entity_type for entity_type, setting in settings_dict.items() if setting.get("enabled", True))
+
     async def _get_pii_settings(self) -> dict[str, dict]:
         """
         PII 설정 조회 (캐시 활용)
@@ -0,0 +1,206 @@
+"""
+정책 탐지 1차 게이트
+키워드/정규식 사전과 RoBERTa 임베딩 기반 선형 모델로
+EXAONE 정책 탐지(2단계)가 필요한 텍스트인지 빠르게 판단
+"""
+from functools import lru_cache
+from pathlib import Path
+import asyncio
+import json
+import logging
+import re
+
+import torch
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# POLICY_GATE_MODE 값
+GATE_OFF = "OFF"          # 게이트 미사용 (항상 LLM 실행)
+GATE_SHADOW = "SHADOW"    # 항상 LLM 실행, 게이트 판단과 LLM 판단을 비교 로그로 기록
+GATE_ENFORCE = "ENFORCE"  # 게이트가 통과시킨 텍스트만 LLM 실행
+
+# 정책 카테고리별 키워드 사전 (하나라도 매칭되면 LLM 검사)
+POLICY_LEXICONS: dict[str, list[str]] = {
+    "VIOLATION_PRIVACY_CITIZEN": [
+        r"주민\s*(등록)?\s*번호", r"민원인", r"신고인", r"제보자", r"수급자", r"피해자",
+        r"(시민|국민|주민|민원인)\s*(의\s*)?(개인\s*정보|신상|인적\s*사항|연락처|주소)",
+        r"신상\s*정보", r"인적\s*사항", r"가족\s*관계", r"병력|진료\s*기록|전과",
+    ],
+    "VIOLATION_CLASSIFIED": [
+        r"기밀", r"대외비", r"비밀\s*(문서|등급|취급)", r"[123]급\s*비밀", r"보안\s*(등급|문서|사항)",
+        r"비공개\s*(문서|자료|정보)", r"군사\s*(작전|시설|정보)", r"내부\s*(문서|자료)\s*(유출|공개)",
+    ],
+    "VIOLATION_HR": [
+        r"인사\s*(발령|평가|고과|기록|카드|위원회)", r"징계", r"승진\s*(대상|심사|명단)",
+        r"근무\s*평정", r"채용\s*(내정|청탁|심사)", r"해고|퇴직\s*권고|직위\s*해제", r"감사\s*결과",
+    ],
+    "VIOLATION_SALARY": [
+        r"연봉", r"급여", r"월급", r"보수\s*(표|액|명세)", r"성과\s*(급|상여)", r"상여금",
+        r"임금\s*(명세|대장)", r"수당\s*(지급|내역)", r"호봉",
+    ],
+    "VIOLATION_DELIBERATION": [
+        r"심의\s*(중|내용|안건|결과)", r"의결\s*(전|안건|내용)", r"회의록", r"국무\s*회의",
+        r"간부\s*회의", r"내부\s*검토", r"결재\s*(전|중|문서)", r"정책\s*(초안|검토안)", r"미확정",
+    ],
+}
+
+
+class PolicyGate:
+    """
+    EXAONE 정책 탐지 전 1차 게이트
+
+    - 키워드 사전 매칭 시 항상 LLM 검사
+    - 선형 모델 가중치가 있으면 recall 목표에 맞는 임계값 이상일 때 LLM 검사
+    - 선형 모델이 없으면 키워드 사전만으로 판단 (SHADOW 비교 전용, ENFORCE는 SHADOW로 전환)
+    """
+
+    def __init__(
+        self,
+        mode: str = GATE_SHADOW,
+        weights_path: str = "",
+        recall_target: float = 0.99
+    ):
+        """
+        Args:
+            mode: OFF | SHADOW | ENFORCE
+            weights_path: 선형 모델 가중치 JSON 경로 (train_policy_gate.py 출력)
+            recall_target: 선형 모델 임계값 선택 기준 recall (검증셋 기준)
+        """
+        self.mode = mode.upper()
+        self.recall_target = recall_target
+        self.patterns = {
+            category: re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+            for category, patterns in POLICY_LEXICONS.items()
+        }
+
+        self.weights: torch.Tensor | None = None
+        self.bias = 0.0
+        self.threshold: float | None = None
+        if weights_path:
+            self._load_linear_model(weights_path)
+        elif self.mode == GATE_ENFORCE:
+            # 키워드 사전만으로는 recall 보장이 없으므로 LLM을 건너뛰지 않음
+            logger.error("Policy gate ENFORCE requires POLICY_GATE_WEIGHTS_PATH, falling back to SHADOW")
+            self.mode = GATE_SHADOW
+
+        # 섀도 모드 비교 통계
+        self.total = 0
+        self.would_skip = 0
+        self.skipped = 0
+        self.missed_violations = 0
+
+    def _load_linear_model(self, weights_path: str) -> None:
+        """선형 모델 가중치와 recall 목표별 임계값 로드"""
+        data = json.loads(Path(weights_path).read_text(encoding="utf-8"))
+        self.weights = torch.tensor(data["weights"], dtype=torch.float32)
+        self.bias = float(data["bias"])
+
+        # recall 목표 이상을 만족하는 임계값 중 가장 높은 값 (가장 많이 건너뜀)
+        thresholds = {float(recall): float(threshold) for recall, threshold in data["thresholds"].items()}
+        eligible = [thresholds[recall] for recall in thresholds if recall >= self.recall_target]
+        self.threshold = max(eligible) if eligible else min(thresholds.values())
+
+        logger.info(
+            f"Loaded policy gate linear model: {weights_path} "
+            f"(recall target {self.recall_target}, threshold {self.threshold:.4f})"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in (GATE_SHADOW, GATE_ENFORCE)
+
+    @property
+    def enforcing(self) -> bool:
+        return self.mode == GATE_ENFORCE
+
+    def match_lexicon(self, text: str) -> str | None:
+        """키워드 사전에 매칭된 첫 카테고리 (없으면 None)"""
+        for category, pattern in self.patterns.items():
+            if pattern.search(text):
+                return category
+        return None
+
+    async def evaluate(self, text: str, pii_detector) -> dict:
+        """
+        LLM 정책 검사가 필요한지 판단
+
+        Args:
+            text: 분석할 텍스트
+            pii_detector: 임베딩 계산용 RoBERTa PII 탐지 모델
+
+        Returns:
+            dict: {
+                "run_policy": bool,
+                "reason": "lexicon" | "linear" | "benign",
+                "category": 매칭된 카테고리 또는 None,
+                "score": 선형 모델 점수 또는 None
+            }
+        """
+        category = self.match_lexicon(text)
+        if category is not None:
+            return {"run_policy": True, "reason": "lexicon", "category": category, "score": None}
+
+        if self.weights is None:
+            return {"run_policy": False, "reason": "benign", "category": None, "score": None}
+
+        embedding = await asyncio.to_thread(pii_detector.encode_pooled, [text])
+        score = float(torch.sigmoid(embedding[0] @ self.weights + self.bias))
+        run_policy = score >= self.threshold
+        return {
+            "run_policy": run_policy,
+            "reason": "linear" if run_policy else "benign",
+            "category": None,
+            "score": score
+        }
+
+    def record(self, decision: dict, policy_judgment: str | None) -> None:
+        """
+        게이트 판단 기록 (섀도 모드에서는 LLM 판단과 비교)
+
+        Args:
+            decision: evaluate() 결과
+            policy_judgment: LLM 판단 (게이트가 건너뛴 경우 None)
+        """
+        self.total += 1
+        if decision["run_policy"]:
+            return
+
+        if policy_judgment is None:
+            self.skipped += 1
+            return
+
+        self.would_skip += 1
+        if policy_judgment != "SAFE":
+            # 게이트가 건너뛰었다면 놓쳤을 위반
+            self.missed_violations += 1
+            logger.warning(
+                f"Policy gate shadow miss: gate=benign (score={decision['score']}) "
+                f"llm={policy_judgment}"
+            )
+        else:
+            logger.info(f"Policy gate shadow agree: gate=benign (score={decision['score']}) llm=SAFE")
+
+    def get_stats(self) -> dict:
+        """게이트 통계 (섀도 모드 recall 검증용)"""
+        return {
+            "mode": self.mode,
+            "linear_model": self.weights is not None,
+            "recall_target": self.recall_target,
+            "threshold": self.threshold,
+            "total": self.total,
+            "skipped": self.skipped,
+            "shadow_would_skip": self.would_skip,
+            "shadow_missed_violations": self.missed_violations,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_policy_gate() -> PolicyGate:
+    """설정 기반 정책 게이트 싱글톤"""
+    return PolicyGate(
+        mode=settings.POLICY_GATE_MODE,
+        weights_path=settings.POLICY_GATE_WEIGHTS_PATH,
+        recall_target=settings.POLICY_GATE_RECALL_TARGET
+    )
@@ -0,0 +1,228 @@
+"""
+파일 페이지 단위 텍스트 추출 (프로세스 풀 워커에서 실행)
+
+PDF 텍스트 레이어, 이미지 OCR(Tesseract), DOCX 본문, 일반 텍스트를 페이지 단위로 꺼냅니다.
+워커 프로세스가 spawn으로 시작되므로 이 모듈은 torch/transformers 등 무거운 모듈을 import하지 않고,
+파일 형식별 라이브러리(pypdf, python-docx, pytesseract, Pillow)도 필요할 때만 가져옵니다.
+"""
+from collections import OrderedDict
+import codecs
+import io
+import os
+
+# 파일 종류
+KIND_PDF = "pdf"
+KIND_IMAGE = "image"
+KIND_DOCX = "docx"
+KIND_TEXT = "text"
+
+# 텍스트/DOCX는 페이지 개념이 없으므로 일정 크기로 나눈 구간을 한 페이지로 취급
+TEXT_PAGE_BYTES = 64 * 1024
+# 텍스트 페이지 경계는 이 범위 안의 마지막 줄바꿈 뒤로, 줄바꿈이 없으면 UTF-8 문자 경계로 당김
+TEXT_LINE_SEARCH_BYTES = 4 * 1024
+# 텍스트 페이지 끝에 덧붙이는 다음 페이지 앞부분 (경계에 걸친 엔티티를 한 페이지에서 온전히 탐지)
+# 탐지기 슬라이딩 윈도우 겹침(PII_WINDOW_STRIDE=128토큰)에 들어가는 엔티티보다 길게 잡음
+TEXT_PAGE_OVERLAP_CHARS = 1024
+DOCX_PARAGRAPHS_PER_PAGE = 100
+
+# 텍스트 레이어가 이보다 짧으면 스캔 문서로 보고 페이지 이미지를 OCR
+PDF_MIN_TEXT_CHARS = 20
+
+_EXTENSION_KINDS = {
+    ".pdf": KIND_PDF,
+    ".docx": KIND_DOCX,
+    ".png": KIND_IMAGE, ".jpg": KIND_IMAGE, ".jpeg": KIND_IMAGE, ".gif": KIND_IMAGE,
+    ".bmp": KIND_IMAGE, ".tif": KIND_IMAGE, ".tiff": KIND_IMAGE, ".webp": KIND_IMAGE,
+    ".txt": KIND_TEXT, ".csv": KIND_TEXT, ".md": KIND_TEXT, ".json": KIND_TEXT,
+    ".log": KIND_TEXT, ".xml": KIND_TEXT, ".html": KIND_TEXT, ".htm": KIND_TEXT,
+}
+
+_CONTENT_TYPE_KINDS = {
+    "application/pdf": KIND_PDF,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": KIND_DOCX,
+    "application/json": KIND_TEXT,
+    "application/xml": KIND_TEXT,
+}
+
+# 워커 프로세스별로 최근 연 문서 유지 (같은 파일의 다음 페이지 요청 시 재파싱 방지)
+_DOCUMENT_CACHE_SIZE = 4
+_documents: OrderedDict[tuple[str, str], object] = OrderedDict()
+
+
+class FileExtractionError(Exception):
+    """추출 불가 (지원하지 않는 형식, 선택 의존성 미설치, 손상된 파일)"""
+
+
+def detect_kind(filename: str | None, content_type: str | None) -> str | None:
+    """파일명 확장자 → Content-Type 순서로 파일 종류 판별 (미지원이면 None)"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in _EXTENSION_KINDS:
+        return _EXTENSION_KINDS[extension]
+
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in _CONTENT_TYPE_KINDS:
+        return _CONTENT_TYPE_KINDS[content_type]
+    if content_type.startswith("image/"):
+        return KIND_IMAGE
+    if content_type.startswith("text/"):
+        return KIND_TEXT
+    return None
+
+
+def count_pages(path: str, kind: str) -> int:
+    """파일의 페이지(처리 단위) 수"""
+    if kind == KIND_TEXT:
+        size = os.path.getsize(path)
+        return max(1, -(-size // TEXT_PAGE_BYTES))
+    if kind == KIND_PDF:
+        return len(_open_document(path, kind).pages)
+    if kind == KIND_IMAGE:
+        return getattr(_open_document(path, kind), "n_frames", 1)
+    if kind == KIND_DOCX:
+        paragraphs = _docx_paragraphs(_open_document(path, kind))
+        return max(1, -(-len(paragraphs) // DOCX_PARAGRAPHS_PER_PAGE))
+    raise FileExtractionError(f"Unsupported file kind: {kind}")
+
+
+def extract_page(path: str, kind: str, index: int, ocr_enabled: bool, ocr_lang: str) -> tuple[str, int]:
+    """
+    페이지 하나의 텍스트 추출
+
+    Args:
+        path: 임시 파일 경로
+        kind: detect_kind() 결과
+        index: 0부터 시작하는 페이지 번호
+        ocr_enabled: 이미지/스캔 페이지 OCR 여부
+        ocr_lang: Tesseract 언어 (예: "kor+eng")
+
+    Returns:
+        (탐지할 텍스트, 이 페이지에 속한 앞부분 길이)
+        텍스트 파일은 다음 페이지 앞부분(TEXT_PAGE_OVERLAP_CHARS)이 뒤에 붙으므로,
+        그 안에서 시작하는 엔티티는 다음 페이지에서 다시 탐지됩니다.
+    """
+    if kind == KIND_TEXT:
+        return _extract_text_page(path, index)
+
+    text = _extract_page_text(path, kind, index, ocr_enabled, ocr_lang)
+    return text, len(text)
+
+
+def _extract_page_text(path: str, kind: str, index: int, ocr_enabled: bool, ocr_lang: str) -> str:
+    """PDF/이미지/DOCX 페이지 텍스트"""
+    if kind == KIND_PDF:
+        page = _open_document(path, kind).pages[index]
+        text = page.extract_text() or ""
+        if ocr_enabled and len(text.strip()) < PDF_MIN_TEXT_CHARS:
+            # 텍스트 레이어가 없는 스캔 페이지: 페이지에 포함된 이미지를 OCR
+            ocr_texts = [_ocr(_load_image(image.data), ocr_lang) for image in page.images]
+            text = "\n".join(t for t in [text, *ocr_texts] if t.strip())
+        return text
+
+    if kind == KIND_IMAGE:
+        if not ocr_enabled:
+            return ""
+        image = _open_document(path, kind)
+        image.seek(index)
+        return _ocr(image, ocr_lang)
+
+    if kind == KIND_DOCX:
+        paragraphs = _docx_paragraphs(_open_document(path, kind))
+        start = index * DOCX_PARAGRAPHS_PER_PAGE
+        return "\n".join(paragraphs[start:start + DOCX_PARAGRAPHS_PER_PAGE])
+
+    raise FileExtractionError(f"Unsupported file kind: {kind}")
+
+
+def _extract_text_page(path: str, index: int) -> tuple[str, int]:
+    """텍스트 파일 페이지 (줄/문자 경계로 자른 구간 + 다음 페이지 앞부분)"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = _text_page_boundary(f, size, index)
+        end = _text_page_boundary(f, size, index + 1)
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8", errors="replace")
+
+        # 끝에서 잘린 멀티바이트 문자는 버리도록 증분 디코더로 읽음 (UTF-8은 문자당 최대 4바이트)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        overlap = decoder.decode(f.read(TEXT_PAGE_OVERLAP_CHARS * 4))[:TEXT_PAGE_OVERLAP_CHARS]
+    return text + overlap, len(text)
+
+
+def _text_page_boundary(f, size: int, index: int) -> int:
+    """index번째 텍스트 페이지 시작 바이트 (직전 줄바꿈 뒤, 없으면 UTF-8 문자 시작)"""
+    position = index * TEXT_PAGE_BYTES
+    if position <= 0 or position >= size:
+        return min(max(position, 0), size)
+
+    search_start = max(0, position - TEXT_LINE_SEARCH_BYTES)
+    f.seek(search_start)
+    window = f.read(position - search_start + 1)
+    newline = window.rfind(b"\n", 0, position - search_start)
+    if newline != -1:
+        return search_start + newline + 1
+
+    # 연속 바이트(0b10xxxxxx)에서 시작하지 않도록 앞으로 당김
+    offset = position - search_start
+    while offset > 0 and position - (search_start + offset) < 3 and window[offset] & 0xC0 == 0x80:
+        offset -= 1
+    return search_start + offset
+
+
+def _open_document(path: str, kind: str):
+    """문서 열기 (워커 프로세스 로컬 LRU 캐시)"""
+    key = (path, kind)
+    document = _documents.get(key)
+    if document is not None:
+        _documents.move_to_end(key)
+        return document
+
+    try:
+        if kind == KIND_PDF:
+            from pypdf import PdfReader
+            document = PdfReader(path)
+        elif kind == KIND_IMAGE:
+            from PIL import Image
+            document = Image.open(path)
+        elif kind == KIND_DOCX:
+            import docx
+            document = docx.Document(path)
+        else:
+            raise FileExtractionError(f"Unsupported file kind: {kind}")
+    except ImportError as e:
+        raise FileExtractionError(f"Missing optional dependency for {kind} files (install '.[files]'): {e}")
+
+    _documents[key] = document
+    while len(_documents) > _DOCUMENT_CACHE_SIZE:
+        _, evicted = _documents.popitem(last=False)
+        close = getattr(evicted, "close", None)
+        if close is not None:
+            close()
+    return document
+
+
+def _docx_paragraphs(document) -> list[str]:
+    """DOCX 본문 문단 + 표 셀 텍스트"""
+    paragraphs = [p.text for p in document.paragraphs if p.text.strip()]
+    for table in document.tables:
+        for row in table.rows:
+            cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+            if cells:
+                paragraphs.append(" | ".join(cells))
+    return paragraphs
+
+
+def _load_image(data: bytes):
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise FileExtractionError(f"Missing optional dependency for OCR (install '.[files]'): {e}")
+    return Image.open(io.BytesIO(data))
+
+
+def _ocr(image, lang: str) -> str:
+    """Tesseract OCR (로컬 엔진, 외부 전송 없음)"""
+    try:
+        import pytesseract
+    except ImportError as e:
+        raise FileExtractionError(f"Missing optional dependency for OCR (install '.[files]'): {e}")
+    return pytesseract.image_to_string(image, lang=lang)
@@ -0,0 +1,85 @@
+"""
+PII 추론 백엔드 지연시간 비교 리포트
+
+PyTorch(LOCAL) / ONNX / ONNX_INT8 백엔드의 지연시간과 PyTorch 대비 라벨 일치율을 측정합니다.
+ONNX 모델은 첫 실행 시 settings.ONNX_CACHE_DIR 에 내보내고 이후 재사용합니다.
+
+사용법:
+    python benchmark_inference_backends.py --runs 20
+"""
+import argparse
+import statistics
+import time
+
+from app.ai.inference_backend import create_inference_backend
+from app.ai.pii_detector import RobertaKoreanPIIDetector
+
+SHORT_TEXT = "저는 홍길동이고, 전화번호는 010-1234-5678입니다. 이메일은 hong@example.com입니다."
+LONG_TEXT = "오늘 날씨가 정말 좋습니다. 산책하기 좋은 날씨네요. " * 40 + SHORT_TEXT
+
+MODES = ["LOCAL", "ONNX", "ONNX_INT8"]
+
+
+def measure(detector, texts: list[str], runs: int) -> tuple[list[float], list]:
+    """워밍업 후 runs회 추론 시간(ms) 측정"""
+    predictions = detector._predict_batch_sync(texts)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        detector._predict_batch_sync(texts)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, predictions
+
+
+def label_agreement(expected: list, actual: list) -> float:
+    """PII 토큰(O 제외) 라벨 일치율 (원문 위치 기준)"""
+    matched = total = 0
+    for exp, act in zip(expected, actual):
+        expected_labels = dict(zip(zip(exp["starts"], exp["ends"]), exp["label_ids"]))
+        actual_labels = dict(zip(zip(act["starts"], act["ends"]), act["label_ids"]))
+        spans = expected_labels.keys() | actual_labels.keys()
+        matched += sum(expected_labels.get(span) == actual_labels.get(span) for span in spans)
+        total += len(spans)
+    return matched / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PII inference backend latency report")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    print("Loading PII model...")
+    detector = RobertaKoreanPIIDetector()
+
+    workloads = {
+        "short": [SHORT_TEXT] * args.batch_size,
+        "long": [LONG_TEXT] * args.batch_size,
+    }
+
+    baseline = {}
+    rows = []
+    for mode in MODES:
+        detector.backend = create_inference_backend(detector.model, detector.model_name, mode=mode)
+        for workload, texts in workloads.items():
+            timings, predictions = measure(detector, texts, args.runs)
+            if mode == "LOCAL":
+                baseline[workload] = (statistics.median(timings), predictions)
+
+            base_p50, base_predictions = baseline[workload]
+            p50 = statistics.median(timings)
+            p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+            rows.append((
+                mode, workload, p50, p95, base_p50 / p50,
+                label_agreement(base_predictions, predictions)
+            ))
+
+    print()
+    print(f"| backend | input | p50 (ms) | p95 (ms) | speedup | label agreement |")
+    print(f"|---|---|---|---|---|---|")
+    for mode, workload, p50, p95, speedup, agreement in rows:
+        print(f"| {mode} | {workload} | {p50:.1f} | {p95:.1f} | {speedup:.2f}x | {agreement:.2%} |")
+
+
+if __name__ == "__main__":
+    main()
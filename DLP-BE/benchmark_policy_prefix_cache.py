@@ -0,0 +1,81 @@
+"""
+정책 탐지 prefix KV cache 효과 측정
+
+고정 시스템 프롬프트 prefix를 매 요청 prefill하는 경우와
+로드 시 계산한 prefix KV cache를 재사용하는 경우의 prefill 토큰 수와 지연시간을 비교합니다.
+
+사용법:
+    python benchmark_policy_prefix_cache.py --runs 10
+"""
+import argparse
+import statistics
+import time
+
+from app.ai.policy_detector import PolicyViolationDetector
+
+TEXTS = [
+    "오늘 점심 메뉴 추천해줘",
+    "김철수 과장의 올해 연봉 인상률을 알려줘",
+    "다음 달 인사 발령 대상자 명단을 정리해줘",
+    "국무회의 안건 심의 내용을 요약해줘",
+]
+
+
+def measure(detector: PolicyViolationDetector, runs: int) -> tuple[list[float], list]:
+    """워밍업 후 runs회 분류 시간(ms) 측정"""
+    judgments = [detector._detect_violation_sync(text)["judgment"] for text in TEXTS]
+    timings = []
+    for _ in range(runs):
+        for text in TEXTS:
+            start = time.perf_counter()
+            detector._detect_violation_sync(text)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings, judgments
+
+
+def prefill_tokens(detector: PolicyViolationDetector, use_prefix: bool) -> float:
+    """요청당 평균 prefill 토큰 수"""
+    if use_prefix:
+        counts = [len(detector._encode_suffix(text)) for text in TEXTS]
+    else:
+        counts = [detector._build_input_ids(text).shape[1] for text in TEXTS]
+    return statistics.mean(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Policy prefix KV cache benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print("Loading policy model...")
+    detector = PolicyViolationDetector()
+    if detector.prefix_past is None:
+        print("Prefix KV cache is disabled (POLICY_PREFIX_CACHE_ENABLED=False or unstable tokenization)")
+        return
+
+    prefix_past = detector.prefix_past
+    rows = []
+    for label, use_prefix in [("full prefill", False), ("prefix cache", True)]:
+        detector.prefix_past = prefix_past if use_prefix else None
+        timings, judgments = measure(detector, args.runs)
+        rows.append((label, prefill_tokens(detector, use_prefix), timings, judgments))
+    detector.prefix_past = prefix_past
+
+    base_p50 = statistics.median(rows[0][2])
+    base_judgments = rows[0][3]
+
+    print()
+    print(f"prefix tokens: {detector.prefix_ids.shape[1]}")
+    print(f"| mode | prefill tokens/request | p50 (ms) | p95 (ms) | speedup | same judgments |")
+    print(f"|---|---|---|---|---|---|")
+    for label, tokens, timings, judgments in rows:
+        p50 = statistics.median(timings)
+        p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+        print(
+            f"| {label} | {tokens:.1f} | {p50:.1f} | {p95:.1f} | "
+            f"{base_p50 / p50:.2f}x | {judgments == base_judgments} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+대시보드 통계 집계 벤치마크 (_source 스크립트 vs nested doc values)
+
+로컬 Elasticsearch에 합성 로그 문서(기본 100만 건)를 적재한 뒤,
+타입별 평균 신뢰도를 기존 Painless 스크립트(params._source 순회)로 계산하는 집계와
+ElasticsearchRepository.aggregate_statistics의 nested 집계 지연시간을 비교합니다.
+shard request cache는 벤치마크 인덱스에서 끄고 측정합니다.
+
+사용법:
+    python benchmark_statistics_aggregation.py --docs 1000000 --runs 10
+    python benchmark_statistics_aggregation.py --skip-load --runs 10   # 이미 적재된 인덱스 재사용
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.core.elasticsearch import ElasticsearchClient
+from app.repository.elasticsearch_repo import ElasticsearchRepository
+
+PII_TYPES = ["PHONE_NUM", "EMAIL", "PERSON", "ADDRESS", "RRN", "CARD_NUM", "ACCOUNT_NUM", "ORG"]
+FILLER = "이 문장은 통계 집계 벤치마크를 위한 합성 로그 본문입니다. "
+
+# 변경 전 집계 (비교용, 문서마다 _source를 읽어 스크립트로 계산)
+LEGACY_AGGS = {
+    "top_pii_types": {
+        "terms": {"field": "entity_types", "size": 10},
+        "aggs": {
+            "avg_confidence": {
+                "avg": {
+                    "script": {
+                        "source": """
+                            double sum = 0;
+                            int count = 0;
+                            for (entity in params._source.detected_entities) {
+                                if (entity.type == params.pii_type) {
+                                    sum += entity.confidence;
+                                    count++;
+                                }
+                            }
+                            return count > 0 ? sum / count : 0;
+                        """,
+                        "params": {"pii_type": "dummy"}
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+def make_document(rng: random.Random, now: datetime, text_chars: int) -> dict:
+    """합성 탐지 로그 1건 (엔티티 0~5개)"""
+    entities = []
+    for _ in range(rng.choice([0, 0, 1, 1, 2, 3, 5])):
+        start = rng.randrange(text_chars)
+        entities.append({
+            "type": rng.choice(PII_TYPES),
+            "value": f"value-{rng.randrange(10 ** 6)}",
+            "confidence": round(rng.uniform(0.5, 1.0), 4),
+            "token_count": rng.randrange(1, 6),
+            "start": start,
+            "end": start + 10
+        })
+    entity_types = sorted({entity["type"] for entity in entities})
+    return {
+        "timestamp": (now - timedelta(seconds=rng.randrange(7 * 24 * 3600))).isoformat(),
+        "client_ip": f"10.{rng.randrange(4)}.{rng.randrange(256)}.{rng.randrange(256)}",
+        "original_text": (FILLER * (text_chars // len(FILLER) + 1))[:text_chars],
+        "text_length": text_chars,
+        "has_pii": bool(entities),
+        "detected_entities": entities,
+        "entity_types": entity_types,
+        "entity_count": len(entities),
+        "blocked": bool(entities),
+        "reason": "benchmark",
+        "response_time_ms": round(rng.uniform(20, 400), 2)
+    }
+
+
+async def load(client, repo: ElasticsearchRepository, docs: int, text_chars: int, chunk: int) -> None:
+    """벤치마크 인덱스 재생성 후 _bulk로 합성 문서 적재"""
+    await client.indices.delete(index=repo.index_name, ignore_unavailable=True)
+    await repo.create_index_if_not_exists()
+    await client.indices.put_settings(
+        index=repo.index_name,
+        settings={"index": {"refresh_interval": "-1", "requests.cache.enable": False}}
+    )
+
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    start_time = time.perf_counter()
+    for offset in range(0, docs, chunk):
+        batch = [make_document(rng, now, text_chars) for _ in range(min(chunk, docs - offset))]
+        failed = await repo.bulk_index(batch)
+        if failed:
+            raise RuntimeError(f"{len(failed)} documents failed to index (first status {failed[0][0]})")
+        print(f"\rindexed {offset + len(batch):,}/{docs:,}", end="", flush=True)
+
+    await client.indices.put_settings(index=repo.index_name, settings={"index": {"refresh_interval": "1s"}})
+    await client.indices.refresh(index=repo.index_name)
+    await client.indices.forcemerge(index=repo.index_name, max_num_segments=1)
+    print(f"\nloaded in {time.perf_counter() - start_time:.1f}s")
+
+
+async def measure(call, runs: int) -> list[float]:
+    """워밍업 1회 후 runs회 지연시간(ms) 측정"""
+    await call()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def run(args) -> None:
+    # 적재/기존 스크립트 집계는 기본 요청 제한 시간(30초)을 넘을 수 있음
+    client = (await ElasticsearchClient.get_client()).options(request_timeout=600)
+    repo = ElasticsearchRepository(client)
+    repo.index_name = args.index
+
+    try:
+        if not args.skip_load:
+            await load(client, repo, args.docs, args.text_chars, args.chunk)
+
+        start_date = datetime.utcnow() - timedelta(days=8)
+        end_date = datetime.utcnow() + timedelta(hours=1)
+        query = {"range": {"timestamp": {"gte": start_date.isoformat(), "lte": end_date.isoformat()}}}
+
+        async def legacy():
+            await client.search(index=repo.index_name, query=query, aggs=LEGACY_AGGS, size=0, request_cache=False)
+
+        async def nested():
+            await repo.aggregate_statistics(start_date, end_date)
+
+        count = (await client.count(index=repo.index_name))["count"]
+        print(f"\n{count:,} documents in {repo.index_name}\n")
+        print("| aggregation | p50 (ms) | p95 (ms) | max (ms) |")
+        print("|---|---|---|---|")
+        for label, call in [("painless _source script (before)", legacy), ("nested doc values (after)", nested)]:
+            timings = await measure(call, args.runs)
+            p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else timings[0]
+            print(f"| {label} | {statistics.median(timings):.1f} | {p95:.1f} | {max(timings):.1f} |")
+    finally:
+        await ElasticsearchClient.close_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics aggregation benchmark")
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--text-chars", type=int, default=1000, help="original_text 길이 (_source 크기)")
+    parser.add_argument("--chunk", type=int, default=5000, help="_bulk 요청당 문서 수")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--index", default="pii-detection-benchmark")
+    parser.add_argument("--skip-load", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,9 +16,13 @@ async def test():
     print(f"\n결과:")
     print(f"  has_pii: {result['has_pii']}")
     print(f"  entities: {result['entities']}")
-    print(f"\n원시 예측 (처음 10개):")
-    for pred in result['raw_predictions'][:10]:
-        print(f"    {pred}")
+    print(f"\n원시 예측 (O 제외, 처음 10개):")
+    raw = result['raw_predictions']
+    for label_id, confidence, start, end in list(zip(
+        raw['label_ids'], raw['confidences'], raw['starts'], raw['ends']
+    ))[:10]:
+        label = detector.model.config.id2label[label_id]
+        print(f"    {text[start:end]!r} {label} ({confidence:.3f})")
 
 if __name__ == "__main__":
     asyncio.run(test())
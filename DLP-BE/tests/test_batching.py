@@ -0,0 +1,63 @@
+"""
+마이크로 배칭 스케줄러 테스트
+"""
+import asyncio
+import pytest
+from app.ai.batching import MicroBatchScheduler
+
+
+class TestMicroBatchScheduler:
+    """MicroBatchScheduler 단위 테스트 (모델 불필요)"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_batched(self):
+        """동시 요청이 하나의 배치로 묶이고 결과가 순서대로 분배되는지 확인"""
+        calls = []
+
+        def batch_fn(texts):
+            calls.append(list(texts))
+            return [text.upper() for text in texts]
+
+        scheduler = MicroBatchScheduler(batch_fn, max_batch_size=8, max_wait_ms=20)
+        texts = [f"text-{i}" for i in range(5)]
+
+        results = await asyncio.gather(*(scheduler.submit(text) for text in texts))
+
+        assert results == [text.upper() for text in texts]
+        assert len(calls) == 1
+        assert scheduler.get_stats()["batch_size_histogram"] == {5: 1}
+        scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_and_length_buckets(self):
+        """배치 크기 상한과 길이 버킷 분리 확인"""
+        calls = []
+
+        def batch_fn(texts):
+            calls.append(list(texts))
+            return texts
+
+        scheduler = MicroBatchScheduler(batch_fn, max_batch_size=2, max_wait_ms=5, bucket_width=10)
+        texts = ["a", "b", "c", "x" * 50]
+
+        results = await asyncio.gather(*(scheduler.submit(text) for text in texts))
+
+        assert results == texts
+        assert all(len(batch) <= 2 for batch in calls)
+        # 긴 텍스트는 짧은 텍스트와 같은 배치에 들어가지 않음
+        assert ["x" * 50] in calls
+        scheduler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_batch_error_propagates(self):
+        """배치 실패 시 모든 대기 요청에 예외 전달"""
+        def batch_fn(texts):
+            raise RuntimeError("boom")
+
+        scheduler = MicroBatchScheduler(batch_fn, max_wait_ms=1)
+
+        with pytest.raises(RuntimeError):
+            await scheduler.submit("text")
+
+        assert scheduler.get_stats()["queue_depth"] == 0
+        scheduler.shutdown()
@@ -0,0 +1,54 @@
+"""
+탐지 결과 캐시 테스트
+"""
+import pytest
+from app.core.detection_cache import InMemoryDetectionCache, build_cache_key
+
+
+class TestDetectionCacheKey:
+    """캐시 키 생성 테스트"""
+
+    def test_key_is_exact_text(self):
+        """앞뒤 공백/유니코드 정규화 형태가 다르면 다른 키 (캐시된 엔티티 위치가 원문 기준이므로)"""
+        assert build_cache_key("홍길동입니다", "v1") == build_cache_key("홍길동입니다", "v1")
+        assert build_cache_key("  홍길동입니다\n", "v1") != build_cache_key("홍길동입니다", "v1")
+        nfd = "\u1112\u1169\u11bc길동입니다"  # "홍"의 NFD 표기
+        assert build_cache_key(nfd, "v1") != build_cache_key("홍길동입니다", "v1")
+
+    def test_key_depends_on_model_version(self):
+        """모델 버전이 다르면 다른 키"""
+        assert build_cache_key("홍길동입니다", "v1") != build_cache_key("홍길동입니다", "v2")
+
+
+class TestInMemoryDetectionCache:
+    """LRU/TTL 캐시 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_hit_miss_and_lru_eviction(self):
+        """히트/미스 카운트와 LRU 제거 확인"""
+        cache = InMemoryDetectionCache(max_entries=2, ttl_seconds=60)
+
+        assert await cache.get("a") is None
+        await cache.set("a", {"entities": []})
+        await cache.set("b", {"entities": []})
+        assert await cache.get("a") == {"entities": []}
+
+        # b가 가장 오래 사용되지 않았으므로 제거됨
+        await cache.set("c", {"entities": []})
+        assert await cache.get("b") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["evictions"] == 1
+        assert stats["size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_miss(self):
+        """TTL이 지난 항목은 미스 처리"""
+        cache = InMemoryDetectionCache(max_entries=10, ttl_seconds=-1)
+
+        await cache.set("a", {"entities": []})
+
+        assert await cache.get("a") is None
+        assert cache.get_stats()["expirations"] == 1
@@ -3,7 +3,7 @@ Elasticsearch 통합 테스트
 """
 import pytest
 from app.core.elasticsearch import ElasticsearchClient, get_elasticsearch_client
-from app.repository.elasticsearch_repo import ElasticsearchRepository
+from app.repository.elasticsearch_repo import ElasticsearchRepository, WriteAliasMissingError
 from app.schemas.log import PIILogCreate
 from datetime import datetime, timedelta
 import asyncio
@@ -285,4 +285,125 @@ class TestElasticsearchPerformance:
             assert elapsed < 10.0
 
         except Exception as e:
-            pytest.skip(f"Elasticsearch not available: {str(e)}")
\ No newline at end of file
+            pytest.skip(f"Elasticsearch not available: {str(e)}")
+
+class TestStatisticsAggregation:
+    """통계 집계 쿼리 구성 테스트 (가짜 클라이언트, ES 불필요)"""
+
+    @pytest.mark.asyncio
+    async def test_avg_confidence_from_nested_doc_values(self, monkeypatch):
+        """타입별 평균 신뢰도는 스크립트 없이 nested 집계로 계산해 응답에 반영"""
+        import json
+        from app.services import log_service as log_service_module
+        from app.services.log_service import PIILogService
+
+        requests = []
+
+        class FakeClient:
+            async def search(self, **kwargs):
+                requests.append(kwargs)
+                return {"aggregations": {
+                    "top_pii_types": {"buckets": [
+                        {"key": "PHONE_NUM", "doc_count": 3},
+                        {"key": "EMAIL", "doc_count": 1}
+                    ]},
+                    "pii_type_confidence": {"doc_count": 5, "by_type": {"buckets": [
+                        {"key": "PHONE_NUM", "doc_count": 4, "avg_confidence": {"value": 0.91234}},
+                        {"key": "EMAIL", "doc_count": 1, "avg_confidence": {"value": 0.8}}
+                    ]}}
+                }}
+
+        async def get_client():
+            return FakeClient()
+        monkeypatch.setattr(log_service_module, "get_elasticsearch_client", get_client)
+
+        response = await PIILogService().get_statistics_by_pii_type(
+            datetime.now() - timedelta(days=1), datetime.now()
+        )
+
+        aggs = requests[0]["aggs"]
+        assert "script" not in json.dumps(aggs)
+        assert aggs["pii_type_confidence"]["nested"] == {"path": "detected_entities"}
+        assert [(s.pii_type, s.count, s.avg_confidence) for s in response.statistics] == [
+            ("PHONE_NUM", 3, 0.9123),
+            ("EMAIL", 1, 0.8)
+        ]
+
+
+class TestTimePartitionedIndices:
+    """날짜별 backing 인덱스 + 쓰기 alias 구성 테스트 (가짜 클라이언트, ES 불필요)"""
+
+    class FakeClient:
+        def __init__(self, alias_exists: bool = False):
+            self.calls = []
+            self.alias_exists = alias_exists
+            self.indices = self
+            self.ilm = self
+
+        async def put_lifecycle(self, **kwargs):
+            self.calls.append(("put_lifecycle", kwargs))
+
+        async def put_index_template(self, **kwargs):
+            self.calls.append(("put_index_template", kwargs))
+
+        async def exists_alias(self, **kwargs):
+            return self.alias_exists
+
+        async def create(self, **kwargs):
+            self.calls.append(("create", kwargs))
+
+        async def bulk(self, **kwargs):
+            self.calls.append(("bulk", kwargs))
+            if self.alias_exists is None:
+                # require_alias=true인데 alias가 없을 때의 문서별 오류
+                error = {"type": "index_not_found_exception", "reason": "no such index [pii-detection-logs-write]"}
+                return {"errors": True, "items": [{"index": {"status": 404, "error": error}}]}
+            return {"errors": False, "items": []}
+
+        async def search(self, **kwargs):
+            self.calls.append(("search", kwargs))
+            return {"hits": {"total": {"value": 0}, "hits": []}}
+
+    @pytest.mark.asyncio
+    async def test_bootstrap_write_alias(self):
+        """ILM rollover 정책, 템플릿, 날짜 포함 첫 인덱스 + 쓰기 alias 생성 (alias가 있으면 인덱스는 만들지 않음)"""
+        client = self.FakeClient()
+        repo = ElasticsearchRepository(client)
+        await repo.create_index_if_not_exists()
+
+        calls = dict(client.calls)
+        rollover = calls["put_lifecycle"]["policy"]["phases"]["hot"]["actions"]["rollover"]
+        assert rollover == {"max_age": "1d", "max_primary_shard_size": "50gb"}
+        template = calls["put_index_template"]
+        assert template["index_patterns"] == ["pii-detection-logs-*"]
+        assert template["template"]["settings"]["index"]["lifecycle"]["rollover_alias"] == "pii-detection-logs-write"
+        assert calls["create"] == {
+            "index": "<pii-detection-logs-{now/d}-000001>",
+            "aliases": {"pii-detection-logs-write": {"is_write_index": True}}
+        }
+
+        client = self.FakeClient(alias_exists=True)
+        await ElasticsearchRepository(client).create_index_if_not_exists()
+        assert [name for name, _ in client.calls] == ["put_lifecycle", "put_index_template"]
+
+    @pytest.mark.asyncio
+    async def test_write_alias_and_read_pattern(self):
+        """쓰기는 alias로, 읽기는 롤업 인덱스를 제외한 로그 인덱스 패턴 + shard pre-filter로"""
+        client = self.FakeClient()
+        repo = ElasticsearchRepository(client)
+
+        await repo.bulk_index([{"timestamp": "2026-03-02T00:00:00"}])
+        await repo.search_logs(datetime(2026, 3, 1), datetime(2026, 3, 2))
+
+        calls = dict(client.calls)
+        assert calls["bulk"]["operations"][0] == {"index": {"_index": "pii-detection-logs-write", "require_alias": True}}
+        assert calls["search"]["index"] == "pii-detection-logs*"
+        assert calls["search"]["pre_filter_shard_size"] == 1
+        assert not "pii-detection-rollups".startswith(calls["search"]["index"].rstrip("*"))
+
+    @pytest.mark.asyncio
+    async def test_bulk_requires_write_alias(self):
+        """alias가 없으면 일반 인덱스를 자동 생성하지 않고 WriteAliasMissingError"""
+        client = self.FakeClient(alias_exists=None)
+        with pytest.raises(WriteAliasMissingError):
+            await ElasticsearchRepository(client).bulk_index([{"timestamp": "2026-03-02T00:00:00"}])
@@ -0,0 +1,62 @@
+"""
+BIO 엔티티 추출 테스트 (모델 없이 병렬 배열 입력으로 검증)
+"""
+from app.utils.entity_extractor import extract_bio_entities
+
+ID2LABEL = {0: "O", 1: "B-NAME", 2: "I-NAME", 3: "B-PHONE_NUM", 4: "I-PHONE_NUM"}
+
+
+def _arrays(tokens):
+    """(label_id, confidence, position, start, end) 목록을 병렬 배열로 변환"""
+    return {
+        "label_ids": [t[0] for t in tokens],
+        "confidences": [t[1] for t in tokens],
+        "positions": [t[2] for t in tokens],
+        "starts": [t[3] for t in tokens],
+        "ends": [t[4] for t in tokens],
+    }
+
+
+class TestExtractBioEntities:
+    """offset 기반 엔티티 구간 추출 테스트"""
+
+    def test_values_are_original_text_slices(self):
+        """엔티티 값은 원문의 [start, end) 구간 그대로"""
+        text = "홍길동 연락처 010-1234-5678"
+        predictions = _arrays([
+            (1, 0.9, 0, 0, 1),
+            (2, 0.8, 1, 1, 3),
+            (3, 0.95, 3, 8, 11),
+            (4, 0.85, 4, 11, 16),
+            (4, 0.75, 5, 16, 21),
+        ])
+
+        entities = extract_bio_entities(predictions, ID2LABEL, text)
+
+        assert [(e["type"], e["value"], e["start"], e["end"]) for e in entities] == [
+            ("NAME", "홍길동", 0, 3),
+            ("PHONE_NUM", "010-1234-5678", 8, 21),
+        ]
+        assert entities[0]["token_count"] == 2
+        assert abs(entities[1]["confidence"] - 0.85) < 1e-9
+
+    def test_position_gap_splits_entities(self):
+        """O 토큰이 빠진 자리(위치 불연속)에서 같은 타입도 분리"""
+        text = "김철수 와 이영희"
+        predictions = _arrays([
+            (1, 0.9, 0, 0, 3),
+            (2, 0.9, 2, 6, 9),
+        ])
+
+        entities = extract_bio_entities(predictions, ID2LABEL, text)
+
+        assert [e["value"] for e in entities] == ["김철수", "이영희"]
+
+    def test_span_excludes_surrounding_whitespace(self):
+        """토큰 offset에 공백이 포함돼도 값은 앞뒤 공백 제외"""
+        text = "이름: 박지성 "
+        predictions = _arrays([(1, 0.9, 1, 3, 8)])
+
+        entity = extract_bio_entities(predictions, ID2LABEL, text)[0]
+
+        assert (entity["value"], entity["start"], entity["end"]) == ("박지성", 4, 7)
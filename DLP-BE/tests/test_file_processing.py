@@ -0,0 +1,169 @@
+"""
+파일 텍스트 추출 + PII 탐지 테스트
+(텍스트 파일만 사용하므로 pypdf/pytesseract 없이 실행 가능)
+"""
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.schemas.pii import DetectedEntity
+from app.services.file_extraction_service import get_file_extraction_service
+from app.utils import file_text_extractor
+
+
+def fake_detect_entities(calls: list[str]):
+    """페이지 텍스트에서 'PHONE' 위치를 엔티티로 반환하는 가짜 탐지기"""
+    async def detect_entities(text: str) -> list[DetectedEntity]:
+        calls.append(text)
+        index = text.find("010-1234-5678")
+        if index == -1:
+            return []
+        return [DetectedEntity(
+            type="PHONE_NUM", value="010-1234-5678", confidence=0.99,
+            token_count=1, start=index, end=index + 13
+        )]
+    return detect_entities
+
+
+class TestDetectKind:
+    """파일 종류 판별 테스트"""
+
+    def test_extension_and_content_type(self):
+        """확장자 우선, 없으면 Content-Type으로 판별"""
+        assert file_text_extractor.detect_kind("a.PDF", None) == "pdf"
+        assert file_text_extractor.detect_kind("scan", "image/png") == "image"
+        assert file_text_extractor.detect_kind("notes", "text/plain; charset=utf-8") == "text"
+        assert file_text_extractor.detect_kind("archive.zip", "application/zip") is None
+
+
+class TestTextPages:
+    """텍스트 파일 페이지 분할 테스트"""
+
+    @staticmethod
+    def split(path) -> list[tuple[str, int]]:
+        pages = file_text_extractor.count_pages(str(path), "text")
+        return [file_text_extractor.extract_page(str(path), "text", index, False, "") for index in range(pages)]
+
+    def test_multibyte_characters_kept(self, tmp_path):
+        """줄바꿈 없는 한글 텍스트도 문자 경계에서 잘라 페이지를 이으면 원문 그대로"""
+        original = "가나다라마바사" * 30000
+        path = tmp_path / "korean.txt"
+        path.write_bytes(original.encode("utf-8"))
+
+        pages = self.split(path)
+
+        assert len(pages) > 2
+        assert "".join(text[:length] for text, length in pages) == original
+        assert all("\ufffd" not in text for text, _ in pages)
+
+    def test_pages_end_on_line_boundary_with_overlap(self, tmp_path):
+        """페이지는 줄 끝에서 나뉘고, 다음 페이지 앞부분이 겹쳐 붙음"""
+        lines = [f"{index:06d} 홍길동 010-1234-5678" for index in range(20000)]
+        path = tmp_path / "lines.txt"
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        pages = self.split(path)
+
+        assert "".join(text[:length] for text, length in pages) == "\n".join(lines)
+        for (text, length), (next_text, next_length) in zip(pages, pages[1:]):
+            assert text[length - 1] == "\n"
+            overlap = text[length:]
+            assert len(overlap) == file_text_extractor.TEXT_PAGE_OVERLAP_CHARS
+            assert next_text.startswith(overlap)
+        assert pages[-1][0] == pages[-1][0][:pages[-1][1]]
+
+
+class TestFileProcessAPI:
+    """파일 검사 API 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_text_file_pages_detected(self, client: AsyncClient, monkeypatch):
+        """페이지별 탐지 결과에 페이지 번호가 붙고, 로그가 저장됨"""
+        from app.api.routers import file as file_router
+
+        calls = []
+        service = get_file_extraction_service()
+        monkeypatch.setattr(service.pii_service, "detect_entities", fake_detect_entities(calls))
+        logged = {}
+
+        async def fake_log_detection(**kwargs):
+            logged.update(kwargs)
+        monkeypatch.setattr(file_router.log_service, "log_detection", fake_log_detection)
+
+        page_size = file_text_extractor.TEXT_PAGE_BYTES
+        content = b"a" * page_size + b"call 010-1234-5678".ljust(page_size, b" ") + b"end"
+
+        response = await client.post(
+            "/api/v1/file/process",
+            files={"file": ("notes.txt", content, "text/plain")}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["kind"] == "text"
+        assert data["pages_total"] == 3
+        assert data["pages_processed"] == 3
+        assert data["truncated"] is False
+        assert data["has_pii"] is True
+        assert data["entities"][0]["page"] == 2
+        assert data["entities"][0]["start"] == 5
+        assert len(data["text"]) == settings.FILE_TEXT_EXCERPT_CHARS
+        assert len(calls) == 3
+        assert logged["result"].has_pii is True
+
+    @pytest.mark.asyncio
+    async def test_entity_across_page_boundary(self, client: AsyncClient, monkeypatch):
+        """페이지 경계에 걸친 엔티티는 앞 페이지에서 한 번만 탐지"""
+        calls = []
+        service = get_file_extraction_service()
+        monkeypatch.setattr(service.pii_service, "detect_entities", fake_detect_entities(calls))
+
+        page_size = file_text_extractor.TEXT_PAGE_BYTES
+        content = b"a" * (page_size - 6) + b"010-1234-5678" + b"b" * 100
+
+        response = await client.post(
+            "/api/v1/file/process",
+            files={"file": ("notes.txt", content, "text/plain")}
+        )
+
+        data = response.json()
+        assert data["pages_total"] == 2
+        assert [(e["page"], e["start"], e["value"]) for e in data["entities"]] == [(1, page_size - 6, "010-1234-5678")]
+
+    @pytest.mark.asyncio
+    async def test_page_budget_truncates(self, client: AsyncClient, monkeypatch):
+        """FILE_MAX_PAGES를 넘는 페이지는 검사하지 않고 truncated 표시"""
+        calls = []
+        service = get_file_extraction_service()
+        monkeypatch.setattr(service.pii_service, "detect_entities", fake_detect_entities(calls))
+        monkeypatch.setattr(settings, "FILE_MAX_PAGES", 2)
+
+        content = b"x" * (file_text_extractor.TEXT_PAGE_BYTES * 5)
+        response = await client.post(
+            "/api/v1/file/process",
+            files={"file": ("big.txt", content, "text/plain")}
+        )
+
+        data = response.json()
+        assert data["pages_total"] == 5
+        assert data["pages_processed"] == 2
+        assert data["truncated"] is True
+        assert data["budget_exceeded"] == "pages"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_unsupported_and_oversized(self, client: AsyncClient, monkeypatch):
+        """미지원 형식은 error로 응답, 크기 제한 초과는 413"""
+        response = await client.post(
+            "/api/v1/file/process",
+            files={"file": ("a.zip", b"PK\x03\x04", "application/zip")}
+        )
+        assert response.status_code == 200
+        assert response.json()["error"] == "unsupported_file_type"
+
+        monkeypatch.setattr(settings, "FILE_MAX_BYTES", 10)
+        response = await client.post(
+            "/api/v1/file/process",
+            files={"file": ("a.txt", b"0123456789abc", "text/plain")}
+        )
+        assert response.status_code == 413
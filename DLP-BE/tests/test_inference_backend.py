@@ -0,0 +1,97 @@
+"""
+ONNX 추론 백엔드 정확도 동등성 테스트 (PyTorch 기준)
+"""
+import pytest
+from app.ai.model_manager import get_pii_detector
+from app.ai.inference_backend import (
+    ONNXRUNTIME_AVAILABLE,
+    TorchTokenClassifierBackend,
+    create_inference_backend
+)
+
+pytestmark = [
+    pytest.mark.slow,
+    pytest.mark.skipif(not ONNXRUNTIME_AVAILABLE, reason="onnxruntime not installed"),
+]
+
+# tests/test_pii_detection.py 에서 사용하는 입력
+PARITY_TEXTS = [
+    "010-1234-5678",
+    "전화번호: 010-9876-5432",
+    "연락처는 01012345678입니다",
+    "test@example.com",
+    "이메일: admin@company.co.kr",
+    "연락처 hong.gildong@test.org",
+    "저는 김철수입니다",
+    "이영희 씨가 왔습니다",
+    "박지성 선수는 훌륭합니다",
+    "홍길동의 전화번호는 010-1234-5678입니다",
+]
+
+
+def _predict_with_backend(detector, backend, texts):
+    """지정한 백엔드로 토큰 예측 수행"""
+    original_backend = detector.backend
+    detector.backend = backend
+    try:
+        return detector._predict_batch_sync(texts)
+    finally:
+        detector.backend = original_backend
+
+
+def _token_labels(detector, backend, texts):
+    """O 토큰을 포함한 전체 토큰의 예측 라벨 ID (패딩 제외)"""
+    inputs = detector.tokenizer(texts, return_tensors="pt", truncation=True, padding=True)
+    label_ids = backend.predict_proba(inputs).argmax(-1)
+    return label_ids[inputs["attention_mask"].bool()].tolist()
+
+
+def _entity_types(detector, predictions, texts):
+    """토큰 예측에서 엔티티 타입 집합 추출"""
+    from app.utils.entity_extractor import extract_bio_entities
+    return [
+        {
+            entity["type"]
+            for entity in extract_bio_entities(arrays, detector.model.config.id2label, text)
+        }
+        for arrays, text in zip(predictions, texts)
+    ]
+
+
+class TestInferenceBackendParity:
+    """PyTorch / ONNX / ONNX INT8 예측 비교"""
+
+    @pytest.fixture(scope="class")
+    def detector(self):
+        return get_pii_detector()
+
+    @pytest.fixture
+    def texts(self, sample_pii_text, sample_non_pii_text):
+        return [sample_pii_text, sample_non_pii_text] + PARITY_TEXTS
+
+    @pytest.fixture
+    def torch_predictions(self, detector, texts):
+        return _predict_with_backend(detector, TorchTokenClassifierBackend(detector.model), texts)
+
+    def test_onnx_fp32_matches_torch(self, detector, texts, torch_predictions):
+        """FP32 ONNX는 토큰 라벨이 동일하고 신뢰도 오차가 작아야 함"""
+        backend = create_inference_backend(detector.model, detector.model_name, mode="ONNX")
+        onnx_predictions = _predict_with_backend(detector, backend, texts)
+
+        for expected, actual in zip(torch_predictions, onnx_predictions):
+            assert expected["label_ids"] == actual["label_ids"]
+            assert expected["positions"] == actual["positions"]
+            for e, a in zip(expected["confidences"], actual["confidences"]):
+                assert abs(e - a) < 1e-3
+
+    def test_onnx_int8_matches_torch_entities(self, detector, texts, torch_predictions):
+        """INT8 ONNX는 토큰 라벨 일치율이 높고 엔티티 타입이 동일해야 함"""
+        backend = create_inference_backend(detector.model, detector.model_name, mode="ONNX_INT8")
+        int8_predictions = _predict_with_backend(detector, backend, texts)
+
+        expected_labels = _token_labels(detector, TorchTokenClassifierBackend(detector.model), texts)
+        actual_labels = _token_labels(detector, backend, texts)
+        matched = sum(e == a for e, a in zip(expected_labels, actual_labels))
+        assert matched / len(expected_labels) >= 0.98
+
+        assert _entity_types(detector, torch_predictions, texts) == _entity_types(detector, int8_predictions, texts)
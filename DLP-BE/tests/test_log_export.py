@@ -0,0 +1,161 @@
+"""
+관리자 로그 내보내기 테스트
+(slice + point-in-time + search_after를 흉내 내는 가짜 ES 클라이언트 사용)
+"""
+from datetime import datetime, timedelta
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services import log_export_service as export_module
+from app.services.log_export_service import LogExportJob, ExportFormatError, get_export_progress
+
+T = datetime(2026, 3, 2)
+
+
+def make_log(index: int) -> dict:
+    return {
+        "timestamp": (T + timedelta(seconds=index // 4)).isoformat(),
+        "client_ip": f"10.0.0.{index % 3}",
+        "original_text": f"로그, \"{index}\"",
+        "text_length": 7,
+        "has_pii": index % 2 == 0,
+        "detected_entities": [{"type": "PHONE_NUM", "value": "010-0000-0000", "confidence": 0.9}] if index % 2 == 0 else [],
+        "entity_types": ["PHONE_NUM"] if index % 2 == 0 else [],
+        "entity_count": 1 if index % 2 == 0 else 0,
+        "blocked": index % 2 == 0,
+        "reason": "test",
+        "response_time_ms": 1.5,
+        "model_version": "test",
+        "api_version": "1.0.0"
+    }
+
+
+class FakeSlicedClient:
+    """_shard_doc % max == slice id 인 문서를 slice로 나눠 (timestamp asc, _shard_doc asc) search_after 페이징"""
+
+    def __init__(self, documents: list[dict]):
+        self.documents = [(f"id-{i}", i, document) for i, document in enumerate(documents)]
+        self.open_pits: set[str] = set()
+        self.slices_seen: set[int] = set()
+        self.fail_after: int | None = None
+        self.searches = 0
+
+    async def count(self, index: str, allow_no_indices: bool, query: dict) -> dict:
+        return {"count": len(self.documents)}
+
+    async def open_point_in_time(self, index: str, keep_alive: str, index_filter: dict | None = None) -> dict:
+        self.open_pits.add("pit-1")
+        return {"id": "pit-1"}
+
+    async def close_point_in_time(self, id: str) -> dict:
+        self.open_pits.discard(id)
+        return {"succeeded": True}
+
+    async def search(self, pit: dict, query: dict, sort: list, size: int, track_total_hits: bool, search_after=None, slice=None):
+        self.searches += 1
+        if self.fail_after is not None and self.searches > self.fail_after:
+            raise ConnectionError("es down")
+        await asyncio.sleep(0)
+
+        slice = slice or {"id": 0, "max": 1}
+        self.slices_seen.add(slice["id"])
+        rows = sorted(
+            (document["timestamp"], shard_doc, doc_id, document)
+            for doc_id, shard_doc, document in self.documents
+            if shard_doc % slice["max"] == slice["id"]
+        )
+        if search_after is not None:
+            rows = [row for row in rows if (row[0], row[1]) > tuple(search_after)]
+        hits = [
+            {"_id": doc_id, "_source": document, "sort": [timestamp, shard_doc]}
+            for timestamp, shard_doc, doc_id, document in rows[:size]
+        ]
+        return {"pit_id": pit["id"], "hits": {"total": {"value": len(self.documents)}, "hits": hits}}
+
+
+@pytest.fixture
+def fake_es(monkeypatch):
+    client = FakeSlicedClient([make_log(i) for i in range(53)])
+
+    async def get_client():
+        return client
+    monkeypatch.setattr(export_module, "get_elasticsearch_client", get_client)
+    monkeypatch.setattr(settings, "EXPORT_SLICES", 3)
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 5)
+    return client
+
+
+async def collect(job: LogExportJob) -> bytes:
+    return b"".join([chunk async for chunk in job.stream()])
+
+
+class TestLogExport:
+    """로그 내보내기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_complete(self, fake_es):
+        """모든 slice를 읽어 로그를 한 번씩 내보내고, 끝나면 point-in-time을 닫음"""
+        job = LogExportJob("ndjson", T, T + timedelta(hours=1))
+        body = await collect(job)
+
+        rows = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+        assert sorted(row["id"] for row in rows) == sorted(f"id-{i}" for i in range(53))
+        assert fake_es.slices_seen == {0, 1, 2}
+        assert fake_es.open_pits == set()
+
+        progress = get_export_progress(job.export_id)
+        assert progress["status"] == "completed"
+        assert (progress["exported"], progress["total"], progress["percent"]) == (53, 53, 100.0)
+
+    @pytest.mark.asyncio
+    async def test_csv_columns(self, fake_es):
+        """CSV는 BOM + 고정 컬럼, 목록/사전 값은 JSON 문자열"""
+        body = await collect(LogExportJob("csv", T, T + timedelta(hours=1), has_pii=True))
+
+        text = body.decode("utf-8")
+        assert text.startswith("﻿")
+        rows = list(csv.DictReader(io.StringIO(text.lstrip("﻿"))))
+        assert len(rows) == 53
+        row = next(row for row in rows if row["id"] == "id-4")
+        assert row["original_text"] == "로그, \"4\""
+        assert json.loads(row["entity_types"]) == ["PHONE_NUM"]
+        assert json.loads(row["detected_entities"])[0]["confidence"] == 0.9
+
+    @pytest.mark.asyncio
+    async def test_failure_and_cancel_cleanup(self, fake_es):
+        """읽기 실패나 클라이언트 중단 시에도 point-in-time을 닫고 상태를 기록"""
+        fake_es.fail_after = 4
+        job = LogExportJob("ndjson", T, T + timedelta(hours=1))
+        with pytest.raises(ConnectionError):
+            await collect(job)
+        assert get_export_progress(job.export_id)["status"] == "failed"
+        assert fake_es.open_pits == set()
+
+        fake_es.fail_after = None
+        job = LogExportJob("ndjson", T, T + timedelta(hours=1))
+        stream = job.stream()
+        await stream.__anext__()
+        await stream.__anext__()
+        await stream.aclose()
+        assert get_export_progress(job.export_id)["status"] == "cancelled"
+        assert fake_es.open_pits == set()
+
+    @pytest.mark.asyncio
+    async def test_parquet(self, fake_es):
+        """Parquet은 배치마다 row group을 쓰고 읽으면 전체 로그가 나옴"""
+        pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+        body = await collect(LogExportJob("parquet", T, T + timedelta(hours=1)))
+
+        table = pyarrow_parquet.read_table(io.BytesIO(body))
+        assert table.num_rows == 53
+        assert table.schema.field("entity_types").type.value_type.equals(table.schema.field("id").type)
+        assert pyarrow_parquet.ParquetFile(io.BytesIO(body)).num_row_groups > 1
+
+    def test_unknown_format(self):
+        with pytest.raises(ExportFormatError):
+            LogExportJob("xml", T, T)
@@ -0,0 +1,129 @@
+"""
+관리자 로그 커서 페이징 테스트
+(point-in-time + search_after를 흉내 내는 가짜 ES 클라이언트 사용)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from elasticsearch import NotFoundError
+
+from app.services import log_service as log_service_module
+from app.services.log_service import PIILogService, InvalidCursorError, CursorExpiredError, decode_cursor
+
+T = datetime(2026, 3, 2)
+
+
+def make_log(index: int, timestamp: datetime) -> dict:
+    return {
+        "timestamp": timestamp.isoformat(),
+        "client_ip": "10.0.0.1",
+        "original_text": f"log {index}",
+        "text_length": 5,
+        "has_pii": index % 2 == 0,
+        "detected_entities": [],
+        "entity_types": [],
+        "entity_count": 0,
+        "blocked": False,
+        "reason": "test",
+        "response_time_ms": 1.0,
+        "model_version": "test",
+        "api_version": "1.0.0"
+    }
+
+
+class FakePITClient:
+    """문서 목록을 (timestamp desc, _shard_doc desc)로 정렬해 search_after 페이징"""
+
+    def __init__(self, documents: list[dict]):
+        self.documents = [(f"id-{i}", i, document) for i, document in enumerate(documents)]
+        self.open_pits: set[str] = set()
+        self.searches: list[dict] = []
+        self._next_pit = 0
+
+    async def open_point_in_time(self, index: str, keep_alive: str, index_filter: dict | None = None) -> dict:
+        self._next_pit += 1
+        pit_id = f"pit-{self._next_pit}"
+        self.open_pits.add(pit_id)
+        return {"id": pit_id}
+
+    async def close_point_in_time(self, id: str) -> dict:
+        self.open_pits.discard(id)
+        return {"succeeded": True}
+
+    async def search(self, pit: dict, query: dict, sort: list, size: int, track_total_hits: bool, search_after=None):
+        self.searches.append({"search_after": search_after, "track_total_hits": track_total_hits})
+        if pit["id"] not in self.open_pits:
+            raise NotFoundError(404, "search_context_missing_exception", {})
+
+        rows = sorted(
+            ((document["timestamp"], shard_doc, doc_id, document) for doc_id, shard_doc, document in self.documents),
+            reverse=True
+        )
+        if search_after is not None:
+            rows = [row for row in rows if (row[0], row[1]) < tuple(search_after)]
+        hits = [
+            {"_id": doc_id, "_source": document, "sort": [timestamp, shard_doc]}
+            for timestamp, shard_doc, doc_id, document in rows[:size]
+        ]
+        return {
+            "pit_id": pit["id"],
+            "hits": {"total": {"value": len(self.documents)}, "hits": hits}
+        }
+
+
+@pytest.fixture
+def fake_es(monkeypatch):
+    # 같은 시각 문서가 여러 개 있어도 _shard_doc 순서로 빠짐/중복 없이 넘어가야 함
+    documents = [make_log(i, T + timedelta(seconds=i // 3)) for i in range(23)]
+    client = FakePITClient(documents)
+
+    async def get_client():
+        return client
+    monkeypatch.setattr(log_service_module, "get_elasticsearch_client", get_client)
+    return client
+
+
+class TestCursorPagination:
+    """커서 페이징 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_walk_all_pages(self, fake_es):
+        """next_cursor를 따라가면 모든 로그를 한 번씩 받고, 마지막 페이지에서 point-in-time을 닫음"""
+        service = PIILogService()
+        response = await service.get_logs(T, T + timedelta(hours=1), page_size=10, cursor_mode=True)
+
+        pages = [response]
+        while response.next_cursor:
+            response = await service.get_logs(T, T, cursor=response.next_cursor)
+            pages.append(response)
+
+        ids = [log.id for page in pages for log in page.logs]
+        assert len(ids) == 23 and len(set(ids)) == 23
+        assert [page.page for page in pages] == [1, 2, 3]
+        assert all(page.total == 23 for page in pages)
+        # 전체 건수는 첫 페이지에서만 계산
+        assert [search["track_total_hits"] for search in fake_es.searches] == [True, False, False]
+        assert fake_es.open_pits == set()
+
+    @pytest.mark.asyncio
+    async def test_cursor_keeps_filters(self, fake_es):
+        """커서에는 첫 요청의 필터/정렬/페이지 크기가 담기고 이후 요청 파라미터는 무시"""
+        service = PIILogService()
+        response = await service.get_logs(T, T + timedelta(hours=1), has_pii=True, page_size=5, cursor_mode=True)
+
+        state = decode_cursor(response.next_cursor)
+        assert state["filters"]["has_pii"] is True
+        assert state["size"] == 5
+        assert state["after"] == [response.logs[-1].timestamp.isoformat(), 18]
+
+    @pytest.mark.asyncio
+    async def test_expired_and_invalid_cursor(self, fake_es):
+        """만료된 point-in-time은 CursorExpiredError, 깨진 토큰은 InvalidCursorError"""
+        service = PIILogService()
+        response = await service.get_logs(T, T + timedelta(hours=1), page_size=10, cursor_mode=True)
+        fake_es.open_pits.clear()
+
+        with pytest.raises(CursorExpiredError):
+            await service.get_logs(T, T, cursor=response.next_cursor)
+        with pytest.raises(InvalidCursorError):
+            await service.get_logs(T, T, cursor="not-a-cursor")
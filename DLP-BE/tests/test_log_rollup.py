@@ -0,0 +1,288 @@
+"""
+관리자 통계 롤업 테스트
+(구간 분할, 롤업 작업 진행, 롤업 결과로 통계 응답 생성 - 실제 Elasticsearch 불필요)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.repository import rollup_repo as rollup_repo_module
+from app.repository.rollup_repo import RollupRepository, empty_summary, merge_summaries
+from app.services import log_rollup as log_rollup_module
+from app.services import log_service as log_service_module
+from app.services.log_rollup import LogRollup, plan_ranges
+from app.services.log_service import PIILogService
+
+T = datetime(2026, 3, 2)
+
+
+class TestPlanRanges:
+    """조회 구간 분할 테스트"""
+
+    def test_hours_minutes_and_raw_edges(self):
+        """가운데는 시간 롤업, 양쪽은 분 롤업, 분 경계 안쪽과 워터마크 이후는 원본"""
+        coverage = {
+            "1m": (T, T + timedelta(hours=5, minutes=42)),
+            "1h": (T, T + timedelta(hours=5)),
+        }
+        start = T + timedelta(hours=1, minutes=37, seconds=20)
+        end = T + timedelta(hours=5, minutes=50, seconds=10)
+
+        rollup_ranges, raw_ranges = plan_ranges(start, end, coverage)
+
+        assert rollup_ranges == [
+            ("1h", T + timedelta(hours=2), T + timedelta(hours=5)),
+            ("1m", T + timedelta(hours=1, minutes=38), T + timedelta(hours=2)),
+            ("1m", T + timedelta(hours=5), T + timedelta(hours=5, minutes=42)),
+        ]
+        assert raw_ranges == [
+            (start, T + timedelta(hours=1, minutes=38), False),
+            (T + timedelta(hours=5, minutes=42), end, True),
+        ]
+
+    def test_outside_coverage_uses_raw(self):
+        """롤업 시작 이전 구간과 분 단위 추세는 시간 롤업을 쓰지 않음"""
+        coverage = {"1m": (T + timedelta(hours=3), T + timedelta(hours=6)), "1h": (T + timedelta(hours=3), T + timedelta(hours=6))}
+
+        rollup_ranges, raw_ranges = plan_ranges(T, T + timedelta(hours=6), coverage, interval="1m")
+
+        assert rollup_ranges == [("1m", T + timedelta(hours=3), T + timedelta(hours=6))]
+        assert raw_ranges == [
+            (T, T + timedelta(hours=3), False),
+            (T + timedelta(hours=6), T + timedelta(hours=6), True),
+        ]
+
+    def test_no_coverage(self):
+        """롤업이 없으면 전체 구간을 원본으로 집계"""
+        assert plan_ranges(T, T + timedelta(days=1), {"1m": None, "1h": None}) == ([], [(T, T + timedelta(days=1), True)])
+
+
+class FakeRollupRepository:
+    """compute/put 호출을 기록하는 가짜 롤업 저장소"""
+
+    calls: list[tuple] = []
+    coverage: dict = {}
+
+    def __init__(self, es_client):
+        pass
+
+    async def create_index_if_not_exists(self):
+        pass
+
+    async def get_coverage(self, granularity):
+        return self.coverage.get(granularity)
+
+    async def compute_rollups(self, granularity, start_date, end_date, ip_size):
+        self.calls.append((granularity, start_date, end_date))
+        return [{"_id": f"{granularity}:{start_date}:summary", "kind": "summary"}]
+
+    async def put_rollups(self, documents, coverage=None):
+        if coverage is not None:
+            FakeRollupRepository.coverage[coverage[0]] = coverage[1:]
+
+
+class TestRollupJob:
+    """롤업 작업 진행 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def fake_repo(self, monkeypatch):
+        async def get_client():
+            return None
+        FakeRollupRepository.calls = []
+        FakeRollupRepository.coverage = {}
+        monkeypatch.setattr(log_rollup_module, "RollupRepository", FakeRollupRepository)
+        monkeypatch.setattr(log_rollup_module, "get_elasticsearch_client", get_client)
+
+    @pytest.mark.asyncio
+    async def test_backfill_then_incremental(self):
+        """처음에는 backfill 구간을 나눠 롤업하고, 이후에는 새로 닫힌 버킷만 롤업"""
+        rollup = LogRollup(interval_seconds=30, settle_seconds=10, backfill_hours=2, max_ips_per_bucket=100)
+        now = T + timedelta(hours=10, minutes=30, seconds=5)
+
+        await rollup.run_once(now)
+
+        minute_calls = [call for call in FakeRollupRepository.calls if call[0] == "1m"]
+        assert minute_calls[0][1] == T + timedelta(hours=8, minutes=29)
+        assert minute_calls[-1][2] == T + timedelta(hours=10, minutes=29)
+        assert rollup.coverage["1m"] == (T + timedelta(hours=8, minutes=29), T + timedelta(hours=10, minutes=29))
+        assert rollup.coverage["1h"] == (T + timedelta(hours=8), T + timedelta(hours=10))
+        assert rollup.ready
+
+        FakeRollupRepository.calls = []
+        await rollup.run_once(now + timedelta(minutes=1))
+        assert FakeRollupRepository.calls == [("1m", T + timedelta(hours=10, minutes=29), T + timedelta(hours=10, minutes=30))]
+
+        # 재시작해도 저장된 워터마크부터 이어서 진행
+        restarted = LogRollup(interval_seconds=30, settle_seconds=10, backfill_hours=2, max_ips_per_bucket=100)
+        FakeRollupRepository.calls = []
+        await restarted.run_once(now + timedelta(minutes=1))
+        assert FakeRollupRepository.calls == []
+
+    @pytest.mark.asyncio
+    async def test_late_documents_rerolled(self):
+        """이미 롤업된 버킷에 늦게 도착한 로그는 해당 분/시간 버킷만 재집계"""
+        rollup = LogRollup(interval_seconds=30, settle_seconds=0, backfill_hours=2, max_ips_per_bucket=100)
+        now = T + timedelta(hours=10, minutes=30)
+        await rollup.run_once(now)
+        FakeRollupRepository.calls = []
+
+        late = (T + timedelta(hours=9, minutes=15, seconds=3)).isoformat()
+        rollup.mark_late([{"timestamp": late}, {"timestamp": late}, {"timestamp": now.isoformat()}])
+        await rollup.run_once(now)
+
+        assert FakeRollupRepository.calls == [
+            ("1m", T + timedelta(hours=9, minutes=15), T + timedelta(hours=9, minutes=16)),
+            ("1h", T + timedelta(hours=9), T + timedelta(hours=10)),
+        ]
+        assert rollup.get_stats()["late_buckets_rolled"] == 2
+
+
+def ip_bucket(bucket_key, client_ip, total, detected=0, types=None):
+    return {
+        "key": {"bucket": bucket_key, "client_ip": client_ip},
+        "doc_count": total,
+        "detected": {"doc_count": detected},
+        "pii_types": {"buckets": [{"key": t, "doc_count": c} for t, c in (types or {}).items()]},
+    }
+
+
+class FakeSearchClient:
+    """버킷 요약 집계와 IP composite 집계 페이지를 돌려주는 가짜 ES 클라이언트"""
+
+    def __init__(self, buckets: list[dict], ip_pages: list[list[dict]]):
+        self.buckets = buckets
+        self.ip_pages = ip_pages
+        self.searches: list[dict] = []
+
+    async def search(self, **kwargs):
+        self.searches.append(kwargs)
+        if "buckets" in kwargs["aggs"]:
+            return {"aggregations": {"buckets": {"buckets": self.buckets}}}
+        page_index = len([s for s in self.searches if "ips" in s["aggs"]]) - 1
+        page = self.ip_pages[page_index]
+        ips = {"buckets": page}
+        if page:
+            ips["after_key"] = page[-1]["key"]
+        return {"aggregations": {"ips": ips}}
+
+
+def summary_bucket(key, doc_count):
+    return {
+        "key_as_string": key,
+        "doc_count": doc_count,
+        "detected": {"doc_count": 0},
+        "blocked": {"doc_count": 0},
+        "response_time": {"sum": 10.0 * doc_count, "count": doc_count, "max": 10.0},
+        "pii_types": {"buckets": []},
+        "confidence": {"by_type": {"buckets": []}},
+    }
+
+
+class TestComputeRollups:
+    """롤업 생성 집계 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_ip_rollups_paged_and_capped(self, monkeypatch):
+        """IP 집계는 composite 페이지로 나눠 조회하고 버킷마다 요청 수 상위 ip_size개만 저장"""
+        monkeypatch.setattr(rollup_repo_module, "IP_ROLLUP_PAGE_SIZE", 2)
+        first, second = "2026-03-02T00:00:00.000Z", "2026-03-02T01:00:00.000Z"
+        client = FakeSearchClient(
+            buckets=[summary_bucket(first, 6), summary_bucket(second, 1)],
+            ip_pages=[
+                [ip_bucket(first, "10.0.0.1", 1), ip_bucket(first, "10.0.0.2", 3, 1, {"EMAIL": 1})],
+                [ip_bucket(first, "10.0.0.3", 2), ip_bucket(second, "10.0.0.1", 1)],
+                [],
+            ],
+        )
+
+        documents = await RollupRepository(client).compute_rollups("1h", T, T + timedelta(hours=24), ip_size=2)
+
+        # 버킷 요약 집계에는 IP 집계를 넣지 않아 버킷 수가 IP 수와 무관함
+        assert "ips" not in client.searches[0]["aggs"]["buckets"]["aggs"]
+        ip_searches = [s["aggs"]["ips"]["composite"] for s in client.searches if "ips" in s["aggs"]]
+        assert [search.get("after") for search in ip_searches] == [
+            None,
+            {"bucket": first, "client_ip": "10.0.0.2"},
+            {"bucket": second, "client_ip": "10.0.0.1"},
+        ]
+
+        ip_documents = {(d["bucket_start"], d["client_ip"]): d for d in documents if d["kind"] == "ip"}
+        assert set(ip_documents) == {
+            ("2026-03-02T00:00:00.000", "10.0.0.2"),
+            ("2026-03-02T00:00:00.000", "10.0.0.3"),
+            ("2026-03-02T01:00:00.000", "10.0.0.1"),
+        }
+        assert ip_documents[("2026-03-02T00:00:00.000", "10.0.0.2")]["pii_types"] == [{"type": "EMAIL", "count": 1}]
+
+
+class FakeReadyRollup:
+    """미리 정한 집계 결과를 돌려주는 롤업"""
+
+    ready = True
+
+    def __init__(self, summaries: list[dict]):
+        self.summary = merge_summaries(summaries)
+
+    async def summarize(self, start_date, end_date, ip_size, interval=None, unique_ips=False):
+        return self.summary | ({"unique_ips": 3} if unique_ips else {})
+
+
+def make_summary(total, detected, ips, types, timeline=None) -> dict:
+    summary = empty_summary()
+    summary.update(total=total, detected=detected, blocked=detected, response_time_sum=total * 100.0, response_time_count=total)
+    summary["ips"] = ips
+    summary["types"] = types
+    summary["timeline"] = timeline or {}
+    return summary
+
+
+class TestStatisticsFromRollups:
+    """롤업 결과로 통계 응답 생성 테스트"""
+
+    @pytest.fixture
+    def rollup(self, monkeypatch):
+        rollup_part = make_summary(
+            10, 4,
+            ips={"10.0.0.1": {"total": 8, "detected": 4, "types": {"PHONE_NUM": 3, "EMAIL": 1}}},
+            types={"PHONE_NUM": {"count": 3, "entity_count": 4, "confidence_sum": 3.6}},
+            timeline={"2026-03-02T00:00:00Z": {"total": 10, "detected": 4}}
+        )
+        raw_part = make_summary(
+            2, 1,
+            ips={"10.0.0.1": {"total": 1, "detected": 0, "types": {}}, "10.0.0.2": {"total": 1, "detected": 1, "types": {"EMAIL": 1}}},
+            types={"EMAIL": {"count": 1, "entity_count": 1, "confidence_sum": 0.8}},
+            timeline={"2026-03-02T00:00:00Z": {"total": 2, "detected": 1}}
+        )
+        fake = FakeReadyRollup([rollup_part, raw_part])
+        monkeypatch.setattr(settings, "ROLLUP_ENABLED", True)
+        monkeypatch.setattr(log_service_module, "get_log_rollup", lambda: fake)
+        return fake
+
+    @pytest.mark.asyncio
+    async def test_overview(self, rollup):
+        """롤업 구간과 원본 구간 합산 결과로 개요 응답"""
+        overview = await PIILogService().get_statistics_overview(T, T + timedelta(hours=1))
+
+        assert overview.total_requests == 12
+        assert overview.detected_requests == 5
+        assert overview.avg_response_time_ms == 100.0
+        assert overview.unique_ips == 3
+        assert overview.top_ips[0] == {"client_ip": "10.0.0.1", "request_count": 9, "detection_count": 4}
+        assert [t["type"] for t in overview.top_detected_types] == ["PHONE_NUM", "EMAIL"]
+
+    @pytest.mark.asyncio
+    async def test_timeline_type_and_ip(self, rollup):
+        """추세/타입별/IP별 응답"""
+        service = PIILogService()
+
+        timeline = await service.get_statistics_timeline(T, T + timedelta(hours=1), "1h")
+        assert [(p.total_requests, p.detected_requests) for p in timeline.timeline] == [(12, 5)]
+
+        by_type = await service.get_statistics_by_pii_type(T, T + timedelta(hours=1))
+        assert [(s.pii_type, s.avg_confidence) for s in by_type.statistics] == [("PHONE_NUM", 0.9), ("EMAIL", 0.8)]
+
+        by_ip = await service.get_statistics_by_ip(T, T + timedelta(hours=1), size=1)
+        assert [(s.client_ip, s.total_requests, s.most_detected_type) for s in by_ip.statistics] == [
+            ("10.0.0.1", 9, "PHONE_NUM")
+        ]
@@ -0,0 +1,263 @@
+"""
+로그 배치 적재기(LogShipper) 테스트
+(실제 Elasticsearch 없이 _bulk 응답을 흉내 내는 가짜 클라이언트 사용)
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.services import log_shipper as log_shipper_module
+from app.repository.elasticsearch_repo import ElasticsearchRepository
+from app.services.log_shipper import LogShipper
+
+
+class FakeBulkClient:
+    """_bulk 호출을 기록하는 가짜 ES 클라이언트"""
+
+    def __init__(self):
+        self.calls: list[list[dict]] = []
+        self.fail = False
+        self.item_statuses: list[int] = []  # 다음 호출에서 문서별로 돌려줄 오류 상태
+        self.alias_missing = False  # require_alias 요청에 쓰기 alias가 없음
+
+    async def bulk(self, operations: list[dict], refresh: str) -> dict:
+        if self.fail:
+            raise ConnectionError("elasticsearch unavailable")
+        documents = operations[1::2]
+        assert all(action["index"]["require_alias"] for action in operations[0::2])
+        if self.alias_missing:
+            error = {"type": "index_not_found_exception", "reason": "no such index"}
+            return {"errors": True, "items": [{"index": {"status": 404, "error": error}} for _ in documents]}
+        self.calls.append(documents)
+
+        statuses, self.item_statuses = self.item_statuses, []
+        items = []
+        for index in range(len(documents)):
+            status = statuses[index] if index < len(statuses) else 201
+            outcome = {"status": status}
+            if status >= 300:
+                outcome["error"] = {"type": "test_error"}
+            items.append({"index": outcome})
+        return {"errors": bool(statuses), "items": items}
+
+    @property
+    def shipped(self) -> list[dict]:
+        return [document for call in self.calls for document in call]
+
+
+@pytest.fixture
+def fake_es(monkeypatch):
+    client = FakeBulkClient()
+
+    async def get_client():
+        return client
+    monkeypatch.setattr(log_shipper_module, "get_elasticsearch_client", get_client)
+    monkeypatch.setattr(log_shipper_module, "RETRY_BASE_SECONDS", 0.01)
+    return client
+
+
+def make_shipper(tmp_path, **overrides) -> LogShipper:
+    options = {
+        "queue_size": 100,
+        "batch_size": 10,
+        "flush_interval": 0.05,
+        "max_retries": 1,
+        "overflow_policy": "spill",
+        "spill_path": str(tmp_path / "spill.jsonl"),
+        "spill_max_bytes": 1024 * 1024,
+    }
+    options.update(overrides)
+    return LogShipper(**options)
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class TestBatching:
+    """크기/시간 기준 배치 전송 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_flush_on_batch_size(self, fake_es, tmp_path):
+        """batch_size만큼 쌓이면 flush_interval을 기다리지 않고 한 번에 전송"""
+        shipper = make_shipper(tmp_path, flush_interval=5.0)
+        await shipper.start()
+        for i in range(25):
+            assert shipper.enqueue({"seq": i})
+
+        await wait_until(lambda: len(fake_es.shipped) >= 20)
+        assert [len(call) for call in fake_es.calls[:2]] == [10, 10]
+
+        await shipper.stop()
+        assert [document["seq"] for document in fake_es.shipped] == list(range(25))
+        assert shipper.get_stats()["shipped"] == 25
+
+    @pytest.mark.asyncio
+    async def test_flush_on_interval(self, fake_es, tmp_path):
+        """배치가 덜 차도 flush_interval이 지나면 전송"""
+        shipper = make_shipper(tmp_path)
+        await shipper.start()
+        shipper.enqueue({"seq": 1})
+        shipper.enqueue({"seq": 2})
+
+        await wait_until(lambda: len(fake_es.shipped) == 2)
+        assert len(fake_es.calls) == 1
+        await shipper.stop()
+
+    @pytest.mark.asyncio
+    async def test_item_errors(self, fake_es, tmp_path):
+        """문서별 429는 재시도, 400(매핑 오류)은 버리고 rejected로 집계"""
+        shipper = make_shipper(tmp_path)
+        fake_es.item_statuses = [201, 429, 400]
+        await shipper.start()
+        for i in range(3):
+            shipper.enqueue({"seq": i})
+        await shipper.stop()
+
+        assert [document["seq"] for document in fake_es.calls[1]] == [1]
+        stats = shipper.get_stats()
+        assert stats["shipped"] == 2
+        assert stats["rejected"] == 1
+
+
+class TestOverflow:
+    """ES 장애/큐 포화 시 drop, spill 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_spill_and_replay(self, fake_es, tmp_path):
+        """전송 실패 배치는 JSONL로 spill되고, 전송이 다시 성공하면 재전송"""
+        shipper = make_shipper(tmp_path)
+        fake_es.fail = True
+        await shipper.start()
+        for i in range(3):
+            shipper.enqueue({"seq": i, "text": "홍길동"})
+
+        await wait_until(lambda: shipper.get_stats()["spilled"] == 3)
+        spilled = [json.loads(line) for line in (tmp_path / "spill.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert spilled[0] == {"seq": 0, "text": "홍길동"}
+        assert shipper.get_stats()["es_available"] is False
+
+        fake_es.fail = False
+        shipper.enqueue({"seq": 3})
+        await shipper.stop()
+
+        assert sorted(document["seq"] for document in fake_es.shipped) == [0, 1, 2, 3]
+        stats = shipper.get_stats()
+        assert stats["replayed"] == 3
+        assert stats["spill_bytes"] == 0
+        assert not (tmp_path / "spill.jsonl").exists()
+
+    @pytest.mark.asyncio
+    async def test_queue_full_drop(self, fake_es, tmp_path):
+        """drop 정책에서 큐가 가득 차면 대기하지 않고 버림"""
+        shipper = make_shipper(tmp_path, queue_size=2, overflow_policy="drop")
+        assert shipper.enqueue({"seq": 1})
+        assert shipper.enqueue({"seq": 2})
+        assert shipper.enqueue({"seq": 3}) is False
+
+        stats = shipper.get_stats()
+        assert stats["queue_depth"] == 2
+        assert stats["dropped"] == 1
+        assert stats["spilled"] == 0
+
+    @pytest.mark.asyncio
+    async def test_spill_size_limit(self, fake_es, tmp_path):
+        """spill 파일이 한도를 넘으면 더 이상 쓰지 않고 drop"""
+        shipper = make_shipper(tmp_path, queue_size=1, spill_max_bytes=40)
+        shipper.enqueue({"seq": 0})
+        shipper.enqueue({"seq": 1, "pad": "x" * 10})
+        shipper.enqueue({"seq": 2, "pad": "x" * 10})
+
+        stats = shipper.get_stats()
+        assert stats["spilled"] == 1
+        assert stats["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_replay_quarantines_truncated_line(self, fake_es, tmp_path):
+        """중간에 끊긴 spill 줄은 격리하고 나머지는 재전송, 작업은 계속 동작"""
+        spill = tmp_path / "spill.jsonl"
+        spill.write_text('{"seq": 0}\n{"seq": 1}\n{"seq": 2, "te', encoding="utf-8")
+        shipper = make_shipper(tmp_path)
+        await shipper.start()
+
+        await wait_until(lambda: shipper.get_stats()["replayed"] == 2)
+        assert (tmp_path / "spill.jsonl.corrupt").read_text(encoding="utf-8") == '{"seq": 2, "te\n'
+        assert shipper.get_stats()["quarantined"] == 1
+        assert shipper.get_stats()["running"] is True
+
+        shipper.enqueue({"seq": 3})
+        await shipper.stop()
+        assert [document["seq"] for document in fake_es.shipped] == [0, 1, 3]
+
+    def test_spill_after_truncated_line(self, tmp_path):
+        """쓰다 만 줄 뒤에 spill해도 새 문서는 별도 줄로 저장"""
+        spill = tmp_path / "spill.jsonl"
+        spill.write_text('{"seq": 0}\n{"seq": 1, "te', encoding="utf-8")
+        shipper = make_shipper(tmp_path)
+
+        assert shipper._spill([{"seq": 2}])
+        assert spill.read_text(encoding="utf-8").splitlines()[-1] == '{"seq": 2}'
+
+    @pytest.mark.asyncio
+    async def test_replay_respill_over_limit_counted(self, fake_es, tmp_path):
+        """재전송 실패분을 spill 한도 때문에 되돌리지 못하면 dropped로 집계"""
+        spill = tmp_path / "spill.jsonl"
+        spill.write_text('{"seq": 0}\n{"seq": 1}\n', encoding="utf-8")
+        fake_es.item_statuses = [429, 429]
+        shipper = make_shipper(tmp_path, spill_max_bytes=10)
+        await shipper.start()
+        await shipper.stop()
+
+        stats = shipper.get_stats()
+        assert stats["dropped"] == 2
+        assert stats["replayed"] == 0
+
+
+class TestResilience:
+    """배치 처리 중 예기치 못한 오류 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_missing_write_alias_bootstrapped(self, fake_es, tmp_path, monkeypatch):
+        """기동 시 alias를 만들지 못했으면 첫 전송에서 alias를 만들고 같은 배치를 다시 전송"""
+        bootstraps = []
+
+        async def create_index_if_not_exists(repo):
+            bootstraps.append(repo.index_name)
+            fake_es.alias_missing = False
+        monkeypatch.setattr(ElasticsearchRepository, "create_index_if_not_exists", create_index_if_not_exists)
+
+        fake_es.alias_missing = True
+        shipper = make_shipper(tmp_path)
+        await shipper.start()
+        shipper.enqueue({"seq": 0})
+        await shipper.stop()
+
+        assert bootstraps == ["pii-detection-logs-write"]
+        assert [document["seq"] for document in fake_es.shipped] == [0]
+        stats = shipper.get_stats()
+        assert (stats["shipped"], stats["rejected"], stats["spilled"]) == (1, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_batch_error_does_not_stop_shipper(self, fake_es, tmp_path):
+        """한 배치에서 예외가 나도 전송 작업은 멈추지 않음"""
+        shipper = make_shipper(tmp_path)
+        seen = []
+
+        def on_shipped(documents):
+            seen.extend(documents)
+            if len(seen) == 1:
+                raise RuntimeError("rollup failed")
+        shipper.on_shipped = on_shipped
+        await shipper.start()
+
+        shipper.enqueue({"seq": 0})
+        await wait_until(lambda: shipper.get_stats()["last_error"] == "rollup failed")
+        assert shipper.get_stats()["running"] is True
+
+        shipper.enqueue({"seq": 1})
+        await shipper.stop()
+        assert [document["seq"] for document in fake_es.shipped] == [0, 1]
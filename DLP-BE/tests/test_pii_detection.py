@@ -131,6 +131,21 @@ class TestPIIDetectionAPI:
 
         assert response.status_code == 422  # Validation error
 
+    @pytest.mark.asyncio
+    async def test_detect_pii_beyond_first_window(self, client: AsyncClient):
+        """512 토큰 이후에 위치한 PII 탐지 테스트 (슬라이딩 윈도우)"""
+        long_text = "오늘 날씨가 정말 좋습니다. " * 200 + "제 전화번호는 010-1234-5678입니다."
+
+        response = await client.post(
+            "/api/v1/pii/detect",
+            json={"text": long_text}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["has_pii"] is True
+        assert any("PHONE" in entity["type"] for entity in data["entities"])
+
     @pytest.mark.asyncio
     async def test_detect_with_ip_header(self, client: AsyncClient):
         """X-Forwarded-For 헤더 처리 테스트"""
@@ -174,4 +189,68 @@ class TestPIIDetectionAPI:
         for response in responses:
             assert response.status_code == 200
             data = response.json()
-            assert data["has_pii"] is True
\ No newline at end of file
+            assert data["has_pii"] is True
+
+class TestPIIAuditAPI:
+    """프록시 자체 차단 감사 로그 API 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_audit_logs_proxy_verdict(self, client: AsyncClient, monkeypatch):
+        """프록시 탐지 결과를 모델 추론 없이 탐지 로그로 기록"""
+        from app.api.routers import pii as pii_router
+
+        logged = {}
+
+        async def fake_log_detection(**kwargs):
+            logged.update(kwargs)
+        monkeypatch.setattr(pii_router.log_service, "log_detection", fake_log_detection)
+
+        response = await client.post(
+            "/api/v1/pii/audit",
+            json={
+                "text": "주민번호 900101-1234568",
+                "entities": [{
+                    "type": "ID_NUM", "value": "900101-1234568", "confidence": 1.0,
+                    "token_count": 1, "start": 5, "end": 19
+                }],
+                "reason": "pii_detected_1_entities"
+            },
+            headers={"X-Forwarded-For": "10.0.0.7"}
+        )
+
+        assert response.status_code == 202
+        assert logged["client_ip"] == "10.0.0.7"
+        assert logged["model_version"] == "proxy_regex"
+        assert logged["result"].has_pii is True
+        assert logged["result"].entities[0].type == "ID_NUM"
+
+    @pytest.mark.asyncio
+    async def test_audit_requires_entities(self, client: AsyncClient):
+        """엔티티 없는 감사 요청은 거부"""
+        response = await client.post(
+            "/api/v1/pii/audit",
+            json={"text": "안녕하세요", "entities": [], "reason": "none"}
+        )
+
+        assert response.status_code == 422
+
+class TestPIIEnabledTypesAPI:
+    """프록시용 활성 PII 타입 조회 API 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_returns_only_enabled_types(self, client: AsyncClient, monkeypatch):
+        """관리자 설정에서 비활성화되었거나 설정이 없는 타입은 제외"""
+        from app.api.routers import pii as pii_router
+
+        async def fake_settings():
+            return {
+                "EMAIL": {"enabled": False, "threshold": 50},
+                "PHONE_NUM": {"enabled": True, "threshold": 90},
+                "ID_NUM": {"enabled": True, "threshold": 0},
+            }
+        monkeypatch.setattr(pii_router.pii_service, "_get_pii_settings", fake_settings)
+
+        response = await client.get("/api/v1/pii/settings")
+
+        assert response.status_code == 200
+        assert response.json() == {"enabled_types": ["ID_NUM", "PHONE_NUM"]}
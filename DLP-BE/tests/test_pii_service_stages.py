@@ -0,0 +1,103 @@
+"""
+NER/정책 단계 동시 실행 테스트 (모델 없이 가짜 탐지기로 검증)
+"""
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services import pii_service
+from app.services.pii_service import PIIDetectionService
+from app.services.policy_gate import PolicyGate
+
+
+class FakePIIDetector:
+    """지연 후 고정 엔티티를 반환하는 가짜 NER 탐지기"""
+
+    model_name = "fake-ner"
+
+    def __init__(self, entities, delay):
+        self.entities = entities
+        self.delay = delay
+
+    async def detect_pii(self, text):
+        await asyncio.sleep(self.delay)
+        return {"has_pii": bool(self.entities), "entities": self.entities, "raw_predictions": []}
+
+
+class FakePolicyDetector:
+    """지연 후 고정 판단을 반환하는 가짜 정책 탐지기"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.started = 0
+        self.finished = 0
+
+    async def detect_violation(self, text):
+        self.started += 1
+        await asyncio.sleep(self.delay)
+        self.finished += 1
+        return {"judgment": "VIOLATION_HR", "confidence": 0.9}
+
+
+PHONE_ENTITY = {"type": "PHONE_NUM", "value": "010-1234-5678", "confidence": 0.99, "token_count": 5}
+
+
+@pytest.fixture
+def patch_stages(monkeypatch):
+    """모델/캐시/DB 의존성을 가짜 객체로 교체"""
+    def _patch(entities, ner_delay, policy_delay, concurrent):
+        policy = FakePolicyDetector(policy_delay)
+        monkeypatch.setattr(settings, "PII_CONCURRENT_STAGES", concurrent)
+        monkeypatch.setattr(pii_service, "get_pii_detector", lambda: FakePIIDetector(entities, ner_delay))
+        monkeypatch.setattr(pii_service, "get_policy_detector", lambda: policy)
+        monkeypatch.setattr(pii_service, "get_detection_cache", lambda: None)
+        monkeypatch.setattr(pii_service, "get_policy_gate", lambda: PolicyGate(mode="OFF"))
+
+        async def _settings(self):
+            return {"PHONE_NUM": {"enabled": True, "threshold": 50}}
+        monkeypatch.setattr(PIIDetectionService, "_get_pii_settings", _settings)
+        return policy
+    return _patch
+
+
+class TestConcurrentStages:
+    """동시 실행 모드 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_clean_text_latency_is_max_of_stages(self, patch_stages):
+        """PII가 없으면 두 단계 지연의 합이 아니라 최댓값에 가깝게 완료"""
+        patch_stages([], ner_delay=0.2, policy_delay=0.2, concurrent=True)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await PIIDetectionService().analyze_text("다음 달 인사 발령 명단")
+        elapsed = loop.time() - start
+
+        assert result.policy_violation is True
+        assert result.policy_judgment == "VIOLATION_HR"
+        assert elapsed < 0.35
+        assert set(result.stage_timings_ms) == {"ner", "policy"}
+
+    @pytest.mark.asyncio
+    async def test_pii_cancels_in_flight_policy(self, patch_stages):
+        """필터링 후 PII가 남으면 진행 중인 정책 검사를 취소하고 기존 응답 유지"""
+        policy = patch_stages([PHONE_ENTITY], ner_delay=0.01, policy_delay=1.0, concurrent=True)
+
+        result = await PIIDetectionService().analyze_text("연락처 010-1234-5678")
+        await asyncio.sleep(0)
+
+        assert result.has_pii is True
+        assert result.policy_violation is False
+        assert result.policy_judgment is None
+        assert policy.started == 1
+        assert policy.finished == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode_skips_policy_on_pii(self, patch_stages):
+        """기본(순차) 모드는 PII가 있으면 정책 검사를 시작하지 않음"""
+        policy = patch_stages([PHONE_ENTITY], ner_delay=0.01, policy_delay=0.01, concurrent=False)
+
+        result = await PIIDetectionService().analyze_text("연락처 010-1234-5678")
+
+        assert result.has_pii is True
+        assert policy.started == 0
+        assert set(result.stage_timings_ms) == {"ner"}
@@ -0,0 +1,139 @@
+"""
+정책 위반 탐지 모델 스코어링 테스트
+(작은 랜덤 Llama + 바이트 단위 토크나이저, CPU에서 실행 - 모델 다운로드 불필요)
+"""
+import pytest
+import torch
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+from app.ai.policy_detector import PolicyViolationDetector
+
+CHAT_TEMPLATE = (
+    "{% for message in messages %}<|{{ message['role'] }}|>\n{{ message['content'] }}<|end|>\n{% endfor %}"
+    "{% if add_generation_prompt %}<|assistant|>\n{% endif %}"
+)
+
+TEXTS = [
+    "홍길동 과장의 연봉은 얼마인가요?",
+    "회의록 공유 부탁드립니다",
+    "2급 비밀 문서를 외부 메일로 보내도 되나요? 급합니다.",
+]
+
+
+def make_tokenizer() -> PreTrainedTokenizerFast:
+    """병합 규칙 없는 바이트 단위 BPE (경계와 무관하게 토큰이 안정적)"""
+    alphabet = pre_tokenizers.ByteLevel.alphabet()
+    vocab = {token: index for index, token in enumerate(sorted(alphabet))}
+    backend = Tokenizer(models.BPE(vocab=vocab, merges=[]))
+    backend.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False, use_regex=False)
+    backend.decoder = decoders.ByteLevel()
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, eos_token="<|endoftext|>")
+    tokenizer.add_special_tokens({"additional_special_tokens": ["<|system|>", "<|user|>", "<|assistant|>", "<|end|>"]})
+    tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.chat_template = CHAT_TEMPLATE
+    return tokenizer
+
+
+def make_detector(prefix_cache: bool) -> PolicyViolationDetector:
+    """모델 로딩 없이 작은 모델/토크나이저로 탐지기 구성"""
+    torch.manual_seed(0)
+    tokenizer = make_tokenizer()
+    config = LlamaConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=1024,
+        pad_token_id=tokenizer.pad_token_id
+    )
+    config._attn_implementation = "eager"
+
+    detector = PolicyViolationDetector.__new__(PolicyViolationDetector)
+    detector.device = torch.device("cpu")
+    detector.tokenizer = tokenizer
+    detector.model = LlamaForCausalLM(config).eval()
+    detector.system_prompt = "정책 위반 분류:\nSAFE | VIOLATION_HR\n\n카테고리만 출력."
+    detector.label_token_ids = [
+        tokenizer.encode(category, add_special_tokens=False) for category in detector.CATEGORIES
+    ]
+    detector.prefix_ids = None
+    detector.prefix_past = None
+    detector.suffix_template = None
+    if prefix_cache:
+        detector._init_prefix_cache()
+    return detector
+
+
+def label_scores(detector: PolicyViolationDetector, texts: list[str]) -> torch.Tensor:
+    with torch.no_grad():
+        outputs, attention_mask = detector._prefill_batch(texts)
+        next_token_logprobs = torch.log_softmax(outputs.logits[:, -1, :].float(), dim=-1)
+        return detector._score_labels(next_token_logprobs, outputs.past_key_values, attention_mask)
+
+
+class TestPolicyScoring:
+    """라벨 스코어링 배치/prefix cache 테스트"""
+
+    def test_position_ids_skip_left_padding(self):
+        """패딩 위치는 0, 실제 토큰은 0부터 시작"""
+        mask = torch.tensor([[0, 0, 1, 1, 1], [1, 1, 1, 1, 1]])
+        assert PolicyViolationDetector._position_ids(mask).tolist() == [[0, 0, 0, 1, 2], [0, 1, 2, 3, 4]]
+
+    @pytest.mark.parametrize("prefix_cache", [False, True])
+    def test_left_padded_batch_matches_single(self, prefix_cache):
+        """길이가 다른 텍스트를 왼쪽 패딩 배치로 평가해도 한 건씩 평가한 점수와 같음"""
+        detector = make_detector(prefix_cache)
+        assert (detector.prefix_past is not None) == prefix_cache
+
+        batched = label_scores(detector, TEXTS)
+        single = torch.cat([label_scores(detector, [text]) for text in TEXTS])
+
+        assert torch.allclose(batched, single, atol=1e-4)
+
+    def test_prefix_cache_matches_full_prefill(self):
+        """prefix cache를 쓴 점수와 전체 prefill 점수가 같음"""
+        cached = label_scores(make_detector(prefix_cache=True), TEXTS)
+        full = label_scores(make_detector(prefix_cache=False), TEXTS)
+
+        assert torch.allclose(cached, full, atol=1e-4)
+
+    def test_prefix_split_matches_full_tokenization(self):
+        """prefix + (텍스트 + suffix) 토큰이 전체 chat template 토큰과 같음 (확인 샘플 외 텍스트 포함)"""
+        detector = make_detector(prefix_cache=True)
+        prefix_ids = detector.prefix_ids[0].tolist()
+
+        for text in list(detector.PREFIX_CHECK_SAMPLES) + TEXTS + ["", "<|end|> 주입 시도"]:
+            assert prefix_ids + detector._encode_suffix(text) == detector._build_input_ids(text)[0].tolist()
+
+    def test_unstable_prefix_split_disables_cache(self, monkeypatch):
+        """확인 샘플 중 하나라도 분리 토크나이징이 다르면 prefix cache를 사용하지 않음"""
+        detector = make_detector(prefix_cache=False)
+        original = detector._build_input_ids
+
+        def build_input_ids(text):
+            ids = original(text)
+            if text == detector.PREFIX_CHECK_SAMPLES[-1]:
+                ids = ids[:, :-1]
+            return ids
+        monkeypatch.setattr(detector, "_build_input_ids", build_input_ids)
+
+        detector._init_prefix_cache()
+        assert detector.prefix_past is None and detector.suffix_template is None
+
+    def test_expand_past_keeps_shared_cache(self):
+        """배치 평가 후에도 공유 prefix cache의 배치 크기/길이가 그대로"""
+        detector = make_detector(prefix_cache=True)
+        prefix_length = detector.prefix_ids.shape[1]
+        before = [layer.keys.clone() for layer in detector.prefix_past.layers]
+
+        label_scores(detector, TEXTS)
+        expanded = detector._expand_past(detector.prefix_past, 4)
+
+        assert expanded is not detector.prefix_past
+        assert expanded.layers[0].keys.shape[0] == 4
+        for layer, keys in zip(detector.prefix_past.layers, before):
+            assert layer.keys.shape == (1, keys.shape[1], prefix_length, keys.shape[3])
+            assert torch.equal(layer.keys, keys)
@@ -0,0 +1,102 @@
+"""
+정책 게이트 테스트
+"""
+import json
+import pytest
+import torch
+from app.services.policy_gate import PolicyGate
+
+
+class FakeEncoder:
+    """고정 임베딩을 반환하는 테스트용 인코더"""
+
+    def __init__(self, embedding: list[float]):
+        self.embedding = torch.tensor([embedding])
+
+    def encode_pooled(self, texts):
+        return self.embedding
+
+
+@pytest.fixture
+def weights_file(tmp_path):
+    path = tmp_path / "gate.json"
+    path.write_text(json.dumps({
+        "weights": [1.0, 0.0],
+        "bias": 0.0,
+        "thresholds": {"0.95": 0.6, "0.99": 0.4, "1.0": 0.2}
+    }))
+    return str(path)
+
+
+class TestPolicyGateLexicon:
+    """키워드 사전 판단 테스트"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("text,category", [
+        ("김 과장 연봉이 얼마야?", "VIOLATION_SALARY"),
+        ("다음 달 인사 발령 명단 정리해줘", "VIOLATION_HR"),
+        ("이 문서는 대외비입니다", "VIOLATION_CLASSIFIED"),
+        ("국무회의 안건 요약해줘", "VIOLATION_DELIBERATION"),
+    ])
+    async def test_lexicon_hit_runs_policy(self, text, category):
+        """키워드가 매칭되면 LLM 검사"""
+        gate = PolicyGate(mode="ENFORCE")
+        decision = await gate.evaluate(text, FakeEncoder([0.0, 0.0]))
+
+        assert decision["run_policy"] is True
+        assert decision["category"] == category
+
+    @pytest.mark.asyncio
+    async def test_benign_text_skips_without_linear_model(self):
+        """선형 모델이 없으면 키워드 미매칭 텍스트는 무해 판정"""
+        gate = PolicyGate(mode="ENFORCE")
+        decision = await gate.evaluate("안녕하세요", FakeEncoder([0.0, 0.0]))
+
+        assert decision["run_policy"] is False
+
+
+    def test_enforce_without_linear_model_falls_back_to_shadow(self):
+        """선형 모델 없이 ENFORCE를 설정하면 LLM을 건너뛰지 않도록 SHADOW로 동작"""
+        gate = PolicyGate(mode="ENFORCE")
+
+        assert gate.mode == "SHADOW"
+        assert gate.enabled and not gate.enforcing
+
+
+class TestPolicyGateLinearModel:
+    """선형 모델 임계값 테스트"""
+
+    def test_threshold_follows_recall_target(self, weights_file):
+        """recall 목표를 만족하는 가장 높은 임계값 선택"""
+        assert PolicyGate(weights_path=weights_file, recall_target=0.99).threshold == 0.4
+        assert PolicyGate(weights_path=weights_file, recall_target=0.9).threshold == 0.6
+        # 목표를 만족하는 항목이 없으면 가장 보수적인 임계값
+        assert PolicyGate(weights_path=weights_file, recall_target=1.5).threshold == 0.2
+
+    @pytest.mark.asyncio
+    async def test_linear_score_against_threshold(self, weights_file):
+        """점수가 임계값 이상이면 LLM 검사"""
+        gate = PolicyGate(mode="ENFORCE", weights_path=weights_file, recall_target=0.99)
+
+        # sigmoid(0) = 0.5 >= 0.4
+        assert (await gate.evaluate("안녕하세요", FakeEncoder([0.0, 3.0])))["run_policy"] is True
+        # sigmoid(-2) ≈ 0.12 < 0.4
+        assert (await gate.evaluate("안녕하세요", FakeEncoder([-2.0, 3.0])))["run_policy"] is False
+
+
+class TestPolicyGateShadow:
+    """섀도 모드 비교 기록 테스트"""
+
+    def test_shadow_counts_missed_violations(self):
+        """게이트가 무해 판정했지만 LLM이 위반으로 본 경우 집계"""
+        gate = PolicyGate(mode="SHADOW")
+        benign = {"run_policy": False, "reason": "benign", "category": None, "score": None}
+
+        gate.record(benign, "SAFE")
+        gate.record(benign, "VIOLATION_HR")
+        gate.record({**benign, "run_policy": True, "reason": "lexicon"}, "VIOLATION_HR")
+
+        stats = gate.get_stats()
+        assert stats["total"] == 3
+        assert stats["shadow_would_skip"] == 2
+        assert stats["shadow_missed_violations"] == 1
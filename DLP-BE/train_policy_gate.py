@@ -0,0 +1,129 @@
+"""
+정책 게이트 선형 모델 학습 스크립트
+
+RoBERTa PII 모델의 mean pooling 임베딩 위에 로지스틱 회귀를 학습하고,
+검증셋에서 recall 목표별 임계값을 계산하여 JSON으로 저장합니다.
+출력 파일 경로를 POLICY_GATE_WEIGHTS_PATH로 지정하면 게이트가 사용합니다.
+
+입력 JSONL 형식 (한 줄에 하나):
+    {"text": "...", "judgment": "SAFE" | "VIOLATION_*"}
+
+사용법:
+    python train_policy_gate.py data/policy_train.jsonl --output .cache/policy_gate.json
+"""
+import argparse
+import json
+import random
+
+import torch
+
+from app.ai.pii_detector import RobertaKoreanPIIDetector
+
+RECALL_TARGETS = [0.9, 0.95, 0.98, 0.99, 0.995, 1.0]
+
+
+def load_dataset(path: str) -> tuple[list[str], list[float]]:
+    """JSONL에서 텍스트와 위반 여부(1.0/0.0) 로드"""
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            texts.append(row["text"])
+            labels.append(0.0 if row["judgment"] == "SAFE" else 1.0)
+    return texts, labels
+
+
+def embed(detector: RobertaKoreanPIIDetector, texts: list[str], batch_size: int) -> torch.Tensor:
+    """배치 단위 임베딩 계산"""
+    chunks = [detector.encode_pooled(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+    return torch.cat(chunks)
+
+
+def recall_thresholds(scores: torch.Tensor, labels: torch.Tensor) -> dict[str, float]:
+    """
+    recall 목표별로 해당 recall을 만족하는 가장 높은 임계값
+
+    Raises:
+        ValueError: 검증셋에 위반 샘플이 없음 (recall을 계산할 수 없음)
+    """
+    positive_scores = scores[labels == 1].sort(descending=True).values
+    if len(positive_scores) == 0:
+        raise ValueError(
+            "validation split has no violation samples; add VIOLATION_* rows or raise --validation-ratio"
+        )
+    thresholds = {}
+    for target in RECALL_TARGETS:
+        # 상위 k개 위반 샘플을 포함해야 target recall 달성
+        k = max(1, int(torch.ceil(torch.tensor(target * len(positive_scores)))))
+        thresholds[str(target)] = float(positive_scores[k - 1])
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train policy gate linear model")
+    parser.add_argument("dataset")
+    parser.add_argument("--output", default=".cache/policy_gate.json")
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--validation-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    texts, labels = load_dataset(args.dataset)
+    indices = list(range(len(texts)))
+    random.Random(42).shuffle(indices)
+    split = int(len(indices) * (1 - args.validation_ratio))
+    # 임베딩 계산 전에 검증셋에 위반 샘플이 있는지 확인 (없으면 recall 임계값을 계산할 수 없음)
+    if not any(labels[i] == 1.0 for i in indices[split:]):
+        raise SystemExit(
+            "error: validation split has no violation samples; add VIOLATION_* rows or raise --validation-ratio"
+        )
+
+    print("Loading PII model...")
+    detector = RobertaKoreanPIIDetector()
+    features = embed(detector, texts, args.batch_size)
+    targets = torch.tensor(labels)
+
+    train_idx = torch.tensor(indices[:split])
+    valid_idx = torch.tensor(indices[split:])
+
+    # 위반 샘플이 적으므로 양성 가중치로 클래스 불균형 보정
+    positives = targets[train_idx].sum().clamp(min=1)
+    pos_weight = (len(train_idx) - positives) / positives
+
+    linear = torch.nn.Linear(features.shape[1], 1)
+    optimizer = torch.optim.Adam(linear.parameters(), lr=1e-3, weight_decay=1e-4)
+    loss_fn = torch.nn.BCEWithLogitsLoss(pos_weight=pos_weight)
+
+    for epoch in range(args.epochs):
+        optimizer.zero_grad()
+        loss = loss_fn(linear(features[train_idx]).squeeze(-1), targets[train_idx])
+        loss.backward()
+        optimizer.step()
+        if (epoch + 1) % 50 == 0:
+            print(f"epoch {epoch + 1}: loss {loss.item():.4f}")
+
+    with torch.no_grad():
+        valid_scores = torch.sigmoid(linear(features[valid_idx]).squeeze(-1))
+    thresholds = recall_thresholds(valid_scores, targets[valid_idx])
+
+    valid_labels = targets[valid_idx]
+    print()
+    print(f"| recall target | threshold | skip rate (SAFE) |")
+    print(f"|---|---|---|")
+    for target, threshold in thresholds.items():
+        skip_rate = (valid_scores[valid_labels == 0] < threshold).float().mean().item()
+        print(f"| {target} | {threshold:.4f} | {skip_rate:.1%} |")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "weights": linear.weight[0].tolist(),
+            "bias": float(linear.bias[0]),
+            "thresholds": thresholds
+        }, f)
+    print(f"\nSaved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,277 @@
 """
 백엔드 API 통신 모듈
 """
+import asyncio
+import io
+import threading
 import time
-import requests
-from typing import Dict, Any, List, Tuple, Optional
+import httpx
+from typing import Dict, Any, List, Set, Tuple, Optional, Union
 from datetime import datetime
 
 from config import (
     BACKEND_URL,
     BACKEND_TIMEOUT,
+    BACKEND_CONNECT_TIMEOUT,
+    BACKEND_POOL_TIMEOUT,
+    BACKEND_POOL_SIZE,
+    BACKEND_POOL_KEEPALIVE,
+    BACKEND_KEEPALIVE_EXPIRY,
+    BACKEND_DEADLINE,
     BACKEND_RETRY,
+    FILE_MAX_BYTES,
+    FILE_PROCESS_TIMEOUT,
     BACKEND_API_KEY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_SLOW_CALL_SECONDS,
+    BREAKER_SLOW_CALL_THRESHOLD,
+    BREAKER_OPEN_SECONDS,
+    VERDICT_CACHE_SIZE,
+    VERDICT_CACHE_TTL,
     APIEndpoints,
     BLOCK_ON_BACKEND_ERROR
 )
 from logger import logger
+from circuit_breaker import CircuitBreaker, VerdictCache
+
+
+class _MemoryReader(io.RawIOBase):
+    """bytes/memoryview를 복사 없이 파일처럼 읽는 래퍼 (httpx multipart 스트리밍용)"""
+
+    def __init__(self, data: Union[bytes, memoryview]):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
 
 
 class BackendClient:
     """백엔드 API와 통신하는 클라이언트"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        sync_transport: Optional[httpx.BaseTransport] = None
+    ):
+        """
+        Args:
+            transport: 테스트/부하 테스트용 httpx 비동기 전송 계층 (기본: 실제 네트워크)
+            sync_transport: 테스트용 httpx 동기 전송 계층 (헬스 체크)
+        """
         self.base_url = BACKEND_URL
         self.timeout = BACKEND_TIMEOUT
+        self.deadline = BACKEND_DEADLINE
         self.retry_count = BACKEND_RETRY
         self.api_key = BACKEND_API_KEY
+        self.transport = transport
+        self.sync_transport = sync_transport
 
-        # 기본 헤더 설정 (간소화)
-        self.headers = {
-            "Content-Type": "application/json"
-        }
+        # 기본 헤더 설정 (Content-Type은 요청별로 httpx가 설정: JSON / 파일 multipart)
+        self.headers = {}
         if self.api_key:
             self.headers["X-API-Key"] = self.api_key
 
-    def comprehensive_analysis(
+        # 연결 풀 설정 (백엔드로 가는 TCP 연결을 요청 간에 재사용)
+        self.limits = httpx.Limits(
+            max_connections=BACKEND_POOL_SIZE,
+            max_keepalive_connections=BACKEND_POOL_KEEPALIVE,
+            keepalive_expiry=BACKEND_KEEPALIVE_EXPIRY
+        )
+
+        # 모든 요청이 공유하는 keep-alive 클라이언트 (첫 요청 시 생성)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._sync_lock = threading.Lock()
+
+        # 연결 풀 통계 (요청 수 대비 새로 연결한 횟수)
+        self._stats = {"requests": 0, "connections_opened": 0}
+
+        # 백엔드 장애 시 빠른 폴백 (브레이커 open 동안 반복 프롬프트는 최근 판정으로 응답)
+        self.breaker = CircuitBreaker(
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            slow_call_seconds=BREAKER_SLOW_CALL_SECONDS,
+            slow_call_threshold=BREAKER_SLOW_CALL_THRESHOLD,
+            open_seconds=BREAKER_OPEN_SECONDS
+        )
+        self.verdict_cache = VerdictCache(max_size=VERDICT_CACHE_SIZE, ttl_seconds=VERDICT_CACHE_TTL)
+
+    def _timeout(self, budget: Optional[float] = None) -> httpx.Timeout:
+        """연결/읽기/풀 대기 타임아웃 (budget: 남은 deadline)"""
+        cap = budget if budget is not None else float("inf")
+        return httpx.Timeout(
+            min(self.timeout, cap),
+            connect=min(BACKEND_CONNECT_TIMEOUT, cap),
+            pool=min(BACKEND_POOL_TIMEOUT, cap)
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """공유 비동기 HTTP 클라이언트 반환 (mitmproxy 이벤트 루프에서 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self._timeout(),
+                limits=self.limits,
+                transport=self.transport
+            )
+        return self._client
+
+    def _get_sync_client(self) -> httpx.Client:
+        """공유 동기 HTTP 클라이언트 반환 (여러 스레드에서 호출해도 하나만 생성)"""
+        with self._sync_lock:
+            if self._sync_client is None or self._sync_client.is_closed:
+                self._sync_client = httpx.Client(
+                    base_url=self.base_url,
+                    headers=self.headers,
+                    timeout=self._timeout(),
+                    limits=self.limits,
+                    transport=self.sync_transport
+                )
+            return self._sync_client
+
+    async def aclose(self):
+        """공유 클라이언트 종료 (프록시 종료 시)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        with self._sync_lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        """httpcore trace 콜백 - 새 TCP 연결 수 집계"""
+        if event_name == "connection.connect_tcp.complete":
+            self._stats["connections_opened"] += 1
+
+    def _trace_sync(self, event_name: str, info: Dict[str, Any]):
+        """httpcore trace 콜백 (동기 클라이언트용)"""
+        if event_name == "connection.connect_tcp.complete":
+            self._stats["connections_opened"] += 1
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """연결 풀 통계 (요청 수, 새 연결 수, 재사용률, 현재 풀 연결 상태)"""
+        requests_count = self._stats["requests"]
+        opened = self._stats["connections_opened"]
+        stats = {
+            "requests": requests_count,
+            "connections_opened": opened,
+            "reuse_ratio": round(1 - opened / requests_count, 3) if requests_count else None,
+            "max_connections": self.limits.max_connections,
+        }
+
+        # httpcore 풀의 연결 목록 (기본 전송 계층일 때만)
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["open"] = len(connections)
+            stats["idle"] = sum(1 for conn in connections if conn.is_idle())
+        return stats
+
+    async def _post_json(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        client_ip: Optional[str],
+        attempt: int,
+        deadline: float,
+        token: str
+    ) -> Optional[httpx.Response]:
+        """
+        요청 단위 deadline 안에서 JSON POST 1회 수행 (token: breaker.allow_request()가 준 호출 토큰)
+
+        Returns:
+            응답 (deadline이 지났거나 브레이커가 열려 재시도하지 않으면 None)
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warn("Backend deadline exceeded")
+            return None
+        if attempt > 0 and self.breaker.state != CircuitBreaker.CLOSED:
+            logger.warn("Circuit breaker is not closed, skipping retry")
+            return None
+
+        # 헤더 구성 (클라이언트 IP 포함)
+        headers = {"X-Forwarded-For": client_ip} if client_ip else None
+
+        logger.debug(f"POST {endpoint} (attempt {attempt + 1}/{self.retry_count}, {remaining:.1f}s left)")
+        self._stats["requests"] += 1
+        start_time = time.monotonic()
+        try:
+            # httpx 타임아웃은 단계별(연결/읽기 1회) 제한이므로 전체 시간은 deadline으로 별도 제한
+            async with asyncio.timeout(remaining):
+                response = await self._get_client().post(
+                    endpoint,
+                    json=payload,
+                    headers=headers,
+                    timeout=self._timeout(remaining),
+                    extensions={"trace": self._trace}
+                )
+        except TimeoutError as e:
+            self.breaker.record_failure("deadline exceeded", token)
+            raise httpx.TimeoutException("Backend deadline exceeded") from e
+        except httpx.TransportError as e:
+            self.breaker.record_failure(type(e).__name__, token)
+            raise
+        except BaseException:
+            # 클라이언트 연결 종료로 인한 취소 등은 백엔드 장애가 아니므로
+            # 실패로 세지 않고 탐색 요청 자리만 반납 (half_open에서 멈추지 않도록)
+            self.breaker.release_probe(token)
+            raise
+
+        # 과부하(429)와 서버 오류는 실패, 그 외 응답은 지연 시간 SLO로 판단
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure(f"HTTP {response.status_code}", token)
+        else:
+            self.breaker.record_success(time.monotonic() - start_time, token)
+
+        logger.debug(f"Backend pool: {self.pool_stats()}, breaker: {self.breaker.state}")
+        return response
+
+    def _remember(self, cache_key: str, verdict: Tuple[bool, str, Optional[Dict]]) -> Tuple[bool, str, Optional[Dict]]:
+        """백엔드 판정을 최근 판정 캐시에 저장 후 그대로 반환"""
+        self.verdict_cache.put(cache_key, verdict)
+        return verdict
+
+    def _backend_unavailable(self, cache_key: str, reason: str = "backend_unavailable") -> Tuple[bool, str, Optional[Dict]]:
+        """백엔드 응답이 없을 때 판정 (최근 판정 캐시 → BLOCK_ON_BACKEND_ERROR 정책)"""
+        cached = self.verdict_cache.get(cache_key)
+        if cached is not None:
+            print(f"💾 [캐시 판정] 백엔드 대신 최근 판정 사용 ({reason})")
+            logger.warn(f"Backend unavailable ({reason}), using cached verdict")
+            return cached
+
+        if BLOCK_ON_BACKEND_ERROR:
+            logger.warn(f"Backend unavailable ({reason}), blocking by default")
+            return (True, reason, {"message": "서비스를 일시적으로 사용할 수 없습니다."})
+        else:
+            logger.warn(f"Backend unavailable ({reason}), allowing by default")
+            return (False, reason, None)
+
+    async def _backoff(self, attempt: int, deadline: float, delay: float):
+        """이벤트 루프를 막지 않는 재시도 대기 (deadline 초과 시 생략)"""
+        if attempt < self.retry_count - 1:
+            await asyncio.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+
+    async def comprehensive_analysis(
         self,
         prompt: str,
         files_data: List[Dict[str, Any]],
@@ -66,30 +304,22 @@ class BackendClient:
             logger.debug("No text content to check, allowing")
             return (False, "no_content", None)
         
-        endpoint = f"{self.base_url}{APIEndpoints.COMPREHENSIVE_ANALYSIS}"
+        endpoint = APIEndpoints.COMPREHENSIVE_ANALYSIS
         payload = {"text": all_text.strip()}
+        cache_key = VerdictCache.make_key(endpoint, payload["text"])
 
-        for attempt in range(self.retry_count):
-            try:
-                logger.debug(f"Comprehensive analysis (attempt {attempt + 1}/{self.retry_count})")
-
-                start_time = time.time()
-
-                # 헤더 구성 (클라이언트 IP 포함)
-                headers = self.headers.copy()
-                if client_ip:
-                    headers["X-Forwarded-For"] = client_ip
+        # 브레이커가 열려 있으면 백엔드를 기다리지 않고 즉시 폴백
+        token = self.breaker.allow_request()
+        if token is None:
+            return self._backend_unavailable(cache_key, "circuit_open")
 
-                # requests 세션을 사용해서 더 안정적으로 요청
-                with requests.Session() as session:
-                    session.headers.update(headers)
-                    response = session.post(
-                        endpoint,
-                        json=payload,
-                        timeout=(5, self.timeout)  # (연결 타임아웃, 읽기 타임아웃)
-                    )
+        deadline = time.monotonic() + self.deadline
 
-                elapsed = time.time() - start_time
+        for attempt in range(self.retry_count):
+            try:
+                response = await self._post_json(endpoint, payload, client_ip, attempt, deadline, token)
+                if response is None:
+                    break
 
                 if response.status_code == 200:
                     result = response.json()
@@ -123,7 +353,7 @@ class BackendClient:
                         from response import ResponseGenerator
                         formatted_message = ResponseGenerator.format_comprehensive_analysis_message(result)
                         
-                        return (
+                        return self._remember(cache_key, (
                             True,
                             "_".join(block_reasons),
                             {
@@ -132,9 +362,9 @@ class BackendClient:
                                 "pii_entities": pii_entities,
                                 "similarity_docs": matched_docs
                             }
-                        )
+                        ))
                     else:
-                        return (False, "analysis_passed", None)
+                        return self._remember(cache_key, (False, "analysis_passed", None))
 
                 elif response.status_code == 400:
                     logger.warn(f"Backend validation error: {response.text[:200]}")
@@ -143,16 +373,17 @@ class BackendClient:
                 elif response.status_code == 429:
                     # Rate limit
                     logger.warn(f"Rate limited by backend, waiting...")
-                    time.sleep(2 ** attempt)
+                    await self._backoff(attempt, deadline, 2 ** attempt)
+                    continue
 
                 else:
                     logger.warn(f"Backend returned HTTP {response.status_code}: {response.text[:200]}")
 
-            except requests.exceptions.Timeout as e:
+            except httpx.TimeoutException as e:
                 print(f"⏰ [타임아웃] 백엔드 응답 시간 초과")
                 logger.warn(f"Backend timeout (attempt {attempt + 1}/{self.retry_count}): {e}")
 
-            except requests.exceptions.ConnectionError:
+            except httpx.ConnectError:
                 print(f"❌ [연결 실패] 백엔드 서버 연결 실패")
                 logger.error(f"Cannot connect to backend at {self.base_url}")
 
@@ -161,18 +392,12 @@ class BackendClient:
                 logger.error(f"Backend error: {e}")
 
             # 재시도 대기
-            if attempt < self.retry_count - 1:
-                time.sleep(0.5 * (attempt + 1))
+            await self._backoff(attempt, deadline, 0.5 * (attempt + 1))
 
         # 백엔드 실패 시 처리
-        if BLOCK_ON_BACKEND_ERROR:
-            logger.warn("Backend unavailable, blocking by default")
-            return (True, "backend_unavailable", {"message": "서비스를 일시적으로 사용할 수 없습니다."})
-        else:
-            logger.warn("Backend unavailable, allowing by default")
-            return (False, "backend_unavailable", None)
+        return self._backend_unavailable(cache_key)
 
-    def check_content(
+    async def check_content(
         self,
         prompt: str,
         files_data: List[Dict[str, Any]],
@@ -202,30 +427,22 @@ class BackendClient:
             logger.debug("No text content to check, allowing")
             return (False, "no_content", None)
         
-        endpoint = f"{self.base_url}{APIEndpoints.CHECK_CONTENT}"
+        endpoint = APIEndpoints.CHECK_CONTENT
         payload = {"text": all_text.strip()}
+        cache_key = VerdictCache.make_key(endpoint, payload["text"])
 
-        for attempt in range(self.retry_count):
-            try:
-                logger.debug(f"Checking PII (attempt {attempt + 1}/{self.retry_count})")
-
-                start_time = time.time()
-
-                # 헤더 구성 (클라이언트 IP 포함)
-                headers = self.headers.copy()
-                if client_ip:
-                    headers["X-Forwarded-For"] = client_ip
+        # 브레이커가 열려 있으면 백엔드를 기다리지 않고 즉시 폴백
+        token = self.breaker.allow_request()
+        if token is None:
+            return self._backend_unavailable(cache_key, "circuit_open")
 
-                # requests 세션을 사용해서 더 안정적으로 요청
-                with requests.Session() as session:
-                    session.headers.update(headers)
-                    response = session.post(
-                        endpoint,
-                        json=payload,
-                        timeout=(5, self.timeout)  # (연결 타임아웃, 읽기 타임아웃)
-                    )
+        deadline = time.monotonic() + self.deadline
 
-                elapsed = time.time() - start_time
+        for attempt in range(self.retry_count):
+            try:
+                response = await self._post_json(endpoint, payload, client_ip, attempt, deadline, token)
+                if response is None:
+                    break
 
                 if response.status_code == 200:
                     result = response.json()
@@ -268,7 +485,7 @@ class BackendClient:
                             block_type = f"policy_violation_{policy_judgment or 'detected'}"
                             message = f"정책 위반이 탐지되어 전송이 차단되었습니다.\n\n{details}"
 
-                        return (
+                        return self._remember(cache_key, (
                             True,
                             block_type,
                             {
@@ -279,9 +496,9 @@ class BackendClient:
                                 "policy_judgment": policy_judgment,
                                 "policy_confidence": policy_confidence
                             }
-                        )
+                        ))
                     else:
-                        return (False, "no_detection", None)
+                        return self._remember(cache_key, (False, "no_detection", None))
 
                 elif response.status_code == 400:
                     logger.warn(f"Backend validation error: {response.text[:200]}")
@@ -290,16 +507,17 @@ class BackendClient:
                 elif response.status_code == 429:
                     # Rate limit
                     logger.warn(f"Rate limited by backend, waiting...")
-                    time.sleep(2 ** attempt)
+                    await self._backoff(attempt, deadline, 2 ** attempt)
+                    continue
 
                 else:
                     logger.warn(f"Backend returned HTTP {response.status_code}: {response.text[:200]}")
 
-            except requests.exceptions.Timeout as e:
+            except httpx.TimeoutException as e:
                 print(f"⏰ [타임아웃] 백엔드 응답 시간 초과")
                 logger.warn(f"Backend timeout (attempt {attempt + 1}/{self.retry_count}): {e}")
 
-            except requests.exceptions.ConnectionError:
+            except httpx.ConnectError:
                 print(f"❌ [연결 실패] 백엔드 서버 연결 실패")
                 logger.error(f"Cannot connect to backend at {self.base_url}")
 
@@ -308,131 +526,165 @@ class BackendClient:
                 logger.error(f"Backend error: {e}")
 
             # 재시도 대기
-            if attempt < self.retry_count - 1:
-                time.sleep(0.5 * (attempt + 1))
+            await self._backoff(attempt, deadline, 0.5 * (attempt + 1))
 
         # 백엔드 실패 시 처리
-        if BLOCK_ON_BACKEND_ERROR:
-            logger.warn("Backend unavailable, blocking by default")
-            return (True, "backend_unavailable", {"message": "서비스를 일시적으로 사용할 수 없습니다."})
-        else:
-            logger.warn("Backend unavailable, allowing by default")
-            return (False, "backend_unavailable", None)
+        return self._backend_unavailable(cache_key)
         
 
-    def process_file(
+    async def post_audit(
         self,
-        file_bytes: bytes,
+        prompt: str,
+        entities: List[Dict[str, Any]],
+        reason: str,
+        client_ip: Optional[str] = None
+    ) -> bool:
+        """
+        프록시에서 확정 차단한 요청의 감사 로그 전송 (실패해도 차단 결과에는 영향 없음)
+
+        Args:
+            prompt: 차단된 프롬프트
+            entities: 프록시 스캐너 탐지 결과
+            reason: 차단 사유
+            client_ip: 클라이언트 IP 주소 (백엔드 로그 기록용)
+
+        Returns:
+            전송 성공 여부
+        """
+        payload = {
+            "text": prompt[:10000],  # 백엔드 입력 최대 길이
+            "entities": [
+                {k: e[k] for k in ("type", "value", "confidence", "token_count", "start", "end")}
+                for e in entities
+            ],
+            "reason": reason,
+            "source": "proxy_regex"
+        }
+        headers = {"X-Forwarded-For": client_ip} if client_ip else None
+
+        try:
+            async with asyncio.timeout(self.deadline):
+                response = await self._get_client().post(
+                    APIEndpoints.PII_AUDIT,
+                    json=payload,
+                    headers=headers,
+                    timeout=self._timeout(self.deadline)
+                )
+            if response.status_code >= 400:
+                logger.warn(f"Audit log rejected by backend: HTTP {response.status_code}")
+                return False
+            return True
+
+        except Exception as e:
+            logger.warn(f"Failed to send audit log: {type(e).__name__}: {e}")
+            return False
+
+    async def get_enabled_pii_types(self) -> Optional[Set[str]]:
+        """
+        관리자 PII 설정에서 활성화된 타입 조회 (정규식 빠른 경로 필터용)
+
+        Returns:
+            활성 타입 집합 (조회 실패 시 None)
+        """
+        try:
+            async with asyncio.timeout(self.deadline):
+                response = await self._get_client().get(
+                    APIEndpoints.PII_SETTINGS,
+                    timeout=self._timeout(self.deadline)
+                )
+            if response.status_code != 200:
+                logger.warn(f"PII settings request failed: HTTP {response.status_code}")
+                return None
+            return set(response.json().get("enabled_types", []))
+
+        except Exception as e:
+            logger.warn(f"Failed to fetch PII settings: {type(e).__name__}: {e}")
+            return None
+
+    async def process_file(
+        self,
+        file_bytes: Union[bytes, memoryview],
         filename: str,
         content_type: str
     ) -> Dict[str, Any]:
         """
         파일 처리 요청 - 파일 원본을 백엔드로 전송
-        백엔드에서 PDF 파싱, OCR, 텍스트 추출 등 모든 처리 수행
+        백엔드에서 페이지 단위 텍스트 추출(PDF, DOCX, OCR)과 PII 탐지 수행
+
+        파일 추출은 일반 탐지보다 훨씬 오래 걸리므로 서킷 브레이커 SLO에는 포함하지 않고
+        FILE_PROCESS_TIMEOUT으로만 제한합니다.
 
         Args:
-            file_bytes: 파일 원본 바이트 데이터
+            file_bytes: 파일 원본 바이트 데이터 (멀티파트 파트는 요청 본문의 memoryview, 복사 없음)
             filename: 파일명
             content_type: 콘텐츠 타입
 
         Returns:
-            백엔드에서 처리된 결과 (추출된 텍스트 포함)
+            백엔드 처리 결과 (text: 추출 텍스트 앞부분, has_pii, entities(page 포함) 등)
+            실패 시 {"filename", "content_type", "text": "", "error", "size"}
         """
-        # ========== 임시 테스트 로직 (백엔드 개발 전) ==========
-        # 파일 처리 없이 기본 정보만 반환
-        logger.debug(f"TEST: Mock processing file {filename} ({len(file_bytes)} bytes)")
-        
-        # 텍스트 파일인 경우 내용 확인
-        extracted_text = ""
-        if content_type.startswith("text/") or filename.endswith((".txt", ".md", ".json")):
-            try:
-                extracted_text = file_bytes.decode("utf-8", errors="ignore")[:1000]  # 처음 1000자만
-                logger.debug(f"TEST: Extracted {len(extracted_text)} chars from text file")
-            except:
-                pass
-        
-        return {
-            "filename": filename,
-            "content_type": content_type,
-            "text": extracted_text,
-            "size": len(file_bytes),
-            "processed_by": "test_mock"
-        }
-        
-        # ========== 실제 백엔드 통신 코드 (주석 처리) ==========
-        # 백엔드 개발 완료 후 위의 테스트 로직을 제거하고 아래 코드 활성화
-        """
-        endpoint = f"{self.base_url}{APIEndpoints.PROCESS_FILE}"
-
-        # 파일 크기 체크 (선택적)
-        max_size = 50 * 1024 * 1024  # 50MB
-        if len(file_bytes) > max_size:
-            logger.warn(f"File {filename} too large ({len(file_bytes)} bytes), skipping")
-            return {
-                "filename": filename,
-                "content_type": content_type,
-                "text": "",
-                "error": "file_too_large",
-                "size": len(file_bytes)
-            }
+        endpoint = APIEndpoints.PROCESS_FILE
+        size = len(file_bytes)
+        failed = {"filename": filename, "content_type": content_type, "text": "", "size": size}
+
+        if size > FILE_MAX_BYTES:
+            logger.warn(f"File {filename} too large ({size} bytes), skipping")
+            return {**failed, "error": "file_too_large"}
+
+        deadline = time.monotonic() + FILE_PROCESS_TIMEOUT
 
         for attempt in range(self.retry_count):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
                 logger.debug(f"Sending file {filename} to backend (attempt {attempt + 1}/{self.retry_count})")
+                self._stats["requests"] += 1
 
-                # 파일 원본을 multipart/form-data로 전송
-                files = {
-                    'file': (filename, file_bytes, content_type)
-                }
-
-                # 추가 메타데이터가 필요한 경우
-                data = {
-                    'process_options': 'ocr,extract_text,parse_pdf'
-                }
-
-                response = requests.post(
-                    endpoint,
-                    files=files,
-                    data=data,
-                    headers={"X-API-Key": self.api_key} if self.api_key else {},
-                    timeout=self.timeout * 2  # 파일 처리는 더 오래 걸릴 수 있음
-                )
+                # memoryview를 복사하지 않고 청크 단위로 읽어 multipart 본문으로 스트리밍
+                files = {"file": (filename, _MemoryReader(file_bytes), content_type or "application/octet-stream")}
+                async with asyncio.timeout(remaining):
+                    response = await self._get_client().post(
+                        endpoint,
+                        files=files,
+                        data={"process_options": "ocr,extract_text,parse_pdf"},
+                        timeout=httpx.Timeout(remaining, connect=min(BACKEND_CONNECT_TIMEOUT, remaining)),
+                        extensions={"trace": self._trace}
+                    )
 
                 if response.status_code == 200:
                     result = response.json()
-                    logger.debug(f"File processed by backend: {filename}, extracted {len(result.get('text', ''))} chars")
+                    logger.debug(
+                        f"File processed by backend: {filename}, pages {result.get('pages_processed')}/"
+                        f"{result.get('pages_total')}, has_pii: {result.get('has_pii')}"
+                    )
                     return result
 
-                else:
-                    logger.warn(f"Backend file processing failed with HTTP {response.status_code}")
+                if response.status_code == 413:
+                    return {**failed, "error": "file_too_large"}
+
+                logger.warn(f"Backend file processing failed with HTTP {response.status_code}")
 
-            except requests.exceptions.Timeout:
+            except (TimeoutError, httpx.TimeoutException):
                 logger.warn(f"Backend timeout processing file {filename}")
+                break
 
             except Exception as e:
                 logger.error(f"Backend file processing error: {e}")
 
-            # 재시도 대기
-            if attempt < self.retry_count - 1:
-                time.sleep(0.5 * (attempt + 1))
+            await self._backoff(attempt, deadline, 0.5 * (attempt + 1))
 
         # 실패 시 빈 결과 반환
-        return {
-            "filename": filename,
-            "content_type": content_type,
-            "text": "",
-            "error": "processing_failed"
-        }
-        """
+        return {**failed, "error": "processing_failed"}
 
     def health_check(self) -> bool:
-        """백엔드 PII 서비스 헬스 체크"""
+        """백엔드 PII 서비스 헬스 체크 (프록시 시작 시 동기 호출)"""
         try:
-            endpoint = f"{self.base_url}{APIEndpoints.HEALTH}"
-            response = requests.get(
-                endpoint,
-                headers=self.headers,
-                timeout=3
+            self._stats["requests"] += 1
+            response = self._get_sync_client().get(
+                APIEndpoints.HEALTH,
+                timeout=self._timeout(3),
+                extensions={"trace": self._trace_sync}
             )
             
             if response.status_code == 200:
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+백엔드 연결 재사용 벤치마크
+
+로컬 HTTP/1.1 keep-alive 서버를 DLP-BE 대신 띄우고, 요청마다 새 클라이언트(세션)를
+만드는 기존 방식과 BackendClient의 공유 연결 풀을 비교합니다.
+백엔드 처리 시간은 0으로 두어 요청당 연결/통신 오버헤드만 측정합니다.
+
+사용법:
+    python benchmark_backend_pool.py --requests 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from backend import BackendClient
+from config import APIEndpoints
+
+PAYLOAD = {"text": "안녕하세요. 회의 일정 공유드립니다."}
+RESPONSE = json.dumps({"has_pii": False, "entities": [], "policy_violation": False}).encode()
+
+
+class CountingServer(ThreadingHTTPServer):
+    """수락한 TCP 연결 수를 세는 서버"""
+
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        CountingServer.connections += 1
+        super().process_request(request, client_address)
+
+
+class DetectHandler(BaseHTTPRequestHandler):
+    """PII 탐지 API 흉내 (keep-alive 유지)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def per_request_client(base_url: str) -> None:
+    """기존 방식: 요청마다 새 세션 생성 → 매번 TCP 연결"""
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post(APIEndpoints.CHECK_CONTENT, json=PAYLOAD)
+        response.json()
+
+
+async def run(call, total: int, concurrency: int):
+    """동시 concurrency개로 total개 요청 후 요청별 지연(ms) 목록 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backend connection pool benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    server = CountingServer(("127.0.0.1", 0), DetectHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    pooled = BackendClient()
+    pooled.base_url = base_url
+
+    async def pooled_call():
+        await pooled.check_content(prompt=PAYLOAD["text"], files_data=[])
+
+    rows = []
+    for name, call in [
+        ("new session per request", lambda: per_request_client(base_url)),
+        ("shared pool", pooled_call),
+    ]:
+        await run(call, 20, args.concurrency)  # 워밍업
+        CountingServer.connections = 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies = await run(call, args.requests, args.concurrency)
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        rows.append((
+            name,
+            statistics.median(latencies),
+            latencies[int(len(latencies) * 0.95) - 1],
+            args.requests / elapsed,
+            CountingServer.connections
+        ))
+
+    stats = pooled.pool_stats()
+    await pooled.aclose()
+    server.shutdown()
+
+    print(f"requests: {args.requests}, concurrency: {args.concurrency}")
+    print(f"| client | p50 (ms) | p95 (ms) | req/s | new TCP connections |")
+    print(f"|---|---|---|---|---|")
+    for name, p50, p95, rps, connections in rows:
+        print(f"| {name} | {p50:.2f} | {p95:.2f} | {rps:.0f} | {connections} |")
+    print(f"\npool stats: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+멀티파트 파서 메모리/시간 벤치마크
+
+대용량 업로드(기본 50MB PDF 흉내 + 텍스트 필드)를 기존 email.parser 방식과
+스트리밍 파서(DataExtractor.iter_multipart)로 각각 파싱하고, tracemalloc 최대 할당량과
+소요 시간을 비교합니다. 두 방식이 같은 파트를 만드는지도 확인합니다.
+
+사용법:
+    python benchmark_multipart.py --size-mb 50
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from email.parser import BytesParser
+from email.policy import default as email_default
+
+from extractor import DataExtractor
+from multipart import MultipartParser, parse_boundary
+
+BOUNDARY = "----WebKitFormBoundaryX3vQ9aLk2PzR7mTd"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def build_body(file_size: int) -> bytes:
+    """텍스트 필드 + 대용량 파일 파트로 구성된 본문"""
+    delimiter = f"--{BOUNDARY}".encode()
+    return b"".join([
+        delimiter, b"\r\n",
+        b'Content-Disposition: form-data; name="purpose"\r\n\r\n',
+        b"assistants", b"\r\n",
+        delimiter, b"\r\n",
+        b'Content-Disposition: form-data; name="file"; filename="report.pdf"\r\n',
+        b"Content-Type: application/pdf\r\n\r\n",
+        b"%PDF-1.7\n" + os.urandom(file_size), b"\r\n",
+        delimiter, b"--\r\n",
+    ])
+
+
+def legacy_parse_multipart(raw_bytes: bytes, content_type: str):
+    """기존 방식: 가짜 헤더를 이어 붙여 email 파서로 전체 파싱"""
+    files = []
+    msg = BytesParser(policy=email_default).parsebytes(
+        b"Content-Type: " + content_type.encode("utf-8") + b"\r\n\r\n" + raw_bytes
+    )
+    for part in msg.iter_parts():
+        payload = part.get_payload(decode=True)
+        if not payload:
+            continue
+        files.append({
+            "field_name": part.get_param("name", header="content-disposition"),
+            "filename": part.get_filename() or "unknown",
+            "content_type": (part.get_content_type() or "").lower(),
+            "data": payload,
+            "size": len(payload)
+        })
+    return files
+
+
+def streaming_parse_multipart(raw_bytes: bytes, content_type: str):
+    """스트리밍 방식: 파트를 하나씩 받아 크기와 앞부분(텍스트 추출용)만 사용"""
+    files = []
+    for part in DataExtractor.iter_multipart(raw_bytes, content_type):
+        files.append({**part, "data": bytes(part["data"][:4000])})
+    return files
+
+
+def measure(fn, body: bytes):
+    """(소요 시간 s, tracemalloc 최대 추가 할당 바이트, 결과)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = fn(body, CONTENT_TYPE)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def check_chunk_boundaries(rounds: int = 200) -> bool:
+    """임의 청크 크기로 잘라 넣어도 boundary가 청크 경계에 걸친 경우를 올바르게 처리하는지 확인"""
+    rng = random.Random(0)
+    boundary = parse_boundary(CONTENT_TYPE)
+    for _ in range(rounds):
+        payloads = [bytes(rng.randrange(256) for _ in range(rng.randrange(0, 300))) + b"\r\n--" for _ in range(3)]
+        body = b"preamble\r\n" + b"".join(
+            b"--" + boundary + b"\r\nContent-Disposition: form-data; name=\"f%d\"\r\n\r\n" % i + p + b"\r\n"
+            for i, p in enumerate(payloads)
+        ) + b"--" + boundary + b"--\r\n"
+
+        parser = MultipartParser(boundary)
+        chunk_size = rng.randrange(1, 64)
+        parts, current = [], None
+        events = [e for i in range(0, len(body), chunk_size) for e in parser.feed(body[i:i + chunk_size])]
+        for kind, value, offset in events + list(parser.close()):
+            if kind == "start":
+                current = bytearray()
+            elif kind == "data":
+                current += value
+            else:
+                parts.append(bytes(current))
+        if parts != payloads:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multipart parser benchmark")
+    parser.add_argument("--size-mb", type=float, default=50)
+    args = parser.parse_args()
+
+    body = build_body(int(args.size_mb * 1024 * 1024))
+
+    rows = []
+    results = {}
+    for name, fn in [("email.parser", legacy_parse_multipart), ("streaming", streaming_parse_multipart)]:
+        elapsed, peak, result = measure(fn, body)
+        rows.append((name, elapsed, peak))
+        results[name] = result
+
+    legacy, streaming = results["email.parser"], results["streaming"]
+    same_parts = [
+        (p["field_name"], p["filename"], p["content_type"], p["size"], p["data"][:4000]) for p in legacy
+    ] == [
+        (p["field_name"], p["filename"], p["content_type"], p["size"], p["data"]) for p in streaming
+    ]
+
+    print(f"body: {len(body) / 1024 / 1024:.1f} MB, parts: {len(streaming)}")
+    print(f"| parser | time (s) | peak alloc (MB) | peak / body |")
+    print(f"|---|---|---|---|")
+    for name, elapsed, peak in rows:
+        print(f"| {name} | {elapsed:.3f} | {peak / 1024 / 1024:.1f} | {peak / len(body):.2f}x |")
+    print(f"\nsame parts: {same_parts}")
+    print(f"chunk boundary check: {check_chunk_boundaries()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+SSE 응답 증분 스캔 검증/벤치마크
+
+ChatGPT 누적 형식, delta 인코딩(v1), OpenAI API 형식의 합성 스트림을 임의 크기 청크로 잘라
+SSEResponseScanner에 흘려보내고 다음을 확인합니다.
+- PII가 없는 스트림은 바이트 그대로 전달되는지
+- delta 경계에 걸쳐 나온 PII가 클라이언트로 완성된 형태로 나가기 전에 끊기는지
+- 청크당 처리 시간(p50/p99/max)과 최대 보류 바이트
+비교용으로 응답 전체를 bytes +=로 모아 매번 전체를 다시 검사하는 방식의 시간도 측정합니다.
+
+사용법:
+    python benchmark_response_scan.py --events 3000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from pii_scanner import pii_scanner
+from response_scanner import SSEResponseScanner
+
+PII_VALUE = "010-1234-5678"
+FILLER = "이 문단은 응답 스트림 테스트용 문장입니다. 2024년 보고서 기준 수치는 3.5% 증가했습니다. "
+
+
+def make_deltas(events: int, pii_at: int = None):
+    """응답 텍스트를 토큰 크기 delta로 분할 (pii_at 위치 근처에 PII를 여러 delta로 나눠 삽입)"""
+    rng = random.Random(1)
+    deltas = []
+    for i in range(events):
+        if pii_at is not None and i == pii_at:
+            deltas.extend(["연락처는 ", "010-", "1234", "-56", "78", " 입니다. "])
+            continue
+        start = rng.randrange(len(FILLER) - 6)
+        deltas.append(FILLER[start:start + rng.randrange(1, 6)])
+    return deltas
+
+
+def encode_stream(deltas, fmt: str) -> bytes:
+    """delta 목록을 SSE 형식 본문으로 변환"""
+    events = []
+    if fmt == "openai":
+        for d in deltas:
+            events.append(b"data: " + json.dumps({"choices": [{"index": 0, "delta": {"content": d}}]}).encode() + b"\n\n")
+    elif fmt == "delta":
+        events.append(b'event: delta_encoding\ndata: "v1"\n\n')
+        events.append(b"event: delta\ndata: " + json.dumps({"p": "", "o": "add", "v": {"message": {
+            "id": "m1", "author": {"role": "assistant"}, "content": {"content_type": "text", "parts": [""]}}}}).encode() + b"\n\n")
+        for i, d in enumerate(deltas):
+            op = {"p": "/message/content/parts/0", "o": "append", "v": d} if i == 0 else {"v": d}
+            events.append(b"event: delta\ndata: " + json.dumps(op, ensure_ascii=False).encode() + b"\n\n")
+    else:
+        text = ""
+        for d in deltas:
+            text += d
+            events.append(b"data: " + json.dumps({"message": {
+                "id": "m1", "author": {"role": "assistant"}, "content": {"content_type": "text", "parts": [text]}}},
+                ensure_ascii=False).encode() + b"\r\n\r\n")
+    events.append(b"data: [DONE]\n\n")
+    return b"".join(events)
+
+
+def chunked(body: bytes, rng: random.Random):
+    pos = 0
+    while pos < len(body):
+        size = rng.randrange(1, 400)
+        yield body[pos:pos + size]
+        pos += size
+
+
+def run_scanner(body: bytes, seed: int = 0):
+    """(클라이언트가 받은 바이트, 청크별 처리 시간 ms, 스캐너)"""
+    scanner = SSEResponseScanner()
+    rng = random.Random(seed)
+    output, timings = bytearray(), []
+    for chunk in list(chunked(body, rng)) + [b""]:
+        start = time.perf_counter()
+        output += scanner(chunk)
+        timings.append((time.perf_counter() - start) * 1000)
+    return bytes(output), timings, scanner
+
+
+def run_full_rescan(body: bytes, seed: int = 0) -> float:
+    """비교용: 응답 전체를 bytes +=로 모으며 매 청크마다 전체 텍스트 재검사"""
+    rng = random.Random(seed)
+    buffer = b""
+    start = time.perf_counter()
+    for chunk in chunked(body, rng):
+        buffer += chunk
+        pii_scanner.scan(buffer.decode("utf-8", errors="ignore"))
+    return time.perf_counter() - start
+
+
+def client_text(output: bytes, fmt: str) -> str:
+    """클라이언트 화면에 표시될 텍스트 재구성"""
+    text = ""
+    for event in output.replace(b"\r\n\r\n", b"\n\n").split(b"\n\n"):
+        for line in event.decode("utf-8").splitlines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            payload = json.loads(line[6:])
+            if not isinstance(payload, dict):
+                continue
+            if "choices" in payload:
+                text += payload["choices"][0]["delta"].get("content") or ""
+            elif "message" in payload:
+                text = "".join(payload["message"]["content"]["parts"])
+            elif isinstance(payload.get("v"), str):
+                text += payload["v"]
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE response scan benchmark")
+    parser.add_argument("--events", type=int, default=3000)
+    args = parser.parse_args()
+
+    print(f"| format | clean passthrough | PII cut | PII leaked | p50 chunk (ms) | p99 chunk (ms) | max held (B) | scan (s) | full rescan (s) |")
+    print(f"|---|---|---|---|---|---|---|---|---|")
+    for fmt in ("cumulative", "delta", "openai"):
+        clean = encode_stream(make_deltas(args.events), fmt)
+        clean_out, timings, scanner = run_scanner(clean)
+        passthrough = clean_out == clean and not scanner.cut
+
+        leaked = []
+        for seed in range(20):
+            dirty = encode_stream(make_deltas(args.events, pii_at=args.events // 2), fmt)
+            dirty_out, _, dirty_scanner = run_scanner(dirty, seed)
+            leaked.append(PII_VALUE in client_text(dirty_out, fmt) or not dirty_scanner.cut)
+
+        # 누적 형식은 이벤트마다 전체 텍스트를 보내므로 전체 재검사 비교는 큰 본문에서만 의미 있음
+        scan_seconds = sum(timings) / 1000
+        rescan_seconds = run_full_rescan(clean) if fmt != "cumulative" else float("nan")
+        print(
+            f"| {fmt} | {passthrough} | {not any(leaked)} | {sum(leaked)}/20 | "
+            f"{statistics.median(timings):.3f} | {statistics.quantiles(timings, n=100)[98]:.3f} | "
+            f"{scanner.stats['max_held_bytes']} | {scan_seconds:.3f} | {rescan_seconds:.3f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
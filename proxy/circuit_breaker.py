@@ -0,0 +1,190 @@
+"""
+백엔드 장애 대응 모듈 (서킷 브레이커 + 최근 판정 캐시)
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from logger import logger
+
+
+class CircuitBreaker:
+    """
+    백엔드 호출 서킷 브레이커
+
+    - closed: 정상 호출. 연속 실패 또는 연속 SLO 초과가 임계값에 도달하면 open
+    - open: 호출하지 않고 즉시 실패 처리. open_seconds 경과 후 half_open
+    - half_open: 단 하나의 탐색 요청만 통과. 성공하면 closed, 실패/SLO 초과면 다시 open
+      (allow_request가 준 탐색 토큰을 가진 호출만 상태를 바꾸며, 그 전에 허용된 호출의 결과는 집계만 함)
+
+    mitmproxy 이벤트 루프 안에서만 사용하므로 별도 잠금은 두지 않습니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # closed 상태에서 허용된 일반 호출 토큰 (탐색 요청은 호출마다 별도 토큰)
+    CALL = "call"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        slow_call_seconds: float,
+        slow_call_threshold: int,
+        open_seconds: float,
+        name: str = "backend"
+    ):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.open_seconds = open_seconds
+        self.name = name
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_slow_calls = 0
+        self.opened_at = 0.0
+        self.probe: Optional[str] = None  # 진행 중인 탐색 요청 토큰
+        self.probe_count = 0
+        self.rejected = 0
+
+    @property
+    def probe_in_flight(self) -> bool:
+        return self.probe is not None
+
+    def allow_request(self) -> Optional[str]:
+        """
+        호출 허용 여부 (half_open에서는 탐색 요청 1건만 허용)
+
+        Returns:
+            허용되면 호출 토큰 (결과 기록 시 그대로 전달), 거부되면 None
+        """
+        if self.state == self.CLOSED:
+            return self.CALL
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return None
+            self._transition(self.HALF_OPEN, "open timeout elapsed")
+
+        # half_open: 진행 중인 탐색 요청이 없을 때만 통과
+        if self.probe_in_flight:
+            self.rejected += 1
+            return None
+        self.probe_count += 1
+        self.probe = f"probe-{self.probe_count}"
+        return self.probe
+
+    def record_success(self, latency: float, token: Optional[str] = None):
+        """
+        응답 수신 기록 (latency가 SLO를 넘으면 느린 호출로 집계)
+
+        half_open 상태 전환은 탐색 요청 토큰을 가진 호출만 할 수 있습니다.
+        closed일 때 허용되어 늦게 끝난 호출(BACKEND_DEADLINE > BREAKER_OPEN_SECONDS)은 집계만 합니다.
+        """
+        is_probe = self._finish_probe(token)
+        self.consecutive_failures = 0
+
+        if latency > self.slow_call_seconds:
+            self.consecutive_slow_calls += 1
+            if is_probe:
+                self._open(f"probe latency {latency:.1f}s > SLO {self.slow_call_seconds:.1f}s")
+            elif self.state == self.CLOSED and self.consecutive_slow_calls >= self.slow_call_threshold:
+                self._open(f"{self.consecutive_slow_calls} consecutive calls over SLO {self.slow_call_seconds:.1f}s")
+            return
+
+        self.consecutive_slow_calls = 0
+        if is_probe:
+            self._transition(self.CLOSED, "probe succeeded")
+
+    def record_failure(self, reason: str, token: Optional[str] = None):
+        """호출 실패 기록 (타임아웃, 연결 실패, 5xx 등)"""
+        is_probe = self._finish_probe(token)
+        self.consecutive_failures += 1
+
+        if is_probe:
+            self._open(f"probe failed: {reason}")
+        elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open(f"{self.consecutive_failures} consecutive failures (last: {reason})")
+
+    def release_probe(self, token: Optional[str] = None):
+        """결과 없이 끝난 호출 정리 (클라이언트 취소 등 백엔드와 무관한 중단은 실패로 세지 않음)"""
+        self._finish_probe(token)
+
+    def _finish_probe(self, token: Optional[str]) -> bool:
+        """진행 중인 탐색 요청의 토큰이면 자리를 반납하고 True"""
+        if token is None or token != self.probe:
+            return False
+        self.probe = None
+        return self.state == self.HALF_OPEN
+
+    def get_stats(self) -> Dict[str, Any]:
+        """브레이커 상태 통계"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "consecutive_slow_calls": self.consecutive_slow_calls,
+            "rejected": self.rejected
+        }
+
+    def _open(self, reason: str):
+        self.opened_at = time.monotonic()
+        self._transition(self.OPEN, reason)
+
+    def _transition(self, new_state: str, reason: str):
+        old_state = self.state
+        self.state = new_state
+        if new_state == self.CLOSED:
+            self.consecutive_failures = 0
+            self.consecutive_slow_calls = 0
+        logger.log_breaker_transition(self.name, old_state, new_state, reason)
+
+
+class VerdictCache:
+    """
+    최근 백엔드 판정 LRU 캐시 (프롬프트 해시 키)
+
+    브레이커가 열려 있는 동안 같은 프롬프트가 반복되면 백엔드 대신 응답합니다.
+    원문은 저장하지 않고 SHA-256 해시만 키로 사용합니다.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[bool, str, Optional[Dict]]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(endpoint: str, text: str) -> str:
+        """엔드포인트 + 텍스트 해시 키 생성"""
+        return hashlib.sha256(f"{endpoint}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bool, str, Optional[Dict]]]:
+        """캐시된 판정 조회 (만료된 항목은 제거)"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, verdict: Tuple[bool, str, Optional[Dict]]):
+        """판정 저장 (가장 오래 사용하지 않은 항목부터 제거)"""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic(), verdict)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -15,9 +15,27 @@ DEBUG = os.getenv("PROXY_DEBUG", "1") == "1"
 # ==============================================================================
 BACKEND_URL = os.getenv("BACKEND_API_URL", "http://127.0.0.1:8000")
 BACKEND_TIMEOUT = int(os.getenv("BACKEND_TIMEOUT", "30"))
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "5"))
+# 연결 풀 설정 (최대 연결 수, 유지할 keep-alive 연결 수, 유휴 연결 만료 시간, 빈 연결 대기 시간)
+BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "20"))
+BACKEND_POOL_KEEPALIVE = int(os.getenv("BACKEND_POOL_KEEPALIVE", "10"))
+BACKEND_KEEPALIVE_EXPIRY = float(os.getenv("BACKEND_KEEPALIVE_EXPIRY", "30"))
+BACKEND_POOL_TIMEOUT = float(os.getenv("BACKEND_POOL_TIMEOUT", "5"))
+# 재시도를 포함한 요청 1건의 전체 처리 시간 상한 (초)
+BACKEND_DEADLINE = float(os.getenv("BACKEND_DEADLINE", "20"))
 BACKEND_RETRY = int(os.getenv("BACKEND_RETRY", "2"))
 BACKEND_API_KEY = os.getenv("BACKEND_API_KEY", "")  # 선택적 API 키
 
+# 서킷 브레이커 (연속 실패 또는 연속 SLO 초과 시 open → 백엔드 호출 없이 즉시 폴백)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "5"))
+BREAKER_SLOW_CALL_THRESHOLD = int(os.getenv("BREAKER_SLOW_CALL_THRESHOLD", "5"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+
+# 최근 판정 캐시 (백엔드 장애 중 같은 프롬프트 재요청에 응답)
+VERDICT_CACHE_SIZE = int(os.getenv("VERDICT_CACHE_SIZE", "1000"))
+VERDICT_CACHE_TTL = float(os.getenv("VERDICT_CACHE_TTL", "600"))
+
 # ==============================================================================
 # 타겟 호스트 및 경로 패턴
 # ==============================================================================
@@ -51,6 +69,39 @@ UPLOAD_HOSTS = re.compile(
 BLOCK_MESSAGE = os.getenv("BLOCK_MESSAGE", "민감정보가 탐지되어 전송이 차단되었습니다.")
 BLOCK_ON_BACKEND_ERROR = os.getenv("BLOCK_ON_BACKEND_ERROR", "0") == "1"
 
+# block: PII 탐지 시 대화 차단 / redact: 최신 사용자 메시지의 PII를 placeholder로 치환 후 전달
+PROXY_MODE = os.getenv("PROXY_MODE", "block").lower()
+REDACT_PLACEHOLDER = os.getenv("REDACT_PLACEHOLDER", "[{type}]")
+
+# 멀티파트 업로드 파싱 청크 크기 (파서가 한 번에 들고 있는 최대 바이트 ≈ 청크 크기)
+MULTIPART_CHUNK_SIZE = int(os.getenv("MULTIPART_CHUNK_SIZE", str(64 * 1024)))
+
+# 업로드/첨부 파일 검사 (백엔드 /api/v1/file/process에서 페이지 단위 추출 + PII 탐지)
+BLOCK_FILE_PII = os.getenv("BLOCK_FILE_PII", "1") == "1"  # 파일에서 PII 탐지 시 대화/업로드 차단
+FILE_MAX_BYTES = int(os.getenv("FILE_MAX_BYTES", str(50 * 1024 * 1024)))  # 초과 파일은 백엔드로 보내지 않음
+FILE_PROCESS_TIMEOUT = float(os.getenv("FILE_PROCESS_TIMEOUT", "45"))  # 파일 1개 처리 제한 시간 (백엔드 예산 + 여유)
+
+# 정형 PII(주민번호, 카드, 휴대폰, 계좌, 이메일) 정규식 빠른 경로
+# 확정 탐지 시 백엔드 왕복 없이 즉시 차단하고, 감사 로그만 백엔드로 비동기 전송
+# 관리자 PII 설정에서 비활성화된 타입은 제외 (설정을 처음 받기 전에는 빠른 경로를 쓰지 않음)
+# (redact 모드는 백엔드 검사를 항상 거치고, 정규식 결과는 백엔드 엔티티와 합쳐 치환)
+REGEX_FAST_PATH = os.getenv("REGEX_FAST_PATH", "1") == "1"
+REGEX_FAST_PATH_TYPES = {
+    t.strip().upper()
+    for t in os.getenv("REGEX_FAST_PATH_TYPES", "ID_NUM,CREDIT_CARD,PHONE_NUM,ACCOUNT,EMAIL").split(",")
+    if t.strip()
+}
+PII_SETTINGS_REFRESH_SECONDS = float(os.getenv("PII_SETTINGS_REFRESH_SECONDS", "60"))  # 관리자 PII 설정(활성 타입) 재조회 주기
+
+# 모델 응답(SSE) 증분 스캔 (옵트인): 응답 스트림에 정형 PII가 나오면 그 지점에서 스트림을 끊음
+RESPONSE_SCAN = os.getenv("RESPONSE_SCAN", "0") == "1"
+RESPONSE_SCAN_WINDOW = int(os.getenv("RESPONSE_SCAN_WINDOW", "256"))  # delta 경계에 걸친 PII를 찾기 위해 유지하는 최근 문자 수
+RESPONSE_SCAN_MAX_HOLD_BYTES = int(os.getenv("RESPONSE_SCAN_MAX_HOLD_BYTES", "4096"))  # 미완성 후보로 보류할 수 있는 최대 바이트
+RESPONSE_BLOCK_MESSAGE = os.getenv(
+    "RESPONSE_BLOCK_MESSAGE",
+    "🚨 응답에 개인정보가 포함되어 이후 내용이 차단되었습니다."
+)
+
 # ==============================================================================
 # 로그 설정
 # ==============================================================================
@@ -86,5 +137,6 @@ CONTENT_TYPE_TO_EXT = {
 class APIEndpoints:
     CHECK_CONTENT = "/api/v1/pii/detect"  # 기존 PII 검사
     COMPREHENSIVE_ANALYSIS = "/api/v1/analyze/comprehensive"  # [미구현] 종합 분석 (PII + 유사도) - 향후 백엔드 구현 시 사용 예정
-    PROCESS_FILE = "/api/v1/file/process"  # [미구현] 파일 처리용 (OCR, PDF 파싱) - 향후 확장
-    HEALTH = "/api/v1/pii/health"
\ No newline at end of file
+    PROCESS_FILE = "/api/v1/file/process"  # 파일 텍스트 추출 + PII 탐지 (PDF, DOCX, 이미지 OCR)
+    HEALTH = "/api/v1/pii/health"
+    PII_AUDIT = "/api/v1/pii/audit"  # 프록시 정규식 빠른 경로 탐지 감사 로그
\ No newline at end of file
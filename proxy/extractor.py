@@ -4,14 +4,14 @@
 import re
 import json
 import base64
-from typing import Dict, Any, List, Optional
-from email.parser import BytesParser
-from email.policy import default as email_default
+import quopri
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 from mitmproxy import http
 
-from config import PATH_CONVERSATION, PATH_UPLOAD, UPLOAD_HOSTS, CONTENT_TYPE_TO_EXT
+from config import PATH_CONVERSATION, PATH_UPLOAD, UPLOAD_HOSTS, CONTENT_TYPE_TO_EXT, REDACT_PLACEHOLDER, MULTIPART_CHUNK_SIZE
 from logger import logger
+from multipart import MultipartParser, parse_boundary
 
 
 class DataExtractor:
@@ -117,19 +117,30 @@ class DataExtractor:
     @staticmethod
     def _extract_message_content(msg: Dict) -> str:
         """메시지에서 콘텐츠 추출"""
+        return DataExtractor._find_message_text(msg).strip()
+
+    @staticmethod
+    def _find_message_text(msg: Dict) -> str:
+        """메시지에서 프롬프트로 사용할 원본 문자열 찾기 (공백 제거 전)"""
+        found = DataExtractor._find_message_text_path(msg)
+        return found[0] if found else ""
+
+    @staticmethod
+    def _find_message_text_path(msg: Dict) -> Optional[Tuple[str, Tuple]]:
+        """메시지에서 프롬프트 원본 문자열과 메시지 기준 JSON 경로 찾기"""
         content = msg.get("content")
 
         # content가 리스트인 경우
         if isinstance(content, list):
-            for part in content:
+            for index, part in enumerate(content):
                 if isinstance(part, dict):
                     # type이 text 또는 input_text인 경우
                     if part.get("type") in ("text", "input_text"):
-                        text = part.get("text", "").strip()
-                        if text:
-                            return text
+                        text = part.get("text", "")
+                        if isinstance(text, str) and text.strip():
+                            return text, ("content", index, "text")
                 elif isinstance(part, str) and part.strip():
-                    return part.strip()
+                    return part, ("content", index)
 
         # content가 딕셔너리인 경우
         elif isinstance(content, dict):
@@ -137,15 +148,162 @@ class DataExtractor:
             if content.get("content_type") == "text":
                 parts = content.get("parts", [])
                 if isinstance(parts, list):
-                    for part in reversed(parts):
+                    for index in range(len(parts) - 1, -1, -1):
+                        part = parts[index]
                         if isinstance(part, str) and part.strip():
-                            return part.strip()
+                            return part, ("content", "parts", index)
 
         # content가 문자열인 경우
         elif isinstance(content, str) and content.strip():
-            return content.strip()
+            return content, ("content",)
 
-        return ""
+        return None
+
+    @staticmethod
+    def _find_value_span(body: str, path: Tuple) -> Optional[Tuple[int, int]]:
+        """
+        JSON 본문에서 경로(키/인덱스)가 가리키는 값의 원문 위치 [start, end)
+
+        json.loads와 같게 중복 키는 마지막 값을 사용하고, 경로 밖의 값은 raw_decode로 건너뜁니다.
+        """
+        decoder = json.JSONDecoder()
+        whitespace = re.compile(r"[ \t\n\r]*")
+
+        def skip(index: int) -> int:
+            return whitespace.match(body, index).end()
+
+        try:
+            index = skip(0)
+            for key in path:
+                if isinstance(key, str):
+                    if body[index] != "{":
+                        return None
+                    index = skip(index + 1)
+                    target = None
+                    while body[index] != "}":
+                        name, index = json.decoder.scanstring(body, index + 1)
+                        index = skip(index)
+                        if body[index] != ":":
+                            return None
+                        index = skip(index + 1)
+                        if name == key:
+                            target = index
+                        _, index = decoder.raw_decode(body, index)
+                        index = skip(index)
+                        if body[index] == ",":
+                            index = skip(index + 1)
+                    if target is None:
+                        return None
+                    index = target
+                else:
+                    if body[index] != "[":
+                        return None
+                    index = skip(index + 1)
+                    for _ in range(key):
+                        _, index = decoder.raw_decode(body, index)
+                        index = skip(index)
+                        if body[index] != ",":
+                            return None
+                        index = skip(index + 1)
+
+            _, end = decoder.raw_decode(body, index)
+            return index, end
+        except (IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def locate_prompt(body: str) -> Optional[Tuple[int, int, str, bool]]:
+        """
+        JSON 본문에서 최신 사용자 메시지의 원본 문자열 리터럴 위치 찾기
+
+        본문을 다시 직렬화하지 않고 제자리에서 수정할 수 있도록, 메시지의 JSON 경로를 따라
+        리터럴 위치를 찾습니다 (제목/메타데이터 등 같은 문자열이 다른 곳에 있어도 메시지 값만 수정).
+
+        Returns:
+            (리터럴 시작, 리터럴 끝, 원본 문자열, ensure_ascii 여부) 또는 None
+        """
+        try:
+            data = json.loads(body)
+        except (json.JSONDecodeError, TypeError):
+            return None
+
+        messages = data.get("messages", []) if isinstance(data, dict) else []
+        if not isinstance(messages, list):
+            return None
+
+        for message_index in range(len(messages) - 1, -1, -1):
+            msg = messages[message_index]
+            if not isinstance(msg, dict) or DataExtractor._get_message_role(msg) != "user":
+                continue
+
+            found = DataExtractor._find_message_text_path(msg)
+            if found is None:
+                continue
+            raw_text, message_path = found
+
+            span = DataExtractor._find_value_span(body, ("messages", message_index) + message_path)
+            if span is None:
+                logger.debug("Prompt literal not found in body")
+                return None
+            start, end = span
+            literal = body[start:end]
+            if json.loads(literal) != raw_text:
+                return None
+
+            # 클라이언트 직렬화 방식에 맞춰 비ASCII 문자를 그대로 두거나 \uXXXX로 이스케이프
+            return (start, end, raw_text, literal.isascii() and not raw_text.isascii())
+
+        return None
+
+    @staticmethod
+    def redact_prompt(body: str, prompt: str, entities: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        최신 사용자 메시지의 PII 구간을 타입 placeholder로 치환한 본문 생성
+
+        Args:
+            body: 원본 JSON 본문
+            prompt: extract_prompt_from_json()이 반환한 프롬프트 (entities 위치 기준)
+            entities: 탐지 결과 (start/end: 프롬프트 기준 문자 위치, value: 해당 구간 문자열)
+
+        Returns:
+            수정된 본문 (위치를 특정할 수 없거나 구간이 value와 다르면 None → 차단으로 처리)
+        """
+        located = DataExtractor.locate_prompt(body)
+        if located is None:
+            return None
+        literal_start, literal_end, raw_text, ensure_ascii = located
+
+        # 백엔드 위치는 공백 제거된 프롬프트 기준 → 원본 문자열 기준으로 보정
+        shift = raw_text.find(prompt)
+        if shift == -1:
+            return None
+
+        spans = []
+        for entity in entities:
+            start, end = entity.get("start"), entity.get("end")
+            if start is None or end is None or not (0 <= start < end <= len(prompt)):
+                return None
+            # 위치가 다른 텍스트 기준으로 계산된 경우 엉뚱한 구간을 가리고 PII를 남기지 않도록 확인
+            if raw_text[start + shift:end + shift] != entity.get("value"):
+                logger.warn(f"Entity span does not match its value ({entity.get('type')}), not redacting")
+                return None
+            spans.append((start + shift, end + shift, entity.get("type", "PII")))
+
+        # 겹치는 구간 병합 후 한 번에 이어 붙이기
+        pieces = []
+        cursor = 0
+        for start, end, entity_type in sorted(spans):
+            if start < cursor:
+                # 앞 placeholder가 이미 덮는 구간
+                cursor = max(cursor, end)
+                continue
+            pieces.append(raw_text[cursor:start])
+            pieces.append(REDACT_PLACEHOLDER.format(type=entity_type))
+            cursor = end
+        pieces.append(raw_text[cursor:])
+
+        literal = json.dumps("".join(pieces), ensure_ascii=ensure_ascii)
+        return body[:literal_start] + literal + body[literal_end:]
 
     @staticmethod
     def extract_base64_images(body: str) -> List[Dict[str, Any]]:
@@ -195,41 +353,63 @@ class DataExtractor:
         return urls
 
     @staticmethod
-    def parse_multipart(raw_bytes: bytes, content_type: str) -> List[Dict[str, Any]]:
-        """멀티파트 폼 데이터 파싱"""
-        files = []
-
+    def iter_multipart(raw_bytes: bytes, content_type: str) -> Iterator[Dict[str, Any]]:
+        """
+        멀티파트 폼 데이터를 파트 단위로 지연 파싱
+
+        본문을 MULTIPART_CHUNK_SIZE 단위로 훑어 boundary 위치만 찾고, 각 파트의 data는
+        원본 본문의 memoryview 구간으로 넘겨 복사하지 않습니다.
+        (base64/quoted-printable 전송 인코딩 파트만 디코딩 사본 생성)
+        """
+        boundary = parse_boundary(content_type)
+        if not boundary:
+            logger.warn("Multipart boundary not found in content-type")
+            return
+
+        view = memoryview(raw_bytes)
+        parser = MultipartParser(boundary)
+
+        def events():
+            for offset in range(0, len(view), MULTIPART_CHUNK_SIZE):
+                yield from parser.feed(view[offset:offset + MULTIPART_CHUNK_SIZE])
+            yield from parser.close()
+
+        headers, body_start = None, 0
         try:
-            # Email parser를 사용한 멀티파트 파싱
-            msg = BytesParser(policy=email_default).parsebytes(
-                b"Content-Type: " + content_type.encode("utf-8") + b"\r\n\r\n" + raw_bytes
-            )
-
-            for part in msg.iter_parts():
-                payload = part.get_payload(decode=True)
-                if not payload:
+            for kind, value, offset in events():
+                if kind == "start":
+                    headers, body_start = value, offset
+                    continue
+                if kind != "end" or headers is None:
                     continue
 
-                ctype = (part.get_content_type() or "").lower()
-                filename = part.get_filename()
-                field_name = part.get_param("name", header="content-disposition")
+                payload = view[body_start:offset]
+                encoding = headers["transfer_encoding"]
+                if encoding == "base64":
+                    payload = base64.b64decode(payload)
+                elif encoding == "quoted-printable":
+                    payload = quopri.decodestring(bytes(payload))
+                if not len(payload):
+                    continue
 
-                file_info = {
+                filename = headers["filename"]
+                logger.debug(f"Extracted multipart file: {filename}, {headers['content_type']}, {len(payload)} bytes")
+                yield {
                     "type": "multipart",
-                    "field_name": field_name,
+                    "field_name": headers["field_name"],
                     "filename": filename or "unknown",
-                    "content_type": ctype,
+                    "content_type": headers["content_type"],
                     "data": payload,
                     "size": len(payload)
                 }
 
-                files.append(file_info)
-                logger.debug(f"Extracted multipart file: {filename}, {ctype}, {len(payload)} bytes")
-
         except Exception as e:
             logger.warn(f"Multipart parse error: {e}")
 
-        return files
+    @staticmethod
+    def parse_multipart(raw_bytes: bytes, content_type: str) -> List[Dict[str, Any]]:
+        """멀티파트 폼 데이터 파싱 (전체 목록, data는 원본 본문의 memoryview)"""
+        return list(DataExtractor.iter_multipart(raw_bytes, content_type))
 
     @staticmethod
     def extract_parent_info(flow: http.HTTPFlow) -> Dict[str, Any]:
@@ -0,0 +1,83 @@
+"""
+정규식 빠른 경로 (관리자 PII 설정 반영 + 감사 로그 전송)
+
+백엔드의 관리자 PII 설정에서 비활성화된 타입은 정규식으로도 확정하지 않도록
+활성 타입을 주기적으로 받아 스캐너에 반영합니다. 요청은 설정 갱신을 기다리지 않고 직전 설정을 사용합니다.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import PII_SETTINGS_REFRESH_SECONDS
+from logger import logger
+from pii_scanner import PIIScanner
+
+
+class RegexFastPath:
+    """정규식 빠른 경로"""
+
+    def __init__(self, scanner: PIIScanner, backend, refresh_seconds: float = PII_SETTINGS_REFRESH_SECONDS):
+        """
+        Args:
+            scanner: 정형 PII 스캐너 (admin_types를 갱신)
+            backend: 백엔드 클라이언트 (get_enabled_pii_types, post_audit)
+            refresh_seconds: 관리자 PII 설정 재조회 주기
+        """
+        self.scanner = scanner
+        self.backend = backend
+        self.refresh_seconds = refresh_seconds
+
+        # 관리자 설정을 받기 전에는 어떤 타입이 꺼져 있는지 모르므로 확정 탐지를 하지 않음 (백엔드가 설정 적용)
+        self.scanner.admin_types = set()
+        self._refreshed_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # 응답을 기다리지 않는 백그라운드 작업 (감사 로그 전송) 참조 보관
+        self._background_tasks = set()
+
+    def refresh_settings(self):
+        """재조회 주기가 지났으면 관리자 PII 설정을 백그라운드로 갱신"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        now = time.monotonic()
+        if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_seconds:
+            return
+        self._refreshed_at = now
+        self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self):
+        enabled_types = await self.backend.get_enabled_pii_types()
+        if enabled_types is None:
+            # 조회 실패 시 직전 설정 유지 (다음 주기에 재시도)
+            return
+        if enabled_types != self.scanner.admin_types:
+            logger.debug(f"PII settings updated, enabled types: {sorted(enabled_types)}")
+        self.scanner.admin_types = enabled_types
+
+    def check(self, prompt: str, client_ip: Optional[str]) -> Optional[Tuple[bool, str, Optional[Dict]]]:
+        """확정 탐지가 있으면 차단 판정을 반환하고 감사 로그 전송, 없으면 None (백엔드 검사 진행)"""
+        verdict = self.scanner.check(prompt)
+        if verdict is not None:
+            _, reason, details = verdict
+            self._send_audit_log(prompt, details["entities"], reason, client_ip)
+        return verdict
+
+    def scan(self, prompt: str) -> List[Dict[str, Any]]:
+        """확정 탐지 엔티티 목록 (redact 모드: 백엔드 판정과 합쳐 치환)"""
+        return self.scanner.scan(prompt)
+
+    def _send_audit_log(self, prompt: str, entities: List[Dict[str, Any]], reason: str, client_ip: Optional[str]):
+        """빠른 경로 탐지 결과를 백엔드 감사 로그로 전송 (플로우는 기다리지 않음)"""
+        task = asyncio.create_task(self.backend.post_audit(
+            prompt=prompt,
+            entities=entities,
+            reason=reason,
+            client_ip=client_ip
+        ))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def drain(self):
+        """남은 감사 로그 전송 대기 (프록시 종료 시)"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+비동기 프록시 훅 부하 테스트
+
+느린 가짜 백엔드(httpx.MockTransport)를 붙인 SemanticProxy에 대화 요청 플로우를
+동시에 흘려 보내고, 백엔드 대기 중에도 플로우들이 직렬화되지 않는지 확인합니다.
+
+    - blocking: 이전 동기 훅처럼 백엔드 대기 동안 이벤트 루프를 막는 경우
+    - sequential: 비동기 훅을 한 번에 하나씩 처리
+    - concurrent: 비동기 훅을 동시에 처리 (mitmproxy 실제 동작)
+
+사용법:
+    python load_test_async.py --flows 50 --delay 0.2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+import httpx
+from mitmproxy.test import tflow
+
+from backend import BackendClient
+from proxy import SemanticProxy
+
+
+def make_backend(delay: float, blocking: bool) -> BackendClient:
+    """응답마다 delay초가 걸리는 가짜 DLP-BE 백엔드"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if blocking:
+            time.sleep(delay)
+        else:
+            await asyncio.sleep(delay)
+        return httpx.Response(200, json={"blocked": False, "has_pii": False, "entities": []})
+
+    return BackendClient(transport=httpx.MockTransport(handler))
+
+
+def make_flow(index: int):
+    """ChatGPT 대화 요청 플로우 생성"""
+    flow = tflow.tflow()
+    flow.request.method = "POST"
+    flow.request.host = "chatgpt.com"
+    flow.request.path = "/backend-api/conversation"
+    flow.request.headers["content-type"] = "application/json"
+    flow.request.text = json.dumps({
+        "messages": [{"author": {"role": "user"}, "content": {"content_type": "text", "parts": [f"질문 {index}"]}}]
+    })
+    return flow
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float, lags: list):
+    """이벤트 루프가 막힌 시간(예정보다 늦게 깨어난 시간)의 최댓값 기록"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - expected)
+
+
+async def run(addon: SemanticProxy, flows: int, concurrent: bool):
+    """플로우 처리 후 (전체 시간, 최대 루프 지연) 반환"""
+    stop = asyncio.Event()
+    lags = []
+    monitor = asyncio.create_task(measure_loop_lag(stop, 0.01, lags))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if concurrent:
+            await asyncio.gather(*(addon.request(make_flow(i)) for i in range(flows)))
+        else:
+            for i in range(flows):
+                await addon.request(make_flow(i))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    await addon.backend.aclose()
+    return elapsed, max(lags, default=0.0)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Async proxy hook load test")
+    parser.add_argument("--flows", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.2, help="fake backend latency (s)")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        addon = SemanticProxy()
+
+    rows = []
+    for name, blocking, concurrent in [
+        ("blocking", True, True),
+        ("sequential", False, False),
+        ("concurrent", False, True),
+    ]:
+        addon.backend = make_backend(args.delay, blocking)
+        elapsed, max_lag = await run(addon, args.flows, concurrent)
+        rows.append((name, elapsed, max_lag))
+
+    print(f"flows: {args.flows}, backend latency: {args.delay * 1000:.0f}ms")
+    print(f"| mode | total (s) | flows/s | max loop lag (ms) |")
+    print(f"|---|---|---|---|")
+    for name, elapsed, max_lag in rows:
+        print(f"| {name} | {elapsed:.2f} | {args.flows / elapsed:.1f} | {max_lag * 1000:.0f} |")
+
+    concurrent_elapsed = rows[-1][1]
+    serialized = concurrent_elapsed >= args.flows * args.delay * 0.5
+    print(f"\nconcurrent flows serialized: {serialized}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
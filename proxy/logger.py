@@ -101,6 +101,31 @@ class ProxyLogger:
         except Exception as e:
             self.error(f"Failed to save block log: {e}")
 
+    def log_breaker_transition(self, name: str, old_state: str, new_state: str, reason: str):
+        """서킷 브레이커 상태 전환 기록 (콘솔 + 일자별 이벤트 로그)"""
+        icon = {"open": "🔴", "half_open": "🟡", "closed": "🟢"}.get(new_state, "⚪")
+        print(f"{icon} [서킷 브레이커] {name}: {old_state} → {new_state} ({reason})")
+        self.warn(f"Circuit breaker {name}: {old_state} -> {new_state} ({reason})")
+
+        try:
+            log_entry = {
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "epoch": datetime.utcnow().timestamp(),
+                "breaker": name,
+                "from": old_state,
+                "to": new_state,
+                "reason": reason
+            }
+
+            today = datetime.utcnow().strftime("%Y-%m-%d")
+            log_path = self.log_dir / f"breaker_{today}.jsonl"
+
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+
+        except Exception as e:
+            self.error(f"Failed to save breaker log: {e}")
+
     def cleanup_old_logs(self, days_to_keep: int = 30):
         """오래된 일자별 로그 파일 정리"""
         try:
@@ -113,6 +138,12 @@ class ProxyLogger:
                     log_file.unlink()
                     self.debug(f"Deleted old log: {log_file.name}")
             
+            # 서킷 브레이커 이벤트 로그 정리
+            for log_file in self.log_dir.glob("breaker_*.jsonl"):
+                if log_file.stat().st_mtime < cutoff_time:
+                    log_file.unlink()
+                    self.debug(f"Deleted old breaker log: {log_file.name}")
+
             # 차단 로그 정리
             block_log_dir = self.log_dir / "blocked"
             if block_log_dir.exists():
@@ -0,0 +1,158 @@
+"""
+스트리밍 멀티파트 파서 모듈
+
+본문 전체를 이어 붙이거나 파트별로 다시 복사하지 않고, 청크 단위로 boundary를 찾아
+파트 시작/데이터/끝 이벤트를 순서대로 내보냅니다.
+파서가 들고 있는 버퍼는 (현재 청크 + boundary 길이 미만의 이월분)으로 제한됩니다.
+"""
+import re
+from email.message import Message
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+Chunk = Union[bytes, bytearray, memoryview]
+
+# 이벤트: ("start", headers, 본문 시작 위치) / ("data", memoryview, 위치) / ("end", None, 본문 끝 위치)
+Event = Tuple[str, Any, int]
+
+_BOUNDARY_PATTERN = re.compile(r'boundary=(?:"([^"]+)"|([^;\s]+))', re.I)
+
+
+class MultipartError(ValueError):
+    """멀티파트 형식 오류"""
+
+
+def parse_boundary(content_type: str) -> Optional[bytes]:
+    """Content-Type 헤더에서 boundary 추출"""
+    match = _BOUNDARY_PATTERN.search(content_type or "")
+    if not match:
+        return None
+    return (match.group(1) or match.group(2)).encode("latin-1")
+
+
+def parse_part_headers(raw_headers: bytes) -> Dict[str, Any]:
+    """
+    파트 헤더 파싱 (헤더 블록만 email 모듈로 해석, 본문은 건드리지 않음)
+
+    Returns:
+        {"field_name", "filename", "content_type", "transfer_encoding"}
+    """
+    msg = Message()
+    for line in raw_headers.decode("utf-8", errors="replace").split("\r\n"):
+        name, sep, value = line.partition(":")
+        if sep:
+            msg[name.strip()] = value.strip()
+
+    return {
+        "field_name": msg.get_param("name", header="content-disposition"),
+        "filename": msg.get_filename(),
+        "content_type": (msg.get_content_type() or "").lower(),
+        "transfer_encoding": (msg.get("content-transfer-encoding") or "").strip().lower()
+    }
+
+
+class MultipartParser:
+    """
+    증분 멀티파트 파서
+
+    feed()에 청크를 순서대로 넣으면 이벤트를 내보냅니다. data 이벤트의 memoryview는
+    다음 feed() 호출 전까지만 유효하므로, 필요하면 호출자가 즉시 처리하거나 복사해야 합니다.
+    위치 값은 전체 본문 기준 바이트 오프셋입니다.
+    """
+
+    MAX_HEADER_SIZE = 16 * 1024
+
+    _PREAMBLE = "preamble"
+    _AFTER_DELIMITER = "after_delimiter"
+    _HEADERS = "headers"
+    _BODY = "body"
+    _EPILOGUE = "epilogue"
+
+    def __init__(self, boundary: bytes):
+        self.delimiter = b"--" + boundary
+        self.body_delimiter = b"\r\n" + self.delimiter
+        self._state = self._PREAMBLE
+        self._carry = b""
+        self._offset = 0  # self._carry[0]의 본문 기준 위치
+
+    @property
+    def finished(self) -> bool:
+        return self._state == self._EPILOGUE
+
+    def feed(self, chunk: Chunk) -> Iterator[Event]:
+        """청크 하나를 처리하고 완성된 이벤트를 내보냄"""
+        buf = self._carry + bytes(chunk) if self._carry else bytes(chunk)
+        base = self._offset
+        view = memoryview(buf)
+        pos = 0
+
+        while pos < len(buf):
+            if self._state == self._PREAMBLE:
+                index = buf.find(self.delimiter, pos)
+                if index == -1:
+                    # 다음 청크와 이어서 찾을 수 있도록 boundary 길이만큼 남김
+                    pos = max(pos, len(buf) - len(self.delimiter) + 1)
+                    break
+                pos = index + len(self.delimiter)
+                self._state = self._AFTER_DELIMITER
+
+            elif self._state == self._AFTER_DELIMITER:
+                if len(buf) - pos < 2:
+                    break
+                if buf[pos:pos + 2] == b"--":
+                    self._state = self._EPILOGUE
+                    pos = len(buf)
+                    break
+                line_end = buf.find(b"\r\n", pos)
+                if line_end == -1:
+                    if len(buf) - pos > self.MAX_HEADER_SIZE:
+                        raise MultipartError("Malformed boundary line")
+                    break
+                pos = line_end + 2
+                self._state = self._HEADERS
+
+            elif self._state == self._HEADERS:
+                if buf.startswith(b"\r\n", pos):
+                    # 헤더 없는 파트
+                    header_end, body_start = pos, pos + 2
+                else:
+                    header_end = buf.find(b"\r\n\r\n", pos)
+                    if header_end == -1:
+                        if len(buf) - pos > self.MAX_HEADER_SIZE:
+                            raise MultipartError("Part headers too large")
+                        break
+                    body_start = header_end + 4
+                headers = parse_part_headers(buf[pos:header_end])
+                pos = body_start
+                self._state = self._BODY
+                yield ("start", headers, base + pos)
+
+            elif self._state == self._BODY:
+                index = buf.find(self.body_delimiter, pos)
+                if index == -1:
+                    # boundary가 청크 경계에 걸칠 수 있으므로 그 길이만큼은 확정하지 않음
+                    safe_end = len(buf) - len(self.body_delimiter) + 1
+                    if safe_end > pos:
+                        yield ("data", view[pos:safe_end], base + pos)
+                        pos = safe_end
+                    break
+                if index > pos:
+                    yield ("data", view[pos:index], base + pos)
+                yield ("end", None, base + index)
+                pos = index + len(self.body_delimiter)
+                self._state = self._AFTER_DELIMITER
+
+            else:  # epilogue
+                pos = len(buf)
+
+        self._carry = buf[pos:]
+        self._offset = base + pos
+
+    def close(self) -> Iterator[Event]:
+        """입력 종료 처리 (닫는 boundary 없이 끝난 파트는 남은 데이터까지 내보냄)"""
+        if self._state == self._BODY:
+            if self._carry:
+                yield ("data", memoryview(self._carry), self._offset)
+            yield ("end", None, self._offset + len(self._carry))
+        self._state = self._EPILOGUE
+        self._offset += len(self._carry)
+        self._carry = b""
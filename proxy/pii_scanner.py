@@ -0,0 +1,211 @@
+"""
+정형 PII 정규식 스캐너 (백엔드 호출 전 빠른 경로)
+
+주민등록번호, 휴대폰 번호, 카드 번호, 계좌 번호, 이메일처럼 형식이 정해진 식별자는
+모델 없이도 확정할 수 있으므로, 하나로 합친 정규식으로 프롬프트를 한 번만 훑고
+검증(체크섬, Luhn, 문맥 키워드)을 통과한 경우에만 확정 탐지로 봅니다.
+검증하지 못한 후보(2020년 이후 주민번호, Luhn 불일치 카드 등)는 백엔드 판단에 맡깁니다.
+"""
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import REGEX_FAST_PATH_TYPES
+from logger import logger
+
+
+# 패턴 순서가 곧 우선순위 (같은 위치에서 먼저 매칭된 타입 사용)
+_COMBINED_PATTERN = re.compile(
+    r"""
+    (?P<ID_NUM>(?<!\d)\d{6}[-\s]?[1-8]\d{6}(?!\d))
+    |(?P<CREDIT_CARD>(?<!\d)[3-6]\d{3}(?P<card_sep>[-\s]?)\d{4}(?P=card_sep)\d{4}(?P=card_sep)\d{4}(?!\d))
+    |(?P<PHONE_NUM>(?<!\d)01[016789](?P<phone_sep>[-\s.]?)\d{3,4}(?P=phone_sep)\d{4}(?!\d))
+    |(?P<ACCOUNT>(?<![\d-])\d{3,6}-\d{2,6}-\d{2,6}(?:-\d{2,3})?(?![\d-]))
+    |(?P<EMAIL>(?<![\w.%+-])[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}\b)
+    """,
+    re.VERBOSE
+)
+
+# 계좌 번호는 날짜/주문번호와 형식이 겹치므로 앞쪽 문맥에 은행 관련 단어가 있을 때만 확정
+_ACCOUNT_CONTEXT = re.compile(r"은행|계좌|입금|송금|이체|뱅크|bank|account", re.I)
+_ACCOUNT_CONTEXT_WINDOW = 20
+
+# 문맥 단어가 있어도 계좌로 보지 않는 같은 형식의 번호 (날짜 YYYY-MM-DD, 사업자등록번호 3-2-5)
+_DATE_SHAPE = re.compile(r"(?:19|20)\d{2}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])(?!\d)")
+_BUSINESS_NUMBER_SHAPE = (3, 2, 5)
+
+# 주민등록번호 체크섬 가중치
+_RRN_WEIGHTS = (2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5)
+
+
+def _digits(value: str) -> str:
+    return "".join(ch for ch in value if ch.isdigit())
+
+
+def is_valid_rrn(value: str) -> bool:
+    """주민등록번호 생년월일 + 체크섬 검증 (2020년 10월 이전 발급 형식)"""
+    digits = _digits(value)
+    if len(digits) != 13:
+        return False
+
+    month, day = int(digits[2:4]), int(digits[4:6])
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return False
+
+    total = sum(int(d) * w for d, w in zip(digits, _RRN_WEIGHTS))
+    return (11 - total % 11) % 10 == int(digits[12])
+
+
+def is_valid_luhn(value: str) -> bool:
+    """카드 번호 Luhn 체크섬 검증"""
+    digits = _digits(value)
+    if not 13 <= len(digits) <= 19:
+        return False
+
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        n = int(d)
+        if i % 2 == 1:
+            n *= 2
+            if n > 9:
+                n -= 9
+        total += n
+    return total % 10 == 0
+
+
+def is_valid_phone(value: str) -> bool:
+    """휴대폰 번호 검증 (010은 가운데 4자리)"""
+    digits = _digits(value)
+    if digits.startswith("010"):
+        return len(digits) == 11
+    return len(digits) in (10, 11)
+
+
+def is_valid_account(value: str) -> bool:
+    """계좌 번호 형식 검증 (국내 계좌 10~14자리, 날짜/사업자등록번호 형식 제외)"""
+    if not 10 <= len(_digits(value)) <= 14:
+        return False
+    if tuple(len(group) for group in value.split("-")) == _BUSINESS_NUMBER_SHAPE:
+        return False
+    return _DATE_SHAPE.match(value) is None
+
+
+class PIIScanner:
+    """정형 PII 스캐너"""
+
+    def __init__(self, enabled_types: Optional[set] = None):
+        """
+        Args:
+            enabled_types: 확정 탐지로 사용할 타입 (None이면 전체)
+        """
+        self.enabled_types = enabled_types
+        # 관리자 PII 설정에서 활성화된 타입 (None이면 제한 없음, 프록시에서는 RegexFastPath가 주기적으로 갱신)
+        self.admin_types: Optional[set] = None
+        self.validators = {
+            "ID_NUM": lambda text, m: is_valid_rrn(m.group()),
+            "CREDIT_CARD": lambda text, m: is_valid_luhn(m.group()),
+            "PHONE_NUM": lambda text, m: is_valid_phone(m.group()),
+            "ACCOUNT": lambda text, m: is_valid_account(m.group()) and self._has_account_context(text, m),
+            "EMAIL": lambda text, m: ".." not in m.group(),
+        }
+
+    @staticmethod
+    def _has_account_context(text: str, match: re.Match) -> bool:
+        window = text[max(0, match.start() - _ACCOUNT_CONTEXT_WINDOW):match.start()]
+        return _ACCOUNT_CONTEXT.search(window) is not None
+
+    def scan(self, text: str) -> List[Dict[str, Any]]:
+        """
+        검증을 통과한 정형 PII 목록 반환
+
+        Returns:
+            [{"type", "value", "start", "end", "confidence", "token_count", "source"}]
+            (start/end: text 기준 문자 위치, 백엔드 엔티티와 같은 형태)
+        """
+        if not text:
+            return []
+
+        entities = []
+        for match in _COMBINED_PATTERN.finditer(text):
+            entity_type = match.lastgroup
+            if self.enabled_types is not None and entity_type not in self.enabled_types:
+                continue
+            if self.admin_types is not None and entity_type not in self.admin_types:
+                continue
+            if not self.validators[entity_type](text, match):
+                continue
+
+            entities.append({
+                "type": entity_type,
+                "value": match.group(),
+                "start": match.start(),
+                "end": match.end(),
+                "confidence": 1.0,
+                "token_count": 1,
+                "source": "regex"
+            })
+
+        return entities
+
+    @staticmethod
+    def build_verdict(entities: List[Dict[str, Any]], source: str = "regex") -> Tuple[bool, str, Optional[Dict]]:
+        """
+        스캔 결과를 backend.check_content()와 같은 (should_block, reason, details) 형태로 변환
+
+        Args:
+            entities: 탐지 엔티티 목록
+            source: 판정 출처 (regex: 빠른 경로, file: 백엔드 파일 검사)
+        """
+        from response import ResponseGenerator
+
+        entity_types = sorted({e["type"] for e in entities})
+        details = {
+            "entities": entities,
+            "reason": f"개인정보 {len(entities)}개 탐지됨 ({', '.join(entity_types)})",
+            "policy_violation": False,
+            "policy_judgment": None,
+            "policy_confidence": None,
+            "source": source
+        }
+        details["message"] = ResponseGenerator.format_detection_message(details)
+        return (True, f"pii_detected_{len(entities)}_entities", details)
+
+    @classmethod
+    def merge_verdict(
+        cls,
+        verdict: Tuple[bool, str, Optional[Dict]],
+        entities: List[Dict[str, Any]]
+    ) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        백엔드 판정에 스캔 결과 합치기 (redact 모드: 백엔드 검사 후 정규식 엔티티도 함께 치환)
+
+        - 엔티티와 함께 차단: 같은 구간이 아닌 스캔 엔티티를 추가 (겹치는 구간은 치환 시 병합)
+        - 통과 (미탐지, 장애 시 허용 정책 등): 스캔 엔티티로 차단 판정 생성
+        - 엔티티 없는 차단 (장애 시 차단 정책 등): 그대로 차단
+        """
+        should_block, reason, details = verdict
+        if not entities:
+            return verdict
+        if not should_block:
+            return cls.build_verdict(entities)
+        if details is None or "entities" not in details:
+            return verdict
+
+        known = {(e.get("start"), e.get("end"), e.get("type")) for e in details["entities"]}
+        extra = [e for e in entities if (e["start"], e["end"], e["type"]) not in known]
+        return (should_block, reason, {**details, "entities": details["entities"] + extra})
+
+    def check(self, text: str) -> Optional[Tuple[bool, str, Optional[Dict]]]:
+        """확정 탐지가 있으면 차단 판정, 없으면 None (백엔드 검사 진행)"""
+        start_time = time.perf_counter()
+        entities = self.scan(text)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug(f"Regex fast path: {len(entities)} entities in {elapsed_ms:.2f}ms")
+
+        if not entities:
+            return None
+        return self.build_verdict(entities)
+
+
+# 싱글톤 인스턴스
+pii_scanner = PIIScanner(REGEX_FAST_PATH_TYPES)
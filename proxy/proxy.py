@@ -1,15 +1,19 @@
 """
 메인 프록시 애드온
 """
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from mitmproxy import http
 
-from config import TARGET_HOSTS, BLOCK_MESSAGE, DEBUG
+from config import TARGET_HOSTS, BLOCK_MESSAGE, BLOCK_FILE_PII, DEBUG, PROXY_MODE, REGEX_FAST_PATH, RESPONSE_SCAN
 from logger import logger
 from backend import backend_client
 from extractor import DataExtractor
+from fast_path import RegexFastPath
+from pii_scanner import pii_scanner
 from response import ResponseGenerator
+from response_scanner import SSEResponseScanner
 from streaming import StreamingHandler
 
 
@@ -20,6 +24,8 @@ class SemanticProxy:
         self.extractor = DataExtractor()
         self.backend = backend_client
         self.response_gen = ResponseGenerator()
+        self.scanner = pii_scanner
+        self.fast_path = RegexFastPath(self.scanner, self.backend)
 
         # 초기화 시 백엔드 헬스 체크
         if self.backend.health_check():
@@ -33,9 +39,9 @@ class SemanticProxy:
         # 스트리밍 기능 비활성화 (안정성 우선)
         # StreamingHandler.optimize_for_streaming()
 
-    def request(self, flow: http.HTTPFlow):
+    async def request(self, flow: http.HTTPFlow):
         """
-        HTTP 요청 처리
+        HTTP 요청 처리 (비동기 훅: 백엔드 대기 중에도 다른 플로우 처리)
 
         Args:
             flow: mitmproxy HTTP 플로우
@@ -47,8 +53,8 @@ class SemanticProxy:
 
         # 요청 타입 확인
         if self.extractor.is_upload_request(flow):
-            # 업로드 요청 처리 (차단하지 않음)
-            self._handle_upload(flow)
+            # 업로드 요청 처리 (파일에서 PII 탐지 시 BLOCK_FILE_PII 설정에 따라 차단)
+            await self._handle_upload(flow)
             return
 
         if not self.extractor.is_stream_request(flow):
@@ -56,9 +62,9 @@ class SemanticProxy:
             return
 
         # 스트림 요청 처리
-        self._handle_stream_request(flow)
+        await self._handle_stream_request(flow)
 
-    def _handle_stream_request(self, flow: http.HTTPFlow):
+    async def _handle_stream_request(self, flow: http.HTTPFlow):
         """스트림 요청 처리 (대화 요청)"""
 
         # 요청 디코딩
@@ -68,7 +74,7 @@ class SemanticProxy:
             logger.debug(f"Failed to decode request: {e}")
 
         # 데이터 추출
-        extracted_data = self._extract_request_data(flow)
+        extracted_data = await self._extract_request_data(flow)
 
         # 추출된 데이터가 없으면 통과 (백그라운드 통신)
         if not extracted_data["prompt"] and not extracted_data["files"]:
@@ -86,17 +92,59 @@ class SemanticProxy:
                 print(f"📎 [파일] {file_info.get('filename', 'unknown')} ({file_info.get('content_type', 'unknown')})")
                 if file_info.get('text'):
                     print(f"  내용: {file_info['text'][:100]}{'...' if len(file_info.get('text', '')) > 100 else ''}")
+                if file_info.get("truncated"):
+                    print(f"  ⚠️ 일부만 검사됨: {file_info.get('pages_processed')}/{file_info.get('pages_total')}페이지 ({file_info.get('budget_exceeded')} 예산 초과)")
 
         # 백엔드에 종합 분석 요청 (PII + 유사 문서)
         print(f"🔍 [검사 시작] 텍스트 길이: {len(extracted_data['prompt'])}, 파일: {len(extracted_data['files'])}개")
-        should_block, reason, details = self.backend.comprehensive_analysis(
-            prompt=extracted_data["prompt"],
-            files_data=extracted_data["files"],
-            metadata=extracted_data["metadata"],
-            client_ip=extracted_data["metadata"]["client_ip"]
-        )
+        # 첨부 파일에서 PII가 나왔으면 프롬프트 검사 없이 차단 (파일 탐지 로그는 백엔드가 이미 저장)
+        file_verdict = self._check_file_pii(extracted_data["files"])
+        # 관리자 PII 설정에서 꺼진 타입은 정규식으로 확정하지 않음 (설정은 주기적으로 백그라운드 갱신, 응답 스캔에도 반영)
+        if REGEX_FAST_PATH or RESPONSE_SCAN:
+            self.fast_path.refresh_settings()
+        # 정형 PII가 확정되면 백엔드 왕복 없이 바로 판정 (감사 로그는 비동기 전송)
+        # 마스킹 모드는 정규식 결과만으로 통과시키면 NER 전용 PII/정책 위반이 검사되지 않으므로 차단 모드에서만 사용
+        fast_verdict = None
+        regex_entities = []
+        if file_verdict is None and REGEX_FAST_PATH:
+            if PROXY_MODE == "redact":
+                regex_entities = self.fast_path.scan(extracted_data["prompt"])
+            else:
+                fast_verdict = self.fast_path.check(extracted_data["prompt"], extracted_data["metadata"]["client_ip"])
+
+        if file_verdict is not None:
+            should_block, reason, details = file_verdict
+            print(f"📎 [파일 PII 탐지] {details['reason']}")
+        elif fast_verdict is not None:
+            should_block, reason, details = fast_verdict
+            print(f"⚡ [빠른 탐지] {details['reason']}")
+        else:
+            # 마스킹 모드는 문자 위치(start/end)를 반환하는 PII 탐지 API 사용
+            analyze = self.backend.check_content if PROXY_MODE == "redact" else self.backend.comprehensive_analysis
+            should_block, reason, details = await analyze(
+                prompt=extracted_data["prompt"],
+                files_data=extracted_data["files"],
+                metadata=extracted_data["metadata"],
+                client_ip=extracted_data["metadata"]["client_ip"]
+            )
+            if regex_entities:
+                should_block, reason, details = self.scanner.merge_verdict((should_block, reason, details), regex_entities)
         print(f"🔍 [검사 완료] 차단: {should_block}, 사유: {reason}")
 
+        # 마스킹 모드: PII만 탐지된 경우 차단 대신 본문을 치환해서 전달
+        if should_block and PROXY_MODE == "redact" and self._redact_request(flow, extracted_data, details):
+            logger.log_request(
+                prompt=extracted_data["prompt"],
+                files_count=len(extracted_data["files"]),
+                client_ip=extracted_data["metadata"]["client_ip"],
+                host=flow.request.host,
+                should_block=False,
+                reason=f"redacted_{reason}",
+                details={"entities": details.get("entities", [])}
+            )
+            self._add_browser_headers(flow)
+            return
+
         # 로그 저장 (logger에서 모든 로그 처리)
         logger.log_request(
             prompt=extracted_data["prompt"],
@@ -140,9 +188,77 @@ class SemanticProxy:
             print(f"✅ [통과] {reason}")
             # 통과한 경우 정상적인 브라우저 헤더 추가하여 Cloudflare 우회
             self._add_browser_headers(flow)
+            if RESPONSE_SCAN:
+                # 압축된 SSE는 청크 단위로 검사할 수 없으므로 비압축 응답 요청
+                flow.request.headers["Accept-Encoding"] = "identity"
+                flow.metadata["scan_response"] = True
             # flow.response가 None이면 원본 요청이 GPT API로 전달됨
 
-    def _handle_upload(self, flow: http.HTTPFlow):
+    def _check_file_pii(self, files: List[Dict[str, Any]]) -> Optional[Tuple[bool, str, Optional[Dict]]]:
+        """백엔드 파일 검사에서 PII가 탐지된 첨부가 있으면 차단 판정, 없으면 None"""
+        if not BLOCK_FILE_PII:
+            return None
+
+        entities = [
+            {**entity, "filename": file_info.get("filename")}
+            for file_info in files if file_info.get("has_pii")
+            for entity in file_info.get("entities", [])
+        ]
+        if not entities:
+            return None
+        return self.scanner.build_verdict(entities, source="file")
+
+    def _block_upload(self, flow: http.HTTPFlow, processed: Dict[str, Any]) -> bool:
+        """PII가 탐지된 업로드 파일 차단 (차단했으면 True)"""
+        verdict = self._check_file_pii([processed])
+        if verdict is None:
+            return False
+
+        _, reason, details = verdict
+        filename = processed.get("filename", "unknown")
+        client_ip = self.extractor.get_client_ip(flow)
+        print(f"🚫 [업로드 차단] {filename}: {details['reason']}")
+
+        logger.log_blocked_request(
+            prompt=f"[file] {filename}",
+            files_count=1,
+            client_ip=client_ip,
+            host=flow.request.host,
+            reason=reason,
+            details=details
+        )
+        flow.response = self.response_gen.create_error_response(flow, details["message"], status_code=403)
+        return True
+
+    def _redact_request(self, flow: http.HTTPFlow, extracted_data: Dict[str, Any], details: Optional[Dict]) -> bool:
+        """
+        최신 사용자 메시지의 PII를 placeholder로 치환 (본문 한 번 이어 붙이기)
+
+        정책 위반, 파일 내 PII, 위치를 특정할 수 없는 경우는 False를 반환하여 차단 처리
+
+        Returns:
+            치환 성공 여부
+        """
+        if not details or details.get("policy_violation") or not details.get("entities"):
+            return False
+        if any(file_info.get("text") for file_info in extracted_data["files"]):
+            return False
+
+        start_time = time.perf_counter()
+        body = flow.request.get_text(strict=False) or ""
+        redacted_body = self.extractor.redact_prompt(body, extracted_data["prompt"], details["entities"])
+        if redacted_body is None:
+            logger.debug("Redaction failed, falling back to block")
+            return False
+
+        flow.request.text = redacted_body
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        entity_types = ", ".join(sorted({e.get("type", "PII") for e in details["entities"]}))
+        print(f"✂️ [마스킹] {len(details['entities'])}개 치환 ({entity_types}), {elapsed_ms:.1f}ms")
+        return True
+
+    async def _handle_upload(self, flow: http.HTTPFlow):
         """업로드 요청 처리"""
 
         # 요청 디코딩
@@ -155,21 +271,26 @@ class SemanticProxy:
 
         # 멀티파트 업로드
         if "multipart/form-data" in content_type:
-            files = self.extractor.parse_multipart(
+            # boundary는 대소문자를 구분하므로 원본 헤더 사용, 파트는 하나씩 지연 파싱
+            files = self.extractor.iter_multipart(
                 flow.request.raw_content or b"",
-                content_type
+                flow.request.headers.get("content-type", "")
             )
 
-            # 각 파일을 백엔드로 전송
+            # 각 파일을 백엔드로 전송 (PII가 탐지된 파일이 나오면 업로드 전체 차단)
+            count = 0
             for file_info in files:
-                self.backend.process_file(
+                processed = await self.backend.process_file(
                     file_bytes=file_info["data"],
                     filename=file_info["filename"],
                     content_type=file_info["content_type"]
                 )
-                print(f"[파일 처리] {file_info['filename']} ({len(file_info['data'])} bytes)")
+                print(f"[파일 처리] {file_info['filename']} ({file_info['size']} bytes)")
+                if self._block_upload(flow, processed):
+                    return
+                count += 1
 
-            print(f"[완료] {len(files)}개 파일 처리됨")
+            print(f"[완료] {count}개 파일 처리됨")
 
         # 바이너리 업로드
         else:
@@ -178,15 +299,16 @@ class SemanticProxy:
                 filename = self.extractor.guess_filename(flow)
 
                 # 백엔드로 파일 전송
-                self.backend.process_file(
+                processed = await self.backend.process_file(
                     file_bytes=raw_data,
                     filename=filename,
                     content_type=content_type
                 )
 
                 print(f"[바이너리 처리] {filename} ({len(raw_data)} bytes)")
+                self._block_upload(flow, processed)
 
-    def _extract_request_data(self, flow: http.HTTPFlow) -> Dict[str, Any]:
+    async def _extract_request_data(self, flow: http.HTTPFlow) -> Dict[str, Any]:
         """요청에서 모든 데이터 추출 (파일은 백엔드로 전송)"""
 
         content_type = flow.request.headers.get("content-type", "").lower()
@@ -216,7 +338,7 @@ class SemanticProxy:
             for file_data in embedded_files:
                 # 파일 원본 바이트를 백엔드로 전송
                 # 백엔드에서 PDF 파싱, OCR, 텍스트 추출 등 모든 처리 수행
-                processed = self.backend.process_file(
+                processed = await self.backend.process_file(
                     file_bytes=file_data["data"],
                     filename=file_data["filename"],
                     content_type=file_data["content_type"]
@@ -233,15 +355,15 @@ class SemanticProxy:
 
         # 멀티파트 요청 처리
         elif "multipart/form-data" in content_type:
-            files = self.extractor.parse_multipart(
+            files = self.extractor.iter_multipart(
                 flow.request.raw_content or b"",
-                content_type
+                flow.request.headers.get("content-type", "")
             )
 
             for file_info in files:
                 # 파일 원본 바이트를 백엔드로 전송
                 # PDF, 이미지, 문서 등 모든 파일 타입의 처리는 백엔드에서 수행
-                processed = self.backend.process_file(
+                processed = await self.backend.process_file(
                     file_bytes=file_info["data"],
                     filename=file_info["filename"],
                     content_type=file_info["content_type"]
@@ -300,23 +422,54 @@ class SemanticProxy:
 
     def responseheaders(self, flow: http.HTTPFlow):
         """
-        응답 헤더 처리 (스트리밍 비활성화)
-        
+        응답 헤더 처리 (RESPONSE_SCAN=1이면 검사한 대화 요청의 SSE 응답을 스트리밍하며 증분 스캔)
+
         Args:
             flow: mitmproxy HTTP 플로우
         """
-        # 스트리밍 관련 처리 완전 비활성화 (안정성 우선)
-        pass
+        if not RESPONSE_SCAN or not flow.metadata.get("scan_response"):
+            return
+
+        content_type = flow.response.headers.get("content-type", "").lower()
+        if "text/event-stream" not in content_type:
+            return
+
+        encoding = flow.response.headers.get("content-encoding", "identity").lower()
+        if encoding not in ("", "identity"):
+            logger.warn(f"Compressed SSE response ({encoding}), response scan skipped")
+            return
+
+        client_ip = self.extractor.get_client_ip(flow)
+        scanner = SSEResponseScanner(
+            on_cut=lambda entities: self._log_response_cut(flow, client_ip, entities)
+        )
+        flow.response.stream = scanner
+        flow.metadata["response_scanner"] = scanner
+
+    def _log_response_cut(self, flow: http.HTTPFlow, client_ip: str, entities: List[Dict[str, Any]]):
+        """응답 스트림 차단 로그"""
+        verdict = self.scanner.build_verdict(entities, source="response")
+        _, reason, details = verdict
+        print(f"✂️ [응답 차단] {flow.request.host}: {details['reason']}")
+        logger.log_blocked_request(
+            prompt="[response]",
+            files_count=0,
+            client_ip=client_ip,
+            host=flow.request.host,
+            reason=f"response_{reason}",
+            details=details
+        )
 
     def response(self, flow: http.HTTPFlow):
         """
-        HTTP 응답 처리
+        HTTP 응답 처리 (스트리밍 스캔 통계 기록)
 
         Args:
             flow: mitmproxy HTTP 플로우
         """
-        # 응답 처리 비활성화 (안정성 우선)
-        pass
+        scanner = flow.metadata.get("response_scanner")
+        if scanner is not None:
+            logger.debug(f"Response scan: cut={scanner.cut}, stats={scanner.stats}")
 
     def error(self, flow: http.HTTPFlow):
         """
@@ -330,6 +483,11 @@ class SemanticProxy:
         if TARGET_HOSTS.search(host):
             print(f"❌ [에러] {host}: {flow.error}")
 
+    async def done(self):
+        """프록시 종료 시 남은 감사 로그 전송 후 백엔드 연결 풀 정리"""
+        await self.fast_path.drain()
+        await self.backend.aclose()
+
 
 # mitmproxy 애드온 등록
 addons = [SemanticProxy()]
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+SSE 응답 증분 스캔 모듈 (모델 응답으로 새어 나오는 정형 PII 차단)
+
+mitmproxy의 flow.response.stream 콜백으로 사용합니다.
+청크를 bytearray에 모아 SSE 이벤트 단위로 나누고, 이벤트에서 새로 추가된 텍스트(delta)만 꺼내
+최근 텍스트 창(window)에 이어 붙여 정규식 스캐너로 검사합니다.
+응답 전체를 버퍼링하지 않으며, 이벤트를 붙잡아 두는 경우는 창 끝에 아직 완성되지 않은
+숫자/이메일 후보가 있을 때뿐입니다 (RESPONSE_SCAN_MAX_HOLD_BYTES 이내).
+"""
+import json
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from config import RESPONSE_SCAN_WINDOW, RESPONSE_SCAN_MAX_HOLD_BYTES, RESPONSE_BLOCK_MESSAGE
+from logger import logger
+from pii_scanner import PIIScanner, pii_scanner
+
+# 창 끝에서 다음 delta로 이어질 수 있는 후보 (숫자열, 작성 중인 이메일)
+_PENDING_TAIL = re.compile(r"(?:\d[\d\s.-]{0,24}|[\w.%+-]+@[\w.-]*)$")
+
+# 구분자 없이 이보다 커지는 이벤트는 해석하지 않고 그대로 전달
+MAX_EVENT_BYTES = 1024 * 1024
+
+_EVENT_SEPARATORS = (b"\r\n\r\n", b"\n\n")
+
+# delta 인코딩(v1)에서 메시지 본문 경로
+_PARTS_PATH = "/message/content/parts"
+
+
+class SSEResponseScanner:
+    """
+    응답 스트림 1건의 증분 PII 스캐너 (flow.response.stream에 지정하는 callable)
+
+    지원하는 SSE 형식:
+    - ChatGPT 누적 형식: data: {"message": {"content": {"parts": ["지금까지의 전체 텍스트"]}}}
+    - ChatGPT delta 인코딩(v1): {"p": "/message/content/parts/0", "o": "append", "v": "..."}, {"v": "..."}, patch 묶음
+    - OpenAI API 형식: data: {"choices": [{"delta": {"content": "..."}}]}
+    """
+
+    def __init__(
+        self,
+        scanner: PIIScanner = pii_scanner,
+        window_chars: int = RESPONSE_SCAN_WINDOW,
+        max_hold_bytes: int = RESPONSE_SCAN_MAX_HOLD_BYTES,
+        on_cut: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ):
+        """
+        Args:
+            scanner: 정규식 PII 스캐너
+            window_chars: 다음 delta와 이어서 검사할 최근 텍스트 길이
+            max_hold_bytes: 미완성 후보 때문에 붙잡아 둘 수 있는 최대 이벤트 바이트
+            on_cut: 스트림을 끊을 때 호출 (탐지 엔티티 목록)
+        """
+        self.scanner = scanner
+        self.window_chars = window_chars
+        self.max_hold_bytes = max_hold_bytes
+        self.on_cut = on_cut
+
+        self._buffer = bytearray()  # 아직 구분자가 오지 않은 이벤트 조각
+        self._held: List[bytes] = []  # 검사는 끝났지만 후보 확정을 기다리는 이벤트
+        self._held_bytes = 0
+        self._window = ""
+
+        # 형식별 상태
+        self.format: Optional[str] = None
+        self._cumulative_lengths: Dict[Any, int] = {}
+        self._last_message: Optional[Dict[str, Any]] = None
+        self._last_path: Optional[str] = None
+        self._last_op: Optional[str] = None
+
+        self.cut = False
+        self.entities: List[Dict[str, Any]] = []
+        self.stats = {"chunks": 0, "events": 0, "chars": 0, "max_held_bytes": 0, "max_chunk_ms": 0.0}
+
+    def __call__(self, data: bytes) -> bytes:
+        """청크 하나 처리 후 클라이언트로 보낼 바이트 반환 (빈 청크는 스트림 종료)"""
+        start_time = time.perf_counter()
+        self.stats["chunks"] += 1
+        try:
+            if self.cut:
+                return b""
+            final = not data
+            output = self._feed(data, final)
+        except Exception as e:
+            # 스캐너 오류로 응답이 멈추지 않도록 남은 데이터는 그대로 전달
+            logger.warn(f"Response scan error, passing through: {e}")
+            output = self._release() + bytes(self._buffer)
+            self._buffer.clear()
+        finally:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self.stats["max_chunk_ms"] = max(self.stats["max_chunk_ms"], elapsed_ms)
+        return output
+
+    def _feed(self, data: bytes, final: bool) -> bytes:
+        self._buffer += data
+
+        # 완성된 이벤트만 꺼내고, 남은 조각은 한 번에 앞으로 당김
+        pos = 0
+        while True:
+            end, separator = self._find_event_end(pos)
+            if end == -1:
+                break
+            event = bytes(self._buffer[pos:end + len(separator)])
+            pos = end + len(separator)
+            cut = self._process_event(event, final=False)
+            if cut is not None:
+                return cut
+        del self._buffer[:pos]
+
+        if final and self._buffer:
+            # 구분자 없이 끝난 마지막 이벤트
+            event = bytes(self._buffer)
+            self._buffer.clear()
+            cut = self._process_event(event, final=True)
+            if cut is not None:
+                return cut
+        elif len(self._buffer) > MAX_EVENT_BYTES:
+            logger.warn(f"SSE event larger than {MAX_EVENT_BYTES} bytes, passing through unscanned")
+            passthrough = self._release() + bytes(self._buffer)
+            self._buffer.clear()
+            return passthrough
+
+        if final:
+            entities = self.scanner.scan(self._window)
+            if entities:
+                return self._cut(entities)
+            return self._release()
+
+        # 창 끝 후보가 확정될 때까지 (한도 안에서) 전달 보류
+        if self._held_bytes <= self.max_hold_bytes and _PENDING_TAIL.search(self._window):
+            return b""
+
+        if self._held_bytes > self.max_hold_bytes:
+            # 한도 초과: 창 끝에 걸친 탐지가 있으면 보수적으로 차단
+            entities = self.scanner.scan(self._window)
+            if entities:
+                return self._cut(entities)
+        return self._release()
+
+    def _find_event_end(self, pos: int):
+        """pos 이후 가장 먼저 나오는 이벤트 구분자 위치"""
+        best, best_separator = -1, b""
+        for separator in _EVENT_SEPARATORS:
+            index = self._buffer.find(separator, pos)
+            if index != -1 and (best == -1 or index < best):
+                best, best_separator = index, separator
+        return best, best_separator
+
+    def _process_event(self, event: bytes, final: bool) -> Optional[bytes]:
+        """이벤트 검사 (차단해야 하면 대체 바이트, 아니면 None)"""
+        self.stats["events"] += 1
+        self._held.append(event)
+        self._held_bytes += len(event)
+        self.stats["max_held_bytes"] = max(self.stats["max_held_bytes"], self._held_bytes)
+
+        delta = self._delta_text(event)
+        if not delta:
+            return None
+
+        self.stats["chars"] += len(delta)
+        window = self._window + delta
+
+        # 창 끝에 닿은 후보는 다음 delta에서 더 길어질 수 있으므로 종료 전까지 확정하지 않음
+        entities = self.scanner.scan(window)
+        confirmed = [e for e in entities if final or e["end"] < len(window)]
+        if confirmed:
+            return self._cut(confirmed)
+
+        self._window = window[-self.window_chars:] if len(window) > self.window_chars else window
+        return None
+
+    def _release(self) -> bytes:
+        """보류 중인 이벤트 전달"""
+        output = b"".join(self._held)
+        self._held.clear()
+        self._held_bytes = 0
+        return output
+
+    def _cut(self, entities: List[Dict[str, Any]]) -> bytes:
+        """보류 중인 이벤트를 버리고 안내 메시지로 스트림 종료"""
+        self.cut = True
+        self.entities = entities
+        self._held.clear()
+        self._held_bytes = 0
+        self._buffer.clear()
+        if self.on_cut is not None:
+            self.on_cut(entities)
+        return self._build_notice()
+
+    # ------------------------------------------------------------------
+    # SSE 이벤트 해석
+    # ------------------------------------------------------------------
+
+    def _delta_text(self, event: bytes) -> str:
+        """이벤트에서 새로 추가된 응답 텍스트"""
+        data_lines = []
+        for line in event.decode("utf-8", errors="replace").splitlines():
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip(" "))
+        data = "\n".join(data_lines)
+        if not data or data == "[DONE]":
+            return ""
+
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return ""
+        if not isinstance(payload, dict):
+            return ""  # 예: data: "v1" (delta 인코딩 선언)
+
+        choices = payload.get("choices")
+        if isinstance(choices, list):
+            self.format = "openai"
+            return "".join(
+                choice["delta"].get("content") or ""
+                for choice in choices
+                if isinstance(choice, dict) and isinstance(choice.get("delta"), dict)
+            )
+
+        message = payload.get("message")
+        if isinstance(message, dict):
+            self.format = "cumulative"
+            return self._cumulative_delta(message)
+
+        if "v" in payload:
+            self.format = "delta"
+            return self._patch_delta(payload)
+        return ""
+
+    def _cumulative_delta(self, message: Dict[str, Any]) -> str:
+        """누적 형식: 같은 메시지의 이전 길이 이후 부분"""
+        author = message.get("author") or {}
+        if author.get("role") != "assistant":
+            return ""
+
+        content = message.get("content") or {}
+        text = "".join(part for part in content.get("parts") or [] if isinstance(part, str))
+        key = message.get("id")
+        seen = self._cumulative_lengths.get(key, 0)
+        self._cumulative_lengths[key] = len(text)
+        self._last_message = message
+        return text[seen:]
+
+    def _patch_delta(self, op: Dict[str, Any]) -> str:
+        """delta 인코딩(v1): 본문 경로에 대한 append 값 (p/o 생략 시 직전 경로/연산 사용)"""
+        if "p" in op:
+            self._last_path = op["p"]
+        if "o" in op:
+            self._last_op = op["o"]
+        value = op.get("v")
+
+        if self._last_op == "patch" and isinstance(value, list):
+            return "".join(self._patch_delta(sub) for sub in value if isinstance(sub, dict))
+        if self._last_op == "add" and isinstance(value, dict):
+            message = value.get("message")
+            return self._cumulative_delta(message) if isinstance(message, dict) else ""
+        if isinstance(value, str) and (self._last_path or "").startswith(_PARTS_PATH):
+            return value if self._last_op in (None, "append") else ""
+        return ""
+
+    def _build_notice(self) -> bytes:
+        """스트림 형식에 맞춘 차단 안내 이벤트 + 종료 표시"""
+        notice = f"\n\n{RESPONSE_BLOCK_MESSAGE}"
+        if self.format == "openai":
+            payload = {"choices": [{"index": 0, "delta": {"content": notice}, "finish_reason": "stop"}]}
+            event = b"data: " + json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n\n"
+        elif self.format == "delta":
+            payload = {"p": f"{_PARTS_PATH}/0", "o": "append", "v": notice}
+            event = b"event: delta\ndata: " + json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n\n"
+        elif self.format == "cumulative" and self._last_message is not None:
+            # 누적 형식은 본문 전체를 교체하므로 이미 표시된 텍스트도 안내 메시지로 바뀜
+            message = dict(self._last_message)
+            message["content"] = {**(message.get("content") or {}), "parts": [RESPONSE_BLOCK_MESSAGE]}
+            message["status"] = "finished_successfully"
+            event = b"data: " + json.dumps({"message": message}, ensure_ascii=False).encode("utf-8") + b"\n\n"
+        else:
+            event = b""
+        return event + b"data: [DONE]\n\n"
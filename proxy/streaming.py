@@ -85,7 +85,7 @@ class ResponseBuffer:
     """스트리밍 응답을 위한 버퍼 관리"""
     
     def __init__(self):
-        self.buffers = {}  # flow_id -> buffer
+        self.buffers = {}  # flow_id -> bytearray
     
     def should_buffer(self, flow: http.HTTPFlow) -> bool:
         """응답을 버퍼링해야 하는지 확인"""
@@ -97,14 +97,14 @@ class ResponseBuffer:
         return False
     
     def add_to_buffer(self, flow_id: str, data: bytes):
-        """버퍼에 데이터 추가"""
+        """버퍼에 데이터 추가 (bytearray 제자리 확장, bytes += 반복 복사 방지)"""
         if flow_id not in self.buffers:
-            self.buffers[flow_id] = b""
+            self.buffers[flow_id] = bytearray()
         self.buffers[flow_id] += data
     
     def get_buffer(self, flow_id: str) -> bytes:
         """버퍼 데이터 반환"""
-        return self.buffers.get(flow_id, b"")
+        return bytes(self.buffers.get(flow_id, b""))
     
     def clear_buffer(self, flow_id: str):
         """버퍼 정리"""
@@ -3,6 +3,7 @@
 종합 분석 메시지 포맷팅 및 백엔드 연동 테스트
 """
 
+import asyncio
 from response import ResponseGenerator
 from backend import backend_client
 
@@ -108,11 +109,11 @@ if __name__ == "__main__":
         
         # 종합 분석 테스트
         test_prompt = "안녕하세요. 저는 홍길동이고 이메일은 hong@example.com입니다."
-        should_block, reason, details = backend_client.comprehensive_analysis(
+        should_block, reason, details = asyncio.run(backend_client.comprehensive_analysis(
             prompt=test_prompt,
             files_data=[],
             metadata={}
-        )
+        ))
         
         print(f"테스트 프롬프트: {test_prompt}")
         print(f"차단 여부: {should_block}")
@@ -0,0 +1,7 @@
+"""
+Pytest 공통 설정 (프록시 모듈은 proxy/ 최상위에서 import)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,264 @@
+"""
+서킷 브레이커 상태 전환 / 최근 판정 캐시 / 백엔드 호출 취소 처리 테스트
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import circuit_breaker as breaker_module
+from backend import BackendClient
+from circuit_breaker import CircuitBreaker, VerdictCache
+
+
+class FakeClock:
+    """time.monotonic 대체 (테스트에서 시간을 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(breaker_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def transitions(monkeypatch):
+    """상태 전환 기록 (로그 파일 대신 목록에 저장)"""
+    recorded = []
+    monkeypatch.setattr(
+        breaker_module.logger, "log_breaker_transition",
+        lambda name, old_state, new_state, reason: recorded.append((old_state, new_state))
+    )
+    return recorded
+
+
+def make_breaker() -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=3, slow_call_seconds=1.0, slow_call_threshold=2, open_seconds=30)
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow_request()
+        breaker.record_failure("ConnectError")
+
+
+class TestCircuitBreaker:
+    """closed → open → half_open → closed/open 전환 테스트"""
+
+    def test_opens_after_consecutive_failures(self, clock, transitions):
+        """연속 실패가 임계값에 도달해야 open, 중간에 성공하면 다시 셈"""
+        breaker = make_breaker()
+        breaker.record_failure("ConnectError")
+        breaker.record_failure("ConnectError")
+        breaker.record_success(0.1)
+        breaker.record_failure("ConnectError")
+        breaker.record_failure("ConnectError")
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure("ConnectError")
+        assert breaker.state == CircuitBreaker.OPEN
+        assert transitions == [("closed", "open")]
+
+    def test_opens_after_consecutive_slow_calls(self, clock, transitions):
+        """응답은 오지만 SLO를 연속으로 넘기면 open"""
+        breaker = make_breaker()
+        breaker.record_success(2.0)
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_success(2.0)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_open_rejects_until_timeout_then_single_probe(self, clock, transitions):
+        """open 동안 거부, 시간이 지나면 half_open에서 탐색 요청 1건만 통과"""
+        breaker = make_breaker()
+        open_breaker(breaker)
+
+        clock.now += 29
+        assert not breaker.allow_request()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        clock.now += 2
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+        assert not breaker.allow_request()
+        assert breaker.get_stats()["rejected"] == 3
+
+    def test_probe_success_closes(self, clock, transitions):
+        """탐색 요청이 SLO 안에 성공하면 closed, 카운터 초기화"""
+        breaker = make_breaker()
+        open_breaker(breaker)
+        clock.now += 31
+        probe = breaker.allow_request()
+        assert probe
+
+        breaker.record_success(0.1, probe)
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.consecutive_failures == 0
+        assert breaker.allow_request() and breaker.allow_request()
+        assert transitions == [("closed", "open"), ("open", "half_open"), ("half_open", "closed")]
+
+    @pytest.mark.parametrize("outcome", ["failure", "slow"])
+    def test_probe_failure_reopens(self, clock, transitions, outcome):
+        """탐색 요청이 실패하거나 SLO를 넘기면 다시 open (open 시간도 새로 시작)"""
+        breaker = make_breaker()
+        open_breaker(breaker)
+        clock.now += 31
+        probe = breaker.allow_request()
+        assert probe
+
+        if outcome == "failure":
+            breaker.record_failure("ReadTimeout", probe)
+        else:
+            breaker.record_success(2.0, probe)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.opened_at == clock.now
+        assert not breaker.allow_request()
+
+    def test_released_probe_does_not_count_as_failure(self, clock, transitions):
+        """결과 없이 반납된 탐색 요청은 상태를 바꾸지 않고 다음 요청이 탐색"""
+        breaker = make_breaker()
+        open_breaker(breaker)
+        clock.now += 31
+        probe = breaker.allow_request()
+        assert probe
+
+        breaker.release_probe(probe)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.consecutive_failures == breaker.failure_threshold
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+    @pytest.mark.parametrize("outcome", ["success", "failure", "slow", "released"])
+    def test_straggler_does_not_change_half_open(self, clock, transitions, outcome):
+        """closed일 때 허용되어 half_open 중에 끝난 호출은 탐색 요청이 아니므로 상태를 바꾸지 않음"""
+        breaker = make_breaker()
+        straggler = breaker.allow_request()
+        open_breaker(breaker)
+        clock.now += 31
+        probe = breaker.allow_request()
+        assert probe and probe != straggler
+
+        if outcome == "success":
+            breaker.record_success(0.1, straggler)
+        elif outcome == "failure":
+            breaker.record_failure("deadline exceeded", straggler)
+        elif outcome == "slow":
+            breaker.record_success(2.0, straggler)
+        else:
+            breaker.release_probe(straggler)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.probe_in_flight
+        assert not breaker.allow_request()
+
+        breaker.record_success(0.1, probe)
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert transitions == [("closed", "open"), ("open", "half_open"), ("half_open", "closed")]
+
+    def test_straggler_does_not_extend_open(self, clock, transitions):
+        """open 중에 끝난 느린 호출은 open 시간을 다시 시작하지 않음"""
+        breaker = make_breaker()
+        straggler = breaker.allow_request()
+        open_breaker(breaker)
+        opened_at = breaker.opened_at
+
+        clock.now += 10
+        breaker.record_success(2.0, straggler)
+        breaker.record_success(2.0, straggler)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.opened_at == opened_at
+
+
+class TestVerdictCache:
+    """최근 판정 LRU + TTL 캐시 테스트"""
+
+    def test_key_depends_on_endpoint_and_text(self):
+        key = VerdictCache.make_key("/a", "홍길동")
+        assert key == VerdictCache.make_key("/a", "홍길동")
+        assert key != VerdictCache.make_key("/b", "홍길동")
+        assert key != VerdictCache.make_key("/a", "홍길동 ")
+        assert "홍길동" not in key
+
+    def test_lru_eviction(self, clock):
+        """최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거"""
+        cache = VerdictCache(max_size=2, ttl_seconds=60)
+        cache.put("a", (True, "a", None))
+        cache.put("b", (False, "b", None))
+        assert cache.get("a") == (True, "a", None)
+
+        cache.put("c", (False, "c", None))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.get_stats() == {"size": 2, "hits": 3, "misses": 1}
+
+    def test_ttl_expiry(self, clock):
+        """TTL이 지난 항목은 조회 시 제거"""
+        cache = VerdictCache(max_size=10, ttl_seconds=60)
+        cache.put("a", (True, "a", None))
+        clock.now += 60
+        assert cache.get("a") is not None
+        clock.now += 1
+        assert cache.get("a") is None
+        assert cache.get_stats()["size"] == 0
+
+    def test_disabled(self):
+        cache = VerdictCache(max_size=0, ttl_seconds=60)
+        cache.put("a", (True, "a", None))
+        assert cache.get("a") is None
+
+
+class TestBackendCallOutcome:
+    """백엔드 호출 결과가 브레이커에 기록되는 방식 테스트"""
+
+    @staticmethod
+    def half_open_client(handler) -> tuple:
+        client = BackendClient(transport=httpx.MockTransport(handler))
+        client.breaker.state = CircuitBreaker.HALF_OPEN
+        probe = client.breaker.allow_request()
+        assert probe
+        return client, probe
+
+    def test_cancelled_probe_is_released(self, transitions):
+        """클라이언트 연결 종료로 취소된 탐색 요청은 실패로 기록하지 않고 자리만 반납"""
+        async def handler(request):
+            await asyncio.sleep(10)
+            return httpx.Response(200, json={})
+
+        async def run():
+            client, probe = self.half_open_client(handler)
+            task = asyncio.create_task(client._post_json("/check", {"text": "x"}, None, 0, time.monotonic() + 5, probe))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await client.aclose()
+            return client.breaker
+
+        breaker = asyncio.run(run())
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.consecutive_failures == 0
+        assert not breaker.probe_in_flight
+        assert transitions == []
+
+    def test_transport_error_is_failure(self, transitions):
+        """연결 실패는 탐색 실패로 기록되어 다시 open"""
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        async def run():
+            client, probe = self.half_open_client(handler)
+            with pytest.raises(httpx.ConnectError):
+                await client._post_json("/check", {"text": "x"}, None, 0, time.monotonic() + 5, probe)
+            await client.aclose()
+            return client.breaker
+
+        breaker = asyncio.run(run())
+        assert breaker.state == CircuitBreaker.OPEN
+        assert transitions == [("half_open", "open")]
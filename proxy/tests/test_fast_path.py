@@ -0,0 +1,94 @@
+"""
+정규식 빠른 경로 테스트 (관리자 PII 설정 반영, 차단 시 감사 로그 전송)
+"""
+import asyncio
+
+from fast_path import RegexFastPath
+from pii_scanner import PIIScanner
+
+TEXT = "연락처 010-1234-5678, 메일 hong@example.com"
+
+
+class FakeBackend:
+    """관리자 설정 조회와 감사 로그 전송을 기록하는 가짜 백엔드"""
+
+    def __init__(self, enabled_types):
+        self.enabled_types = enabled_types
+        self.settings_requests = 0
+        self.audits = []
+
+    async def get_enabled_pii_types(self):
+        self.settings_requests += 1
+        return self.enabled_types
+
+    async def post_audit(self, prompt, entities, reason, client_ip=None):
+        self.audits.append({"prompt": prompt, "entities": entities, "reason": reason, "client_ip": client_ip})
+        return True
+
+
+async def loaded_fast_path(backend, refresh_seconds=60) -> RegexFastPath:
+    fast_path = RegexFastPath(PIIScanner(), backend, refresh_seconds=refresh_seconds)
+    fast_path.refresh_settings()
+    await fast_path._refresh_task
+    return fast_path
+
+
+class TestRegexFastPath:
+    """빠른 경로 판정 + 관리자 설정 테스트"""
+
+    def test_check_blocks_and_sends_audit(self):
+        """확정 탐지 시 차단 판정을 반환하고 감사 로그를 백엔드로 전송"""
+        backend = FakeBackend({"PHONE_NUM", "EMAIL"})
+
+        async def run():
+            fast_path = await loaded_fast_path(backend)
+            verdict = fast_path.check(TEXT, "10.0.0.7")
+            await fast_path.drain()
+            return verdict
+
+        should_block, reason, details = asyncio.run(run())
+        assert should_block
+        assert [e["type"] for e in details["entities"]] == ["PHONE_NUM", "EMAIL"]
+        assert backend.audits == [{"prompt": TEXT, "entities": details["entities"], "reason": reason, "client_ip": "10.0.0.7"}]
+
+    def test_disabled_types_not_blocked(self):
+        """관리자 설정에서 꺼진 타입은 차단/치환하지 않음"""
+        backend = FakeBackend({"PHONE_NUM"})
+
+        async def run():
+            fast_path = await loaded_fast_path(backend)
+            return fast_path.check("메일 hong@example.com", None), fast_path.scan(TEXT)
+
+        verdict, entities = asyncio.run(run())
+        assert verdict is None
+        assert [e["type"] for e in entities] == ["PHONE_NUM"]
+        assert backend.audits == []
+
+    def test_no_fast_path_before_settings_loaded(self):
+        """설정을 받기 전이나 조회에 계속 실패하면 확정 탐지 없이 백엔드 검사"""
+        backend = FakeBackend(None)
+
+        async def run():
+            fast_path = await loaded_fast_path(backend)
+            return fast_path.check(TEXT, None)
+
+        assert asyncio.run(run()) is None
+
+    def test_refresh_interval_and_failure_keeps_settings(self):
+        """재조회 주기 안에서는 다시 조회하지 않고, 조회 실패 시 직전 설정 유지"""
+        backend = FakeBackend({"PHONE_NUM"})
+
+        async def run():
+            fast_path = await loaded_fast_path(backend, refresh_seconds=60)
+            fast_path.refresh_settings()
+            assert fast_path._refresh_task.done() and backend.settings_requests == 1
+
+            backend.enabled_types = None
+            fast_path.refresh_seconds = 0
+            fast_path.refresh_settings()
+            await fast_path._refresh_task
+            return fast_path
+
+        fast_path = asyncio.run(run())
+        assert backend.settings_requests == 2
+        assert fast_path.scanner.admin_types == {"PHONE_NUM"}
@@ -0,0 +1,138 @@
+"""
+정규식 스캐너 검증 규칙 / 판정 병합 테스트 (redact 모드: 백엔드 판정 + 정규식 엔티티)
+"""
+import pytest
+
+from pii_scanner import PIIScanner, is_valid_account, is_valid_luhn, is_valid_phone, is_valid_rrn
+
+TEXT = "홍길동 연락처 010-1234-5678"
+NAME = {"type": "NAME", "value": "홍길동", "start": 0, "end": 3, "confidence": 0.99, "token_count": 2}
+
+
+def backend_block(entities, **extra):
+    return (True, f"pii_detected_{len(entities)}_entities", {"message": "차단", "entities": entities, "policy_violation": False, **extra})
+
+
+class TestValidators:
+    """타입별 검증 규칙 테스트"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("900101-1234568", True),
+        ("9001011234568", True),
+        ("900101-1234567", False),  # 체크섬 불일치
+        ("901301-1234568", False),  # 13월
+        ("900101-123456", False),
+    ])
+    def test_rrn(self, value, expected):
+        assert is_valid_rrn(value) is expected
+
+    @pytest.mark.parametrize("value, expected", [
+        ("4111-1111-1111-1111", True),
+        ("4111 1111 1111 1111", True),
+        ("4111-1111-1111-1112", False),
+        ("4111-1111-11", False),
+    ])
+    def test_luhn(self, value, expected):
+        assert is_valid_luhn(value) is expected
+
+    @pytest.mark.parametrize("value, expected", [
+        ("010-1234-5678", True),
+        ("011-123-4567", True),
+        ("010-123-5678", False),  # 010은 가운데 4자리
+    ])
+    def test_phone(self, value, expected):
+        assert is_valid_phone(value) is expected
+
+    @pytest.mark.parametrize("value, expected", [
+        ("110-123-456789", True),
+        ("123456-12-123456", True),
+        ("2024-01-15", False),  # 날짜
+        ("2024-01-15-123", False),
+        ("123-45-67890", False),  # 사업자등록번호
+        ("12-3456-78", False),
+    ])
+    def test_account(self, value, expected):
+        assert is_valid_account(value) is expected
+
+
+class TestScan:
+    """검증을 거친 스캔 결과 테스트"""
+
+    def setup_method(self):
+        self.scanner = PIIScanner()
+
+    def scan(self, text):
+        return [(e["type"], e["value"]) for e in self.scanner.scan(text)]
+
+    def test_account_needs_bank_context(self):
+        """계좌 형식은 앞쪽 문맥에 은행 관련 단어가 있을 때만 확정"""
+        assert self.scan("신한은행 계좌 110-123-456789로 이체") == [("ACCOUNT", "110-123-456789")]
+        assert self.scan("주문번호 110-123-456789 확인") == []
+        assert self.scan("110-123-456789 입금") == []
+
+    def test_account_false_positives(self):
+        """은행 문맥이 있어도 날짜/사업자등록번호 형식은 계좌로 보지 않음"""
+        assert self.scan("입금일 2024-01-15 확인") == []
+        assert self.scan("송금 주문번호 123-45-67890") == []
+
+    def test_email(self):
+        assert self.scan("메일 hong.gd@example.co.kr 로 회신") == [("EMAIL", "hong.gd@example.co.kr")]
+        assert self.scan("메일 hong..gd@example.com") == []
+        assert self.scan("버전 user@localhost") == []
+
+    def test_unverified_candidates_left_to_backend(self):
+        """체크섬/Luhn을 통과하지 못한 후보는 확정하지 않음"""
+        assert self.scan("주민번호 900101-1234567 카드 4111-1111-1111-1112") == []
+        assert self.scan("주민번호 900101-1234568 카드 4111-1111-1111-1111") == [
+            ("ID_NUM", "900101-1234568"), ("CREDIT_CARD", "4111-1111-1111-1111")
+        ]
+
+    def test_enabled_types(self):
+        scanner = PIIScanner({"EMAIL"})
+        assert [e["type"] for e in scanner.scan("010-1234-5678 hong@example.com")] == ["EMAIL"]
+
+
+class TestMergeVerdict:
+    """백엔드 판정에 정규식 엔티티 합치기"""
+
+    def setup_method(self):
+        self.scanner = PIIScanner()
+        self.phone = self.scanner.scan(TEXT)
+
+    def test_scan_offsets(self):
+        assert [(e["type"], e["start"], e["end"]) for e in self.phone] == [("PHONE_NUM", 8, 21)]
+
+    def test_backend_entities_kept_and_regex_added(self):
+        """백엔드 NER 엔티티를 유지하고 정규식 엔티티를 추가"""
+        should_block, _, details = self.scanner.merge_verdict(backend_block([NAME]), self.phone)
+
+        assert should_block
+        assert [e["type"] for e in details["entities"]] == ["NAME", "PHONE_NUM"]
+
+    def test_same_span_not_duplicated(self):
+        backend_phone = {**self.phone[0], "confidence": 0.97, "source": "model"}
+        _, _, details = self.scanner.merge_verdict(backend_block([NAME, backend_phone]), self.phone)
+
+        assert details["entities"] == [NAME, backend_phone]
+
+    def test_policy_violation_preserved(self):
+        """정책 위반 정보는 그대로 남아 치환 대신 차단으로 처리됨"""
+        _, _, details = self.scanner.merge_verdict(backend_block([], policy_violation=True), self.phone)
+
+        assert details["policy_violation"] is True
+        assert details["entities"] == self.phone
+
+    def test_backend_pass_uses_regex_verdict(self):
+        """백엔드가 놓쳤거나 장애 시 허용 정책이어도 정규식 엔티티는 치환 대상"""
+        for verdict in [(False, "no_detection", None), (False, "backend_unavailable", None)]:
+            should_block, _, details = self.scanner.merge_verdict(verdict, self.phone)
+            assert should_block and details["entities"] == self.phone
+
+    def test_block_without_entities_unchanged(self):
+        """엔티티 없는 차단(장애 시 차단 정책)은 치환으로 바꾸지 않음"""
+        verdict = (True, "backend_unavailable", {"message": "서비스를 일시적으로 사용할 수 없습니다."})
+        assert self.scanner.merge_verdict(verdict, self.phone) == verdict
+
+    def test_no_regex_entities(self):
+        verdict = (False, "no_detection", None)
+        assert self.scanner.merge_verdict(verdict, []) == verdict